@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Cluster Throughput Benchmark
+============================
+Measures requests per second of the real server (run_server.py) for a
+range of MOCK_WORKERS settings, with several client processes each
+acting as its own tenant (X-Mock-Tenant), the way parallel groundplex
+nodes or test suites would.
+
+Each client loops over a small SnapLogic-like mix for --seconds: create
+an Account, then run --reads SOQL queries over that tenant's Accounts.
+Workers = 1 is the classic single-process server; higher counts use the
+front end (salesforce_mock/cluster.py), which sends writes to the
+tenant's owning worker and queries to any worker.
+
+Usage (from docker/salesforce/django-server):
+  python benchmarks/cluster_throughput.py [--workers 1,2,4] [--clients 8] [--seconds 10]
+                                          [--reads 1] [--no-tenant]
+
+--no-tenant drops the X-Mock-Tenant header, like a default single-tenant
+CI setup: every write then goes to the same worker while the queries
+spread over all of them, so a higher --reads shows how far one tenant
+scales. Scaling is bounded by the machine's cores (os.cpu_count()),
+shared by the server processes and the benchmark's own client processes;
+on a single core the multi-worker rows only show the relay and sync
+overhead.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+V = '/services/data/v59.0'
+QUERY = urllib.parse.quote("SELECT Id, Name FROM Account WHERE Industry = 'Technology' LIMIT 50")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(workers, port):
+    env = dict(
+        os.environ,
+        MOCK_WORKERS=str(workers),
+        MOCK_WORKER_BASE_PORT=str(_free_port() + 1000),
+        HTTP_PORT=str(port),
+        HTTPS_PORT=str(_free_port()),
+        CERT_PEM='/nonexistent',
+        SCHEMA_DIR=os.path.join(SERVER_DIR, 'schemas'),
+        LOG_LEVEL='WARNING',
+        REQUEST_LOG_LEVEL='DEBUG',
+    )
+    process = subprocess.Popen(
+        [sys.executable, 'run_server.py'], cwd=SERVER_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/__admin/health', timeout=1).read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'server with {workers} workers did not start')
+
+
+def _client(port, tenant, seconds, reads, results):
+    base = f'http://127.0.0.1:{port}'
+    headers = {'Content-Type': 'application/json'}
+    if tenant:
+        headers['X-Mock-Tenant'] = tenant
+    body = json.dumps({'Name': 'Bench', 'Industry': 'Technology'}).encode()
+    count = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        create = urllib.request.Request(f'{base}{V}/sobjects/Account', data=body, headers=headers)
+        urllib.request.urlopen(create).read()
+        for _ in range(reads):
+            query = urllib.request.Request(f'{base}{V}/query?q={QUERY}', headers=headers)
+            urllib.request.urlopen(query).read()
+        count += 1 + reads
+    results.put(count)
+
+
+def _run(workers, clients, seconds, reads, tenants=True):
+    port = _free_port()
+    server = _start_server(workers, port)
+    try:
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(
+                target=_client, args=(port, f'bench-{i}' if tenants else None, seconds, reads, results),
+            )
+            for i in range(clients)
+        ]
+        start = time.perf_counter()
+        for proc in procs:
+            proc.start()
+        total = sum(results.get() for _ in procs)
+        elapsed = time.perf_counter() - start
+        for proc in procs:
+            proc.join()
+        return total / elapsed
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--workers', default='1,2,4', help='comma-separated MOCK_WORKERS values')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--reads', type=int, default=1, help='queries per created Account')
+    parser.add_argument('--no-tenant', action='store_true',
+                        help='send no X-Mock-Tenant (all clients share the default tenant)')
+    args = parser.parse_args()
+
+    counts = [int(value) for value in args.workers.split(',')]
+    tenancy = 'one shared (default)' if args.no_tenant else 'one per client'
+    print(f'cores: {os.cpu_count()}  clients: {args.clients}  seconds: {args.seconds:g}  '
+          f'reads per write: {args.reads}  tenants: {tenancy}')
+    print(f'{"workers":>8}{"req/s":>12}{"speedup":>10}')
+    baseline = None
+    for workers in counts:
+        rate = _run(workers, args.clients, args.seconds, args.reads, tenants=not args.no_tenant)
+        baseline = baseline or rate
+        print(f'{workers:>8}{rate:>12.0f}{rate / baseline:>9.2f}x')
+
+
+if __name__ == '__main__':
+    main()
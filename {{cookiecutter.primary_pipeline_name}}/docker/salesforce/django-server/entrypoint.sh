@@ -13,6 +13,15 @@
 # query via HTTPS returns empty). A single process with threading ensures
 # all protocols share the same in-memory state — matching the Node.js
 # custom server behavior.
+#
+# MOCK_WORKERS=N (or auto) runs N worker processes behind a front end. Each
+# tenant (X-Mock-Tenant / tenant-scoped token, else 'default') is owned by
+# one worker that handles all of its writes; queries, searches and reads by
+# Id go to the least busy worker, which first syncs its copy of the tenant
+# from the owner, so reads still see every completed write. Query-heavy
+# traffic scales with cores even for a single tenant; writes to one tenant
+# do not, and every request pays a relay hop, so write-heavy single-tenant
+# runs should keep MOCK_WORKERS=1.
 # =============================================================================
 
 set -e
@@ -49,6 +58,6 @@ else
     echo ""
 fi
 
-# Start single-process server (HTTP + HTTPS in one process)
+# Start the server (HTTP + HTTPS in one process, or the MOCK_WORKERS front end)
 # PYTHONUNBUFFERED=1 ensures print() output appears immediately in Docker logs
 exec python -u run_server.py
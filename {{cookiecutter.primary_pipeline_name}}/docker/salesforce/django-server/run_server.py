@@ -18,11 +18,22 @@ Architecture:
   Child Thread → HTTP server  (plain WSGIServer)
   Both share the same Django WSGI application and in-memory state.
 
+Multi-worker mode (MOCK_WORKERS=N or 'auto'):
+  The main process becomes a front end that relays each request to one of
+  N worker processes (this script with MOCK_WORKER_PORT set). Writes go
+  to the worker that owns the request's tenant; record reads (queries,
+  search, GET by Id) go to the least busy worker, which first syncs its
+  copy of the tenant from the owner. Reads see every completed write, as
+  in single-process mode; see salesforce_mock/cluster.py and
+  salesforce_mock/state/replication.py. Query-heavy traffic scales with
+  cores even for a single tenant; writes to one tenant stay on one core.
+
 Usage:
   python run_server.py
   (configured via environment variables — see entrypoint.sh)
 """
 import os
+import signal
 import ssl
 import sys
 import threading
@@ -30,15 +41,10 @@ import logging
 from socketserver import ThreadingMixIn
 from wsgiref.simple_server import make_server, WSGIServer, WSGIRequestHandler
 
-# =====================================================================
-# Setup Django before importing the WSGI application
-# =====================================================================
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'salesforce_mock.settings')
 
-import django
-django.setup()
-
-from salesforce_mock.wsgi import application
+from salesforce_mock import cluster
+from salesforce_mock.state import replication
 
 # =====================================================================
 # Configuration
@@ -47,6 +53,13 @@ HTTP_PORT = int(os.environ.get('HTTP_PORT', '8080'))
 HTTPS_PORT = int(os.environ.get('HTTPS_PORT', '8443'))
 CERT_PEM = os.environ.get('CERT_PEM', '/app/certs/cert.pem')
 KEY_PEM = os.environ.get('KEY_PEM', '/app/certs/key.pem')
+MOCK_WORKERS = cluster.worker_count(os.environ.get('MOCK_WORKERS', '1'))
+MOCK_WORKER_BASE_PORT = int(os.environ.get('MOCK_WORKER_BASE_PORT', '9100'))
+# Set by the cluster front end for its worker processes
+MOCK_WORKER_PORT = os.environ.get('MOCK_WORKER_PORT')
+MOCK_WORKER_INDEX = int(os.environ.get('MOCK_WORKER_INDEX', '0'))
+MOCK_WORKER_COUNT = int(os.environ.get('MOCK_WORKER_COUNT', '1'))
+MOCK_CLUSTER_DIR = os.environ.get('MOCK_CLUSTER_DIR')
 
 logger = logging.getLogger('salesforce_mock')
 
@@ -62,8 +75,9 @@ class QuietWSGIHandler(WSGIRequestHandler):
         logger.info("%s %s", self.client_address[0], format % args)
 
     def log_request(self, code='-', size='-'):
-        # Log each request on a single line
-        logger.info('%s "%s" %s %s',
+        # RequestLoggingMiddleware already logs method/path/status at INFO;
+        # the access line with client address and size is DEBUG-only
+        logger.debug('%s "%s" %s %s',
                     self.client_address[0],
                     self.requestline,
                     str(code),
@@ -137,10 +151,90 @@ class StoppableWSGIServer:
         self.server.shutdown()
 
 
+def load_application():
+    """Set up Django (loads schemas) and return the WSGI application."""
+    import django
+    django.setup()
+
+    from salesforce_mock.wsgi import application
+    return application
+
+
+def load_ssl_context():
+    """SSL context for the HTTPS port, or None if no certificate is mounted."""
+    if not (os.path.isfile(CERT_PEM) and os.path.isfile(KEY_PEM)):
+        return None
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ssl_context.load_cert_chain(certfile=CERT_PEM, keyfile=KEY_PEM)
+    # Accept self-signed certs (this IS a mock server)
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+
+# =====================================================================
+# Multi-worker mode: worker process and front end
+# =====================================================================
+def run_worker(port):
+    """Serve plain HTTP on 127.0.0.1 for the cluster front end."""
+    replication.configure(MOCK_WORKER_INDEX, MOCK_WORKER_COUNT, MOCK_CLUSTER_DIR)
+    app = cluster.ForwardedSchemeMiddleware(load_application())
+    server = StoppableWSGIServer('127.0.0.1', port, app, name=f'worker:{port}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def run_cluster():
+    """Start MOCK_WORKERS workers and relay HTTP/HTTPS traffic to them."""
+    print("======================================================")
+    print("  Salesforce Django Mock API Server")
+    print("======================================================")
+    print(f"  HTTP Port:  {HTTP_PORT}")
+    print(f"  HTTPS Port: {HTTPS_PORT}")
+    print(f"  Schema Dir: {os.environ.get('SCHEMA_DIR', '/app/schemas')}")
+    print(f"  Mode:       {MOCK_WORKERS} workers (writes on the tenant's owner, reads on any)")
+    print("======================================================")
+    print()
+
+    # Docker stops the container with SIGTERM; shut the workers down with us
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    workers = cluster.Cluster(MOCK_WORKERS, MOCK_WORKER_BASE_PORT, os.path.abspath(__file__))
+    print(f"  Workers listening on 127.0.0.1:{MOCK_WORKER_BASE_PORT}-{MOCK_WORKER_BASE_PORT + MOCK_WORKERS - 1}")
+
+    servers = [cluster.ProxyServer(('0.0.0.0', HTTP_PORT), cluster.ProxyHandler, workers)]
+    print(f"  🌐 HTTP  server listening on port {HTTP_PORT}")
+    ssl_context = load_ssl_context()
+    if ssl_context:
+        servers.append(cluster.ProxyServer(
+            ('0.0.0.0', HTTPS_PORT), cluster.HTTPSProxyHandler, workers, ssl_context=ssl_context,
+        ))
+        print(f"  🔒 HTTPS server listening on port {HTTPS_PORT}")
+        print(f"     📌 Using certificate: {CERT_PEM}")
+    else:
+        print(f"  ⚠️  Certificate not found: {CERT_PEM}")
+        print(f"     HTTPS will not be available")
+    print()
+
+    exit_code = cluster.serve(servers, workers)
+    print("  Server stopped.")
+    sys.exit(exit_code)
+
+
 # =====================================================================
 # Main: Start both HTTP and HTTPS servers
 # =====================================================================
 def main():
+    if MOCK_WORKER_PORT:
+        run_worker(int(MOCK_WORKER_PORT))
+        return
+    if MOCK_WORKERS > 1:
+        run_cluster()
+        return
+
+    application = load_application()
+
     print("======================================================")
     print("  Salesforce Django Mock API Server")
     print("======================================================")
@@ -169,13 +263,8 @@ def main():
     # -----------------------------------------------------------------
     # Start HTTPS server in the main thread (if cert available)
     # -----------------------------------------------------------------
-    if os.path.isfile(CERT_PEM) and os.path.isfile(KEY_PEM):
-        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-        ssl_context.load_cert_chain(certfile=CERT_PEM, keyfile=KEY_PEM)
-        # Accept self-signed certs (this IS a mock server)
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-
+    ssl_context = load_ssl_context()
+    if ssl_context:
         https_server = StoppableWSGIServer(
             '0.0.0.0', HTTPS_PORT, application,
             ssl_context=ssl_context, name='HTTPS',
@@ -0,0 +1,421 @@
+"""
+Multi-Worker Cluster
+====================
+Runs the mock as several worker processes behind a tenant-routing front
+end when MOCK_WORKERS > 1 (see run_server.py).
+
+Each worker is an ordinary single-process server (run_server.py with
+MOCK_WORKER_PORT set) listening on 127.0.0.1. The front end accepts the
+public HTTP/HTTPS connections, reads the request head, and relays the
+request to a worker. Every tenant (X-Mock-Tenant header or tenant-scoped
+token, see state/tenants.py) has one owning worker, which handles all of
+its writes and holds its bulk jobs, events and counters.
+
+Record reads that have no side effects (REPLICA_READS: SOQL queries,
+SOSL search, describe, GET of a record by Id, /__admin/db) go to the
+least busy worker instead. A worker that does not own the tenant first
+syncs its copy of the tenant's records from the owner's change journal
+(state/replication.py), so a read sees every write answered before it
+was sent, as in single-process mode. A single tenant -- including the
+'default' tenant of an untenanted CI setup -- therefore spreads its
+queries over all cores, while its writes stay on the owner. If a replica
+cannot serve the tenant (421), the read is retried on the owner.
+
+Admin endpoints that span tenants are fanned out to the workers:
+  POST   /__admin/baseline  captured on the caller's worker, copied to the rest
+  PUT    /__admin/baseline  loaded on every worker
+  DELETE /__admin/baseline  applied on every worker
+  GET    /__admin/tenants   merged from every worker
+  POST   /__admin/schemas, /__admin/schemas/reload  applied on every worker
+  DELETE /__admin/tenants/:name  routed to the worker owning :name
+
+The front end only parses request heads and copies bytes; it does not
+load Django. Chunked request bodies are de-chunked before they are
+relayed, since wsgiref workers only read Content-Length bodies. A fan-out
+that a worker fails (unreachable, an error status or an unreadable reply)
+answers 502 naming that worker.
+"""
+import http.client
+import json
+import logging
+import itertools
+import os
+import re
+import shutil
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from salesforce_mock.state import replication
+from salesforce_mock.state.tenants import requested_tenant
+
+logger = logging.getLogger('salesforce_mock')
+
+MAX_HEAD_LINE = 65536
+COPY_CHUNK = 65536
+WORKER_START_TIMEOUT = 60
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+# GET paths any worker can serve from its copy of the tenant's records
+REPLICA_READS = re.compile(
+    r'^/services/data/[^/]+/(query|search|sobjects/\w+/describe|sobjects/\w+/[^/]+)$'
+    r'|^/__admin/db(/\w+(/count)?)?$'
+)
+
+
+class WorkerError(Exception):
+    """A worker could not be reached or sent a reply the front end cannot use."""
+
+    def __init__(self, worker, reason):
+        super().__init__(f'Worker {worker.index} failed: {reason}')
+
+
+def worker_count(value):
+    """Parse MOCK_WORKERS: a positive integer or 'auto' (one per CPU)."""
+    if str(value).strip().lower() == 'auto':
+        return os.cpu_count() or 1
+    return max(1, int(value))
+
+
+class Worker:
+    """One backend server process bound to 127.0.0.1:port."""
+
+    def __init__(self, index, port, script, count, directory):
+        self.index = index
+        self.port = port
+        self.active = 0  # requests being relayed to this worker
+        env = dict(
+            os.environ, MOCK_WORKER_PORT=str(port), MOCK_WORKERS='1', MOCK_WORKER_INDEX=str(index),
+            MOCK_WORKER_COUNT=str(count), MOCK_CLUSTER_DIR=directory,
+        )
+        self.process = subprocess.Popen([sys.executable, '-u', script], env=env)
+
+    def wait_ready(self, timeout=WORKER_START_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'worker {self.index} exited with code {self.process.returncode}')
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.1)
+        raise RuntimeError(f'worker {self.index} did not start listening on port {self.port}')
+
+    def request(self, method, path, body=None, headers=None):
+        """Send one request to this worker. Returns (status, headers, body bytes)."""
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=300)
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            return response.status, response.getheaders(), response.read()
+        finally:
+            conn.close()
+
+    def call(self, method, path, body=None, headers=None, expect=None):
+        """
+        request() for the front end's own fan-out. Returns (status, body bytes);
+        raises WorkerError if the worker is unreachable or, when `expect` is
+        given, answers with any other status.
+        """
+        try:
+            status, _, payload = self.request(method, path, body, headers)
+        except (OSError, http.client.HTTPException) as exc:
+            raise WorkerError(self, f'{method} {path}: {exc}') from exc
+        if expect is not None and status != expect:
+            raise WorkerError(self, f'{method} {path} returned {status}: {payload[:200].decode("utf-8", "replace")}')
+        return status, payload
+
+    def json(self, payload):
+        """Decode a JSON reply from this worker, raising WorkerError if it is not JSON."""
+        try:
+            return json.loads(payload)
+        except ValueError:
+            raise WorkerError(self, f'reply is not JSON: {payload[:200]!r}') from None
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class Cluster:
+    """The worker processes and the tenant -> worker mapping."""
+
+    def __init__(self, count, base_port, script):
+        # Epoch board and journal sockets shared by the workers (state/replication.py)
+        self.directory = tempfile.mkdtemp(prefix='salesforce-mock-')
+        replication.EpochBoard.create(os.path.join(self.directory, replication.EPOCH_FILE), count)
+        self.workers = [Worker(i, base_port + i, script, count, self.directory) for i in range(count)]
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        for worker in self.workers:
+            worker.wait_ready()
+
+    def worker_for(self, tenant):
+        """Stable owner of a tenant (the same worker for the process lifetime)."""
+        return self.workers[replication.owner_index(tenant, len(self.workers))]
+
+    def reader(self):
+        """The worker with the fewest requests in flight (round robin among equals)."""
+        start = next(self._turn)
+        count = len(self.workers)
+        return min((self.workers[(start + i) % count] for i in range(count)), key=lambda w: w.active)
+
+    def relaying(self, worker, delta):
+        with self._lock:
+            worker.active += delta
+
+    def failed_worker(self):
+        """The first worker that has exited, or None."""
+        return next((w for w in self.workers if w.process.poll() is not None), None)
+
+    def stop(self):
+        for worker in self.workers:
+            worker.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+# =====================================================================
+# Front end
+# =====================================================================
+
+class ProxyHandler(socketserver.StreamRequestHandler):
+    """Relays one request per connection to the owning worker (HTTP/1.0 style, like wsgiref)."""
+
+    scheme = 'http'
+
+    def handle(self):
+        request_line = self.rfile.readline(MAX_HEAD_LINE)
+        if not request_line.strip():
+            return
+        try:
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            headers = http.client.parse_headers(self.rfile)
+        except (ValueError, http.client.HTTPException):
+            self._respond(400, {'error': 'Malformed request'})
+            return
+
+        path = target.split('?', 1)[0].rstrip('/')
+        tenant = requested_tenant(headers)
+        cluster = self.server.cluster
+
+        try:
+            if path == '/__admin/baseline' and method in ('POST', 'DELETE'):
+                self._baseline(method, headers, cluster.worker_for(tenant))
+            elif path == '/__admin/tenants' and method == 'GET':
+                self._tenants()
+            elif path in ('/__admin/schemas', '/__admin/schemas/reload') and method == 'POST':
+                self._broadcast(method, target, headers)
+            elif path == '/__admin/baseline' and method == 'PUT':
+                self._broadcast(method, target, headers)
+            elif method == 'GET' and REPLICA_READS.match(path):
+                self._relay(request_line, headers, cluster.reader(), owner=cluster.worker_for(tenant))
+            else:
+                if path.startswith('/__admin/tenants/'):
+                    tenant = path.rsplit('/', 1)[1]
+                self._relay(request_line, headers, cluster.worker_for(tenant))
+        except WorkerError as exc:
+            logger.error('%s %s: %s', method, path, exc)
+            self._respond(502, {'error': str(exc)})
+        except ValueError as exc:
+            self._respond(400, {'error': str(exc)})
+
+    def _request_body(self, headers):
+        """
+        The request body as (file, length). Chunked bodies are de-chunked into
+        a spooled temporary file first; other bodies are read from the client
+        connection as they are copied.
+        """
+        if 'chunked' not in headers.get('Transfer-Encoding', '').lower():
+            return self.rfile, int(headers.get('Content-Length') or 0)
+
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+        while True:
+            line = self.rfile.readline(MAX_HEAD_LINE)
+            try:
+                size = int(line.split(b';', 1)[0], 16)
+            except ValueError:
+                raise ValueError('Malformed chunked request body') from None
+            if size == 0:
+                break
+            while size > 0:
+                chunk = self.rfile.read(min(COPY_CHUNK, size))
+                if not chunk:
+                    raise ValueError('Truncated chunked request body')
+                spool.write(chunk)
+                size -= len(chunk)
+            self.rfile.readline(MAX_HEAD_LINE)
+        while self.rfile.readline(MAX_HEAD_LINE).strip():
+            pass  # trailer fields
+        length = spool.tell()
+        spool.seek(0)
+        return spool, length
+
+    def _relay(self, request_line, headers, worker, owner=None):
+        """
+        Forward the request head and body, then stream the response back.
+        A bodiless read sent to a worker other than its `owner` is sent to
+        the owner instead if that worker answers 421.
+        """
+        cluster = self.server.cluster
+        cluster.relaying(worker, 1)
+        try:
+            self._relay_to(request_line, headers, worker, None if owner is worker else owner)
+        finally:
+            cluster.relaying(worker, -1)
+
+    def _relay_to(self, request_line, headers, worker, owner):
+        body, remaining = self._request_body(headers)
+        try:
+            upstream = socket.create_connection(('127.0.0.1', worker.port))
+        except OSError:
+            self._respond(502, {'error': f'Worker {worker.index} is not available'})
+            return
+        with upstream:
+            head = [request_line]
+            for name, value in headers.items():
+                if name.lower() not in ('connection', 'x-forwarded-proto', 'x-forwarded-for',
+                                        'transfer-encoding', 'content-length'):
+                    head.append(f'{name}: {value}\r\n'.encode('latin-1'))
+            if remaining or 'Content-Length' in headers:
+                head.append(f'Content-Length: {remaining}\r\n'.encode('latin-1'))
+            head.append(f'X-Forwarded-Proto: {self.scheme}\r\n'.encode('latin-1'))
+            head.append(f'X-Forwarded-For: {self.client_address[0]}\r\n'.encode('latin-1'))
+            head.append(b'Connection: close\r\n\r\n')
+            upstream.sendall(b''.join(head))
+
+            while remaining > 0:
+                chunk = body.read(min(COPY_CHUNK, remaining))
+                if not chunk:
+                    break
+                upstream.sendall(chunk)
+                remaining -= len(chunk)
+            if body is not self.rfile:
+                body.close()
+
+            chunk = upstream.recv(COPY_CHUNK)
+            while chunk and b'\n' not in chunk:
+                more = upstream.recv(COPY_CHUNK)
+                if not more:
+                    break
+                chunk += more
+            if owner is not None and chunk.split(b' ', 2)[1:2] == [b'421']:
+                upstream.close()
+                self._relay(request_line, headers, owner)
+                return
+            while chunk:
+                self.wfile.write(chunk)
+                chunk = upstream.recv(COPY_CHUNK)
+
+    def _baseline(self, method, headers, owner):
+        """Capture on the caller's worker and copy it everywhere, or clear everywhere."""
+        forwarded = {k: v for k, v in headers.items() if k.lower() in ('x-mock-tenant', 'authorization', 'x-sfdc-session')}
+        status, body = owner.call(method, '/__admin/baseline', headers=forwarded)
+        result = owner.json(body)
+        others = [w for w in self.server.cluster.workers if w is not owner]
+        if method == 'POST' and status == 200:
+            _, snapshot = owner.call('GET', '/__admin/baseline?export=true', expect=200)
+            for worker in others:
+                worker.call('PUT', '/__admin/baseline', body=snapshot,
+                            headers={'Content-Type': 'application/json'}, expect=200)
+        elif method == 'DELETE':
+            for worker in others:
+                worker.call('DELETE', '/__admin/baseline', expect=200)
+        self._respond(status, result)
+
+    def _broadcast(self, method, target, headers):
+        """
+        Send the same request to every worker and reply with the first worker's
+        response. The other workers must answer with the same status.
+        """
+        body, length = self._request_body(headers)
+        body = body.read(length)
+        forwarded = {'Content-Type': headers.get('Content-Type', 'application/json')}
+        workers = self.server.cluster.workers
+        status, payload = workers[0].call(method, target, body=body, headers=forwarded)
+        result = workers[0].json(payload)
+        for worker in workers[1:]:
+            worker.call(method, target, body=body, headers=forwarded, expect=status)
+        self._respond(status, result)
+
+    def _tenants(self):
+        merged = {}
+        for worker in self.server.cluster.workers:
+            _, body = worker.call('GET', '/__admin/tenants', expect=200)
+            merged.update(worker.json(body).get('tenants', {}))
+        tenants = dict(sorted(merged.items()))
+        self._respond(200, {'count': len(tenants), 'tenants': tenants})
+
+    def _respond(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        reason = http.client.responses.get(status, '')
+        self.wfile.write(
+            f'HTTP/1.0 {status} {reason}\r\n'
+            f'Content-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: close\r\n\r\n'.encode('latin-1') + body
+        )
+
+
+class HTTPSProxyHandler(ProxyHandler):
+    scheme = 'https'
+
+
+class ProxyServer(socketserver.ThreadingTCPServer):
+    """Threaded front-end listener; one thread per client connection."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, address, handler, cluster, ssl_context=None):
+        super().__init__(address, handler)
+        self.cluster = cluster
+        if ssl_context:
+            self.socket = ssl_context.wrap_socket(self.socket, server_side=True)
+
+
+class ForwardedSchemeMiddleware:
+    """
+    WSGI middleware for workers: trust the front end's X-Forwarded-Proto /
+    X-Forwarded-For so request.is_secure() and client addresses match
+    single-process mode. Workers only listen on 127.0.0.1.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        if environ.get('HTTP_X_FORWARDED_PROTO') == 'https':
+            environ['wsgi.url_scheme'] = 'https'
+        if environ.get('HTTP_X_FORWARDED_FOR'):
+            environ['REMOTE_ADDR'] = environ['HTTP_X_FORWARDED_FOR']
+        return self.app(environ, start_response)
+
+
+def serve(servers, cluster):
+    """Run the front-end listeners until interrupted or a worker exits."""
+    threads = [threading.Thread(target=s.serve_forever, daemon=True) for s in servers]
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            failed = cluster.failed_worker()
+            if failed:
+                print(f'  Worker {failed.index} exited (code {failed.process.returncode}); stopping')
+                return 1
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print('\n  Shutting down...')
+        return 0
+    finally:
+        for server in servers:
+            server.shutdown()
+        cluster.stop()
@@ -0,0 +1,46 @@
+"""
+Asynchronous Log Handler
+========================
+Logging handler that moves formatting and I/O off the request thread.
+
+Request threads only enqueue the LogRecord (no string formatting, no
+write syscall). A background QueueListener thread formats records and
+writes them to the stream. The queue is bounded: when it is full, records
+are dropped and counted instead of blocking request handling.
+
+Configured from settings.LOGGING:
+    'class': 'salesforce_mock.log_queue.AsyncStreamHandler',
+    'maxsize': 10000,
+"""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class AsyncStreamHandler(QueueHandler):
+    """QueueHandler paired with its own listener thread and StreamHandler."""
+
+    def __init__(self, maxsize=10000, stream=None):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        self._target = logging.StreamHandler(stream)
+        self._listener = QueueListener(self.queue, self._target)
+        self._listener.start()
+        atexit.register(self._listener.stop)
+
+    def setFormatter(self, fmt):
+        """Apply the formatter on the listener side, where records are written."""
+        super().setFormatter(fmt)
+        self._target.setFormatter(fmt)
+
+    def prepare(self, record):
+        """Skip eager formatting; the listener thread formats the record."""
+        return record
+
+    def enqueue(self, record):
+        """Enqueue without blocking; drop the record if the buffer is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
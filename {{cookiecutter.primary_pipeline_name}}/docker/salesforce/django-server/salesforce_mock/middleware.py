@@ -3,19 +3,36 @@ Django Middleware — replaces Express middleware chain.
 
 Provides:
   - CORS support (matching WireMock --enable-stub-cors)
-  - Raw body preservation for CSV/XML content types
-  - Request logging
+  - Tenant selection (X-Mock-Tenant header or tenant-scoped OAuth token)
+  - gzip/deflate request decompression (Content-Encoding)
+  - Negotiated gzip response compression (Accept-Encoding)
+  - Sampled, queued request logging
   - Global error handling
+
+Raw CSV/XML bodies are decoded lazily by the views that need them
+(salesforce_mock.utils.request_body.get_raw_body), not by middleware.
 """
-import json
+import io
 import logging
+import random
+import re
 import traceback
-from datetime import datetime, timezone
+import zlib
 
+from django.conf import settings
 from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+from salesforce_mock.state import replication, tenants
+from salesforce_mock.state.database import baseline
+from salesforce_mock.utils.error_formatter import format_error
 
 logger = logging.getLogger('salesforce_mock')
 
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+READ_ONLY_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
 
 class TrailingSlashMiddleware:
     """
@@ -60,41 +77,217 @@ class CORSMiddleware:
 
         response['Access-Control-Allow-Origin'] = '*'
         response['Access-Control-Allow-Methods'] = 'GET, POST, PATCH, DELETE, PUT, OPTIONS'
-        response['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-SFDC-Session'
+        response['Access-Control-Allow-Headers'] = (
+            'Content-Type, Authorization, X-SFDC-Session, X-Mock-Tenant'
+        )
         return response
 
 
-class RawBodyMiddleware:
+class TenantMiddleware:
     """
-    Preserves raw request body for CSV and XML content types.
-    Django normally parses request.body only for form data.
-    For CSV/XML, we need the raw text content.
+    Selects the tenant whose state the request reads and writes.
+
+    The X-Mock-Tenant header wins; otherwise the tenant embedded in the
+    session token (Authorization or X-SFDC-Session) is used; otherwise the
+    'default' tenant. Read-only methods are flagged so they can read the
+    shared baseline without cloning it into the tenant.
+
+    The tenant is not reset after the response: streamed bodies are
+    generated after this returns, and every request sets its own tenant.
+
+    In a cluster worker that does not own the tenant, reads are served
+    from a copy synced with the owner first (state/replication.py), or
+    answer 421 if the copy cannot be synced so the front end asks the
+    owner. The front end only sends such a worker the tenant's reads and
+    worker-wide admin requests (baseline, schemas).
     """
 
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        # Store raw body as text for CSV and XML content types
-        content_type = request.content_type or ''
-        if any(ct in content_type for ct in ['text/csv', 'application/xml', 'text/xml']):
-            request.raw_body = request.body.decode('utf-8')
+        name = tenants.requested_tenant(request.headers)
+        if not tenants.valid_tenant_name(name):
+            return JsonResponse(
+                format_error('INVALID_FIELD', f'Invalid X-Mock-Tenant header: {name}'),
+                status=400, safe=False,
+            )
+        writable = request.method not in READ_ONLY_METHODS
+        tenants.activate(name, writable=writable)
+        if not writable and replication.is_replica(name):
+            try:
+                replication.sync(tenants.get_tenant(name), baseline)
+            except replication.ReplicaMismatch as err:
+                return JsonResponse({'error': str(err)}, status=421)
         return self.get_response(request)
 
 
+class RequestBodyTooLarge(Exception):
+    """An inflated request body exceeded MAX_DECOMPRESSED_BODY_SIZE."""
+
+
+class RequestDecompressionMiddleware:
+    """
+    Transparently decompresses request bodies sent with
+    Content-Encoding: gzip or deflate (real Salesforce accepts both for
+    Bulk API uploads, and SnapLogic's compression setting uses them).
+
+    The body is inflated incrementally from the input stream in fixed-size
+    chunks, so the compressed payload is never held in memory in full.
+    Concatenated gzip members (as written by `cat a.gz b.gz` or chunked
+    gzip writers) are inflated one after another. A truncated or corrupt
+    stream gets a 400, and a body that inflates beyond
+    MAX_DECOMPRESSED_BODY_SIZE gets a 413 before it is fully expanded.
+    Downstream middleware and views see a plain request.body.
+
+    Must be placed BEFORE any middleware that reads request.body.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    ENCODINGS = ('gzip', 'x-gzip', 'deflate')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.max_size = getattr(settings, 'MAX_DECOMPRESSED_BODY_SIZE', 150 * 1024 * 1024)
+
+    def __call__(self, request):
+        encoding = request.META.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+        if encoding in self.ENCODINGS:
+            try:
+                body = self._inflate(request)
+            except zlib.error as err:
+                return JsonResponse(
+                    format_error('INVALID_FIELD', f'Unable to decode {encoding} request body: {err}'),
+                    safe=False,
+                    status=400,
+                )
+            except RequestBodyTooLarge:
+                return JsonResponse(
+                    format_error(
+                        'EXCEEDED_MAX_SIZE_REQUEST',
+                        f'Decompressed request body exceeds {self.max_size} bytes',
+                    ),
+                    safe=False,
+                    status=413,
+                )
+            request._body = body
+            request._stream = io.BytesIO(body)
+            request.META['CONTENT_LENGTH'] = str(len(body))
+            del request.META['HTTP_CONTENT_ENCODING']
+        return self.get_response(request)
+
+    def _inflate(self, request):
+        """
+        Inflate the request stream chunk by chunk (gzip or zlib header
+        auto-detected), starting a new decompressor for each gzip member.
+
+        Raises:
+            zlib.error: corrupt or truncated stream.
+            RequestBodyTooLarge: the output exceeds max_size.
+        """
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        parts, size, received = [], 0, False
+        pending = b''
+        while True:
+            if not pending:
+                pending = request.read(self.CHUNK_SIZE)
+                if not pending:
+                    break
+                received = True
+            if decompressor.eof:
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+            # Inflate at most one byte past the limit so a bomb never expands
+            part = decompressor.decompress(pending, self.max_size - size + 1)
+            size += len(part)
+            if size > self.max_size:
+                raise RequestBodyTooLarge()
+            parts.append(part)
+            pending = decompressor.unused_data if decompressor.eof else decompressor.unconsumed_tail
+        if received and not decompressor.eof:
+            raise zlib.error('incomplete or truncated stream')
+        return b''.join(parts)
+
+
+class GZipResponseMiddleware:
+    """
+    Gzip-compresses CSV/JSON/XML responses when the client sends
+    Accept-Encoding: gzip, matching Salesforce's compressed bulk results.
+
+    - Regular responses are compressed only above GZIP_MIN_RESPONSE_SIZE bytes
+    - Streaming responses (bulk result downloads, NDJSON) are compressed
+      chunk by chunk as they are sent
+    - Binary downloads and other content types are left untouched
+
+    Disable with GZIP_RESPONSES=false.
+    """
+
+    COMPRESSIBLE_TYPES = (
+        'text/csv', 'application/json', 'application/xml', 'text/xml',
+        'application/x-ndjson',
+    )
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'GZIP_RESPONSES', True)
+        self.min_size = getattr(settings, 'GZIP_MIN_RESPONSE_SIZE', 8192)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.enabled or response.has_header('Content-Encoding'):
+            return response
+
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in self.COMPRESSIBLE_TYPES:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if not ACCEPTS_GZIP.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_sequence(response.streaming_content)
+            if response.has_header('Content-Length'):
+                del response['Content-Length']
+        else:
+            if len(response.content) < self.min_size:
+                return response
+            compressed = compress_string(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        response['Content-Encoding'] = 'gzip'
+        return response
+
+
 class RequestLoggingMiddleware:
     """
     Request logging — matches the Express logging middleware in server.js.
-    Logs: [timestamp] METHOD /path
+    Logs: METHOD /path -> status
+
+    Kept cheap on the request path:
+      - The timestamp comes from the log formatter, not per-request strftime
+      - Arguments are passed lazily (formatted only if the record is emitted)
+      - Records go to the AsyncStreamHandler queue, not a blocking write
+      - REQUEST_LOG_SAMPLE_RATE (0.0-1.0) logs only a fraction of requests
+      - REQUEST_LOG_LEVEL sets the level requests are logged at
+        (e.g. DEBUG to hide them unless LOG_LEVEL=DEBUG)
     """
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.level = logging.getLevelName(getattr(settings, 'REQUEST_LOG_LEVEL', 'INFO'))
+        self.sample_rate = getattr(settings, 'REQUEST_LOG_SAMPLE_RATE', 1.0)
 
     def __call__(self, request):
-        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
-        logger.info(f'[{timestamp}] {request.method} {request.get_full_path()}')
-        return self.get_response(request)
+        response = self.get_response(request)
+        if logger.isEnabledFor(self.level) and (
+            self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        ):
+            logger.log(self.level, '%s %s -> %s',
+                       request.method, request.get_full_path(), response.status_code)
+        return response
 
 
 class ErrorHandlerMiddleware:
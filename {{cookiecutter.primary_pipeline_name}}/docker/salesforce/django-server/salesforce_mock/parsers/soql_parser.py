@@ -8,14 +8,25 @@ Parses Salesforce Object Query Language (SOQL) queries.
 Supported:
   SELECT fields FROM Object
   SELECT COUNT() FROM Object
+  SELECT Parent.Field, Parent.Parent.Field FROM Object   (parent relationships)
+  SELECT fields, (SELECT fields FROM ChildRelationship ...) FROM Object
+  SELECT field, COUNT(f) / COUNT_DISTINCT(f) / SUM(f) / AVG(f) / MIN(f) / MAX(f) [alias]
+    FROM Object GROUP BY field [HAVING aggregate-condition]
   WHERE field = 'value' / != / > / >= / < / <= / LIKE / IN / NOT IN
   WHERE cond AND cond / OR cond
-  ORDER BY field ASC/DESC [NULLS FIRST|LAST]
+  ORDER BY field ASC/DESC [NULLS FIRST|LAST] [, field ...]
   LIMIT n / OFFSET n
 
-Exports: parse_soql(), apply_where(), apply_order_by()
+Relationship paths are resolved by services/soql_executor.py, which joins
+the related records onto each row; the helpers here read dotted paths
+from those joined rows via get_field_value().
+
+Exports: parse_soql(), parse_where(), apply_where(), matches_where(), apply_order_by(),
+         get_field_value()
 """
+import heapq
 import re
+from functools import cmp_to_key
 
 
 def parse_soql(soql):
@@ -23,15 +34,23 @@ def parse_soql(soql):
     Parse a SOQL query string into a structured dict.
 
     Returns:
-        dict with keys: fields, object, where, order_by, limit, offset, is_count
+        dict with keys: fields, object, where, order_by, limit, offset, is_count,
+        subqueries, aggregates, group_by, having. Each subquery is itself a
+        parsed dict whose 'object' is the child relationship name (e.g.
+        'Contacts'). Each aggregate is {function, field, alias, key}, where
+        key is the normalized expression ('SUM(Amount)') that HAVING and
+        ORDER BY conditions refer to. order_by is a list of
+        {field, direction, nulls}, one per sort column.
     """
     if not soql or not isinstance(soql, str):
         raise ValueError('SOQL query is required')
 
-    normalized = re.sub(r'\s+', ' ', soql.strip())
+    normalized, subqueries = _extract_subqueries(re.sub(r'\s+', ' ', soql.strip()))
     result = {
         'fields': [], 'object': None, 'where': None,
-        'order_by': None, 'limit': None, 'offset': None, 'is_count': False
+        'order_by': None, 'limit': None, 'offset': None, 'is_count': False,
+        'subqueries': [parse_soql(sub) for sub in subqueries],
+        'aggregates': [], 'group_by': [], 'having': None,
     }
 
     # Check for COUNT()
@@ -47,10 +66,19 @@ def parse_soql(soql):
     if not select_match:
         raise ValueError(f'Malformed SOQL: Cannot parse SELECT...FROM: {soql}')
 
-    result['fields'] = [f.strip() for f in select_match.group(1).split(',') if f.strip()]
+    for item in select_match.group(1).split(','):
+        item = item.strip()
+        if not item or item == _SUBQUERY_PLACEHOLDER:
+            continue
+        aggregate = _parse_aggregate(item)
+        if aggregate:
+            result['aggregates'].append(aggregate)
+        else:
+            result['fields'].append(item)
     result['object'] = select_match.group(2)
 
     _parse_where_clause(normalized, result)
+    _parse_group_by(normalized, result)
     _parse_order_by(normalized, result)
     _parse_limit(normalized, result)
     _parse_offset(normalized, result)
@@ -58,6 +86,51 @@ def parse_soql(soql):
     return result
 
 
+_SUBQUERY_PLACEHOLDER = '__subquery__'
+
+
+def _extract_subqueries(soql):
+    """
+    Pull parenthesized child subqueries out of the SELECT list.
+
+    Returns the statement with each subquery replaced by a placeholder
+    (so the flat SELECT/WHERE/ORDER BY regexes never see the inner
+    clauses) and the list of inner SOQL strings. Only the SELECT list is
+    scanned; scanning stops at the top-level FROM.
+    """
+    subqueries = []
+    spans = []
+    depth = 0
+    in_quote = False
+    start = None
+    upper = soql.upper()
+
+    for i, ch in enumerate(soql):
+        if ch == "'":
+            in_quote = not in_quote
+        elif in_quote:
+            continue
+        elif ch == '(':
+            if depth == 0 and upper[i + 1:].lstrip().startswith('SELECT '):
+                start = i
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth == 0 and start is not None:
+                subqueries.append(soql[start + 1:i].strip())
+                spans.append((start, i + 1))
+                start = None
+        elif depth == 0 and upper.startswith(' FROM ', i):
+            break
+
+    if start is not None:
+        raise ValueError(f'Malformed SOQL: Unbalanced parentheses in subquery: {soql}')
+
+    for begin, end in reversed(spans):
+        soql = soql[:begin] + _SUBQUERY_PLACEHOLDER + soql[end:]
+    return soql, subqueries
+
+
 # ═══════════════════════════════════════════════════════════════
 # WHERE CLAUSE PARSING
 # ═══════════════════════════════════════════════════════════════
@@ -65,7 +138,7 @@ def parse_soql(soql):
 def _parse_where_clause(soql, result):
     """Extract and parse WHERE clause from SOQL string."""
     where_match = re.search(
-        r'\bWHERE\s+(.+?)(?:\s+ORDER\s+BY|\s+LIMIT|\s+OFFSET|$)',
+        r'\bWHERE\s+(.+?)(?:\s+GROUP\s+BY|\s+HAVING|\s+ORDER\s+BY|\s+LIMIT|\s+OFFSET|$)',
         soql, re.IGNORECASE
     )
     if not where_match:
@@ -73,6 +146,22 @@ def _parse_where_clause(soql, result):
     result['where'] = _parse_conditions(where_match.group(1).strip())
 
 
+def parse_where(where_str):
+    """
+    Parse a bare WHERE expression (without the WHERE keyword) into
+    condition dicts compatible with apply_where() / matches_where().
+
+    Used by callers that accept a filter outside a full SOQL statement,
+    e.g. the admin inspection endpoints (?where=Industry='Energy').
+    """
+    if not where_str or not where_str.strip():
+        return []
+    conditions = _parse_conditions(re.sub(r'\s+', ' ', where_str.strip()))
+    if not conditions:
+        raise ValueError(f'Malformed WHERE expression: {where_str}')
+    return conditions
+
+
 def _parse_conditions(cond_str):
     """Parse WHERE clause string into array of condition objects."""
     conditions = []
@@ -115,24 +204,24 @@ def _split_by_logical_operators(s):
 def _parse_single_condition(cond_str):
     """Parse a single WHERE condition into {field, operator, value}."""
     # IN operator
-    in_match = re.match(r'^(\w+)\s+IN\s*\((.+)\)$', cond_str, re.IGNORECASE)
+    in_match = re.match(r'^(' + _FIELD_EXPR + r')\s+IN\s*\((.+)\)$', cond_str, re.IGNORECASE)
     if in_match:
         values = [v.strip().strip("'") for v in in_match.group(2).split(',')]
-        return {'field': in_match.group(1), 'operator': 'IN', 'value': values}
+        return {'field': _normalize_expr(in_match.group(1)), 'operator': 'IN', 'value': values}
 
     # NOT IN operator
-    not_in_match = re.match(r'^(\w+)\s+NOT\s+IN\s*\((.+)\)$', cond_str, re.IGNORECASE)
+    not_in_match = re.match(r'^(' + _FIELD_EXPR + r')\s+NOT\s+IN\s*\((.+)\)$', cond_str, re.IGNORECASE)
     if not_in_match:
         values = [v.strip().strip("'") for v in not_in_match.group(2).split(',')]
-        return {'field': not_in_match.group(1), 'operator': 'NOT IN', 'value': values}
+        return {'field': _normalize_expr(not_in_match.group(1)), 'operator': 'NOT IN', 'value': values}
 
     # LIKE operator
-    like_match = re.match(r"^(\w+)\s+LIKE\s+'(.+)'$", cond_str, re.IGNORECASE)
+    like_match = re.match(r'^(' + _FIELD_EXPR + r")\s+LIKE\s+'(.+)'$", cond_str, re.IGNORECASE)
     if like_match:
-        return {'field': like_match.group(1), 'operator': 'LIKE', 'value': like_match.group(2)}
+        return {'field': _normalize_expr(like_match.group(1)), 'operator': 'LIKE', 'value': like_match.group(2)}
 
     # Comparison operators: =, !=, <>, >=, <=, >, <
-    comp_match = re.match(r'^(\w+)\s*(!=|<>|>=|<=|>|<|=)\s*(.+)$', cond_str)
+    comp_match = re.match(r'^(' + _FIELD_EXPR + r')\s*(!=|<>|>=|<=|>|<|=)\s*(.+)$', cond_str)
     if comp_match:
         value = comp_match.group(3).strip()
         # Auto-detect and convert value types
@@ -151,27 +240,102 @@ def _parse_single_condition(cond_str):
                 pass
 
         operator = '!=' if comp_match.group(2) == '<>' else comp_match.group(2)
-        return {'field': comp_match.group(1), 'operator': operator, 'value': value}
+        return {'field': _normalize_expr(comp_match.group(1)), 'operator': operator, 'value': value}
 
     return None
 
 
+# ═══════════════════════════════════════════════════════════════
+# AGGREGATES, GROUP BY, HAVING
+# ═══════════════════════════════════════════════════════════════
+
+AGGREGATE_FUNCTIONS = ('COUNT', 'COUNT_DISTINCT', 'SUM', 'AVG', 'MIN', 'MAX')
+
+# A field path or an aggregate expression: Name, Account.Name, COUNT(Id), SUM(Amount)
+_FIELD_EXPR = r'[\w.]+(?:\(\s*[\w.]*\s*\))?'
+
+
+def _normalize_expr(expr):
+    """Canonical form of an aggregate expression: 'sum( Amount )' -> 'SUM(Amount)'."""
+    match = re.match(r'^(\w+)\(\s*([\w.]*)\s*\)$', expr)
+    if not match:
+        return expr
+    return f'{match.group(1).upper()}({match.group(2)})'
+
+
+def _parse_aggregate(item):
+    """
+    Parse a SELECT item like 'SUM(Amount) total'. Returns None for plain
+    fields and for non-aggregate functions (e.g. toLabel), which are left
+    in the field list as before.
+    """
+    match = re.match(r'^(\w+)\(\s*([\w.]*)\s*\)(?:\s+(\w+))?$', item)
+    if not match or match.group(1).upper() not in AGGREGATE_FUNCTIONS:
+        return None
+    function = match.group(1).upper()
+    field = match.group(2)
+    if not field and function != 'COUNT':
+        raise ValueError(f'{function}() requires a field')
+    return {
+        'function': function,
+        'field': field or 'Id',
+        'alias': match.group(3),
+        'key': f'{function}({field})',
+    }
+
+
+def _parse_group_by(soql, result):
+    """Extract GROUP BY fields and the HAVING clause; validate the SELECT list."""
+    group_match = re.search(
+        r'\bGROUP\s+BY\s+(.+?)(?:\s+HAVING|\s+ORDER\s+BY|\s+LIMIT|\s+OFFSET|$)',
+        soql, re.IGNORECASE
+    )
+    if group_match:
+        result['group_by'] = [f.strip() for f in group_match.group(1).split(',') if f.strip()]
+
+    having_match = re.search(
+        r'\bHAVING\s+(.+?)(?:\s+ORDER\s+BY|\s+LIMIT|\s+OFFSET|$)',
+        soql, re.IGNORECASE
+    )
+    if having_match:
+        if not group_match:
+            raise ValueError('Malformed SOQL: HAVING requires GROUP BY')
+        result['having'] = _parse_conditions(having_match.group(1).strip())
+
+    if result['aggregates'] or result['group_by']:
+        grouped = {f.lower() for f in result['group_by']}
+        for field in result['fields']:
+            if field.lower() not in grouped:
+                raise ValueError(f'Field must be grouped or aggregated: {field}')
+
+
 # ═══════════════════════════════════════════════════════════════
 # ORDER BY, LIMIT, OFFSET PARSERS
 # ═══════════════════════════════════════════════════════════════
 
 def _parse_order_by(soql, result):
-    """Extract ORDER BY clause."""
+    """Extract ORDER BY clause as a list of sort columns."""
     order_match = re.search(
-        r'\bORDER\s+BY\s+(\w+)(?:\s+(ASC|DESC))?(?:\s+NULLS\s+(FIRST|LAST))?',
+        r'\bORDER\s+BY\s+(.+?)(?:\s+LIMIT|\s+OFFSET|$)',
         soql, re.IGNORECASE
     )
-    if order_match:
-        result['order_by'] = {
-            'field': order_match.group(1),
-            'direction': (order_match.group(2) or 'ASC').upper(),
-            'nulls': order_match.group(3).upper() if order_match.group(3) else None
-        }
+    if not order_match:
+        return
+
+    columns = []
+    for item in order_match.group(1).split(','):
+        column_match = re.match(
+            r'^(' + _FIELD_EXPR + r')(?:\s+(ASC|DESC))?(?:\s+NULLS\s+(FIRST|LAST))?$',
+            item.strip(), re.IGNORECASE
+        )
+        if not column_match:
+            raise ValueError(f'Malformed SOQL: Cannot parse ORDER BY item: {item.strip()}')
+        columns.append({
+            'field': _normalize_expr(column_match.group(1)),
+            'direction': (column_match.group(2) or 'ASC').upper(),
+            'nulls': column_match.group(3).upper() if column_match.group(3) else None
+        })
+    result['order_by'] = columns
 
 
 def _parse_limit(soql, result):
@@ -200,22 +364,50 @@ def apply_where(records, conditions):
     if not conditions:
         return records
 
-    def matches(record):
-        result = _evaluate_condition(record, conditions[0])
-        for cond in conditions[1:]:
-            cond_result = _evaluate_condition(record, cond)
-            if cond.get('logical') == 'AND':
-                result = result and cond_result
-            elif cond.get('logical') == 'OR':
-                result = result or cond_result
-        return result
+    return [r for r in records if matches_where(r, conditions)]
+
 
-    return [r for r in records if matches(r)]
+def matches_where(record, conditions):
+    """
+    Evaluate parsed WHERE conditions against a single record.
+    Left-to-right evaluation (no operator precedence), same as apply_where().
+
+    Lets callers filter lazily (generators, counting) without building
+    an intermediate list of matching records.
+    """
+    if not conditions:
+        return True
+
+    result = _evaluate_condition(record, conditions[0])
+    for cond in conditions[1:]:
+        cond_result = _evaluate_condition(record, cond)
+        if cond.get('logical') == 'AND':
+            result = result and cond_result
+        elif cond.get('logical') == 'OR':
+            result = result or cond_result
+    return result
+
+
+def get_field_value(record, field):
+    """
+    Read a field from a record, following dotted relationship paths
+    (e.g. 'Account.Owner.Name') through joined parent records.
+    A missing parent anywhere along the path yields None. Flat keys win,
+    so aggregate rows keyed by 'Account.Name' or 'SUM(Amount)' also work.
+    """
+    if '.' not in field or field in record:
+        return record.get(field)
+    value = record
+    for part in field.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
 
 
 def _evaluate_condition(record, condition):
     """Evaluate a single condition against a record."""
-    record_value = record.get(condition['field'])
+    record_value = get_field_value(record, condition['field'])
     cond_value = condition['value']
     op = condition['operator']
 
@@ -263,23 +455,87 @@ def _evaluate_condition(record, condition):
         return True
 
 
-def apply_order_by(records, order_by):
+NUMERIC_TYPES = ('int', 'double', 'currency', 'percent')
+
+
+def apply_order_by(records, order_by, limit=None, field_types=None):
     """
-    Sort records based on ORDER BY clause.
+    Sort records based on ORDER BY columns.
     Returns a new sorted list (does not mutate original).
-    """
-    if not order_by:
-        return records
 
-    field = order_by['field']
-    descending = order_by['direction'] == 'DESC'
-    nulls_first = order_by.get('nulls') == 'FIRST'
+    Each column sorts by its own direction; nulls go first for ASC and
+    last for DESC unless NULLS FIRST/LAST says otherwise (Salesforce
+    defaults). Values are compared by type so mixed values never raise:
+    fields whose schema type (field_types: path -> type) is numeric
+    compare as numbers even when stored as CSV strings, and otherwise
+    numbers sort before text.
 
-    def sort_key(record):
-        val = record.get(field)
-        if val is None:
-            # Nulls: use a tuple to control position
-            return (0 if nulls_first else 2, '')
-        return (1, val)
-
-    return sorted(records, key=sort_key, reverse=descending)
+    With `limit`, only the first `limit` records in order are returned,
+    selected with a bounded heap: O(n log limit) instead of a full sort.
+    """
+    if not order_by:
+        return records if limit is None else records[:limit]
+    if isinstance(order_by, dict):
+        order_by = [order_by]
+
+    column_keys = [_column_key(col, (field_types or {}).get(col['field'])) for col in order_by]
+    directions = {col['direction'] for col in order_by}
+
+    if len(directions) == 1:
+        # Uniform direction: one tuple key, reversed as a whole for DESC
+        reverse = directions == {'DESC'}
+        if len(column_keys) == 1:
+            key = column_keys[0]
+        else:
+            def key(record):
+                return tuple(column_key(record) for column_key in column_keys)
+    else:
+        reverse = False
+        descending = [col['direction'] == 'DESC' for col in order_by]
+
+        def compare(a, b):
+            for column_key, desc in zip(column_keys, descending):
+                ka, kb = column_key(a), column_key(b)
+                if ka != kb:
+                    result = -1 if ka < kb else 1
+                    return -result if desc else result
+            return 0
+        key = cmp_to_key(compare)
+
+    if limit is not None and limit < len(records):
+        # heapq.nsmallest/nlargest are stable, like sorted(...)[:limit]
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return select(limit, records, key=key)
+    return sorted(records, key=key, reverse=reverse)
+
+
+def _column_key(column, field_type):
+    """
+    Sort key for one ORDER BY column: (rank, value), where rank places
+    nulls before or after all values and keeps numbers apart from text.
+    The null rank is chosen so it holds after a DESC reversal.
+    """
+    field = column['field']
+    nulls_first = (
+        column['nulls'] == 'FIRST' if column.get('nulls')
+        else column['direction'] == 'ASC'
+    )
+    descending = column['direction'] == 'DESC'
+    null_key = (0, 0) if nulls_first != descending else (4, 0)
+    numeric = field_type in NUMERIC_TYPES
+
+    def key(record):
+        val = get_field_value(record, field)
+        if val is None or val == '':
+            return null_key
+        if isinstance(val, bool):
+            return (1, int(val))
+        if isinstance(val, (int, float)):
+            return (2, val)
+        if numeric:
+            try:
+                return (2, float(val))
+            except (TypeError, ValueError):
+                pass
+        return (3, str(val))
+    return key
@@ -8,26 +8,37 @@ Processes bulk ingest and query jobs against the in-memory database.
 Ingest operations (insert/update/upsert/delete):
   - Parses CSV data into records
   - Processes each record independently
-  - Tracks successful/failed results per record
+  - Tracks successful/failed results per record as compact row references
+    against the uploaded CSV (see iter_ingest_results_csv)
   - Updates the in-memory database
 
 Query operations:
-  - Executes SOQL query via the shared soql_parser
+  - Executes SOQL query via the shared soql_parser / soql_executor
+    (parent relationship paths become dotted CSV columns, e.g. Account.Name)
   - Serializes results as CSV
-  - Stores CSV in job['queryResults']
+  - Stores CSV in job['queryResults'], or with PK chunking
+    (Sforce-Enable-PKChunking) plans Id-range chunks whose CSV is built
+    lazily on first download (see PKChunkPlan)
 
 Both processors are SYNCHRONOUS -- they complete immediately when called.
 SnapLogic's first poll sees the completed state.
 """
+import bisect
 import csv
 import io
 import logging
+import threading
 from datetime import datetime, timezone
 
+from salesforce_mock.services import change_events
 from salesforce_mock.state.database import schemas, database
+from salesforce_mock.state.recycle_bin import recycle_bin
+from salesforce_mock.state.stats import op_stats
+from salesforce_mock.state.tenants import read_only
 from salesforce_mock.utils.id_generator import generate_id
 from salesforce_mock.utils.validator import validate
-from salesforce_mock.parsers.soql_parser import parse_soql, apply_where, apply_order_by
+from salesforce_mock.parsers.soql_parser import parse_soql, get_field_value
+from salesforce_mock.services.soql_executor import count_records, execute_query, is_aggregate
 
 logger = logging.getLogger('salesforce_mock')
 
@@ -42,7 +53,15 @@ def process_ingest_job(job):
 
     Parses the job's CSV data into records, then processes each record
     according to the job's operation type. Results are stored in
-    job['successfulResults'] and job['failedResults'] lists.
+    job['successfulResults'] and job['failedResults'] as compact tuples
+    referencing the input row instead of copying every input column:
+
+        successfulResults: (row_index, sf__Id, created)
+        failedResults:     (row_index, sf__Id, sf__Error)
+
+    row_index is the position of the record in parse_csv(job['csvData']);
+    iter_ingest_results_csv() joins the references back to the input rows
+    when the results are downloaded.
 
     Each record is processed independently -- a failure in one record
     does not affect others (matching real Salesforce behavior).
@@ -77,36 +96,36 @@ def process_ingest_job(job):
     job['numberRecordsFailed'] = 0
 
     start_time = datetime.now(timezone.utc)
-
-    for record in records:
-        try:
-            operation = job['operation']
-            if operation == 'insert':
-                _process_insert(record, schema, collection, job)
-            elif operation == 'update':
-                _process_update(record, schema, collection, job)
-            elif operation == 'upsert':
-                _process_upsert(record, schema, collection, job)
-            elif operation == 'delete':
-                _process_delete(record, collection, job)
-            else:
-                job['failedResults'].append({
-                    'sf__Id': '',
-                    'sf__Error': f'INVALID_OPERATION:Unsupported operation: {operation}',
-                    **record,
-                })
-                job['numberRecordsFailed'] += 1
-        except Exception as err:
-            job['failedResults'].append({
-                'sf__Id': record.get('Id', ''),
-                'sf__Error': f'UNKNOWN_EXCEPTION:{str(err)}',
-                **record,
-            })
-            job['numberRecordsFailed'] += 1
+    ext_id_index = None
+    if job['operation'] == 'upsert':
+        # One hash index on the external ID field instead of a scan per row
+        ext_id_index = _external_id_index(collection, job.get('externalIdFieldName') or 'Id')
+
+    # One change data capture transaction per job
+    with change_events.transaction(change_events.origin('bulkapi', job.get('apiVersion', '59.0'))):
+        for row, record in enumerate(records):
+            try:
+                operation = job['operation']
+                if operation == 'insert':
+                    _process_insert(row, record, schema, collection, job)
+                elif operation == 'update':
+                    _process_update(row, record, schema, collection, job)
+                elif operation == 'upsert':
+                    _process_upsert(row, record, schema, collection, job, ext_id_index)
+                elif operation == 'delete':
+                    _process_delete(row, record, collection, job)
+                else:
+                    _record_failure(job, row, '',
+                                    f'INVALID_OPERATION:Unsupported operation: {operation}')
+            except Exception as err:
+                _record_failure(job, row, record.get('Id', ''), f'UNKNOWN_EXCEPTION:{str(err)}')
 
     elapsed = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
     job['totalProcessingTime'] = int(elapsed)
 
+    op_stats.incr(job['object'], f"bulk_{job['operation']}", job['numberRecordsProcessed'])
+    op_stats.incr(job['object'], 'bulk_failed', job['numberRecordsFailed'])
+
     if job['numberRecordsFailed'] > 0 and job['numberRecordsProcessed'] == 0:
         job['state'] = 'Failed'
     else:
@@ -127,7 +146,7 @@ def process_ingest_job(job):
 # QUERY PROCESSOR
 # =====================================================================
 
-def process_query_job(job):
+def process_query_job(job, pk_chunking=None):
     """
     Process a bulk query job by executing its SOQL query against
     the in-memory database and storing results as CSV.
@@ -136,8 +155,13 @@ def process_query_job(job):
     executes it against the in-memory database, and serializes the results
     as CSV stored in job['queryResults'].
 
+    With pk_chunking (see parse_pk_chunking_header) the query is not run
+    up front: a PKChunkPlan is stored in job['_pkChunks'] and each chunk's
+    CSV is produced when it is first downloaded.
+
     Args:
         job: The bulk job dict from job_store.
+        pk_chunking: Optional {'chunkSize': int, 'startRow': str or None}.
 
     Returns:
         The updated job dict with state, queryResults, and counts.
@@ -153,81 +177,204 @@ def process_query_job(job):
         # Set the object name on the job (extracted from SOQL)
         job['object'] = parsed['object']
 
-        records = list(database.get(parsed['object'], []))
-
-        # Apply WHERE filters
-        if parsed.get('where') and len(parsed['where']) > 0:
-            records = apply_where(records, parsed['where'])
-
-        # Apply ORDER BY
-        if parsed.get('order_by'):
-            records = apply_order_by(records, parsed['order_by'])
-
-        # Apply OFFSET
-        if parsed.get('offset'):
-            records = records[parsed['offset']:]
-
-        # Apply LIMIT
-        if parsed.get('limit'):
-            records = records[:parsed['limit']]
-
-        # Determine which fields to include
-        if '*' in parsed['fields']:
-            # All fields - get from first record or schema
-            if records:
-                headers = [k for k in records[0].keys() if k != 'attributes']
-            else:
-                headers = ['Id'] + list(schemas[parsed['object']].get('fields', {}).keys())
-        else:
-            headers = parsed['fields']
-
-        # Project only the selected fields
-        projected = []
-        for record in records:
-            row = {}
-            for field in headers:
-                val = record.get(field)
-                row[field] = val if val is not None else ''
-            projected.append(row)
+        # Bulk API query does not support child relationship subqueries or aggregates
+        if parsed.get('subqueries'):
+            raise ValueError('Nested queries are not supported in Bulk API query jobs')
+        if is_aggregate(parsed):
+            raise ValueError('Aggregate queries are not supported in Bulk API query jobs')
+
+        # Queries only read records; don't clone baseline objects into the tenant
+        if pk_chunking:
+            with read_only():
+                plan = PKChunkPlan(parsed, pk_chunking['chunkSize'], pk_chunking.get('startRow'))
+            job['_pkChunks'] = plan
+            job['numberRecordsProcessed'] = plan.total_records()
+            job['state'] = 'JobComplete'
+            logger.info(
+                "Bulk query: %d records from %s in %d PK chunks of %d",
+                job['numberRecordsProcessed'],
+                parsed['object'],
+                len(plan),
+                pk_chunking['chunkSize'],
+            )
+            return job
+
+        with read_only():
+            records = execute_query(parsed)
+        headers = query_headers(parsed, records)
 
         # Serialize to CSV
-        job['queryResults'] = to_csv(headers, projected)
-        job['numberRecordsProcessed'] = len(projected)
+        job['queryResults'] = to_csv(headers, _project_rows(headers, records))
+        job['numberRecordsProcessed'] = len(records)
         job['state'] = 'JobComplete'
 
         logger.info(
             "Bulk query: %d records from %s",
-            len(projected),
+            len(records),
             parsed['object'],
         )
 
     except Exception as exc:
         job['state'] = 'Failed'
         job['numberRecordsFailed'] = 1
+        job['errorMessage'] = str(exc)
         logger.error("Bulk query failed: %s", str(exc))
 
     return job
 
 
+def query_headers(parsed, records):
+    """CSV columns for a query: the SELECT list, or every stored field for '*'."""
+    if '*' not in parsed['fields']:
+        return parsed['fields']
+    # All fields - get from first record or schema
+    if records:
+        return [k for k in records[0].keys() if k != 'attributes']
+    return ['Id'] + list(schemas[parsed['object']].get('fields', {}).keys())
+
+
+def _project_rows(headers, records):
+    """Project only the selected fields (dotted paths read joined parents)."""
+    projected = []
+    for record in records:
+        row = {}
+        for field in headers:
+            val = get_field_value(record, field)
+            row[field] = val if val is not None else ''
+        projected.append(row)
+    return projected
+
+
+# =====================================================================
+# PK CHUNKING
+# =====================================================================
+
+DEFAULT_PK_CHUNK_SIZE = 100000
+MAX_PK_CHUNK_SIZE = 250000
+
+
+def parse_pk_chunking_header(value):
+    """
+    Parse a Sforce-Enable-PKChunking header value.
+
+    Accepts 'true' / 'false' or semicolon-separated options, e.g.
+    'chunkSize=50000; startRow=001000000000001AAA'.
+
+    Returns:
+        {'chunkSize': int, 'startRow': str or None}, or None when chunking
+        is not requested.
+
+    Raises:
+        ValueError: unknown option or chunkSize outside 1..250000.
+    """
+    if value is None or not value.strip() or value.strip().lower() == 'false':
+        return None
+    if value.strip().lower() == 'true':
+        return {'chunkSize': DEFAULT_PK_CHUNK_SIZE, 'startRow': None}
+
+    options = {}
+    for part in value.split(';'):
+        if not part.strip():
+            continue
+        name, sep, option = part.partition('=')
+        if not sep or name.strip().lower() not in ('chunksize', 'startrow', 'parent'):
+            raise ValueError(f'Invalid Sforce-Enable-PKChunking option: {part.strip()}')
+        options[name.strip().lower()] = option.strip()
+
+    try:
+        chunk_size = int(options.get('chunksize', DEFAULT_PK_CHUNK_SIZE))
+    except ValueError:
+        raise ValueError(f"Invalid chunkSize: {options['chunksize']}")
+    if not 1 <= chunk_size <= MAX_PK_CHUNK_SIZE:
+        raise ValueError(f'chunkSize must be between 1 and {MAX_PK_CHUNK_SIZE}')
+    return {'chunkSize': chunk_size, 'startRow': options.get('startrow') or None}
+
+
+class PKChunkPlan:
+    """
+    A PK-chunked bulk query.
+
+    At job creation the object's records are snapshotted in Id order and
+    split into ranges of chunk_size records, like Salesforce splitting on
+    Id boundaries (chunks can hold fewer rows once WHERE is applied). No
+    rows are projected or serialized until a chunk is requested; each
+    chunk's CSV is then built once and cached. Chunks have independent
+    locks so different chunks can be downloaded concurrently.
+    """
+
+    def __init__(self, parsed, chunk_size, start_row=None):
+        if parsed.get('order_by') or parsed.get('limit') or parsed.get('offset'):
+            raise ValueError('PK chunking does not support ORDER BY, LIMIT or OFFSET')
+
+        records = sorted(database.get(parsed['object'], []), key=lambda r: r.get('Id') or '')
+        if start_row:
+            ids = [r.get('Id') or '' for r in records]
+            records = records[bisect.bisect_left(ids, start_row):]
+
+        self.parsed = parsed
+        self.records = records
+        self.ranges = [
+            (start, min(start + chunk_size, len(records)))
+            for start in range(0, len(records), chunk_size)
+        ] or [(0, 0)]
+        self.headers = query_headers(parsed, records)
+        self._results = {}
+        self._locks = [threading.Lock() for _ in self.ranges]
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def total_records(self):
+        """Rows matching the query across all chunks (no projection)."""
+        if not self.parsed.get('where'):
+            return len(self.records)
+        return count_records(self.parsed, records=self.records)
+
+    def chunk(self, index):
+        """
+        Return (csv_text, record_count) for chunk `index`, building it on
+        first access.
+        """
+        with self._locks[index]:
+            if index not in self._results:
+                start, stop = self.ranges[index]
+                rows = execute_query(self.parsed, records=self.records[start:stop])
+                self._results[index] = (
+                    to_csv(self.headers, _project_rows(self.headers, rows)),
+                    len(rows),
+                )
+            return self._results[index]
+
+
 # =====================================================================
 # Individual record operations (used by ingest processor)
 # =====================================================================
 
-def _process_insert(record, schema, collection, job):
+def _record_success(job, row, record_id, created):
+    """Append a compact success reference for input row `row`."""
+    job['successfulResults'].append((row, record_id, created))
+    job['numberRecordsProcessed'] += 1
+
+
+def _record_failure(job, row, record_id, error):
+    """Append a compact failure reference for input row `row`."""
+    job['failedResults'].append((row, record_id, error))
+    job['numberRecordsFailed'] += 1
+
+
+def _format_errors(errors):
+    """Join validator errors into a single sf__Error value."""
+    return '; '.join(f"{e['errorCode']}:{e['message']}" for e in errors)
+
+
+def _process_insert(row, record, schema, collection, job):
     """
     Processes a single INSERT record from bulk CSV data.
     Validates, generates ID, and adds to the database.
     """
     errors = validate(record, schema, 'create')
     if len(errors) > 0:
-        job['failedResults'].append({
-            'sf__Id': '',
-            'sf__Error': '; '.join(
-                f"{e['errorCode']}:{e['message']}" for e in errors
-            ),
-            **record,
-        })
-        job['numberRecordsFailed'] += 1
+        _record_failure(job, row, '', _format_errors(errors))
         return
 
     record_id = generate_id(schema['idPrefix'])
@@ -239,27 +386,21 @@ def _process_insert(record, schema, collection, job):
         'CreatedDate': now,
         'LastModifiedDate': now,
         'SystemModstamp': now,
-        'attributes': {'type': schema['name']},
     }
 
     collection.append(new_record)
-    job['successfulResults'].append({'sf__Id': record_id, 'sf__Created': 'true', **record})
-    job['numberRecordsProcessed'] += 1
+    change_events.created(job['object'], new_record)
+    _record_success(job, row, record_id, True)
 
 
-def _process_update(record, schema, collection, job):
+def _process_update(row, record, schema, collection, job):
     """
     Processes a single UPDATE record from bulk CSV data.
     Finds existing record by Id, validates, and merges changes.
     """
     record_id = record.get('Id', '')
     if not record_id:
-        job['failedResults'].append({
-            'sf__Id': '',
-            'sf__Error': 'MISSING_ARGUMENT:Id is required for update operation',
-            **record,
-        })
-        job['numberRecordsFailed'] += 1
+        _record_failure(job, row, '', 'MISSING_ARGUMENT:Id is required for update operation')
         return
 
     index = None
@@ -269,88 +410,77 @@ def _process_update(record, schema, collection, job):
             break
 
     if index is None:
-        job['failedResults'].append({
-            'sf__Id': record_id,
-            'sf__Error': f'INVALID_CROSS_REFERENCE_KEY:Record not found: {record_id}',
-            **record,
-        })
-        job['numberRecordsFailed'] += 1
+        _record_failure(job, row, record_id,
+                        f'INVALID_CROSS_REFERENCE_KEY:Record not found: {record_id}')
         return
 
     # Validate fields (without required check -- it's an update)
     update_fields = {k: v for k, v in record.items() if k != 'Id'}
     errors = validate(update_fields, schema, 'update')
     if len(errors) > 0:
-        job['failedResults'].append({
-            'sf__Id': record_id,
-            'sf__Error': '; '.join(
-                f"{e['errorCode']}:{e['message']}" for e in errors
-            ),
-            **record,
-        })
-        job['numberRecordsFailed'] += 1
+        _record_failure(job, row, record_id, _format_errors(errors))
         return
 
     now = datetime.now(timezone.utc).isoformat()
+    change_events.updating(job['object'], collection[index], update_fields, now)
     collection[index].update(update_fields)
     collection[index]['LastModifiedDate'] = now
     collection[index]['SystemModstamp'] = now
 
-    job['successfulResults'].append({'sf__Id': record_id, 'sf__Created': 'false', **record})
-    job['numberRecordsProcessed'] += 1
+    _record_success(job, row, record_id, False)
 
 
-def _process_upsert(record, schema, collection, job):
+def _process_upsert(row, record, schema, collection, job, index):
     """
     Processes a single UPSERT record from bulk CSV data.
     Finds by external ID field -- updates if found, inserts if not.
+    `index` maps external ID values to positions in `collection`
+    (see _external_id_index) and is kept current on insert.
     """
     ext_id_field = job.get('externalIdFieldName') or 'Id'
     ext_id_value = record.get(ext_id_field, '')
 
     if not ext_id_value:
         # No external ID value -- treat as insert
-        _process_insert(record, schema, collection, job)
+        _process_insert(row, record, schema, collection, job)
         return
 
-    existing_index = None
-    for i, r in enumerate(collection):
-        if str(r.get(ext_id_field, '')) == str(ext_id_value):
-            existing_index = i
-            break
+    existing_index = index.get(str(ext_id_value))
 
     if existing_index is not None:
         # Found -- update existing record
         update_fields = {k: v for k, v in record.items() if k != ext_id_field}
         now = datetime.now(timezone.utc).isoformat()
+        change_events.updating(job['object'], collection[existing_index], update_fields, now)
         collection[existing_index].update(update_fields)
         collection[existing_index]['LastModifiedDate'] = now
         collection[existing_index]['SystemModstamp'] = now
 
-        job['successfulResults'].append({
-            'sf__Id': collection[existing_index]['Id'],
-            'sf__Created': 'false',
-            **record,
-        })
-        job['numberRecordsProcessed'] += 1
+        _record_success(job, row, collection[existing_index]['Id'], False)
     else:
         # Not found -- insert new record
-        _process_insert(record, schema, collection, job)
+        size = len(collection)
+        _process_insert(row, record, schema, collection, job)
+        if len(collection) > size:
+            index.setdefault(str(collection[-1].get(ext_id_field, '')), size)
+
+
+def _external_id_index(collection, field):
+    """{ str(value): position } of the first record holding each value of `field`."""
+    index = {}
+    for i, r in enumerate(collection):
+        index.setdefault(str(r.get(field, '')), i)
+    return index
 
 
-def _process_delete(record, collection, job):
+def _process_delete(row, record, collection, job):
     """
     Processes a single DELETE record from bulk CSV data.
     Finds by Id and removes from the database.
     """
     record_id = record.get('Id', '')
     if not record_id:
-        job['failedResults'].append({
-            'sf__Id': '',
-            'sf__Error': 'MISSING_ARGUMENT:Id is required for delete operation',
-            **record,
-        })
-        job['numberRecordsFailed'] += 1
+        _record_failure(job, row, '', 'MISSING_ARGUMENT:Id is required for delete operation')
         return
 
     index = None
@@ -360,17 +490,13 @@ def _process_delete(record, collection, job):
             break
 
     if index is None:
-        job['failedResults'].append({
-            'sf__Id': record_id,
-            'sf__Error': f'ENTITY_IS_DELETED:Entity is deleted or does not exist: {record_id}',
-            **record,
-        })
-        job['numberRecordsFailed'] += 1
+        _record_failure(job, row, record_id,
+                        f'ENTITY_IS_DELETED:Entity is deleted or does not exist: {record_id}')
         return
 
-    collection.pop(index)
-    job['successfulResults'].append({'sf__Id': record_id, 'sf__Created': 'false'})
-    job['numberRecordsProcessed'] += 1
+    recycle_bin.add(job['object'], collection.pop(index))
+    change_events.deleted(job['object'], record_id)
+    _record_success(job, row, record_id, False)
 
 
 # =====================================================================
@@ -391,16 +517,93 @@ def parse_csv(csv_string):
     Returns:
         List of dicts, one per data row.
     """
+    return list(iter_csv_records(csv_string))
+
+
+def iter_csv_records(csv_string):
+    """
+    Lazily yield the same records as parse_csv(), one dict at a time.
+
+    Row positions match parse_csv() exactly, so compact result references
+    (row_index) can be joined back to the input while streaming.
+    """
     if not csv_string or not csv_string.strip():
-        return []
+        return
 
     reader = csv.DictReader(io.StringIO(csv_string.strip()))
-    records = []
     for row in reader:
         # Skip completely empty rows
         if any(v for v in row.values()):
-            records.append(dict(row))
-    return records
+            yield dict(row)
+
+
+def iter_ingest_results_csv(job, kind, chunk_rows=1000):
+    """
+    Stream an ingest job's successful or failed results as CSV text chunks.
+
+    Joins the compact (row_index, sf__Id, status) references stored by
+    process_ingest_job() with the uploaded input rows in a single forward
+    pass, so a download never materializes per-row dicts for the whole job.
+
+    Output columns match real Salesforce:
+        successful: sf__Id, sf__Created, <input columns>
+        failed:     sf__Id, sf__Error,   <input columns>
+    Successful delete results carry only sf__Id and sf__Created.
+
+    Args:
+        job: The bulk job dict from job_store.
+        kind: 'successful' or 'failed'.
+        chunk_rows: Number of CSV rows per yielded chunk.
+
+    Yields:
+        CSV text chunks (header first). Nothing is yielded when there
+        are no results of the requested kind.
+    """
+    refs = job.get(f'{kind}Results') or []
+    if not refs:
+        return
+
+    csv_data = job.get('csvData', '')
+    if kind == 'successful':
+        status_headers = ['sf__Id', 'sf__Created']
+        include_input = job.get('operation') != 'delete'
+    else:
+        status_headers = ['sf__Id', 'sf__Error']
+        include_input = True
+
+    input_headers = []
+    if include_input:
+        header_line = get_csv_headers(csv_data.lstrip())
+        input_headers = next(csv.reader([header_line]), []) if header_line else []
+
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(status_headers + input_headers)
+
+    rows = enumerate(iter_csv_records(csv_data)) if include_input else None
+    pending = 0
+    for row_index, record_id, status in refs:
+        if kind == 'successful':
+            status = 'true' if status else 'false'
+        values = [record_id, status]
+        if rows is not None:
+            # Refs are stored in input order: advance to the referenced row
+            for index, record in rows:
+                if index == row_index:
+                    values.extend(record.get(h, '') for h in input_headers)
+                    break
+        writer.writerow(values)
+
+        pending += 1
+        if pending >= chunk_rows:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+            pending = 0
+
+    remainder = output.getvalue()
+    if remainder:
+        yield remainder
 
 
 def to_csv(headers, records):
@@ -0,0 +1,249 @@
+"""
+Change Data Capture
+===================
+Publishes Salesforce Change Data Capture events for record mutations made
+through the REST and Bulk APIs, on /data/<Object>ChangeEvent channels
+(/data/AccountChangeEvent, /data/Widget__ChangeEvent) and, merged, on
+/data/ChangeEvents (see state/event_bus.py).
+
+Views and the bulk processor report each change as they make it:
+created(), updating() (before the new values are applied), deleted() and
+undeleted(). Changes made inside one transaction() -- a bulk batch -- share
+a transactionKey and commitNumber and are numbered by sequenceNumber;
+changes outside a transaction (single REST calls) commit on their own.
+
+Reporting is cheap: the request thread only copies the changed values.
+Committed transactions are queued, and a background publisher thread
+builds the events in batches and appends them to the tenant's event bus,
+so a 100k-row bulk load is not slowed by event construction. flush()
+waits until everything queued has been published; CometD polls and the
+admin event views call it first, so clients never miss committed changes.
+
+Like Salesforce, consecutive changes in a transaction with the same
+change type and the same field values are merged into one event listing
+several recordIds.
+
+CDC is enabled for an object when CDC_ENTITIES lists it (comma-separated,
+'*' = all objects), or while a CometD client of the tenant is subscribed
+to its channel or to /data/ChangeEvents. Changes to other objects are not
+recorded at all.
+
+Exports: transaction(), created(), updating(), deleted(), undeleted(),
+         flush(), channel_for(), origin()
+"""
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import count
+
+from salesforce_mock.state.event_bus import ALL_CHANGE_EVENTS, EventBus
+from salesforce_mock.state.tenants import get_tenant
+
+logger = logging.getLogger('salesforce_mock')
+
+CDC_ENTITIES = frozenset(
+    name.strip() for name in os.environ.get('CDC_ENTITIES', '').split(',') if name.strip()
+)
+# Transactions published per event-bus lock acquisition
+PUBLISH_BATCH = 64
+COMMIT_USER = '005000000000000AAA'
+REST_ORIGIN = 'com/salesforce/api/rest'
+
+_current = ContextVar('cdc_transaction', default=None)
+_commit_numbers = count(1)
+
+
+def channel_for(object_name):
+    """CDC channel of an object: Account -> /data/AccountChangeEvent, Foo__c -> /data/Foo__ChangeEvent."""
+    if object_name.endswith('__c'):
+        return f'/data/{object_name[:-1]}ChangeEvent'
+    return f'/data/{object_name}ChangeEvent'
+
+
+def origin(api, version):
+    """changeOrigin of an API call: origin('rest', 'v59.0') -> 'com/salesforce/api/rest/59.0'."""
+    return f'com/salesforce/api/{api}/{str(version).lstrip("v")}'
+
+
+def _enabled(tenant, object_name):
+    if '*' in CDC_ENTITIES or object_name in CDC_ENTITIES:
+        return True
+    bus = tenant.local('event_bus', EventBus)
+    return bus.has_subscribers(channel_for(object_name)) or bus.has_subscribers(ALL_CHANGE_EVENTS)
+
+
+class _Transaction:
+    """Changes reported between transaction() entry and exit."""
+
+    def __init__(self, origin, autocommit=False):
+        self.tenant = get_tenant()
+        self.origin = origin
+        self.autocommit = autocommit
+        self.changes = []       # (object_name, change_type, record_id, fields)
+        self._enabled = {}
+
+    def enabled(self, object_name):
+        enabled = self._enabled.get(object_name)
+        if enabled is None:
+            enabled = self._enabled[object_name] = _enabled(self.tenant, object_name)
+        return enabled
+
+    def add(self, object_name, change_type, record_id, fields):
+        self.changes.append((object_name, change_type, record_id, fields))
+        if self.autocommit:
+            _commit(self)
+
+
+@contextmanager
+def transaction(origin):
+    """
+    Group the changes reported inside the block into one CDC transaction,
+    committed (queued for publishing) when the block exits. Nested blocks
+    join the outer transaction.
+    """
+    if _current.get() is not None:
+        yield
+        return
+    tx = _Transaction(origin)
+    token = _current.set(tx)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+        _commit(tx)
+
+
+def _active(object_name, origin):
+    """The transaction to record a change of `object_name` in, or None if CDC is off for it."""
+    tx = _current.get() or _Transaction(origin or REST_ORIGIN, autocommit=True)
+    return tx if tx.enabled(object_name) else None
+
+
+def created(object_name, record, origin=None):
+    """Report a new record; its non-null fields are the changed fields."""
+    tx = _active(object_name, origin)
+    if tx is not None:
+        fields = {k: v for k, v in record.items() if k != 'Id' and v is not None}
+        tx.add(object_name, 'CREATE', record['Id'], fields)
+
+
+def updating(object_name, record, data, modified, origin=None):
+    """
+    Report an update before `data` is applied to `record` at time
+    `modified`; fields whose value changes are the changed fields.
+    """
+    tx = _active(object_name, origin)
+    if tx is not None:
+        fields = {
+            k: v for k, v in data.items()
+            if k not in ('Id', 'id') and (k not in record or record[k] != v)
+        }
+        fields['LastModifiedDate'] = modified
+        tx.add(object_name, 'UPDATE', record['Id'], fields)
+
+
+def deleted(object_name, record_id, origin=None):
+    """Report a deleted record."""
+    tx = _active(object_name, origin)
+    if tx is not None:
+        tx.add(object_name, 'DELETE', record_id, {})
+
+
+def undeleted(object_name, record, origin=None):
+    """Report a restored record; like a create, its non-null fields are included."""
+    tx = _active(object_name, origin)
+    if tx is not None:
+        fields = {k: v for k, v in record.items() if k != 'Id' and v is not None}
+        tx.add(object_name, 'UNDELETE', record['Id'], fields)
+
+
+# =====================================================================
+# PUBLISHING
+# =====================================================================
+
+def _commit(tx):
+    if tx.changes:
+        _publisher.submit((tx, next(_commit_numbers), int(time.time() * 1000)))
+
+
+def _events(tx, commit_number, commit_timestamp):
+    """[(channel, payload)] for one committed transaction, merging identical consecutive changes."""
+    transaction_key = str(uuid.uuid4())
+    events, last = [], None
+    for object_name, change_type, record_id, fields in tx.changes:
+        if last is not None and last[0] == (object_name, change_type, fields):
+            last[1]['recordIds'].append(record_id)
+            continue
+        header = {
+            'entityName': object_name,
+            'recordIds': [record_id],
+            'changeType': change_type,
+            'changeOrigin': tx.origin,
+            'transactionKey': transaction_key,
+            'sequenceNumber': len(events) + 1,
+            'commitTimestamp': commit_timestamp,
+            'commitNumber': commit_number,
+            'commitUser': COMMIT_USER,
+            'nulledFields': [k for k, v in fields.items() if v is None],
+            'diffFields': [],
+            'changedFields': list(fields),
+        }
+        events.append((channel_for(object_name), {'ChangeEventHeader': header, **fields}))
+        last = ((object_name, change_type, fields), header)
+    return events
+
+
+class _Publisher:
+    """Background thread that turns committed transactions into bus events."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, item):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='cdc-publisher', daemon=True)
+                    self._thread.start()
+        self._queue.put(item)
+
+    def flush(self):
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < PUBLISH_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                by_bus = {}
+                for tx, commit_number, commit_timestamp in batch:
+                    bus = tx.tenant.local('event_bus', EventBus)
+                    by_bus.setdefault(id(bus), (bus, []))[1].extend(
+                        _events(tx, commit_number, commit_timestamp)
+                    )
+                for bus, events in by_bus.values():
+                    bus.publish_many(events)
+            except Exception:
+                logger.exception('Publishing change events failed')
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_publisher = _Publisher()
+
+
+def flush():
+    """Block until every committed change has been published."""
+    _publisher.flush()
@@ -0,0 +1,672 @@
+"""
+SOQL Executor
+=============
+Runs parsed SOQL (see parsers/soql_parser.py) against the in-memory
+database, including relationship queries:
+
+  Parent lookups:   SELECT Name, Account.Name, Account.Owner.Name FROM Contact
+  Child subqueries: SELECT Name, (SELECT LastName FROM Contacts) FROM Account
+
+Relationships are derived from the schema files (compiled by
+state/schema_registry.py, so they follow schema reloads). Every 'reference' field
+defines a parent relationship on its object (AccountId -> Account,
+WhoId -> Who, Custom__c -> Custom__r) and a child relationship on each
+object it references, named after the child's labelPlural without spaces
+(Contacts, Opportunities, CampaignMembers). A field spec may override
+either name with 'relationshipName' / 'childRelationshipName'.
+
+Joins are hash joins rather than nested loops:
+  - Parent lookups build one Id -> record index per referenced object per
+    query and resolve each row's foreign key with a dict lookup.
+  - Child subqueries bucket the child object by foreign key in a single
+    pass over its records, restricted to the parent Ids being returned.
+
+Independent child subqueries are evaluated concurrently on a small thread
+pool (SOQL_SUBQUERY_WORKERS, default 4; set to 1 to run them serially).
+
+Aggregate queries (GROUP BY, COUNT(f), COUNT_DISTINCT, SUM, AVG, MIN, MAX,
+HAVING) stream the filtered records once through a hash table keyed by
+the GROUP BY values, each group holding one accumulator per aggregate.
+COUNT() without WHERE is answered from the stored list length.
+
+Exports: execute_query(), count_records(), is_aggregate(), compile_projection(), project_record(),
+         project_aggregate(), relationship_paths(), parent_relationships(),
+         child_relationships()
+"""
+import os
+import re
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from salesforce_mock.state.database import schemas, database
+from salesforce_mock.state.schema_registry import registry
+from salesforce_mock.parsers.soql_parser import (
+    NUMERIC_TYPES,
+    apply_order_by,
+    get_field_value,
+    matches_where,
+)
+
+SUBQUERY_WORKERS = int(os.environ.get('SOQL_SUBQUERY_WORKERS', '4'))
+
+_subquery_pool = None
+
+
+# =====================================================================
+# RELATIONSHIP METADATA
+# =====================================================================
+
+def parent_relationships(object_name):
+    """
+    Parent relationships of an object, keyed by lower-cased name.
+
+    Returns:
+        { 'account': ('AccountId', ('Account',)), 'who': ('WhoId', ('Contact', 'Lead')) }
+    """
+    return registry.compiled.parents.get(object_name, {})
+
+
+def child_relationships(object_name):
+    """
+    Child relationships pointing at an object, keyed by lower-cased name.
+
+    Returns:
+        { 'contacts': ('Contact', 'AccountId', 'Contacts'), 'cases': ('Case', 'AccountId', 'Cases') }
+    """
+    return registry.compiled.children.get(object_name, {})
+
+
+def _resolve_parent(object_name, relationship):
+    """Look up a parent relationship or raise ValueError like Salesforce's INVALID_FIELD."""
+    found = parent_relationships(object_name).get(relationship.lower())
+    if not found:
+        raise ValueError(
+            f"Didn't understand relationship '{relationship}' in field path. "
+            f"No such relationship on {object_name}."
+        )
+    return found
+
+
+def _resolve_child(object_name, relationship):
+    """Look up a child relationship or raise ValueError."""
+    found = child_relationships(object_name).get(relationship.lower())
+    if not found:
+        raise ValueError(
+            f"Didn't understand relationship '{relationship}' in FROM part of query call. "
+            f"No such child relationship on {object_name}."
+        )
+    return found
+
+
+def _record_type(record, targets):
+    """Object name of a parent record; polymorphic targets are told apart by Id prefix."""
+    if len(targets) == 1:
+        return targets[0]
+    record_type = record.get('attributes', {}).get('type')
+    if record_type:
+        return record_type
+    target = registry.compiled.prefixes.get(str(record.get('Id', ''))[:3])
+    return target if target in targets else targets[0]
+
+
+# =====================================================================
+# PARENT JOINS
+# =====================================================================
+
+def relationship_paths(parsed):
+    """
+    Nested dict of the parent relationships a query reads, from its
+    SELECT list, aggregates, GROUP BY, WHERE conditions and ORDER BY field.
+
+    'Account.Owner.Name' and 'Account.Name' -> {'Account': {'Owner': {}}}
+    """
+    paths = list(parsed.get('fields') or [])
+    paths.extend(parsed.get('group_by') or [])
+    paths.extend(agg['field'] for agg in parsed.get('aggregates') or [])
+    paths.extend(cond['field'] for cond in parsed.get('where') or [])
+    paths.extend(col['field'] for col in parsed.get('order_by') or [])
+
+    tree = {}
+    for path in paths:
+        if '(' in path:
+            continue  # aggregate expression in HAVING / ORDER BY
+        node = tree
+        for part in path.split('.')[:-1]:
+            node = node.setdefault(part, {})
+    return tree
+
+
+def _join_parents(records, object_name, tree, indexes):
+    """
+    Return shallow copies of `records` with each relationship in `tree`
+    set to the (recursively joined) parent record, or None.
+
+    `indexes` caches Id -> record maps for the duration of one query so
+    each parent object is indexed at most once.
+    """
+    lookups = []
+    for relationship, subtree in tree.items():
+        field, targets = _resolve_parent(object_name, relationship)
+        lookups.append((relationship, field, _parent_index(targets, subtree, indexes)))
+
+    joined = []
+    for record in records:
+        row = dict(record)
+        for relationship, field, index in lookups:
+            row[relationship] = index.get(record.get(field))
+        joined.append(row)
+    return joined
+
+
+def _parent_index(targets, tree, indexes):
+    """Id -> joined record for the parent object(s) of a relationship."""
+    key = (targets, repr(tree))
+    if key not in indexes:
+        index = {}
+        for target in targets:
+            records = database.get(target, [])
+            if tree:
+                records = _join_parents(records, target, tree, indexes)
+            for record in records:
+                index[record.get('Id')] = record
+        indexes[key] = index
+    return indexes[key]
+
+
+# =====================================================================
+# CHILD SUBQUERIES
+# =====================================================================
+
+def _run_subquery(object_name, subquery, parent_ids):
+    """
+    Evaluate one child subquery for a set of parent Ids.
+
+    Returns:
+        (relationship_name, { parent_id: [joined child rows] })
+    """
+    if subquery.get('subqueries'):
+        raise ValueError('Nested subqueries are only supported one level deep.')
+    child_name, field, _ = _resolve_child(object_name, subquery['object'])
+
+    buckets = defaultdict(list)
+    children = database.get(child_name, [])
+    tree = relationship_paths(subquery)
+    if tree:
+        children = _join_parents(children, child_name, tree, {})
+    conditions = subquery.get('where')
+    for child in children:
+        parent_id = child.get(field)
+        if parent_id in parent_ids and matches_where(child, conditions):
+            buckets[parent_id].append(child)
+
+    for parent_id, rows in buckets.items():
+        buckets[parent_id] = _order_and_page(rows, subquery, child_name)
+    return subquery['object'], buckets
+
+
+def _attach_children(rows, object_name, subqueries):
+    """Attach each subquery's child rows to the parent rows under the relationship name."""
+    parent_ids = {row.get('Id') for row in rows}
+    if len(subqueries) > 1 and SUBQUERY_WORKERS > 1:
+        pool = _get_subquery_pool()
+        # Run in the request's context so workers read the same tenant's records
+        futures = [
+            pool.submit(copy_context().run, _run_subquery, object_name, sub, parent_ids)
+            for sub in subqueries
+        ]
+        results = [future.result() for future in futures]
+    else:
+        results = [_run_subquery(object_name, sub, parent_ids) for sub in subqueries]
+
+    for relationship, buckets in results:
+        for row in rows:
+            row[relationship] = buckets.get(row.get('Id'), [])
+
+
+def _get_subquery_pool():
+    """Lazily create the shared subquery thread pool."""
+    global _subquery_pool
+    if _subquery_pool is None:
+        _subquery_pool = ThreadPoolExecutor(
+            max_workers=SUBQUERY_WORKERS, thread_name_prefix='soql-subquery'
+        )
+    return _subquery_pool
+
+
+# =====================================================================
+# QUERY EXECUTION
+# =====================================================================
+
+def execute_query(parsed, records=None):
+    """
+    Execute a parsed SOQL query against the in-memory database.
+
+    Returns the matching rows after WHERE, ORDER BY, OFFSET and LIMIT.
+    Rows that read relationships are shallow copies carrying the joined
+    parent records (by relationship name) and child row lists (by child
+    relationship name); plain queries return the stored records as-is.
+    Aggregate queries return one row per group (see _aggregate()).
+
+    `records` overrides the source rows (default: every stored record of
+    the object), e.g. one PK chunk of a bulk query.
+
+    Raises:
+        ValueError: unknown relationship in a field path or subquery.
+    """
+    object_name = parsed['object']
+    if records is None:
+        records = database.get(object_name, [])
+
+    tree = relationship_paths(parsed)
+    if tree:
+        records = _join_parents(records, object_name, tree, {})
+
+    if is_aggregate(parsed):
+        if parsed.get('where'):
+            records = (r for r in records if matches_where(r, parsed['where']))
+        groups = _aggregate(records, parsed)
+        if parsed.get('having'):
+            groups = [g for g in groups if matches_where(g, parsed['having'])]
+        return _order_and_page(groups, parsed)
+
+    if parsed.get('order_by'):
+        if parsed.get('where'):
+            records = [r for r in records if matches_where(r, parsed['where'])]
+        records = _order_and_page(records, parsed, object_name)
+    else:
+        # Unordered: stop filtering as soon as OFFSET + LIMIT rows matched
+        if parsed.get('where'):
+            records = (r for r in records if matches_where(r, parsed['where']))
+        offset = parsed.get('offset') or 0
+        stop = offset + parsed['limit'] if parsed.get('limit') else None
+        records = list(islice(records, offset, stop))
+
+    subqueries = parsed.get('subqueries')
+    if subqueries:
+        if not tree:
+            records = [dict(r) for r in records]
+        _attach_children(records, object_name, subqueries)
+    return records
+
+
+def count_records(parsed, records=None):
+    """
+    Answer SELECT COUNT() without building the filtered record list.
+
+    With no WHERE the stored list length is the per-object count; with a
+    WHERE the matches are counted as they stream past. `records` overrides
+    the source rows as in execute_query().
+    """
+    if records is None:
+        records = database.get(parsed['object'], [])
+    if not parsed.get('where'):
+        total = len(records)
+    else:
+        tree = relationship_paths(parsed)
+        if tree:
+            records = _join_parents(records, parsed['object'], tree, {})
+        total = sum(1 for r in records if matches_where(r, parsed['where']))
+
+    total = max(0, total - (parsed.get('offset') or 0))
+    if parsed.get('limit'):
+        total = min(total, parsed['limit'])
+    return total
+
+
+def _order_and_page(records, parsed, object_name=None):
+    """
+    Apply ORDER BY, OFFSET and LIMIT from a parsed query. With a LIMIT
+    only the top OFFSET + LIMIT rows are selected (bounded heap) rather
+    than sorting everything. `object_name` enables schema-typed sort keys.
+    """
+    offset = parsed.get('offset') or 0
+    limit = parsed.get('limit')
+    if parsed.get('order_by'):
+        field_types = _field_types(object_name, parsed['order_by']) if object_name else None
+        records = apply_order_by(
+            records, parsed['order_by'],
+            limit=offset + limit if limit else None,
+            field_types=field_types,
+        )
+    if offset:
+        records = records[offset:]
+    if limit:
+        records = records[:limit]
+    return records
+
+
+def _field_types(object_name, columns):
+    """Schema type of each ORDER BY path ('Account.AnnualRevenue' -> 'currency')."""
+    types = {}
+    for column in columns:
+        path = column['field']
+        if '(' in path:
+            continue
+        obj = object_name
+        parts = path.split('.')
+        for relationship in parts[:-1]:
+            _, targets = _resolve_parent(obj, relationship)
+            obj = targets[0]
+        types[path] = schemas.get(obj, {}).get('fields', {}).get(parts[-1], {}).get('type')
+    return types
+
+
+# =====================================================================
+# AGGREGATION
+# =====================================================================
+
+def is_aggregate(parsed):
+    """True for queries with aggregate functions or GROUP BY."""
+    return bool(parsed.get('aggregates') or parsed.get('group_by'))
+
+
+class _Count:
+    def __init__(self):
+        self.value = 0
+
+    def add(self, value):
+        if value is not None:
+            self.value += 1
+
+    def result(self):
+        return self.value
+
+
+class _CountDistinct:
+    def __init__(self):
+        self.values = set()
+
+    def add(self, value):
+        if value is not None:
+            self.values.add(value)
+
+    def result(self):
+        return len(self.values)
+
+
+class _Sum:
+    """Integer-only input (including integer strings from CSV loads) sums to an int."""
+
+    def __init__(self):
+        self.total = None
+        self.count = 0
+
+    def add(self, value):
+        if value is None or value == '':
+            return
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            value = _numeric(value)
+        self.total = value if self.total is None else self.total + value
+        self.count += 1
+
+    def result(self):
+        return self.total
+
+
+class _Avg(_Sum):
+    def result(self):
+        return None if not self.count else self.total / self.count
+
+
+def _numeric(value):
+    """int for integer text ('42'), float for other numeric text or values."""
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'Aggregate function requires a numeric field, got {value!r}')
+
+
+DATE_TYPES = ('date', 'datetime')
+
+
+class _Min:
+    """
+    Numeric fields (and untyped fields whose values all parse as numbers)
+    compare as numbers, so '10' beats '9'; date and datetime fields compare
+    as dates. Anything else compares as stored.
+    """
+
+    def __init__(self, field_type=None):
+        self.field_type = field_type
+        self.numeric = field_type is None or field_type in NUMERIC_TYPES
+        self.number = None
+        self.value = None
+        self.key = None
+
+    def add(self, value):
+        if value is None or value == '':
+            return
+        if self.numeric:
+            try:
+                number = value if _is_number(value) else _numeric(value)
+            except ValueError:
+                self.numeric = False
+            else:
+                if self.number is None or self._before(number, self.number):
+                    self.number = number
+        key = _date_key(value) if self.field_type in DATE_TYPES else value
+        if self.value is None or self._before(key, self.key):
+            self.value, self.key = value, key
+
+    def _before(self, a, b):
+        return _less(a, b)
+
+    def result(self):
+        return self.number if self.numeric and self.number is not None else self.value
+
+
+class _Max(_Min):
+    def _before(self, a, b):
+        return _less(b, a)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _date_key(value):
+    """datetime for ISO date/datetime text ('...Z', '...+0000'), else the value itself."""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _less(a, b):
+    """a < b, falling back to string comparison for mixed types."""
+    try:
+        return a < b
+    except TypeError:
+        return str(a) < str(b)
+
+
+_ACCUMULATORS = {
+    'COUNT': _Count,
+    'COUNT_DISTINCT': _CountDistinct,
+    'SUM': _Sum,
+    'AVG': _Avg,
+    'MIN': _Min,
+    'MAX': _Max,
+}
+
+
+def _required_aggregates(parsed):
+    """
+    Aggregates to compute: the SELECT list plus any aggregate expression
+    referenced only by HAVING or ORDER BY. Returns [(key, function, field)].
+    """
+    required = {}
+    for agg in parsed.get('aggregates') or []:
+        required.setdefault(agg['key'], (agg['function'], agg['field']))
+
+    exprs = [cond['field'] for cond in parsed.get('having') or []]
+    exprs.extend(col['field'] for col in parsed.get('order_by') or [])
+    for expr in exprs:
+        match = re.match(r'^(\w+)\(([\w.]*)\)$', expr)
+        if match and match.group(1) in _ACCUMULATORS:
+            required.setdefault(expr, (match.group(1), match.group(2) or 'Id'))
+
+    return [(key, function, field) for key, (function, field) in required.items()]
+
+
+def _accumulators(aggregates, field_types):
+    """Fresh accumulators for one group; MIN/MAX also get the field's schema type."""
+    return [
+        _ACCUMULATORS[fn](field_types.get(field)) if fn in ('MIN', 'MAX') else _ACCUMULATORS[fn]()
+        for _, fn, field in aggregates
+    ]
+
+
+def _aggregate(records, parsed):
+    """
+    One-pass hash aggregation.
+
+    Returns one dict per group keyed by the GROUP BY field paths and the
+    normalized aggregate expressions ('COUNT(Id)'), so HAVING and ORDER BY
+    can be evaluated on it with the regular condition helpers. Without
+    GROUP BY there is exactly one group, even for zero input records.
+    """
+    group_by = parsed.get('group_by') or []
+    aggregates = _required_aggregates(parsed)
+    field_types = _field_types(parsed['object'], [{'field': field} for _, _, field in aggregates])
+    groups = {}
+
+    for record in records:
+        key = tuple(get_field_value(record, f) for f in group_by)
+        accumulators = groups.get(key)
+        if accumulators is None:
+            accumulators = groups[key] = _accumulators(aggregates, field_types)
+        for accumulator, (_, _, field) in zip(accumulators, aggregates):
+            accumulator.add(get_field_value(record, field))
+
+    if not groups and not group_by:
+        groups[()] = _accumulators(aggregates, field_types)
+
+    rows = []
+    for key, accumulators in groups.items():
+        row = dict(zip(group_by, key))
+        for accumulator, (expr, _, _) in zip(accumulators, aggregates):
+            row[expr] = accumulator.result()
+        rows.append(row)
+    return rows
+
+
+def project_aggregate(row, parsed):
+    """
+    Shape a group row like Salesforce's AggregateResult: grouped fields by
+    their field name, aggregates by alias or expr0, expr1, ... in SELECT
+    order for unaliased ones.
+    """
+    out = {'attributes': {'type': 'AggregateResult'}}
+    for field in parsed.get('fields') or []:
+        out[field.rsplit('.', 1)[-1]] = row.get(field)
+    expr_index = 0
+    for agg in parsed.get('aggregates') or []:
+        if agg['alias']:
+            name = agg['alias']
+        else:
+            name = f'expr{expr_index}'
+            expr_index += 1
+        out[name] = row.get(agg['key'])
+    return out
+
+
+# =====================================================================
+# REST PROJECTION
+# =====================================================================
+
+def compile_projection(parsed, version, object_name=None):
+    """
+    Build the function that shapes an executed row like the REST query API.
+
+    Everything that depends only on the query -- the field order, parent
+    paths and their relationship targets, child projections and the
+    attributes URL prefix -- is resolved here once per query, so the
+    returned function only reads the row. Attributes are not stored on
+    records; they are derived from the object name and Id.
+
+    Parent paths become nested objects with their own attributes
+    ({'Account': {'attributes': {...}, 'Name': 'Acme'}}, or None when the
+    lookup is empty); child subqueries become nested query results
+    ({'Contacts': {'totalSize': 2, 'done': True, 'records': [...]}}, or
+    None when there are no children).
+    """
+    object_name = object_name or parsed['object']
+    fields = parsed.get('fields', [])
+    sobjects_url = f'/services/data/{version}/sobjects/'
+    url_prefix = f'{sobjects_url}{object_name}/'
+    skip = {'attributes', *relationship_paths(parsed)} if '*' in fields else None
+
+    # (field, None) for stored fields, (None, [(relationship, targets), ...], leaf) for paths
+    steps = []
+    for field in fields:
+        if field == '*':
+            continue
+        if '.' not in field:
+            steps.append((field, None, None))
+            continue
+        parts = field.split('.')
+        hops, obj = [], object_name
+        for relationship in parts[:-1]:
+            _, targets = _resolve_parent(obj, relationship)
+            hops.append((relationship, targets))
+            obj = targets[0]
+        steps.append((None, hops, parts[-1]))
+
+    children = []
+    for subquery in parsed.get('subqueries') or []:
+        child_name, _, _ = _resolve_child(object_name, subquery['object'])
+        children.append((subquery['object'], compile_projection(subquery, version, child_name)))
+
+    def project(row):
+        out = {'attributes': {'type': object_name, 'url': url_prefix + str(row.get('Id'))}}
+        if skip is not None:
+            # Wildcard: include all stored fields except joined relationships
+            for key in row:
+                if key not in skip:
+                    out[key] = row[key]
+        for field, hops, leaf in steps:
+            if hops is None:
+                if field in row:
+                    out[field] = row[field]
+                continue
+            target, value = out, row
+            for relationship, targets in hops:
+                value = value.get(relationship)
+                if value is None:
+                    target.setdefault(relationship, None)
+                    break
+                if target.get(relationship) is None:
+                    parent_type = _record_type(value, targets)
+                    target[relationship] = {'attributes': {
+                        'type': parent_type,
+                        'url': f"{sobjects_url}{parent_type}/{value.get('Id')}",
+                    }}
+                target = target[relationship]
+            else:
+                target[leaf] = get_field_value(value, leaf)
+        for relationship, project_child in children:
+            rows = row.get(relationship)
+            out[relationship] = {
+                'totalSize': len(rows),
+                'done': True,
+                'records': [project_child(child) for child in rows],
+            } if rows else None
+        return out
+
+    return project
+
+
+def project_record(row, parsed, version, object_name=None):
+    """Shape one executed row (see compile_projection(); prefer it for many rows)."""
+    return compile_projection(parsed, version, object_name)(row)
@@ -18,8 +18,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'salesforce_mock.middleware.TrailingSlashMiddleware',  # Strip trailing slashes (Express compat)
+    'salesforce_mock.middleware.GZipResponseMiddleware',  # Accept-Encoding: gzip
     'salesforce_mock.middleware.CORSMiddleware',
-    'salesforce_mock.middleware.RawBodyMiddleware',
+    'salesforce_mock.middleware.TenantMiddleware',  # X-Mock-Tenant / tenant-scoped tokens
+    'salesforce_mock.middleware.RequestDecompressionMiddleware',  # Content-Encoding: gzip/deflate
     'salesforce_mock.middleware.RequestLoggingMiddleware',
     'django.middleware.common.CommonMiddleware',
     'salesforce_mock.middleware.ErrorHandlerMiddleware',
@@ -46,11 +48,28 @@ SCHEMA_DIR = os.environ.get('SCHEMA_DIR', '/app/schemas')
 P12_FILE = os.environ.get('P12_FILE', '/app/certs/custom-keystore.p12')
 P12_PASSWORD = os.environ.get('P12_PASSWORD', 'password')
 
+# Response compression (Accept-Encoding: gzip) for CSV/JSON/XML payloads
+GZIP_RESPONSES = os.environ.get('GZIP_RESPONSES', 'true').lower() == 'true'
+GZIP_MIN_RESPONSE_SIZE = int(os.environ.get('GZIP_MIN_RESPONSE_SIZE', '8192'))
+
+# Largest gzip/deflate request body accepted once inflated (default 150MB,
+# the Bulk API upload limit); larger bodies get a 413
+MAX_DECOMPRESSED_BODY_SIZE = int(os.environ.get('MAX_DECOMPRESSED_BODY_SIZE', str(150 * 1024 * 1024)))
+
+# Tenant isolation: when true, tokens issued for different OAuth usernames
+# get separate state (otherwise only X-Mock-Tenant selects a tenant)
+MOCK_TENANT_BY_USERNAME = os.environ.get('MOCK_TENANT_BY_USERNAME', 'false').lower() == 'true'
+
 # Disable Django's CSRF (this is a mock API server)
 CSRF_COOKIE_SECURE = False
 APPEND_SLASH = False
 
-# Logging
+# Logging — records are queued and written by a background thread
+# (salesforce_mock.log_queue.AsyncStreamHandler) so request threads never block on I/O.
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+REQUEST_LOG_LEVEL = os.environ.get('REQUEST_LOG_LEVEL', 'INFO').upper()
+REQUEST_LOG_SAMPLE_RATE = float(os.environ.get('REQUEST_LOG_SAMPLE_RATE', '1.0'))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -62,14 +81,15 @@ LOGGING = {
     },
     'handlers': {
         'console': {
-            'class': 'logging.StreamHandler',
+            'class': 'salesforce_mock.log_queue.AsyncStreamHandler',
             'formatter': 'simple',
+            'maxsize': 10000,
         },
     },
     'loggers': {
         'salesforce_mock': {
             'handlers': ['console'],
-            'level': 'INFO',
+            'level': LOG_LEVEL,
         },
     },
 }
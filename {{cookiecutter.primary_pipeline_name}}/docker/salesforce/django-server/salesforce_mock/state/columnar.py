@@ -0,0 +1,502 @@
+"""
+Columnar Record Tables
+======================
+Compact, read-only storage for large record lists -- the shared seeded
+baseline (state/database.py) that every tenant reads until it modifies
+an object.
+
+A ColumnTable stores a record list column by column:
+  - int and float columns in typed arrays ('q' / 'd'),
+  - ISO-8601 UTC timestamps (CreatedDate, SystemModstamp, ...) as integer
+    microseconds since the epoch,
+  - everything else dictionary-encoded: one pool of distinct values per
+    column and an array of integer codes (1 byte per row for picklists).
+Each row also keeps its shape -- which keys it has, in which order -- so
+rows come back exactly as stored, including fields a record never had.
+
+Rows materialize as new dicts when read (iteration, indexing, slicing):
+callers use them like any record dict, and changing one does not change
+the table. Typical seeded Accounts take about half the memory of the
+equivalent dicts, at the cost of building each dict when it is read;
+iteration decodes a block of rows column by column to keep that cheap.
+
+A tenant that modifies a baseline object gets a TableOverlay over its
+ColumnTable instead of a copy: only the rows it changes, deletes or adds
+are held by the tenant, and every other row is still read from the table.
+"""
+import sys
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import MutableSequence, Sequence
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+INT64_RANGE = (-2 ** 63, 2 ** 63 - 1)
+ITER_BLOCK = 1024
+
+
+# =====================================================================
+# COLUMN ENCODINGS
+# =====================================================================
+
+class _ArrayColumn:
+    """
+    Numbers in a typed array. Rows holding None are listed, in ascending
+    order, in the `nulls` array, so a row range finds its nulls by bisection.
+    """
+
+    def __init__(self, typecode, values):
+        self.nulls = array('q', (i for i, v in enumerate(values) if v is None))
+        self.data = array(typecode, (0 if v is None else v for v in values))
+
+    def is_null(self, i):
+        nulls = self.nulls
+        if not nulls:
+            return False
+        position = bisect_left(nulls, i)
+        return position < len(nulls) and nulls[position] == i
+
+    def null_range(self, start, stop):
+        """Null row numbers in [start, stop)."""
+        nulls = self.nulls
+        if not nulls:
+            return ()
+        return nulls[bisect_left(nulls, start):bisect_left(nulls, stop)]
+
+    def get(self, i):
+        if self.is_null(i):
+            return None
+        return self.data[i]
+
+    def get_range(self, start, stop):
+        values = self.data[start:stop].tolist()
+        for i in self.null_range(start, stop):
+            values[i - start] = None
+        return values
+
+
+@lru_cache(maxsize=4096)
+def _render_timestamp(micros, suffix):
+    """ISO text for epoch microseconds. Cached: a record's CreatedDate,
+    LastModifiedDate and SystemModstamp are usually the same instant."""
+    seconds, fraction = divmod(micros, 1000000)
+    text = _render_seconds(seconds)
+    return f'{text}.{fraction:06d}{suffix}' if fraction else text + suffix
+
+
+@lru_cache(maxsize=256)
+def _render_seconds(seconds):
+    """'YYYY-MM-DDTHH:MM:SS' for epoch seconds (bulk-loaded rows share a few)."""
+    return (EPOCH + timedelta(seconds=seconds)).isoformat()[:19]
+
+
+class _TimestampColumn(_ArrayColumn):
+    """UTC timestamps as microseconds since the epoch, re-rendered on read."""
+
+    def __init__(self, micros, zulu):
+        super().__init__('q', micros)
+        self.suffix = 'Z' if zulu else '+00:00'
+
+    def get(self, i):
+        if self.is_null(i):
+            return None
+        return _render_timestamp(self.data[i], self.suffix)
+
+    def get_range(self, start, stop):
+        suffix = self.suffix
+        values = [_render_timestamp(m, suffix) for m in self.data[start:stop]]
+        for i in self.null_range(start, stop):
+            values[i - start] = None
+        return values
+
+
+class _DictionaryColumn:
+    """Distinct values in a pool, one integer code per row."""
+
+    def __init__(self, values):
+        pool, codes = [], {}
+        encoded = []
+        for value in values:
+            key = (type(value), value)     # keep True / 1 / 1.0 apart
+            code = codes.get(key)
+            if code is None:
+                code = codes[key] = len(pool)
+                pool.append(value)
+            encoded.append(code)
+        typecode = 'B' if len(pool) <= 0xFF else 'H' if len(pool) <= 0xFFFF else 'I'
+        self.pool = pool
+        self.codes = array(typecode, encoded)
+
+    def get(self, i):
+        return self.pool[self.codes[i]]
+
+    def get_range(self, start, stop):
+        return list(map(self.pool.__getitem__, self.codes[start:stop]))
+
+
+class _ObjectColumn:
+    """Fallback for unhashable values (nested objects): a plain list."""
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    def get(self, i):
+        return self.values[i]
+
+    def get_range(self, start, stop):
+        return self.values[start:stop]
+
+
+def _timestamp_micros(values):
+    """
+    Microseconds for each value if the column is ISO UTC timestamps that
+    re-render byte for byte, else None. Returns (micros, zulu).
+    """
+    micros, zulu = [], None
+    for value in values:
+        if value is None:
+            micros.append(None)
+            continue
+        if type(value) is not str or 'T' not in value:
+            return None, None
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None, None
+        if parsed.utcoffset() != timedelta(0):
+            return None, None
+        value_zulu = value.endswith('Z')
+        if zulu is None:
+            zulu = value_zulu
+        rendered = parsed.isoformat()
+        if zulu != value_zulu or (rendered.replace('+00:00', 'Z') if zulu else rendered) != value:
+            return None, None
+        micros.append((parsed - EPOCH) // ONE_MICROSECOND)
+    return micros, bool(zulu)
+
+
+def _encode_column(values):
+    """Pick the most compact encoding that returns every value unchanged."""
+    present = [v for v in values if v is not None]
+    if present and all(type(v) is int for v in present) \
+            and INT64_RANGE[0] <= min(present) and max(present) <= INT64_RANGE[1]:
+        return _ArrayColumn('q', values)
+    if present and all(type(v) is float for v in present):
+        return _ArrayColumn('d', values)
+    if present and type(present[0]) is str:
+        micros, zulu = _timestamp_micros(values)
+        if micros is not None:
+            return _TimestampColumn(micros, zulu)
+    try:
+        return _DictionaryColumn(values)
+    except TypeError:
+        return _ObjectColumn(values)
+
+
+# =====================================================================
+# TABLE
+# =====================================================================
+
+class ColumnTable(Sequence):
+    """
+    Read-only, column-encoded copy of a list of record dicts. `generation`
+    numbers the baseline the table belongs to (state/database.py).
+    """
+
+    def __init__(self, records, generation=None):
+        self.generation = generation
+        records = list(records)
+        shape_ids, key_shapes = {}, []
+        shape_of = []
+        for record in records:
+            keys = tuple(record)
+            shape = shape_ids.get(keys)
+            if shape is None:
+                shape = shape_ids[keys] = len(key_shapes)
+                key_shapes.append(keys)
+            shape_of.append(shape)
+
+        names = list(dict.fromkeys(key for keys in key_shapes for key in keys))
+        columns = {
+            name: _encode_column([record.get(name) for record in records])
+            for name in names
+        }
+        self._length = len(records)
+        self._shape_of = array('H' if len(key_shapes) <= 0xFFFF else 'I', shape_of)
+        # Per shape: ((key, column), ...) in the record's original key order
+        self._shapes = [
+            tuple((sys.intern(key), columns[key]) for key in keys) for keys in key_shapes
+        ]
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('ColumnTable index out of range')
+        return self._row(index)
+
+    def __iter__(self):
+        return self.rows(dict)
+
+    def rows(self, row_type):
+        """Iterate the rows built as row_type(key/value pairs)."""
+        # Decode a block of rows column by column, then zip the values into
+        # dicts: far cheaper than decoding one cell at a time.
+        for start in range(0, self._length, ITER_BLOCK):
+            stop = min(start + ITER_BLOCK, self._length)
+            shape_ids = set(self._shape_of[start:stop])
+            if len(shape_ids) == 1:
+                shape = self._shapes[shape_ids.pop()]
+                keys = [key for key, _ in shape]
+                columns = [column.get_range(start, stop) for _, column in shape]
+                for values in zip(*columns):
+                    yield row_type(zip(keys, values))
+            else:
+                for i in range(start, stop):
+                    yield self._row(i, row_type)
+
+    def _row(self, i, row_type=dict):
+        return row_type((key, column.get(i)) for key, column in self._shapes[self._shape_of[i]])
+
+
+# =====================================================================
+# TENANT OVERLAY
+# =====================================================================
+
+class _OverlayRow(dict):
+    """
+    A row handed out by a TableOverlay. Every change to it is reported to
+    the overlay, which keeps a changed table row as the row read from then
+    on. `_position` is the table row number, or ~sequence for added rows.
+    """
+
+    __slots__ = ('_overlay', '_position')
+
+    def _touch(self):
+        overlay = self._overlay
+        if overlay is not None:
+            overlay._row_changed(self)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._touch()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._touch()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self._touch()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._touch()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._touch()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._touch()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._touch()
+        return value
+
+    def clear(self):
+        super().clear()
+        self._touch()
+
+
+class TableOverlay(MutableSequence):
+    """
+    A tenant's writable record list over a shared ColumnTable.
+
+    The tenant holds only its differences: rows it changed (by table row
+    number), the sorted table row numbers it deleted, and the rows it
+    added, which follow the table's rows. Unchanged rows are decoded from
+    the table when read; the first in-place change to one (row['Name'] =
+    ..., row.update(...)) keeps that dict as the tenant's version of the
+    row. Rows can only be added after the table's rows, and the list
+    stores a copy of each row assigned or added.
+
+    Each added row gets an increasing sequence number. If `on_change` is
+    set it is called as on_change(key, row) after every change, with key
+    ('b', table row number) or ('a', sequence) and row None for a deleted
+    row; apply() makes the same change to another overlay over the same
+    table (see state/replication.py).
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.on_change = None
+        self._changed = {}          # table row number -> dict
+        self._deleted = array('q')  # table row numbers, ascending
+        self._added = []
+        self._sequences = array('q')  # sequence of each added row, ascending
+        self._next_sequence = 0
+
+    def _base_length(self):
+        return len(self.table) - len(self._deleted)
+
+    def __len__(self):
+        return self._base_length() + len(self._added)
+
+    def _position(self, index):
+        """Table row number of the index-th table row still in the list."""
+        deleted = self._deleted
+        if not deleted:
+            return index
+        # Smallest row number with index + 1 rows at or before it not deleted
+        low, high = index, index + len(deleted)
+        while low < high:
+            middle = (low + high) // 2
+            if middle + 1 - bisect_right(deleted, middle) > index:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def _read(self, position):
+        row = self._changed.get(position)
+        if row is None:
+            row = self.table._row(position, _OverlayRow)
+            row._overlay, row._position = self, position
+        return row
+
+    def _locate(self, index):
+        """(table row number, None) or (None, index into the added rows)."""
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('list index out of range')
+        base_length = self._base_length()
+        if index < base_length:
+            return self._position(index), None
+        return None, index - base_length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        position, added = self._locate(index)
+        return self._added[added] if position is None else self._read(position)
+
+    def __setitem__(self, index, record):
+        if isinstance(index, slice):
+            raise TypeError('TableOverlay does not support slice assignment')
+        position, added = self._locate(index)
+        if position is None:
+            sequence = self._sequences[added]
+            row = self._added[added] = self._adopt(record, ~sequence)
+            self._report(('a', sequence), row)
+        else:
+            row = self._changed[position] = self._adopt(record, position)
+            self._report(('b', position), row)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            for i in sorted(range(*index.indices(len(self))), reverse=True):
+                del self[i]
+            return
+        position, added = self._locate(index)
+        if position is None:
+            sequence = self._sequences[added]
+            del self._added[added]
+            del self._sequences[added]
+            self._report(('a', sequence), None)
+        else:
+            self._changed.pop(position, None)
+            insort(self._deleted, position)
+            self._report(('b', position), None)
+
+    def pop(self, index=-1):
+        record = self[index]
+        del self[index]
+        if isinstance(record, _OverlayRow):
+            record._overlay = None
+        return record
+
+    def insert(self, index, record):
+        if index < 0:
+            index += len(self)
+        if index < len(self):
+            raise IndexError('TableOverlay rows can only be added after the last row')
+        self.append(record)
+
+    def append(self, record):
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        row = self._adopt(record, ~sequence)
+        self._added.append(row)
+        self._sequences.append(sequence)
+        self._report(('a', sequence), row)
+
+    def _adopt(self, record, position):
+        row = _OverlayRow(record)
+        row._overlay, row._position = self, position
+        return row
+
+    def _row_changed(self, row):
+        position = row._position
+        if position < 0:
+            self._report(('a', ~position), row)
+        else:
+            self._report(('b', position), self._changed.setdefault(position, row))
+
+    def _report(self, key, row):
+        if self.on_change is not None:
+            self.on_change(key, row)
+
+    def apply(self, key, row):
+        """Make a change reported by another overlay's on_change (row is then a plain dict)."""
+        kind, number = key
+        if kind == 'b':
+            if row is not None:
+                self._changed[number] = row
+                return
+            self._changed.pop(number, None)
+            i = bisect_left(self._deleted, number)
+            if i == len(self._deleted) or self._deleted[i] != number:
+                self._deleted.insert(i, number)
+            return
+        sequences = self._sequences
+        i = bisect_left(sequences, number)
+        if i < len(sequences) and sequences[i] == number:
+            if row is None:
+                del self._added[i]
+                del sequences[i]
+            else:
+                self._added[i] = row
+        elif row is not None:
+            self._added.insert(i, row)
+            sequences.insert(i, number)
+
+    def __iter__(self):
+        changed, deleted = self._changed, self._deleted
+        next_deleted, d = (deleted[0] if deleted else -1), 0
+        for position, row in enumerate(self.table.rows(_OverlayRow)):
+            if position == next_deleted:
+                d += 1
+                next_deleted = deleted[d] if d < len(deleted) else -1
+                continue
+            current = changed.get(position)
+            if current is not None:
+                yield current
+            else:
+                row._overlay, row._position = self, position
+                yield row
+        yield from self._added
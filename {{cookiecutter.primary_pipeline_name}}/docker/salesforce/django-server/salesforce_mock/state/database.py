@@ -5,21 +5,200 @@ Port of: the database/schemas objects from server.js
 
 Module-level dict singletons imported by all views.
 All data is lost on restart (by design for clean tests).
+
+Records are tenant-aware (see state/tenants.py): `database` is a mapping
+view of the current tenant's records over the shared `baseline`. The
+baseline is empty unless captured with capture_baseline()
+(POST /__admin/baseline), so the default tenant starts empty as before.
+
+Captured baselines are stored as ColumnTables (state/columnar.py):
+compact, read-only column storage whose rows materialize as dicts when
+read. Objects a tenant modifies get a TableOverlay that holds only the
+tenant's changed, deleted and added rows on top of the shared table.
+Each captured or loaded table is tagged with the baseline generation, a
+counter every cluster worker advances in step (state/replication.py).
 """
+import threading
+from collections.abc import Mapping, MutableMapping
+
+from salesforce_mock.state.columnar import ColumnTable
+from salesforce_mock.state.tenants import get_tenant, is_writable
+
+
+class SnapshotMap(Mapping):
+    """
+    Read-only mapping over a dict that is replaced, never modified.
+
+    Writers build a new dict and swap() it in with one reference
+    assignment, so a request iterating the map (or holding current())
+    keeps a consistent version and never sees it change size mid-loop.
+    """
+
+    def __init__(self):
+        self._current = {}
+
+    def current(self):
+        """The dict currently installed (treat it as read-only)."""
+        return self._current
+
+    def swap(self, mapping):
+        self._current = mapping
+
+    def __getitem__(self, name):
+        return self._current[name]
+
+    def get(self, name, default=None):
+        return self._current.get(name, default)
 
-# Schema definitions loaded from JSON files
+    def __contains__(self, name):
+        return name in self._current
+
+    def __iter__(self):
+        return iter(self._current)
+
+    def __len__(self):
+        return len(self._current)
+
+    def keys(self):
+        return self._current.keys()
+
+    def items(self):
+        return self._current.items()
+
+    def values(self):
+        return self._current.values()
+
+
+# Schema definitions loaded from JSON files, installed by the schema
+# registry (state/schema_registry.py) through install_schemas()
 # { 'Account': { name, idPrefix, fields: {...} }, 'Contact': {...}, ... }
-schemas = {}
+schemas = SnapshotMap()
+
+# Shared seeded records every tenant starts from. Never mutated in place;
+# replaced wholesale by capture_baseline() / clear_baseline().
+# { 'Account': ColumnTable or [] , 'Contact': ..., ... }
+baseline = SnapshotMap()
+_baseline_lock = threading.Lock()
+_generation = 0
+
+
+class TenantDatabase(MutableMapping):
+    """
+    { object name: record list } for the current tenant.
 
-# In-memory record storage
+    Read-only requests get the baseline list for objects the tenant has
+    not modified; any other access clones the object into the tenant
+    first (copy-on-write), so the returned list is safe to mutate.
+    """
+
+    def __getitem__(self, name):
+        tenant = get_tenant()
+        records = tenant.data.get(name)
+        if records is not None:
+            return records
+        records = baseline[name]
+        if not is_writable():
+            return records
+        return tenant.clone(name, records)
+
+    def __setitem__(self, name, records):
+        if name not in baseline:
+            _add_baseline_objects([name])
+        get_tenant().replace(name, records)
+
+    def __delitem__(self, name):
+        get_tenant().discard(name)
+
+    def setdefault(self, name, default=None):
+        # The tenant may keep a copy of `default`: return the stored list
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def __contains__(self, name):
+        return name in baseline
+
+    def __iter__(self):
+        return iter(baseline)
+
+    def __len__(self):
+        return len(baseline)
+
+
+# In-memory record storage for the current tenant
 # { 'Account': [record1, record2, ...], 'Contact': [...], ... }
-database = {}
+database = TenantDatabase()
+
+
+def install_schemas(definitions):
+    """
+    Make `definitions` ({ name: schema }) the current schemas and give
+    new objects an empty baseline. Called by the schema registry; the dict
+    must not be modified afterwards.
+    """
+    _add_baseline_objects(definitions)
+    schemas.swap(definitions)
+
+
+def _add_baseline_objects(names):
+    """Add an empty baseline for each of `names` not in it yet."""
+    with _baseline_lock:
+        missing = [name for name in names if name not in baseline]
+        if missing:
+            baseline.swap({**baseline.current(), **{name: [] for name in missing}})
 
 
 def reset_all():
-    """Clear all records, preserve schema definitions."""
-    total = 0
-    for name in database:
-        total += len(database[name])
-        database[name] = []
+    """
+    Reset the current tenant's records to the baseline, preserving schema
+    definitions. Returns the number of records the tenant had.
+    """
+    tenant = get_tenant()
+    total = sum(len(tenant.data.get(name, records)) for name, records in baseline.items())
+    tenant.reset_data()
+    return total
+
+
+def capture_baseline():
+    """
+    Make the current tenant's records the shared baseline for all tenants.
+    The tenant's own copies are then dropped (they equal the new baseline),
+    so the records are held once, in columnar form.
+    Returns the number of records captured.
+    """
+    global _generation
+    tenant = get_tenant()
+    with _baseline_lock:
+        _generation += 1
+        snapshot = {
+            name: ColumnTable(tenant.data.get(name, records), _generation)
+            for name, records in baseline.items()
+        }
+        baseline.swap({**baseline.current(), **snapshot})
+    tenant.reset_data()
+    return sum(len(records) for records in snapshot.values())
+
+
+def load_baseline(snapshot):
+    """
+    Replace the baseline of the objects in `snapshot` ({ name: records }),
+    e.g. a baseline exported by another worker. Returns the record count.
+    """
+    global _generation
+    with _baseline_lock:
+        _generation += 1
+        snapshot = {
+            name: ColumnTable(records, _generation) for name, records in snapshot.items() if name in baseline
+        }
+        baseline.swap({**baseline.current(), **snapshot})
+    return sum(len(records) for records in snapshot.values())
+
+
+def clear_baseline():
+    """Empty the shared baseline. Returns the number of records dropped."""
+    global _generation
+    with _baseline_lock:
+        _generation += 1
+        total = sum(len(records) for records in baseline.values())
+        baseline.swap({name: [] for name in baseline})
     return total
@@ -10,13 +10,28 @@ Manages:
   - Event publishing with replay IDs
   - CometD client sessions
   - Channel subscriptions with replay positions
+
+Change Data Capture events (services/change_events.py) are published from
+a background thread, so publishing and polling are serialized by a lock.
+A subscription to /data/ChangeEvents receives the events of every
+/data/<Object>ChangeEvent channel.
 """
+import heapq
+import threading
 import uuid
 from datetime import datetime, timezone
 
+from salesforce_mock.state.tenants import TenantLocal
 from salesforce_mock.utils.id_generator import generate_id
 
 
+ALL_CHANGE_EVENTS = '/data/ChangeEvents'
+
+
+def _is_change_channel(channel):
+    return channel.startswith('/data/') and channel.endswith('ChangeEvent')
+
+
 class EventBus:
     """Manages Platform Events and CometD client sessions."""
 
@@ -24,23 +39,32 @@ class EventBus:
         self._events = {}      # channel -> [event, ...]
         self._clients = {}     # clientId -> {subscriptions, connectedAt}
         self._replay_counter = 0
+        self._lock = threading.Lock()
 
     def publish(self, channel, payload):
         """
         Publish an event to a channel.
         Assigns a replay ID and stores the event.
         """
-        self._replay_counter += 1
-        event = {
-            'replayId': self._replay_counter,
-            'payload': payload,
-            'createdDate': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
-        }
-        if channel not in self._events:
-            self._events[channel] = []
-        self._events[channel].append(event)
+        self.publish_many([(channel, payload)])
         return generate_id('e00')
 
+    def publish_many(self, events):
+        """Publish [(channel, payload), ...] in order, under one lock acquisition."""
+        created = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        with self._lock:
+            for channel, payload in events:
+                self._replay_counter += 1
+                self._events.setdefault(channel, []).append({
+                    'replayId': self._replay_counter,
+                    'payload': payload,
+                    'createdDate': created,
+                })
+
+    def has_subscribers(self, channel):
+        """True if any client is subscribed to `channel`."""
+        return any(channel in client['subscriptions'] for client in list(self._clients.values()))
+
     def create_client(self):
         """Create a new CometD client session."""
         client_id = f'mock-client-{uuid.uuid4().hex[:12]}'
@@ -55,6 +79,10 @@ class EventBus:
         client = self._clients.get(client_id)
         if not client:
             return False
+        if replay_id == -1:
+            # Tip: deliver only events published after this subscription
+            with self._lock:
+                replay_id = self._replay_counter
         client['subscriptions'][channel] = {
             'replayFrom': replay_id,
         }
@@ -77,17 +105,21 @@ class EventBus:
         if not client:
             return []
 
+        with self._lock:
+            return self._poll(client)
+
+    def _poll(self, client):
         events = []
         for channel, sub in client['subscriptions'].items():
             replay_from = sub.get('replayFrom', -1)
-            channel_events = self._events.get(channel, [])
+            channel_events = self._channel_events(channel)
 
             for event in channel_events:
                 if replay_from == -2:
                     # Replay all events
                     events.append({'channel': channel, 'data': event})
                 elif replay_from == -1:
-                    # Only new events (tip) — none pending since this is synchronous
+                    # Only new events (tip)
                     pass
                 elif event['replayId'] > replay_from:
                     events.append({'channel': channel, 'data': event})
@@ -98,6 +130,13 @@ class EventBus:
 
         return events
 
+    def _channel_events(self, channel):
+        """Stored events of a channel; /data/ChangeEvents merges all CDC channels."""
+        if channel != ALL_CHANGE_EVENTS:
+            return self._events.get(channel, [])
+        streams = [events for name, events in self._events.items() if _is_change_channel(name)]
+        return list(heapq.merge(*streams, key=lambda event: event['replayId']))
+
     def disconnect(self, client_id):
         """Remove a client session."""
         return self._clients.pop(client_id, None) is not None
@@ -124,13 +163,14 @@ class EventBus:
 
     def clear(self):
         """Reset all events and clients."""
-        events_cleared = sum(len(v) for v in self._events.values())
-        clients_cleared = len(self._clients)
-        self._events.clear()
-        self._clients.clear()
-        self._replay_counter = 0
+        with self._lock:
+            events_cleared = sum(len(v) for v in self._events.values())
+            clients_cleared = len(self._clients)
+            self._events.clear()
+            self._clients.clear()
+            self._replay_counter = 0
         return {'eventsCleared': events_cleared, 'clientsCleared': clients_cleared}
 
 
-# Module-level singleton
-event_bus = EventBus()
+# Module-level singleton (one bus per tenant, see state/tenants.py)
+event_bus = TenantLocal('event_bus', EventBus)
@@ -10,19 +10,40 @@ Job States:
   Open -> UploadComplete -> InProgress -> JobComplete
   Open -> Aborted
   Any -> Failed
+
+Eviction:
+  Finished jobs (JobComplete / Failed / Aborted, or v1 Closed / Aborted)
+  keep their uploaded data and results in memory until they are evicted.
+  A finished job is evicted once it has not been touched (created, read
+  or updated) for BULK_JOB_TTL_SECONDS, and the oldest finished jobs are
+  evicted when more than BULK_JOB_MAX_FINISHED are retained. Open jobs are
+  never evicted. Set either variable to 0 to disable that limit.
 """
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
+from salesforce_mock.state.tenants import TenantLocal
 from salesforce_mock.utils.id_generator import generate_id
 
+FINISHED_STATES = ('JobComplete', 'Failed', 'Aborted')
+FINISHED_V1_STATES = ('Closed', 'Aborted')
+
 
 class JobStore:
     """Manages bulk job state for all Bulk API versions."""
 
-    def __init__(self):
+    def __init__(self, ttl_seconds=0, max_finished=0):
         self._jobs = {}
+        self._last_touched = OrderedDict()  # job_id -> monotonic time, oldest first
+        self._lock = threading.Lock()
+        self.ttl_seconds = ttl_seconds
+        self.max_finished = max_finished
 
     def create(self, config):
         """Create a new bulk job."""
+        self.evict_expired()
         job_id = generate_id('750')
         now = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
         job = {
@@ -44,11 +65,15 @@ class JobStore:
             'results': {'successful': [], 'failed': [], 'unprocessed': []},
         }
         self._jobs[job_id] = job
+        self._touch(job_id)
         return job
 
     def get(self, job_id):
         """Get job by ID."""
-        return self._jobs.get(job_id)
+        job = self._jobs.get(job_id)
+        if job:
+            self._touch(job_id)
+        return job
 
     def update(self, job_id, updates):
         """Update job fields."""
@@ -56,14 +81,18 @@ class JobStore:
         if job:
             job.update(updates)
             job['systemModstamp'] = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+            self._touch(job_id)
         return job
 
     def remove(self, job_id):
         """Delete a job."""
+        with self._lock:
+            self._last_touched.pop(job_id, None)
         return self._jobs.pop(job_id, None)
 
     def list_jobs(self, job_type=None):
         """List jobs, optionally filtered by type."""
+        self.evict_expired()
         jobs = list(self._jobs.values())
         if job_type:
             jobs = [j for j in jobs if j.get('jobType') == job_type]
@@ -71,15 +100,63 @@ class JobStore:
 
     def list_all(self):
         """Return all jobs."""
+        self.evict_expired()
         jobs = list(self._jobs.values())
         return {'count': len(jobs), 'jobs': jobs}
 
     def clear(self):
         """Remove all jobs. Returns count cleared."""
         count = len(self._jobs)
+        with self._lock:
+            self._last_touched.clear()
         self._jobs.clear()
         return count
 
+    def evict_expired(self):
+        """
+        Drop finished jobs that exceeded the idle TTL or the retention cap.
+        Returns the number of jobs evicted.
+        """
+        if not self.ttl_seconds and not self.max_finished:
+            return 0
+
+        now = time.monotonic()
+        evicted = 0
+        with self._lock:
+            finished = [
+                (job_id, touched) for job_id, touched in self._last_touched.items()
+                if _is_finished(self._jobs.get(job_id))
+            ]
+            overflow = len(finished) - self.max_finished if self.max_finished else 0
+            for job_id, touched in finished:
+                expired = self.ttl_seconds and now - touched > self.ttl_seconds
+                if expired or overflow > 0:
+                    self._last_touched.pop(job_id, None)
+                    self._jobs.pop(job_id, None)
+                    overflow -= 1
+                    evicted += 1
+        return evicted
+
+    def _touch(self, job_id):
+        """Mark a job as recently used (moves it to the newest end)."""
+        with self._lock:
+            self._last_touched[job_id] = time.monotonic()
+            self._last_touched.move_to_end(job_id)
+
+
+def _is_finished(job):
+    """True if a job has reached a terminal state and may be evicted."""
+    if not job:
+        return False
+    return job.get('state') in FINISHED_STATES or job.get('v1State') in FINISHED_V1_STATES
+
+
+def _create_job_store():
+    return JobStore(
+        ttl_seconds=int(os.environ.get('BULK_JOB_TTL_SECONDS', '3600')),
+        max_finished=int(os.environ.get('BULK_JOB_MAX_FINISHED', '500')),
+    )
+
 
-# Module-level singleton
-job_store = JobStore()
+# Module-level singleton (one store per tenant, see state/tenants.py)
+job_store = TenantLocal('job_store', _create_job_store)
@@ -0,0 +1,58 @@
+"""
+Recycle Bin
+===========
+Deleted records, kept so they can be undeleted (POST /__admin/undelete).
+
+REST and bulk deletes move records here instead of dropping them. The
+bin keeps at most RECYCLE_BIN_MAX_RECORDS records per tenant (default
+100000; 0 = unlimited), evicting the oldest deletions first, and is
+emptied by POST /__admin/reset.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from salesforce_mock.state.tenants import TenantLocal
+
+MAX_RECORDS = int(os.environ.get('RECYCLE_BIN_MAX_RECORDS', '100000'))
+
+
+class RecycleBin:
+    """Deleted records keyed by (object_name, Id), oldest first."""
+
+    def __init__(self, max_records=MAX_RECORDS):
+        self._records = OrderedDict()
+        self._max_records = max_records
+        self._lock = threading.Lock()
+
+    def add(self, object_name, record):
+        with self._lock:
+            self._records[(object_name, record.get('Id'))] = record
+            if self._max_records:
+                while len(self._records) > self._max_records:
+                    self._records.popitem(last=False)
+
+    def restore(self, object_name, record_id):
+        """Remove and return a deleted record, or None if it is not in the bin."""
+        with self._lock:
+            return self._records.pop((object_name, record_id), None)
+
+    def counts(self):
+        """{ object_name: deleted record count }"""
+        with self._lock:
+            keys = list(self._records)
+        counts = {}
+        for object_name, _ in keys:
+            counts[object_name] = counts.get(object_name, 0) + 1
+        return counts
+
+    def clear(self):
+        """Empty the bin. Returns the number of records dropped."""
+        with self._lock:
+            count = len(self._records)
+            self._records.clear()
+        return count
+
+
+# Module-level singleton (one bin per tenant, see state/tenants.py)
+recycle_bin = TenantLocal('recycle_bin', RecycleBin)
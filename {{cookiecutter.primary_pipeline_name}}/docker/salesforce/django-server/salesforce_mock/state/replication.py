@@ -0,0 +1,348 @@
+"""
+Tenant Replication
+==================
+Lets every worker of a cluster (cluster.py) serve a tenant's record
+reads, not only the worker that owns the tenant.
+
+The owner (owner_index()) still handles every write. Each tenant it owns
+keeps a Journal of the record lists the tenant modified: for every
+TableOverlay (state/columnar.py), the rows that changed, were deleted or
+were added, keyed by table row number or insertion sequence and ordered
+by the version of their last change. Every change also bumps the
+tenant's slot on the epoch board, a file of 64-bit counters mapped into
+every worker's memory.
+
+A worker serving a read for a tenant it does not own first compares the
+tenant's slot with the value it last synced at (sync()). If it moved, it
+asks the owner over a Unix socket for the journal entries newer than the
+version it holds and applies them to its own overlays. A change is on
+the board before the owner answers the write that made it, so a read
+sent after a write's response sees that write, as in single-process
+mode; a read racing a write may or may not see it, as before.
+
+Row numbers only mean the same rows on the same baseline table. Tables
+carry the baseline generation they were installed in, which every worker
+advances in the same order (the front end fans captures and clears out
+to all workers); a replica on a different generation raises
+ReplicaMismatch and the front end retries the request on the owner.
+
+Only cluster workers call configure(); a single-process server has no
+journals and keeps plain record lists.
+"""
+import functools
+import mmap
+import os
+import pickle
+import socket
+import socketserver
+import struct
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+
+from salesforce_mock.state.columnar import ColumnTable, TableOverlay
+
+SLOTS_PER_WORKER = 1024
+EPOCH_FILE = 'epochs'
+_FRAME = struct.Struct('!Q')
+
+
+class ReplicaMismatch(Exception):
+    """This worker cannot serve the tenant's reads; its owner has to."""
+
+
+def owner_index(name, count):
+    """Index of the worker (of `count`) that owns tenant `name`."""
+    return zlib.crc32(name.encode('utf-8')) % count
+
+
+def socket_path(directory, index):
+    return os.path.join(directory, f'worker-{index}.sock')
+
+
+class EpochBoard:
+    """
+    One change counter per tenant slot, in a file every worker maps.
+
+    A tenant's slot is its hash modulo workers * SLOTS_PER_WORKER, so all
+    tenants in a slot have the same owner and each counter is written by
+    a single process.
+    """
+
+    def __init__(self, path, count):
+        self.slots = count * SLOTS_PER_WORKER
+        with open(path, 'r+b') as file:
+            self._map = mmap.mmap(file.fileno(), self.slots * 8)
+        self._counters = memoryview(self._map).cast('Q')
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create(path, count):
+        """Write a zeroed board for `count` workers."""
+        with open(path, 'wb') as file:
+            file.truncate(count * SLOTS_PER_WORKER * 8)
+
+    def _slot(self, name):
+        return zlib.crc32(name.encode('utf-8')) % self.slots
+
+    def read(self, name):
+        return self._counters[self._slot(name)]
+
+    def bump(self, name):
+        slot = self._slot(name)
+        with self._lock:
+            self._counters[slot] += 1
+
+
+# =====================================================================
+# OWNER: journals and the socket that serves them
+# =====================================================================
+
+class Journal:
+    """Changes to one owned tenant's record lists since it was created or reset."""
+
+    def __init__(self, name, board):
+        self.name = name
+        self.token = uuid.uuid4().hex
+        self.version = 0
+        self._board = board
+        self._entries = OrderedDict()   # (object name, key) -> (version, row or None)
+        self._tables = {}               # object name -> (version, generation, table length)
+        self._lock = threading.Lock()
+
+    def track(self, object_name, overlay):
+        """Journal every change to `overlay`, the tenant's new list for `object_name`."""
+        with self._lock:
+            self._forget_object(object_name)
+            self.version += 1
+            self._tables[object_name] = (self.version, overlay.table.generation, len(overlay.table))
+            overlay.on_change = functools.partial(self.record, object_name, self.version)
+        self._board.bump(self.name)
+
+    def untrack(self, object_name):
+        """The tenant dropped its list for `object_name` (back to the baseline)."""
+        with self._lock:
+            self._forget_object(object_name)
+            self.version += 1
+        self._board.bump(self.name)
+
+    def record(self, object_name, tracked, key, row):
+        """on_change callback of the overlay tracked at version `tracked`."""
+        with self._lock:
+            if self._tables.get(object_name, (None,))[0] != tracked:
+                return  # a list the tenant has since replaced or dropped
+            self.version += 1
+            entry = (object_name, key)
+            self._entries[entry] = (self.version, row)
+            self._entries.move_to_end(entry)
+        self._board.bump(self.name)
+
+    def reset(self):
+        """The tenant dropped all of its lists: replicas start over."""
+        with self._lock:
+            self.token = uuid.uuid4().hex
+            self.version += 1
+            self._entries.clear()
+            self._tables.clear()
+        self._board.bump(self.name)
+
+    def changes(self, token, since):
+        """Entries newer than version `since` (all of them if `token` is stale)."""
+        with self._lock:
+            if token != self.token:
+                since = 0
+            changes = []
+            for (object_name, key), (version, row) in reversed(self._entries.items()):
+                if version <= since:
+                    break
+                changes.append((object_name, key, None if row is None else dict(row)))
+            changes.reverse()
+            return {
+                'token': self.token,
+                'version': self.version,
+                'tables': dict(self._tables),
+                'changes': changes,
+            }
+
+    def _forget_object(self, object_name):
+        self._tables.pop(object_name, None)
+        for entry in [entry for entry in self._entries if entry[0] == object_name]:
+            del self._entries[entry]
+
+
+def _send(file, payload):
+    data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    file.write(_FRAME.pack(len(data)) + data)
+    file.flush()
+
+
+def _receive(file):
+    """The next message; raises EOFError once the peer closes the connection."""
+    head = file.read(_FRAME.size)
+    if len(head) < _FRAME.size:
+        raise EOFError
+    (length,) = _FRAME.unpack(head)
+    data = file.read(length)
+    if len(data) < length:
+        raise EOFError
+    return pickle.loads(data)
+
+
+class _JournalHandler(socketserver.StreamRequestHandler):
+    """Answers (tenant, token, version) requests from one replica connection."""
+
+    def handle(self):
+        while True:
+            try:
+                name, token, since = _receive(self.rfile)
+            except EOFError:
+                return
+            journal = _journals.get(name)
+            _send(self.wfile, journal.changes(token, since) if journal else None)
+
+
+class _JournalServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+# =====================================================================
+# REPLICA: syncing tenants from their owners
+# =====================================================================
+
+class _Replica:
+    """What a replica has applied of one tenant's journal."""
+
+    def __init__(self):
+        self.token = None
+        self.version = 0
+        self.epoch = None
+        self.tables = {}
+        self.lock = threading.Lock()
+
+
+class _Connections(threading.local):
+    """Each thread's connections to the owners' journal sockets."""
+
+    def __init__(self):
+        self.files = {}
+
+    def fetch(self, owner, request):
+        for attempt in range(2):
+            file = self.files.get(owner)
+            try:
+                if file is None:
+                    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    connection.connect(socket_path(_cluster['directory'], owner))
+                    file = self.files[owner] = connection.makefile('rwb')
+                _send(file, request)
+                return _receive(file)
+            except (OSError, EOFError) as exc:
+                self.files.pop(owner, None)
+                if file is not None:
+                    file.close()
+                if attempt:
+                    raise ReplicaMismatch(f'Worker {owner} is not available: {exc}') from exc
+
+
+_cluster = {}         # index, count, directory, board; set by configure()
+_journals = {}        # tenant name -> Journal, for the tenants this worker owns
+_journals_lock = threading.Lock()
+_replicas = {}        # tenant name -> _Replica, for the tenants it does not
+_replicas_lock = threading.Lock()
+_connections = _Connections()
+
+
+def configure(index, count, directory):
+    """
+    Make this process worker `index` of `count`, sharing the epoch board and
+    journal sockets in `directory`, and start serving its journals.
+    """
+    _cluster.update(
+        index=index, count=count, directory=directory,
+        board=EpochBoard(os.path.join(directory, EPOCH_FILE), count),
+    )
+    server = _JournalServer(socket_path(directory, index), _JournalHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def is_replica(name):
+    """True if this is a cluster worker that does not own tenant `name`."""
+    return bool(_cluster) and owner_index(name, _cluster['count']) != _cluster['index']
+
+
+def journal_for(name):
+    """A new Journal for tenant `name` if this worker owns it, else None."""
+    if not _cluster or is_replica(name):
+        return None
+    journal = Journal(name, _cluster['board'])
+    with _journals_lock:
+        _journals[name] = journal
+    return journal
+
+
+def forget(journal):
+    """The owner dropped the tenant: its replicas go back to the baseline."""
+    with _journals_lock:
+        if _journals.get(journal.name) is journal:
+            del _journals[journal.name]
+    journal.reset()
+
+
+def sync(tenant, baseline):
+    """
+    Bring this worker's copy of a tenant it does not own up to date with
+    the owner before serving a read. `baseline` is the shared baseline map.
+    """
+    name = tenant.name
+    replica = _replicas.get(name)
+    if replica is None:
+        with _replicas_lock:
+            replica = _replicas.setdefault(name, _Replica())
+    epoch = _cluster['board'].read(name)
+    if replica.epoch == epoch:
+        return
+    with replica.lock:
+        if replica.epoch == epoch:
+            return
+        owner = owner_index(name, _cluster['count'])
+        reply = _connections.fetch(owner, (name, replica.token, replica.version))
+        try:
+            _apply(tenant, replica, reply, baseline)
+        except ReplicaMismatch:
+            tenant.data.clear()
+            replica.token, replica.version, replica.tables = None, 0, {}
+            raise
+        replica.epoch = epoch
+
+
+def _apply(tenant, replica, reply, baseline):
+    data = tenant.data
+    if reply is None or reply['token'] != replica.token:
+        data.clear()
+        replica.tables = {}
+    if reply is None:
+        replica.token, replica.version = None, 0
+        return
+
+    tables = reply['tables']
+    for object_name in list(data):
+        if tables.get(object_name) != replica.tables.get(object_name):
+            del data[object_name]
+    for object_name, header in tables.items():
+        if object_name not in data:
+            data[object_name] = _overlay(object_name, header, baseline)
+    for object_name, key, row in reply['changes']:
+        data[object_name].apply(key, row)
+    replica.token, replica.version, replica.tables = reply['token'], reply['version'], tables
+
+
+def _overlay(object_name, header, baseline):
+    """An empty overlay over the same table as the owner's list."""
+    _, generation, length = header
+    if generation is None and length == 0:
+        return TableOverlay(ColumnTable([]))
+    table = baseline.get(object_name)
+    if not isinstance(table, ColumnTable) or (table.generation, len(table)) != (generation, length):
+        raise ReplicaMismatch(f'{object_name} baseline differs from the owning worker')
+    return TableOverlay(table)
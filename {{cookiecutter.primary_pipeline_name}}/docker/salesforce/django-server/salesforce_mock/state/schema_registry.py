@@ -0,0 +1,316 @@
+"""
+Schema Registry
+===============
+Owns the schema definitions and everything compiled from them.
+
+Schemas come from SCHEMA_DIR/*.json (loaded at startup by apps.py) plus
+any uploaded through POST /__admin/schemas. Each load compiles a
+CompiledSchemas snapshot: parent/child relationship maps, describe
+payloads, the Id prefix -> object map and external-ID field lists.
+Snapshots are never modified; a reload builds a new one off to the side
+and swaps it in with a single reference assignment, so requests keep
+running against the old version until the new one is complete.
+
+The shared `schemas` map (state/database.py), which many modules read
+directly, is swapped to the new definitions the same way: it is a
+SnapshotMap whose dict is replaced, never modified, so a request
+iterating it during a reload keeps the version it started with.
+Records are never touched; a reload keeps all tenant state.
+
+With SCHEMA_WATCH_INTERVAL > 0 (seconds, default 2) a daemon thread polls
+SCHEMA_DIR and reloads when a *.json file is added, changed or removed.
+
+Exports: registry (SchemaRegistry singleton), CompiledSchemas, relationship_name()
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from salesforce_mock.state.database import install_schemas
+
+logger = logging.getLogger('salesforce_mock')
+
+WATCH_INTERVAL = float(os.environ.get('SCHEMA_WATCH_INTERVAL', '2'))
+
+
+def relationship_name(field, spec):
+    """Parent relationship name of a reference field: AccountId -> Account, Custom__c -> Custom__r."""
+    if spec.get('relationshipName'):
+        return spec['relationshipName']
+    if field.endswith('__c'):
+        return field[:-3] + '__r'
+    if field.endswith('Id') and len(field) > 2:
+        return field[:-2]
+    return field
+
+
+def validate_schema(schema):
+    """Raise ValueError unless `schema` looks like a schemas/*.json definition."""
+    if not isinstance(schema, dict):
+        raise ValueError('Schema must be a JSON object')
+    if not isinstance(schema.get('name'), str) or not schema['name']:
+        raise ValueError("Schema is missing 'name'")
+    if not isinstance(schema.get('idPrefix'), str) or len(schema['idPrefix']) != 3:
+        raise ValueError(f"Schema {schema['name']}: 'idPrefix' must be a 3-character string")
+    if not isinstance(schema.get('fields', {}), dict):
+        raise ValueError(f"Schema {schema['name']}: 'fields' must be an object")
+    for field, spec in schema.get('fields', {}).items():
+        if not isinstance(spec, dict):
+            raise ValueError(f"Schema {schema['name']}: field '{field}' must be an object")
+
+
+# =====================================================================
+# COMPILED ARTIFACTS
+# =====================================================================
+
+class CompiledSchemas:
+    """Read-only artifacts derived from one version of the schemas."""
+
+    def __init__(self, definitions, version):
+        self.version = version
+        self.loaded_at = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        self.schemas = definitions
+        self.parents = {name: _parent_relationships(schema) for name, schema in definitions.items()}
+        self.children = _child_relationships(definitions)
+        self.prefixes = {
+            schema['idPrefix']: name
+            for name, schema in definitions.items() if schema.get('idPrefix')
+        }
+        self.external_id_fields = {
+            name: tuple(
+                field for field, spec in schema.get('fields', {}).items()
+                if spec.get('externalId') or spec.get('idLookup')
+            )
+            for name, schema in definitions.items()
+        }
+        self.describes = {name: self._describe(name, schema) for name, schema in definitions.items()}
+
+    def _describe(self, object_name, schema):
+        """Version-independent part of the describe response (urls are added per request)."""
+        label = schema.get('label', object_name)
+        fields = [{
+            'name': 'Id',
+            'type': 'id',
+            'label': f'{label} ID',
+            'length': 18,
+            'updateable': False,
+            'createable': False,
+            'nillable': False,
+            'queryable': True,
+            'filterable': True,
+            'externalId': False,
+            'idLookup': True,
+            'picklistValues': [],
+        }]
+        for name, field_def in schema.get('fields', {}).items():
+            picklist_values = [
+                {
+                    'value': v,
+                    'label': v,
+                    'active': True,
+                    'defaultValue': i == 0 and field_def.get('required', False),
+                }
+                for i, v in enumerate(field_def.get('values', []))
+            ]
+            fields.append({
+                'name': name,
+                'type': field_def.get('type', 'string'),
+                'label': field_def.get('label', name),
+                'length': field_def.get('maxLength', 18 if field_def.get('type') == 'id' else 0),
+                'precision': field_def.get('precision', 0),
+                'scale': field_def.get('scale', 0),
+                'digits': field_def.get('digits', 0),
+                'updateable': field_def.get('updateable', True) is not False,
+                'createable': field_def.get('createable', True) is not False,
+                'nillable': not field_def.get('required', False),
+                'queryable': True,
+                'filterable': True,
+                'externalId': bool(field_def.get('externalId')),
+                'idLookup': bool(field_def.get('externalId') or field_def.get('idLookup')),
+                'referenceTo': field_def.get('referenceTo', []),
+                'relationshipName': (
+                    relationship_name(name, field_def) if field_def.get('type') == 'reference' else None
+                ),
+                'picklistValues': picklist_values,
+            })
+
+        return {
+            'name': schema['name'],
+            'label': label,
+            'labelPlural': schema.get('labelPlural', label + 's'),
+            'keyPrefix': schema.get('keyPrefix', schema.get('idPrefix', '')),
+            'fields': fields,
+            'childRelationships': [
+                {'childSObject': child, 'field': field, 'relationshipName': rel_name}
+                for child, field, rel_name in self.children.get(object_name, {}).values()
+            ],
+            'createable': True,
+            'updateable': True,
+            'deletable': True,
+            'queryable': True,
+            'searchable': True,
+        }
+
+
+def _parent_relationships(schema):
+    """{ 'account': ('AccountId', ('Account',)) } for one object."""
+    relationships = {}
+    for field, spec in schema.get('fields', {}).items():
+        if spec.get('type') != 'reference' or not spec.get('referenceTo'):
+            continue
+        relationships[relationship_name(field, spec).lower()] = (field, tuple(spec['referenceTo']))
+    return relationships
+
+
+def _child_relationships(definitions):
+    """{ parent: { 'contacts': ('Contact', 'AccountId', 'Contacts') } } for all objects."""
+    relationships = {}
+    for child_name, schema in definitions.items():
+        for field, spec in schema.get('fields', {}).items():
+            if spec.get('type') != 'reference':
+                continue
+            name = (
+                spec.get('childRelationshipName')
+                or schema.get('labelPlural', f'{child_name}s').replace(' ', '')
+            )
+            for parent in spec.get('referenceTo') or ():
+                relationships.setdefault(parent, {}).setdefault(
+                    name.lower(), (child_name, field, name)
+                )
+    return relationships
+
+
+# =====================================================================
+# REGISTRY
+# =====================================================================
+
+class SchemaRegistry:
+    """Loads, compiles and hot-swaps schema versions."""
+
+    def __init__(self):
+        self._compiled = CompiledSchemas({}, 0)
+        self._lock = threading.Lock()   # serializes reloads, never held by readers
+        self._from_dir = {}             # object name -> schema loaded from SCHEMA_DIR
+        self._uploaded = {}             # object name -> schema uploaded via the admin API
+        self._fingerprint = None
+        self._watcher = None
+        self.schema_dir = None
+        self.last_error = None
+
+    @property
+    def compiled(self):
+        """The current CompiledSchemas snapshot."""
+        return self._compiled
+
+    def load_dir(self, schema_dir):
+        """
+        (Re)load every *.json file in `schema_dir`. Files that fail to parse
+        are reported and skipped; the rest are swapped in as a new version.
+        Returns (loaded schemas, {file name: error}).
+        """
+        with self._lock:
+            self.schema_dir = schema_dir
+            self._fingerprint = self._scan()
+            loaded, errors = {}, {}
+            for file in sorted(Path(schema_dir).glob('*.json')):
+                try:
+                    with open(file, 'r') as f:
+                        schema = json.load(f)
+                    validate_schema(schema)
+                    loaded[schema['name']] = schema
+                except Exception as e:
+                    errors[file.name] = str(e)
+            self._from_dir = loaded
+            self.last_error = errors or None
+            self._install()
+        return loaded, errors
+
+    def reload(self):
+        """Reload SCHEMA_DIR (keeps uploaded schemas). Returns the new version."""
+        if self.schema_dir:
+            self.load_dir(self.schema_dir)
+        return self._compiled.version
+
+    def upload(self, definitions):
+        """
+        Add or replace schemas (one definition or a list). Raises ValueError
+        if any is invalid, in which case nothing is changed.
+        Returns the object names installed.
+        """
+        if isinstance(definitions, dict):
+            definitions = [definitions]
+        if not isinstance(definitions, list) or not definitions:
+            raise ValueError('Request body must be a schema object or a list of schemas')
+        for schema in definitions:
+            validate_schema(schema)
+        with self._lock:
+            for schema in definitions:
+                self._uploaded[schema['name']] = schema
+            self._install()
+        return [schema['name'] for schema in definitions]
+
+    def status(self):
+        """Version information for GET /__admin/schemas/registry."""
+        compiled = self._compiled
+        return {
+            'version': compiled.version,
+            'loadedAt': compiled.loaded_at,
+            'objects': len(compiled.schemas),
+            'schemaDir': self.schema_dir,
+            'uploaded': sorted(self._uploaded),
+            'watching': self._watcher is not None,
+            'errors': self.last_error,
+        }
+
+    def _install(self):
+        """Compile the merged definitions and swap them in (caller holds _lock)."""
+        definitions = {**self._from_dir, **self._uploaded}
+        compiled = CompiledSchemas(definitions, self._compiled.version + 1)
+
+        self._compiled = compiled
+        install_schemas(compiled.schemas)
+
+    # -----------------------------------------------------------------
+    # File watching
+    # -----------------------------------------------------------------
+
+    def start_watching(self, interval=WATCH_INTERVAL):
+        """Poll SCHEMA_DIR every `interval` seconds and reload on changes."""
+        if interval <= 0 or self._watcher is not None or not self.schema_dir:
+            return
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name='schema-watcher', daemon=True,
+        )
+        self._watcher.start()
+
+    def _scan(self):
+        """(name, mtime, size) of every schema file; changes when any file does."""
+        path = Path(self.schema_dir)
+        if not path.exists():
+            return ()
+        fingerprint = []
+        for file in sorted(path.glob('*.json')):
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            fingerprint.append((file.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+
+    def _watch(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                if self._scan() != self._fingerprint:
+                    version = self.reload()
+                    logger.info('Schemas reloaded from %s (version %d)', self.schema_dir, version)
+            except Exception:
+                logger.exception('Schema reload failed')
+
+
+# Module-level singleton
+registry = SchemaRegistry()
@@ -0,0 +1,48 @@
+"""
+Operation Counters
+==================
+Cheap in-memory counters for record operations.
+
+Replaces the per-record print() calls in the REST and bulk views: each
+operation increments a counter (object, operation) instead of writing a
+line to stdout. Counts are exposed via GET /__admin/stats and cleared by
+POST /__admin/reset.
+"""
+import threading
+from collections import Counter
+
+from salesforce_mock.state.tenants import TenantLocal
+
+
+class OperationStats:
+    """Thread-safe counters keyed by (object_name, operation)."""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def incr(self, object_name, operation, amount=1):
+        """Add `amount` to the counter for object_name/operation."""
+        if amount:
+            with self._lock:
+                self._counts[(object_name, operation)] += amount
+
+    def snapshot(self):
+        """Return counts grouped by object: { 'Account': { 'create': 3 } }."""
+        with self._lock:
+            items = list(self._counts.items())
+        result = {}
+        for (object_name, operation), count in sorted(items):
+            result.setdefault(object_name, {})[operation] = count
+        return result
+
+    def clear(self):
+        """Reset all counters. Returns the total number of operations cleared."""
+        with self._lock:
+            total = sum(self._counts.values())
+            self._counts.clear()
+        return total
+
+
+# Module-level singleton (per tenant, see state/tenants.py)
+op_stats = TenantLocal('op_stats', OperationStats)
@@ -0,0 +1,207 @@
+"""
+Mock Tenants
+============
+Isolated state for parallel test suites sharing one mock server.
+
+Every request runs as a tenant, chosen by TenantMiddleware from the
+X-Mock-Tenant header or from the tenant encoded in the OAuth token
+(see rest_views.oauth_token). Requests without either use the 'default'
+tenant, which behaves exactly like the former single global state.
+
+Each tenant sees the shared baseline records (state/database.py) through
+a copy-on-write view: the first time a mutating request (POST/PUT/PATCH/
+DELETE) touches an object, the tenant gets its own record list for it --
+a TableOverlay (state/columnar.py) over a captured baseline, holding only
+the rows the tenant changes, deletes or adds -- so tenants never see each
+other's writes and baseline rows are never copied wholesale. Bulk jobs, platform events and operation counters are
+tenant-local as well (TenantLocal).
+
+Resetting a tenant drops its clones and tenant-local state, which
+restores the baseline for that tenant only.
+
+In a cluster, the worker that owns a tenant journals every change to its
+record lists (Tenant.journal) so the other workers can serve its reads
+from their own copies (state/replication.py). Owned tenants then use a
+TableOverlay for every object, including ones with no baseline table.
+"""
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from salesforce_mock.state import replication
+from salesforce_mock.state.columnar import ColumnTable, TableOverlay
+
+DEFAULT_TENANT = 'default'
+TENANT_NAME_PATTERN = re.compile(r'^[\w-]{1,64}$')
+# Tenant-scoped tokens look like 00D000000000000!mock.tenant.<name>.<ts>.<suffix>
+TENANT_TOKEN = re.compile(r'!mock\.tenant\.([\w-]{1,64})\.')
+
+_current_tenant = ContextVar('mock_tenant', default=DEFAULT_TENANT)
+# False while serving read-only requests: reads then use the baseline
+# lists instead of cloning them into the tenant.
+_writable = ContextVar('mock_tenant_writable', default=True)
+
+
+class Tenant:
+    """One tenant's cloned objects and tenant-local singletons."""
+
+    def __init__(self, name):
+        self.name = name
+        self.data = {}      # object name -> cloned record list
+        self._locals = {}   # TenantLocal key -> instance
+        self._lock = threading.Lock()
+        # Set on the cluster worker that owns the tenant (state/replication.py)
+        self.journal = replication.journal_for(name)
+
+    def clone(self, name, records):
+        """
+        This tenant's writable list for `records`, made once: an overlay for
+        a baseline ColumnTable, otherwise a copy (records are never shared).
+        """
+        with self._lock:
+            if name not in self.data:
+                if isinstance(records, ColumnTable):
+                    self._install(name, TableOverlay(records))
+                elif self.journal is not None:
+                    self._install(name, TableOverlay(ColumnTable(records)))
+                else:
+                    self.data[name] = [dict(record) for record in records]
+            return self.data[name]
+
+    def replace(self, name, records):
+        """Make `records` this tenant's list for object `name`."""
+        with self._lock:
+            if self.journal is None:
+                self.data[name] = records
+                return
+            overlay = TableOverlay(ColumnTable([]))
+            self._install(name, overlay)
+            overlay.extend(records)
+
+    def discard(self, name):
+        """Drop this tenant's list for object `name` (back to the baseline)."""
+        with self._lock:
+            if self.data.pop(name, None) is not None and self.journal is not None:
+                self.journal.untrack(name)
+
+    def reset_data(self):
+        """Drop every cloned object (back to the baseline)."""
+        with self._lock:
+            self._reset_data()
+
+    def _install(self, name, overlay):
+        self.data[name] = overlay
+        if self.journal is not None:
+            self.journal.track(name, overlay)
+
+    def _reset_data(self):
+        self.data.clear()
+        if self.journal is not None:
+            self.journal.reset()
+
+    def local(self, key, factory):
+        """Tenant-local instance for `key`, created on first use."""
+        with self._lock:
+            if key not in self._locals:
+                self._locals[key] = factory()
+            return self._locals[key]
+
+    def reset(self):
+        """Drop cloned objects and tenant-local state."""
+        with self._lock:
+            self._reset_data()
+            self._locals.clear()
+
+
+_tenants = {}
+_tenants_lock = threading.Lock()
+
+
+def get_tenant(name=None):
+    """Return the named tenant (default: the current one), creating it if needed."""
+    name = name or _current_tenant.get()
+    tenant = _tenants.get(name)
+    if tenant is None:
+        with _tenants_lock:
+            tenant = _tenants.get(name)
+            if tenant is None:
+                tenant = _tenants[name] = Tenant(name)
+    return tenant
+
+
+def list_tenants():
+    """
+    Names of all tenants created so far (in a cluster worker, the ones it
+    owns; it only holds copies of the others).
+    """
+    return sorted(name for name in list(_tenants) if not replication.is_replica(name))
+
+
+def drop_tenant(name):
+    """Forget a tenant entirely. Returns False if it did not exist."""
+    with _tenants_lock:
+        tenant = _tenants.pop(name, None)
+    if tenant is not None and tenant.journal is not None:
+        replication.forget(tenant.journal)
+    return tenant is not None
+
+
+def activate(name, writable=True):
+    """Run the rest of the current request (or thread) as tenant `name`."""
+    _current_tenant.set(name or DEFAULT_TENANT)
+    _writable.set(writable)
+
+
+def is_writable():
+    """True unless the current request is read-only."""
+    return _writable.get()
+
+
+@contextmanager
+def read_only():
+    """
+    Treat record access inside the block as read-only, e.g. a query run
+    by a POST that creates a bulk query job: objects the tenant has not
+    modified are then read from the baseline instead of cloned.
+    """
+    token = _writable.set(False)
+    try:
+        yield
+    finally:
+        _writable.reset(token)
+
+
+def requested_tenant(headers):
+    """
+    Tenant named by a request's headers: X-Mock-Tenant (returned as sent,
+    validate with valid_tenant_name), else the tenant in the session token
+    (Authorization or X-SFDC-Session), else the default tenant.
+    """
+    name = headers.get('X-Mock-Tenant')
+    if name is not None:
+        return name
+    token = headers.get('Authorization') or headers.get('X-SFDC-Session') or ''
+    match = TENANT_TOKEN.search(token)
+    return match.group(1) if match else DEFAULT_TENANT
+
+
+def valid_tenant_name(name):
+    return bool(name) and bool(TENANT_NAME_PATTERN.match(name))
+
+
+class TenantLocal:
+    """
+    Proxy to a per-tenant instance of a state singleton.
+
+    Attribute access is forwarded to the current tenant's instance, built
+    with `factory` on first use, so existing `job_store.create(...)` style
+    call sites become tenant-aware without changes.
+    """
+
+    def __init__(self, key, factory):
+        self._key = key
+        self._factory = factory
+
+    def __getattr__(self, name):
+        return getattr(get_tenant().local(self._key, self._factory), name)
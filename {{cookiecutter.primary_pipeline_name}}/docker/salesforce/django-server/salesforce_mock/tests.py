@@ -0,0 +1,310 @@
+"""
+Salesforce Mock API Server -- endpoint tests
+============================================
+
+Run from the django-server directory with the bundled schemas:
+
+    SCHEMA_DIR=schemas python manage.py test salesforce_mock
+
+The tests only use Django's test client (no database is configured, so
+every case is a SimpleTestCase) and reset the mock before each test.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import Client, SimpleTestCase
+
+from salesforce_mock.services.soql_executor import execute_query
+from salesforce_mock.parsers.soql_parser import parse_soql
+from salesforce_mock.state.columnar import ColumnTable, TableOverlay
+from salesforce_mock.state.database import baseline, schemas
+from salesforce_mock.state.replication import EPOCH_FILE, EpochBoard, Journal
+from salesforce_mock.state.tenants import get_tenant
+from salesforce_mock.state.schema_registry import registry
+from salesforce_mock.views import bulk_v1_views
+
+V1_JOB = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<jobInfo xmlns="http://www.force.com/2009/06/asyncapi/dataload">'
+    '<operation>{operation}</operation><object>Account</object>'
+    '<contentType>{content_type}</contentType>'
+    '</jobInfo>'
+)
+
+
+class RequestDecompressionTests(SimpleTestCase):
+    """Content-Encoding: gzip / deflate request bodies."""
+
+    def setUp(self):
+        self.client.post('/__admin/reset')
+
+    def _post_gzip(self, body):
+        return self.client.post(
+            '/services/data/v59.0/sobjects/Account',
+            data=body,
+            content_type='application/json',
+            headers={'Content-Encoding': 'gzip'},
+        )
+
+    def test_concatenated_gzip_members(self):
+        payload = json.dumps({'Name': 'Acme Corporation'}).encode()
+        body = gzip.compress(payload[:12]) + gzip.compress(payload[12:])
+
+        response = self._post_gzip(body)
+
+        self.assertEqual(response.status_code, 201)
+        record = self.client.get(f"/services/data/v59.0/sobjects/Account/{response.json()['id']}").json()
+        self.assertEqual(record['Name'], 'Acme Corporation')
+
+    def test_truncated_gzip_is_rejected(self):
+        body = gzip.compress(json.dumps({'Name': 'Acme'}).encode())[:-6]
+
+        self.assertEqual(self._post_gzip(body).status_code, 400)
+
+    def test_inflated_size_is_capped(self):
+        # Middleware reads the limit when it is loaded, so use a fresh client
+        with self.settings(MAX_DECOMPRESSED_BODY_SIZE=1000):
+            self.client = Client()
+            response = self._post_gzip(gzip.compress(b' ' * 100000))
+
+        self.assertEqual(response.status_code, 413)
+
+
+class SchemaRegistryTests(SimpleTestCase):
+    """Schema uploads and reloads while requests read the schemas."""
+
+    def test_upload_while_iterating_schemas(self):
+        seen = []
+        for i, name in enumerate(schemas):
+            if i == 0:
+                registry.upload({'name': 'RegistryTest__c', 'idPrefix': 'a0T', 'fields': {}})
+            seen.append(name)
+
+        self.assertNotIn('RegistryTest__c', seen)
+        self.assertIn('RegistryTest__c', schemas)
+        self.assertIn('RegistryTest__c', baseline)
+        self.assertIs(schemas.current(), registry.compiled.schemas)
+
+    def test_upload_requires_id_prefix(self):
+        for id_prefix in (None, 'a0', 123):
+            schema = {'name': 'NoPrefix__c', 'fields': {}}
+            if id_prefix is not None:
+                schema['idPrefix'] = id_prefix
+
+            response = self.client.post('/__admin/schemas', data=json.dumps(schema), content_type='application/json')
+
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('idPrefix', response.json()['error'])
+        self.assertNotIn('NoPrefix__c', schemas)
+
+
+class TenantOverlayTests(SimpleTestCase):
+    """Tenant writes on top of a captured baseline."""
+
+    def setUp(self):
+        self.client.delete('/__admin/baseline')
+        self.client.post('/__admin/reset')
+        self.ids = [self._post({'Name': f'Account {i}'}).json()['id'] for i in range(5)]
+        self.client.post('/__admin/baseline')
+        self.addCleanup(self.client.delete, '/__admin/baseline')
+
+    def _post(self, record, tenant='default'):
+        return self.client.post(
+            '/services/data/v59.0/sobjects/Account', data=json.dumps(record),
+            content_type='application/json', headers={'X-Mock-Tenant': tenant},
+        )
+
+    def _names(self, tenant):
+        response = self.client.get('/__admin/db/Account', headers={'X-Mock-Tenant': tenant})
+        return sorted(record['Name'] for record in response.json()['records'])
+
+    def test_tenant_keeps_only_its_changes(self):
+        url = '/services/data/v59.0/sobjects/Account/'
+        headers = {'X-Mock-Tenant': 'overlay'}
+        self.client.patch(url + self.ids[1], data=json.dumps({'Name': 'Renamed'}),
+                          content_type='application/json', headers=headers)
+        self.client.delete(url + self.ids[3], headers=headers)
+        self._post({'Name': 'Added'}, tenant='overlay')
+
+        records = get_tenant('overlay').data['Account']
+        self.assertIsInstance(records, TableOverlay)
+        self.assertEqual((len(records._changed), len(records._deleted), len(records._added)), (1, 1, 1))
+        self.assertEqual(self._names('overlay'), ['Account 0', 'Account 2', 'Account 4', 'Added', 'Renamed'])
+        self.assertEqual(self._names('default'), [f'Account {i}' for i in range(5)])
+
+
+class ReplicationTests(SimpleTestCase):
+    """Copies of a tenant's records kept in step with the owner's journal."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, EPOCH_FILE)
+        EpochBoard.create(path, 1)
+        self.board = EpochBoard(path, 1)
+        self.table = ColumnTable([{'Id': str(i), 'Name': f'Account {i}'} for i in range(5)], generation=1)
+
+    def _sync(self, replica, journal, token=None, since=0):
+        reply = journal.changes(token, since)
+        for _, key, row in reply['changes']:
+            replica.apply(key, row)
+        return reply
+
+    def test_replica_applies_owner_changes(self):
+        journal = Journal('suite-a', self.board)
+        owner, replica = TableOverlay(self.table), TableOverlay(self.table)
+        journal.track('Account', owner)
+        owner[1]['Name'] = 'Renamed'
+        del owner[3]
+        owner.append({'Id': '5', 'Name': 'Added'})
+        reply = self._sync(replica, journal)
+        epoch = self.board.read('suite-a')
+
+        owner[-1]['Name'] = 'Added again'
+        owner.pop(0)
+        later = self._sync(replica, journal, reply['token'], reply['version'])
+
+        self.assertGreater(self.board.read('suite-a'), epoch)
+        self.assertEqual(len(later['changes']), 2)
+        self.assertEqual(list(replica), list(owner))
+        self.assertEqual([row['Name'] for row in replica], ['Renamed', 'Account 2', 'Account 4', 'Added again'])
+
+        journal.reset()
+        self.assertEqual(journal.changes(later['token'], later['version'])['tables'], {})
+
+
+class AggregateQueryTests(SimpleTestCase):
+    """SOQL aggregate functions over the in-memory records."""
+
+    def test_sum_of_integer_strings_is_an_int(self):
+        records = [{'Amount': '2'}, {'Amount': 3}, {'Amount': ''}]
+
+        rows = execute_query(parse_soql('SELECT SUM(Amount) FROM Opportunity'), records=records)
+
+        self.assertEqual(rows[0]['SUM(Amount)'], 5)
+        self.assertIsInstance(rows[0]['SUM(Amount)'], int)
+
+    def test_min_max_of_number_strings(self):
+        records = [{'Amount': '9'}, {'Amount': '10'}, {'Amount': 2.5}, {'Amount': None}]
+
+        rows = execute_query(parse_soql('SELECT MIN(Amount), MAX(Amount) FROM Opportunity'), records=records)
+
+        self.assertEqual(rows[0]['MIN(Amount)'], 2.5)
+        self.assertEqual(rows[0]['MAX(Amount)'], 10)
+
+    def test_min_max_of_datetimes(self):
+        records = [
+            {'StartDateTime': '2024-03-01T09:00:00.000+0000'},
+            {'StartDateTime': '2024-03-01T08:00:00Z'},
+            {'StartDateTime': '2024-03-01T10:00:00.000+0200'},
+        ]
+
+        rows = execute_query(
+            parse_soql('SELECT MIN(StartDateTime), MAX(StartDateTime) FROM Event'), records=records,
+        )
+
+        self.assertEqual(rows[0]['MIN(StartDateTime)'], '2024-03-01T08:00:00Z')
+        self.assertEqual(rows[0]['MAX(StartDateTime)'], '2024-03-01T09:00:00.000+0000')
+
+
+class BulkV1QueryTests(SimpleTestCase):
+    """Bulk API v1 query jobs and the admin views that list them."""
+
+    def setUp(self):
+        self.client.post('/__admin/reset')
+        for i in range(5):
+            response = self.client.post(
+                '/services/data/v59.0/sobjects/Account',
+                data=json.dumps({'Name': f'Account {i}'}),
+                content_type='application/json',
+            )
+            self.assertEqual(response.status_code, 201)
+
+    def _run_query(self, content_type='CSV', **headers):
+        """Create a v1 query job, add its batch and return (job_id, batch_id)."""
+        response = self.client.post(
+            '/services/async/59.0/job',
+            data=V1_JOB.format(operation='query', content_type=content_type),
+            content_type='application/xml',
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 201)
+        job_id = bulk_v1_views._xml_get(response.content.decode(), 'id')
+
+        response = self.client.post(
+            f'/services/async/59.0/job/{job_id}/batch',
+            data='SELECT Id, Name FROM Account',
+            content_type='text/csv',
+        )
+        self.assertEqual(response.status_code, 201)
+        batch_id = bulk_v1_views._xml_get(response.content.decode(), 'id')
+        return job_id, batch_id
+
+    def _result_ids(self, job_id, batch_id):
+        response = self.client.get(f'/services/async/59.0/job/{job_id}/batch/{batch_id}/result')
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content) if response['Content-Type'] == 'application/json' else [
+            item.split('</result>')[0] for item in response.content.decode().split('<result>')[1:]
+        ]
+
+    def _download(self, job_id, batch_id, result_id):
+        response = self.client.get(
+            f'/services/async/59.0/job/{job_id}/batch/{batch_id}/result/{result_id}'
+        )
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_admin_bulk_jobs_after_v1_query(self):
+        job_id, _ = self._run_query()
+
+        response = self.client.get('/__admin/bulk-jobs')
+
+        self.assertEqual(response.status_code, 200)
+        job = next(j for j in response.json()['jobs'] if j['id'] == job_id)
+        self.assertFalse([key for key in job if key.startswith('_')])
+        for batch in job['batches']:
+            self.assertFalse([key for key in batch if key.startswith('_')])
+
+    def test_query_result_streams_csv(self):
+        job_id, batch_id = self._run_query()
+
+        result_ids = self._result_ids(job_id, batch_id)
+        rows = list(csv.DictReader(io.StringIO(self._download(job_id, batch_id, result_ids[0]))))
+
+        self.assertEqual(len(result_ids), 1)
+        self.assertEqual(sorted(row['Name'] for row in rows), [f'Account {i}' for i in range(5)])
+
+    def test_query_results_split_by_size(self):
+        with mock.patch.object(bulk_v1_views, 'RESULT_MAX_BYTES', 100), \
+                mock.patch.object(bulk_v1_views, 'RESULT_BLOCK_ROWS', 2):
+            job_id, batch_id = self._run_query('JSON')
+            result_ids = self._result_ids(job_id, batch_id)
+            files = [json.loads(self._download(job_id, batch_id, result_id)) for result_id in result_ids]
+
+        self.assertGreater(len(result_ids), 1)
+        self.assertEqual(
+            sorted(record['Name'] for records in files for record in records),
+            [f'Account {i}' for i in range(5)],
+        )
+
+    def test_pk_chunk_batches_stream_their_range(self):
+        job_id, _ = self._run_query('JSON', **{'Sforce-Enable-PKChunking': 'chunkSize=2'})
+        jobs = self.client.get('/__admin/bulk-jobs').json()['jobs']
+        chunks = [b['id'] for b in next(j for j in jobs if j['id'] == job_id)['batches']
+                  if b['state'] == 'Completed']
+
+        names = [
+            record['Name']
+            for batch_id in chunks
+            for result_id in self._result_ids(job_id, batch_id)
+            for record in json.loads(self._download(job_id, batch_id, result_id))
+        ]
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(sorted(names), [f'Account {i}' for i in range(5)])
@@ -86,6 +86,8 @@ urlpatterns = [
     # ═══════════════════════════════════════════════════════════════
     # 5. BULK API v1 — /services/async/:version/job[/...]
     # ═══════════════════════════════════════════════════════════════
+    path(f'services/async/{V}/job/<str:job_id>/batch/<str:batch_id>/result/<str:result_id>',
+         bulk_v1_views.get_v1_query_result),
     path(f'services/async/{V}/job/<str:job_id>/batch/<str:batch_id>/result',
          bulk_v1_views.get_v1_batch_results),
     path(f'services/async/{V}/job/<str:job_id>/batch/<str:batch_id>',
@@ -118,6 +120,8 @@ urlpatterns = [
     # ═══════════════════════════════════════════════════════════════
     path(f'services/data/{V}/jobs/query/<str:job_id>/results',
          bulk_v2_query_views.get_query_results),
+    path(f'services/data/{V}/jobs/query/<str:job_id>/resultPages',
+         bulk_v2_query_views.get_query_result_pages),
     path(f'services/data/{V}/jobs/query/<str:job_id>',
          bulk_v2_query_views.query_job_detail),
     path(f'services/data/{V}/jobs/query',
@@ -143,9 +147,17 @@ urlpatterns = [
     # ═══════════════════════════════════════════════════════════════
     # 10. ADMIN + HEALTH — Last
     # ═══════════════════════════════════════════════════════════════
+    path('__admin/db/<str:object_name>/count', admin_views.admin_db_count),
     path('__admin/db/<str:object_name>', admin_views.admin_db_object),
     path('__admin/db', admin_views.admin_db),
     path('__admin/reset', admin_views.admin_reset),
+    path('__admin/undelete', admin_views.admin_undelete),
+    path('__admin/tenants/<str:tenant_name>', admin_views.admin_tenant),
+    path('__admin/tenants', admin_views.admin_tenants),
+    path('__admin/baseline', admin_views.admin_baseline),
+    path('__admin/stats', admin_views.admin_stats),
+    path('__admin/schemas/reload', admin_views.admin_schemas_reload),
+    path('__admin/schemas/registry', admin_views.admin_schemas_registry),
     path('__admin/schemas', admin_views.admin_schemas),
     path('__admin/bulk-jobs', admin_views.admin_bulk_jobs),
     path('__admin/events', admin_views.admin_events),
@@ -0,0 +1,31 @@
+"""
+Request Body Helpers
+====================
+Lazy, cached access to the decoded request body.
+
+Replaces the old RawBodyMiddleware, which decoded every CSV/XML body to a
+str up front even though views decoded request.body again themselves.
+Views now call get_raw_body() only when they need text, and the decode
+happens at most once per request.
+"""
+
+
+def get_raw_body(request):
+    """
+    Return the request body decoded as UTF-8 (empty string if no body).
+
+    The decoded text is cached on the request, so repeated calls (e.g. a
+    dispatcher and the view it routes to) share a single decode.
+
+    Args:
+        request: Django HttpRequest
+
+    Returns:
+        Decoded body text
+    """
+    text = getattr(request, '_raw_body_text', None)
+    if text is None:
+        body = request.body
+        text = body.decode('utf-8') if body else ''
+        request._raw_body_text = text
+    return text
@@ -10,23 +10,48 @@ they provide test introspection, database reset, and health monitoring.
 Routes:
     GET  /__admin/db                  - View all records grouped by object
     GET  /__admin/db/:object          - View records for a single object
-    POST /__admin/reset               - Reset all data (records, jobs, events)
+                                        (?limit, ?offset/?cursor, ?fields, ?where,
+                                         ?format=ndjson for streaming)
+    GET  /__admin/db/:object/count    - Count records (optionally ?where=...)
+    POST /__admin/reset               - Reset the tenant's data (records, jobs, events, counters)
+    POST /__admin/undelete            - Restore deleted records from the recycle bin
+    GET  /__admin/tenants             - List tenants and the objects each has modified
+    DELETE /__admin/tenants/:name     - Drop a tenant's state entirely
+    GET/POST/DELETE /__admin/baseline - View / capture / clear the shared seed records
+    GET  /__admin/stats               - Record operation counters per object
     GET  /__admin/schemas             - View loaded schema definitions
+    POST /__admin/schemas             - Upload schema definitions (hot, no restart)
+    POST /__admin/schemas/reload      - Reload SCHEMA_DIR
+    GET  /__admin/schemas/registry    - Schema version, load time and errors
     GET  /__admin/bulk-jobs           - View all bulk API jobs
     GET  /__admin/events              - View all platform events
     GET  /__admin/streaming-clients   - View CometD client sessions
     GET  /__admin/health              - Simple health check
     GET  /health                      - Detailed health status with counts
+
+All endpoints act on the request's tenant (X-Mock-Tenant header or
+tenant-scoped token, see state/tenants.py); without one, the 'default'
+tenant.
 """
 
+import json
 from datetime import datetime, timezone
+from itertools import islice
 
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
-from salesforce_mock.state.database import schemas, database, reset_all
+from salesforce_mock.state import tenants
+from salesforce_mock.state.schema_registry import registry
+from salesforce_mock.state.database import (
+    schemas, database, baseline, reset_all, capture_baseline, clear_baseline, load_baseline,
+)
+from salesforce_mock.parsers.soql_parser import parse_where, matches_where
 from salesforce_mock.state.job_store import job_store
 from salesforce_mock.state.event_bus import event_bus
+from salesforce_mock.state.recycle_bin import recycle_bin
+from salesforce_mock.services import change_events
+from salesforce_mock.state.stats import op_stats
 
 
 # =====================================================================
@@ -41,6 +66,9 @@ def admin_db(request):
     Useful for test verification -- inspect what records exist after a
     pipeline run.
 
+    Query parameters:
+        limit: Max records returned per object (``limit=0`` returns counts only)
+
     Response format:
         {
             "Account": { "count": 3, "records": [...] },
@@ -48,11 +76,16 @@ def admin_db(request):
             ...
         }
     """
+    try:
+        limit = _int_param(request, 'limit')
+    except ValueError as err:
+        return JsonResponse({'error': str(err)}, status=400)
+
     result = {}
     for object_name, records in database.items():
         result[object_name] = {
             'count': len(records),
-            'records': records,
+            'records': list(records) if limit is None else records[:limit],
         }
 
     return JsonResponse(result)
@@ -62,11 +95,24 @@ def admin_db_object(request, object_name):
     """
     GET /__admin/db/:object_name
 
-    Return all records for a single object type. Returns 404 if the
+    Return records for a single object type. Returns 404 if the
     object type does not exist in the database.
 
-    Response format:
-        { "count": 3, "records": [...] }
+    Without query parameters every record is returned (original behavior).
+    Verification keywords should narrow the result instead of pulling the
+    whole object after large bulk runs:
+
+    Query parameters:
+        limit:  Max records to return
+        offset: Number of matching records to skip
+        cursor: Opaque ``nextCursor`` value from a previous page (overrides offset)
+        fields: Comma-separated field projection (e.g. ``Id,Name``)
+        where:  SOQL-style filter (e.g. ``Industry = 'Energy' AND Name LIKE 'A%'``)
+        format: ``ndjson`` streams one JSON record per line instead of a
+                single JSON document (limit/offset/fields/where still apply)
+
+    Response format (JSON):
+        { "count": 3, "records": [...], "done": true, "nextCursor": null }
     """
     if object_name not in database:
         return JsonResponse(
@@ -74,14 +120,97 @@ def admin_db_object(request, object_name):
             status=404,
         )
 
-    records = database[object_name]
+    try:
+        limit = _int_param(request, 'limit')
+        offset = _int_param(request, 'cursor')
+        if offset is None:
+            offset = _int_param(request, 'offset') or 0
+        conditions = parse_where(request.GET.get('where', ''))
+    except ValueError as err:
+        return JsonResponse({'error': str(err)}, status=400)
+
+    fields = [f.strip() for f in request.GET.get('fields', '').split(',') if f.strip()]
+    matching = _iter_matching(database[object_name], conditions, fields)
+
+    if request.GET.get('format', '').lower() == 'ndjson':
+        stop = None if limit is None else offset + limit
+        lines = (json.dumps(r) + '\n' for r in islice(matching, offset, stop))
+        return StreamingHttpResponse(lines, content_type='application/x-ndjson')
+
+    if limit is None:
+        page = list(islice(matching, offset, None))
+        done = True
+    else:
+        # Fetch one extra record to know whether another page exists
+        page = list(islice(matching, offset, offset + limit + 1))
+        done = len(page) <= limit
+        page = page[:limit]
 
     return JsonResponse({
-        'count': len(records),
-        'records': records,
+        'count': len(page),
+        'records': page,
+        'done': done,
+        'nextCursor': None if done else str(offset + len(page)),
     })
 
 
+def admin_db_count(request, object_name):
+    """
+    GET /__admin/db/:object_name/count
+
+    Return the number of records for an object type, optionally filtered
+    with a SOQL-style ``where`` parameter. Records are counted in a single
+    pass without building a result list, so verification cost does not
+    depend on record size.
+
+    Response format:
+        { "object": "Account", "count": 42 }
+    """
+    if object_name not in database:
+        return JsonResponse(
+            {'error': f"Object '{object_name}' not found in database"},
+            status=404,
+        )
+
+    try:
+        conditions = parse_where(request.GET.get('where', ''))
+    except ValueError as err:
+        return JsonResponse({'error': str(err)}, status=400)
+
+    records = database[object_name]
+    if conditions:
+        count = sum(1 for r in records if matches_where(r, conditions))
+    else:
+        count = len(records)
+
+    return JsonResponse({'object': object_name, 'count': count})
+
+
+def _int_param(request, name):
+    """Read a non-negative integer query parameter, or None if absent."""
+    raw = request.GET.get(name)
+    if raw is None or raw == '':
+        return None
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"Query parameter '{name}' must be an integer: {raw}")
+    if value < 0:
+        raise ValueError(f"Query parameter '{name}' must not be negative: {raw}")
+    return value
+
+
+def _iter_matching(records, conditions, fields):
+    """Lazily yield filtered (and optionally projected) records."""
+    for record in records:
+        if conditions and not matches_where(record, conditions):
+            continue
+        if fields:
+            yield {f: record[f] for f in fields if f in record}
+        else:
+            yield record
+
+
 # =====================================================================
 # Admin: Reset
 # =====================================================================
@@ -91,12 +220,16 @@ def admin_reset(request):
     """
     POST /__admin/reset
 
-    Reset all mock server state:
-        - Clear all database records (preserving schema definitions)
+    Reset the current tenant's mock server state:
+        - Restore database records to the shared baseline (empty unless
+          captured via /__admin/baseline; schema definitions are kept)
         - Clear all bulk API jobs
         - Clear all platform events and CometD client sessions
+        - Empty the recycle bin
+        - Clear record operation counters
 
     Used by test setup/teardown to ensure a clean state between test runs.
+    Other tenants are not affected.
 
     Response format:
         {
@@ -104,12 +237,16 @@ def admin_reset(request):
             "recordsCleared": <count>,
             "bulkJobsCleared": <count>,
             "eventsCleared": <count>,
-            "clientsCleared": <count>
+            "clientsCleared": <count>,
+            "recycleBinCleared": <count>
         }
     """
     records_cleared = reset_all()
     bulk_jobs_cleared = job_store.clear()
+    change_events.flush()
     events_result = event_bus.clear()
+    recycle_bin_cleared = recycle_bin.clear()
+    op_stats.clear()
 
     return JsonResponse({
         'status': 'reset',
@@ -117,28 +254,238 @@ def admin_reset(request):
         'bulkJobsCleared': bulk_jobs_cleared,
         'eventsCleared': events_result.get('eventsCleared', 0),
         'clientsCleared': events_result.get('clientsCleared', 0),
+        'recycleBinCleared': recycle_bin_cleared,
+    })
+
+
+# =====================================================================
+# Admin: Undelete
+# =====================================================================
+
+@csrf_exempt
+def admin_undelete(request):
+    """
+    POST /__admin/undelete
+
+    Restore records deleted through the REST or Bulk APIs from the
+    tenant's recycle bin, as Salesforce's undelete() call does. Restored
+    records keep their Ids and field values and publish UNDELETE change
+    events (one transaction per request). GET lists the bin's contents
+    per object.
+
+    Request body:
+        { "object": "Account", "ids": ["001...", "001..."] }
+
+    Response format:
+        {
+            "object": "Account",
+            "results": [
+                { "id": "001...", "success": true, "errors": [] },
+                { "id": "001...", "success": false,
+                  "errors": [{"statusCode": "ENTITY_IS_DELETED", ...}] }
+            ]
+        }
+    """
+    if request.method == 'GET':
+        counts = recycle_bin.counts()
+        return JsonResponse({'totalRecords': sum(counts.values()), 'objects': counts})
+    if request.method != 'POST':
+        return JsonResponse({'error': f'Method {request.method} not allowed'}, status=405)
+
+    try:
+        body = json.loads(request.body or b'{}')
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse({'error': 'Request body must be JSON'}, status=400)
+    object_name = body.get('object') if isinstance(body, dict) else None
+    ids = body.get('ids') if isinstance(body, dict) else None
+    if not object_name or not isinstance(ids, list):
+        return JsonResponse({'error': 'Body must be {"object": <name>, "ids": [<id>, ...]}'}, status=400)
+
+    results = []
+    with change_events.transaction(''):
+        for record_id in ids:
+            record = recycle_bin.restore(object_name, record_id)
+            if record is None:
+                results.append({
+                    'id': record_id,
+                    'success': False,
+                    'errors': [{
+                        'statusCode': 'ENTITY_IS_DELETED',
+                        'message': 'entity is not in the recycle bin',
+                        'fields': [],
+                    }],
+                })
+                continue
+            database.setdefault(object_name, []).append(record)
+            change_events.undeleted(object_name, record)
+            results.append({'id': record_id, 'success': True, 'errors': []})
+
+    return JsonResponse({'object': object_name, 'results': results})
+
+
+# =====================================================================
+# Admin: Tenants and Baseline
+# =====================================================================
+
+def admin_tenants(request):
+    """
+    GET /__admin/tenants
+
+    List tenants seen so far with the objects each has modified (cloned
+    from the baseline) and their record counts.
+
+    Response format:
+        {
+            "count": 2,
+            "tenants": { "default": { "Account": 3 }, "suite-a": {} }
+        }
+    """
+    result = {}
+    for name in tenants.list_tenants():
+        data = tenants.get_tenant(name).data
+        result[name] = {object_name: len(records) for object_name, records in list(data.items())}
+    return JsonResponse({'count': len(result), 'tenants': result})
+
+
+@csrf_exempt
+def admin_tenant(request, tenant_name):
+    """
+    DELETE /__admin/tenants/:tenant_name
+
+    Drop a tenant's records, bulk jobs, events and counters. The tenant
+    starts again from the baseline on its next request.
+    """
+    if request.method != 'DELETE':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    if not tenants.drop_tenant(tenant_name):
+        return JsonResponse({'error': f"Tenant '{tenant_name}' not found"}, status=404)
+    return JsonResponse({'status': 'dropped', 'tenant': tenant_name})
+
+
+@csrf_exempt
+def admin_baseline(request):
+    """
+    GET    /__admin/baseline  - Record counts of the shared baseline
+                                (?export=true returns the records themselves)
+    POST   /__admin/baseline  - Capture the current tenant's records as the baseline
+    PUT    /__admin/baseline  - Load exported records ({ "Account": [...] }) as the baseline
+    DELETE /__admin/baseline  - Empty the baseline
+
+    Seed data once (as any tenant), POST here, and every tenant sees those
+    records until it modifies them; /__admin/reset returns a tenant to them.
+    The export/PUT pair lets cluster mode copy a baseline between workers.
+
+    Response format:
+        { "status": "captured", "records": <count>, "objects": { "Account": 3 } }
+    """
+    if request.method == 'GET' and request.GET.get('export') == 'true':
+        return JsonResponse({name: list(rows) for name, rows in baseline.items() if rows})
+    if request.method == 'POST':
+        status, records = 'captured', capture_baseline()
+    elif request.method == 'PUT':
+        try:
+            snapshot = json.loads(request.body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return JsonResponse({'error': 'Request body must be a JSON object of record lists'}, status=400)
+        if not isinstance(snapshot, dict):
+            return JsonResponse({'error': 'Request body must be a JSON object of record lists'}, status=400)
+        status, records = 'loaded', load_baseline(snapshot)
+    elif request.method == 'DELETE':
+        status, records = 'cleared', clear_baseline()
+    else:
+        status, records = 'ok', sum(len(rows) for rows in baseline.values())
+    return JsonResponse({
+        'status': status,
+        'records': records,
+        'objects': {name: len(rows) for name, rows in baseline.items() if rows},
     })
 
 
+# =====================================================================
+# Admin: Operation Counters
+# =====================================================================
+
+def admin_stats(request):
+    """
+    GET /__admin/stats
+
+    Return record operation counters grouped by object. The REST and bulk
+    views count operations here instead of printing a line per record.
+
+    Response format:
+        {
+            "operations": {
+                "Account": { "create": 3, "bulk_insert": 1000, "bulk_failed": 2 }
+            }
+        }
+    """
+    return JsonResponse({'operations': op_stats.snapshot()})
+
+
 # =====================================================================
 # Admin: Schema Inspection
 # =====================================================================
 
+@csrf_exempt
 def admin_schemas(request):
     """
-    GET /__admin/schemas
+    GET  /__admin/schemas
+    POST /__admin/schemas
 
-    Return all loaded schema definitions. Useful for debugging which
+    GET returns all loaded schema definitions. Useful for debugging which
     Salesforce object types are available and their field configurations.
 
-    Response format:
+    POST adds or replaces schemas without a restart or losing records. The
+    body is one definition in the schemas/*.json format, or a list of them.
+    Uploaded schemas survive SCHEMA_DIR reloads.
+
+    Response format (GET):
         {
             "Account": { "name": "Account", "idPrefix": "001", "fields": {...} },
             "Contact": { ... },
             ...
         }
+
+    Response format (POST):
+        { "status": "loaded", "objects": ["Widget__c"], "version": 3 }
+    """
+    if request.method == 'POST':
+        try:
+            names = registry.upload(json.loads(request.body))
+        except json.JSONDecodeError:
+            return JsonResponse({'error': 'Request body must be valid JSON'}, status=400)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        return JsonResponse({'status': 'loaded', 'objects': names, 'version': registry.compiled.version})
+
+    return JsonResponse(schemas.current())
+
+
+@csrf_exempt
+def admin_schemas_reload(request):
+    """
+    POST /__admin/schemas/reload
+
+    Re-read SCHEMA_DIR now instead of waiting for the file watcher.
+    Files that fail to parse are skipped and listed under "errors".
+
+    Response format:
+        { "status": "reloaded", "version": 4, "objects": 25, "errors": null, ... }
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    registry.reload()
+    return JsonResponse({'status': 'reloaded', **registry.status()})
+
+
+def admin_schemas_registry(request):
+    """
+    GET /__admin/schemas/registry
+
+    Current schema version (incremented on every reload or upload), when
+    it was compiled, uploaded objects and the last load errors.
     """
-    return JsonResponse(schemas)
+    return JsonResponse(registry.status())
 
 
 # =====================================================================
@@ -154,8 +501,16 @@ def admin_bulk_jobs(request):
 
     Response format:
         { "count": 2, "jobs": [...] }
+
+    Internal runtime state (keys starting with '_', e.g. PK chunk plans)
+    is omitted.
     """
-    return JsonResponse(job_store.list_all())
+    result = job_store.list_all()
+    result['jobs'] = [
+        {key: value for key, value in job.items() if not key.startswith('_')}
+        for job in result['jobs']
+    ]
+    return JsonResponse(result)
 
 
 # =====================================================================
@@ -177,6 +532,7 @@ def admin_events(request):
             "totalEvents": 5
         }
     """
+    change_events.flush()
     return JsonResponse(event_bus.get_all_events())
 
 
@@ -230,6 +586,7 @@ def health(request):
     """
     total_records = sum(len(records) for records in database.values())
 
+    change_events.flush()
     events_info = event_bus.get_all_events()
     clients_info = event_bus.get_clients()
     jobs_info = job_store.list_all()
@@ -289,8 +646,13 @@ def root_index(request):
             'bulk_v2_query': f'{base}/services/data/v59.0/jobs/query',
             'bulk_v1': f'{base}/services/async/59.0/job',
             'admin_db': f'{base}/__admin/db',
+            'admin_db_count': f'{base}/__admin/db/{{Object}}/count',
             'admin_schemas': f'{base}/__admin/schemas',
             'admin_reset': f'{base}/__admin/reset',
+            'admin_undelete': f'{base}/__admin/undelete',
+            'admin_tenants': f'{base}/__admin/tenants',
+            'admin_baseline': f'{base}/__admin/baseline',
+            'admin_stats': f'{base}/__admin/stats',
             'admin_bulk_jobs': f'{base}/__admin/bulk-jobs',
         },
     })
@@ -20,31 +20,67 @@ Views:
   list_v1_batches       - GET    /services/async/:version/job/:jobId/batch
   get_v1_batch          - GET    /services/async/:version/job/:jobId/batch/:batchId
   get_v1_batch_results  - GET    /services/async/:version/job/:jobId/batch/:batchId/result
+  get_v1_query_result   - GET    /services/async/:version/job/:jobId/batch/:batchId/result/:resultId
 
 Job States: Open, Closed, Aborted, Failed
-Batch States: Queued, InProgress, Completed, Failed, Not Processed
+Batch States: Queued, InProgress, Completed, Failed, NotProcessed, Not Processed
 
 Processing is SYNCHRONOUS -- batches complete immediately when added.
+
+Query jobs (operation query / queryAll) take the SOQL text as the batch
+body and run it through the shared SOQL engine. The batch's result
+endpoint lists result IDs; each result file is streamed in the job's
+contentType (CSV, XML or JSON) from .../result/:resultId. Results are
+split into files of at most BULK_V1_RESULT_MAX_BYTES characters
+(default 1 GB, like Salesforce).
+
+With Sforce-Enable-PKChunking on job creation, adding the query batch
+creates one batch per Id-range chunk (see bulk_processor.PKChunkPlan)
+and leaves the original batch NotProcessed, as Salesforce does. Chunk
+results are built on first download.
 """
 
 import json
 import csv
 import io
+import logging
+import os
 import re
+import threading
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
+from salesforce_mock.parsers.soql_parser import parse_soql, get_field_value
+from salesforce_mock.services import change_events
+from salesforce_mock.services.bulk_processor import PKChunkPlan, parse_pk_chunking_header, query_headers
+from salesforce_mock.services.soql_executor import (
+    compile_projection, count_records, execute_query, is_aggregate,
+)
 from salesforce_mock.state.database import schemas, database
+from salesforce_mock.state.recycle_bin import recycle_bin
+from salesforce_mock.state.tenants import read_only
 from salesforce_mock.utils.id_generator import generate_id
 from salesforce_mock.utils.validator import validate
 from salesforce_mock.state.job_store import job_store
+from salesforce_mock.state.stats import op_stats
+from salesforce_mock.utils.request_body import get_raw_body
+
+logger = logging.getLogger(__name__)
 
 
 # XML namespace for Bulk API v1
 NS = 'http://www.force.com/2009/06/asyncapi/dataload'
+XSI = 'http://www.w3.org/2001/XMLSchema-instance'
+
+QUERY_OPERATIONS = ('query', 'queryAll')
+
+# Maximum size of one query result file (characters of serialized output)
+RESULT_MAX_BYTES = int(os.environ.get('BULK_V1_RESULT_MAX_BYTES', str(1024 ** 3)))
+# Serialized rows are kept in blocks of this many rows
+RESULT_BLOCK_ROWS = 1000
 
 
 # =====================================================================
@@ -143,6 +179,7 @@ def _batch_info_xml(batch):
         f'  <id>{batch["id"]}</id>\n'
         f'  <jobId>{batch["jobId"]}</jobId>\n'
         f'  <state>{batch["state"]}</state>\n'
+        f'{_state_message_xml(batch)}'
         f'  <createdDate>{batch["createdDate"]}</createdDate>\n'
         f'  <systemModstamp>{batch["systemModstamp"]}</systemModstamp>\n'
         f'  <numberRecordsProcessed>{batch.get("numberRecordsProcessed", 0)}</numberRecordsProcessed>\n'
@@ -154,6 +191,14 @@ def _batch_info_xml(batch):
     )
 
 
+def _state_message_xml(batch, indent='  '):
+    """<stateMessage> line for failed / not processed batches, else ''."""
+    if not batch.get('stateMessage'):
+        return ''
+    return f'{indent}<stateMessage>{_escape_xml(batch["stateMessage"])}</stateMessage>\n'
+
+
+
 def _error_xml(code, message):
     """
     Build an XML error response.
@@ -281,6 +326,163 @@ def _parse_csv_records(csv_str):
     return [dict(row) for row in reader]
 
 
+# =====================================================================
+# QUERY RESULTS
+# =====================================================================
+
+def _xml_value(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return _escape_xml(value)
+
+
+def _sobject_xml(record):
+    """Fields of one projected record as XML (parents nest as sObjects)."""
+    parts = [f'<type>{record["attributes"]["type"]}</type>']
+    for field, value in record.items():
+        if field == 'attributes':
+            continue
+        if value is None:
+            parts.append(f'<{field} xsi:nil="true"/>')
+        elif isinstance(value, dict):
+            parts.append(f'<{field} xsi:type="sObject">{_sobject_xml(value)}</{field}>')
+        else:
+            parts.append(f'<{field}>{_xml_value(value)}</{field}>')
+    return ''.join(parts)
+
+
+class QueryBatchResults:
+    """
+    The result files of one v1 query batch.
+
+    build() runs the query (read-only, so baseline objects are not cloned
+    into the tenant) and measures each row's serialized size in the job's
+    content type to cut the matching rows into result files of at most
+    RESULT_MAX_BYTES, each with its own result ID. The matching rows are
+    kept in `rows` (the stored records themselves for plain queries,
+    shallow copies carrying the joined parents for relationship queries),
+    so the results reflect the data when the batch was added; each file
+    keeps only its row range, and its text is serialized block by block
+    while it is streamed rather than held.
+
+    The main batch is built when it is added, since row_count() reports
+    numberRecordsProcessed in the batch response. PK chunk batches pass
+    their chunk's `records` and are built on first access.
+    """
+
+    def __init__(self, parsed, content_type, version, records=None):
+        self.parsed = parsed
+        self.content_type = content_type
+        self.version = version
+        self.records = records
+        self.rows = None
+        self.files = None       # [(result_id, start, stop)] row ranges
+        self._lock = threading.Lock()
+
+    def build(self):
+        with self._lock:
+            if self.files is None:
+                with read_only():
+                    self.rows = execute_query(self.parsed, records=self.records)
+                self.files = self._split(self.rows)
+                self.records = None
+            return self.files
+
+    def row_count(self):
+        self.build()
+        return len(self.rows)
+
+    def result_ids(self):
+        return [result_id for result_id, _, _ in self.build()]
+
+    def stream(self, result_id):
+        """Iterator over the text of result `result_id`, or None if unknown."""
+        for file_id, start, stop in self.build():
+            if file_id == result_id:
+                return self._iter_file(start, stop)
+        return None
+
+    def _iter_file(self, start, stop):
+        # Each download gets its own serializer (the CSV writer is stateful)
+        serialize, (prefix, separator, suffix) = self._serializer(self.rows)
+        yield prefix
+        for block_start in range(start, stop, RESULT_BLOCK_ROWS):
+            block = separator.join(
+                serialize(row) for row in self.rows[block_start:min(block_start + RESULT_BLOCK_ROWS, stop)]
+            )
+            yield separator + block if block_start > start else block
+        yield suffix
+
+    def _split(self, rows):
+        serialize, (prefix, separator, suffix) = self._serializer(rows)
+        overhead = len(prefix) + len(suffix)
+
+        files, start, size = [], 0, overhead
+        for index, row in enumerate(rows):
+            length = len(serialize(row)) + len(separator)
+            if index > start and size + length > RESULT_MAX_BYTES:
+                files.append((generate_id('752'), start, index))
+                start, size = index, overhead
+            size += length
+        files.append((generate_id('752'), start, len(rows)))
+        return files
+
+    def _serializer(self, rows):
+        """(row -> text, (file prefix, row separator, file suffix)) for the content type."""
+        if self.content_type in ('CSV', 'ZIP_CSV'):
+            headers = query_headers(self.parsed, rows)
+            output = io.StringIO()
+            writer = csv.writer(output, quoting=csv.QUOTE_ALL, lineterminator='\n')
+            writer.writerow(headers)
+            header_line = output.getvalue()
+
+            def serialize(row):
+                output.seek(0)
+                output.truncate(0)
+                values = []
+                for field in headers:
+                    value = get_field_value(row, field)
+                    values.append(value if value is not None else '')
+                writer.writerow(values)
+                return output.getvalue()
+
+            return serialize, (header_line, '', '')
+
+        project = compile_projection(self.parsed, f"v{self.version.lstrip('v')}")
+        if self.content_type in ('JSON', 'ZIP_JSON'):
+            return (lambda row: json.dumps(project(row))), ('[', ',', ']')
+        return (
+            lambda row: f'<records xsi:type="sObject">{_sobject_xml(project(row))}</records>',
+            (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                f'<queryResult xmlns="{NS}" xmlns:xsi="{XSI}">',
+                '',
+                '</queryResult>',
+            ),
+        )
+
+
+def _result_list(job, ids):
+    """Body and content type listing a query batch's result IDs."""
+    if job.get('contentType') in ('JSON', 'ZIP_JSON'):
+        return json.dumps(ids), 'application/json'
+    items = ''.join(f'<result>{result_id}</result>' for result_id in ids)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<result-list xmlns="{NS}">{items}</result-list>',
+        'application/xml',
+    )
+
+
+def _query_content_type(job):
+    ct = job.get('contentType', 'CSV')
+    if ct in ('CSV', 'ZIP_CSV'):
+        return 'text/csv'
+    if ct in ('JSON', 'ZIP_JSON'):
+        return 'application/json'
+    return 'application/xml'
+
+
 # =====================================================================
 # VIEW FUNCTIONS
 # =====================================================================
@@ -292,7 +494,7 @@ def create_v1_job(request, version):
 
     Creates a new Bulk API v1 job. Accepts XML body with operation, object, contentType.
     """
-    xml = request.body.decode('utf-8') if request.body else ''
+    xml = get_raw_body(request)
     operation = _xml_get(xml, 'operation')
     obj = _xml_get(xml, 'object')
     content_type = _xml_get(xml, 'contentType') or 'CSV'
@@ -319,6 +521,17 @@ def create_v1_job(request, version):
             content_type='application/xml',
         )
 
+    pk_chunking = None
+    if operation in QUERY_OPERATIONS:
+        try:
+            pk_chunking = parse_pk_chunking_header(request.headers.get('Sforce-Enable-PKChunking'))
+        except ValueError as err:
+            return HttpResponse(
+                _error_xml('InvalidJob', str(err)),
+                status=400,
+                content_type='application/xml',
+            )
+
     job = job_store.create({
         'object': obj,
         'operation': operation,
@@ -344,9 +557,10 @@ def create_v1_job(request, version):
         'numberBatchesTotal': 0,
         'apiActiveProcessingTime': 0,
         'apexProcessingTime': 0,
+        'pkChunking': pk_chunking,
     })
 
-    print(f'  Bulk v1: Created {operation} job {job["id"]} for {obj} ({content_type})')
+    logger.info('Bulk v1: Created %s job %s for %s (%s)', operation, job['id'], obj, content_type)
 
     return HttpResponse(
         _job_info_xml(job_store.get(job['id'])),
@@ -383,11 +597,14 @@ def add_v1_batch(request, version, job_id):
             content_type='application/xml',
         )
 
-    raw_data = request.body.decode('utf-8') if request.body else ''
+    raw_data = get_raw_body(request)
     schema = schemas.get(job['object'])
     batch_id = generate_id('751')
     now = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
 
+    if job['operation'] in QUERY_OPERATIONS:
+        return _add_query_batch(job, raw_data, version, batch_id, now)
+
     # Parse the batch data
     records = []
     try:
@@ -422,7 +639,7 @@ def add_v1_batch(request, version, job_id):
             'numberBatchesTotal': (job.get('numberBatchesTotal') or 0) + 1,
         })
 
-        print(f'  Bulk v1: Batch {batch_id} failed to parse: {err}')
+        logger.info('Bulk v1: Batch %s failed to parse: %s', batch_id, err)
         return HttpResponse(
             _batch_info_xml(batch),
             status=201,
@@ -434,84 +651,11 @@ def add_v1_batch(request, version, job_id):
     processed = 0
     failed = 0
 
-    for record in records:
-        try:
-            if job['operation'] == 'insert':
-                errors = validate(record, schema, 'create')
-                if errors:
-                    results.append({
-                        'success': False,
-                        'created': False,
-                        'errorCode': errors[0].get('errorCode', 'VALIDATION_ERROR'),
-                        'errorMessage': errors[0].get('message', 'Validation failed'),
-                    })
-                    failed += 1
-                else:
-                    rec_id = generate_id(schema['idPrefix'])
-                    new_record = {
-                        'Id': rec_id,
-                        **record,
-                        'CreatedDate': now,
-                        'LastModifiedDate': now,
-                        'SystemModstamp': now,
-                        'attributes': {
-                            'type': job['object'],
-                            'url': f'/services/data/v{job.get("apiVersion", 52.0)}/sobjects/{job["object"]}/{rec_id}',
-                        },
-                    }
-                    database[job['object']].append(new_record)
-                    results.append({'id': rec_id, 'success': True, 'created': True})
-
-            elif job['operation'] == 'update':
-                record_id = record.get('Id') or record.get('id')
-                if not record_id:
-                    results.append({
-                        'success': False,
-                        'created': False,
-                        'errorCode': 'MISSING_ARGUMENT',
-                        'errorMessage': 'Id field is required for update',
-                    })
-                    failed += 1
-                    processed += 1
-                    continue
-
-                existing = None
-                for r in database.get(job['object'], []):
-                    if r.get('Id') == record_id:
-                        existing = r
-                        break
-
-                if not existing:
-                    results.append({
-                        'success': False,
-                        'created': False,
-                        'errorCode': 'ENTITY_IS_DELETED',
-                        'errorMessage': f'Record not found: {record_id}',
-                    })
-                    failed += 1
-                else:
-                    update_data = {k: v for k, v in record.items() if k not in ('Id', 'id')}
-                    existing.update(update_data)
-                    existing['LastModifiedDate'] = now
-                    existing['SystemModstamp'] = now
-                    results.append({'id': record_id, 'success': True, 'created': False})
-
-            elif job['operation'] == 'upsert':
-                ext_field = job.get('externalIdFieldName') or 'Id'
-                ext_value = record.get(ext_field)
-                existing = None
-                for r in database.get(job['object'], []):
-                    if str(r.get(ext_field, '')) == str(ext_value):
-                        existing = r
-                        break
-
-                if existing:
-                    update_data = {k: v for k, v in record.items() if k != ext_field}
-                    existing.update(update_data)
-                    existing['LastModifiedDate'] = now
-                    existing['SystemModstamp'] = now
-                    results.append({'id': existing['Id'], 'success': True, 'created': False})
-                else:
+    # One change data capture transaction per batch
+    with change_events.transaction(change_events.origin('bulkapi', version)):
+        for record in records:
+            try:
+                if job['operation'] == 'insert':
                     errors = validate(record, schema, 'create')
                     if errors:
                         results.append({
@@ -529,57 +673,129 @@ def add_v1_batch(request, version, job_id):
                             'CreatedDate': now,
                             'LastModifiedDate': now,
                             'SystemModstamp': now,
-                            'attributes': {
-                                'type': job['object'],
-                                'url': f'/services/data/v{job.get("apiVersion", 52.0)}/sobjects/{job["object"]}/{rec_id}',
-                            },
                         }
                         database[job['object']].append(new_record)
+                        change_events.created(job['object'], new_record)
                         results.append({'id': rec_id, 'success': True, 'created': True})
 
-            elif job['operation'] == 'delete':
-                record_id = record.get('Id') or record.get('id')
-                if not record_id:
-                    results.append({
-                        'success': False,
-                        'created': False,
-                        'errorCode': 'MISSING_ARGUMENT',
-                        'errorMessage': 'Id field is required for delete',
-                    })
-                    failed += 1
-                    processed += 1
-                    continue
-
-                db_records = database.get(job['object'], [])
-                idx = None
-                for i, r in enumerate(db_records):
-                    if r.get('Id') == record_id:
-                        idx = i
-                        break
-
-                if idx is None:
-                    results.append({
-                        'success': False,
-                        'created': False,
-                        'errorCode': 'ENTITY_IS_DELETED',
-                        'errorMessage': f'Record not found: {record_id}',
-                    })
-                    failed += 1
-                else:
-                    db_records.pop(idx)
-                    results.append({'id': record_id, 'success': True, 'created': False})
-
-            processed += 1
-
-        except Exception as err:
-            results.append({
-                'success': False,
-                'created': False,
-                'errorCode': 'UNKNOWN_EXCEPTION',
-                'errorMessage': str(err),
-            })
-            failed += 1
-            processed += 1
+                elif job['operation'] == 'update':
+                    record_id = record.get('Id') or record.get('id')
+                    if not record_id:
+                        results.append({
+                            'success': False,
+                            'created': False,
+                            'errorCode': 'MISSING_ARGUMENT',
+                            'errorMessage': 'Id field is required for update',
+                        })
+                        failed += 1
+                        processed += 1
+                        continue
+
+                    existing = None
+                    for r in database.get(job['object'], []):
+                        if r.get('Id') == record_id:
+                            existing = r
+                            break
+
+                    if not existing:
+                        results.append({
+                            'success': False,
+                            'created': False,
+                            'errorCode': 'ENTITY_IS_DELETED',
+                            'errorMessage': f'Record not found: {record_id}',
+                        })
+                        failed += 1
+                    else:
+                        update_data = {k: v for k, v in record.items() if k not in ('Id', 'id')}
+                        change_events.updating(job['object'], existing, update_data, now)
+                        existing.update(update_data)
+                        existing['LastModifiedDate'] = now
+                        existing['SystemModstamp'] = now
+                        results.append({'id': record_id, 'success': True, 'created': False})
+
+                elif job['operation'] == 'upsert':
+                    ext_field = job.get('externalIdFieldName') or 'Id'
+                    ext_value = record.get(ext_field)
+                    existing = None
+                    for r in database.get(job['object'], []):
+                        if str(r.get(ext_field, '')) == str(ext_value):
+                            existing = r
+                            break
+
+                    if existing:
+                        update_data = {k: v for k, v in record.items() if k != ext_field}
+                        change_events.updating(job['object'], existing, update_data, now)
+                        existing.update(update_data)
+                        existing['LastModifiedDate'] = now
+                        existing['SystemModstamp'] = now
+                        results.append({'id': existing['Id'], 'success': True, 'created': False})
+                    else:
+                        errors = validate(record, schema, 'create')
+                        if errors:
+                            results.append({
+                                'success': False,
+                                'created': False,
+                                'errorCode': errors[0].get('errorCode', 'VALIDATION_ERROR'),
+                                'errorMessage': errors[0].get('message', 'Validation failed'),
+                            })
+                            failed += 1
+                        else:
+                            rec_id = generate_id(schema['idPrefix'])
+                            new_record = {
+                                'Id': rec_id,
+                                **record,
+                                'CreatedDate': now,
+                                'LastModifiedDate': now,
+                                'SystemModstamp': now,
+                            }
+                            database[job['object']].append(new_record)
+                            change_events.created(job['object'], new_record)
+                            results.append({'id': rec_id, 'success': True, 'created': True})
+
+                elif job['operation'] == 'delete':
+                    record_id = record.get('Id') or record.get('id')
+                    if not record_id:
+                        results.append({
+                            'success': False,
+                            'created': False,
+                            'errorCode': 'MISSING_ARGUMENT',
+                            'errorMessage': 'Id field is required for delete',
+                        })
+                        failed += 1
+                        processed += 1
+                        continue
+
+                    db_records = database.get(job['object'], [])
+                    idx = None
+                    for i, r in enumerate(db_records):
+                        if r.get('Id') == record_id:
+                            idx = i
+                            break
+
+                    if idx is None:
+                        results.append({
+                            'success': False,
+                            'created': False,
+                            'errorCode': 'ENTITY_IS_DELETED',
+                            'errorMessage': f'Record not found: {record_id}',
+                        })
+                        failed += 1
+                    else:
+                        recycle_bin.add(job['object'], db_records.pop(idx))
+                        change_events.deleted(job['object'], record_id)
+                        results.append({'id': record_id, 'success': True, 'created': False})
+
+                processed += 1
+
+            except Exception as err:
+                results.append({
+                    'success': False,
+                    'created': False,
+                    'errorCode': 'UNKNOWN_EXCEPTION',
+                    'errorMessage': str(err),
+                })
+                failed += 1
+                processed += 1
 
     # Build batch result
     batch = {
@@ -605,7 +821,10 @@ def add_v1_batch(request, version, job_id):
         'numberRecordsFailed': (job.get('numberRecordsFailed') or 0) + failed,
     })
 
-    print(f'  Bulk v1: Batch {batch_id} -- {processed} processed, {failed} failed ({job["operation"]} {job["object"]})')
+    op_stats.incr(job['object'], f'bulk_{job["operation"]}', processed - failed)
+    op_stats.incr(job['object'], 'bulk_failed', failed)
+    logger.info('Bulk v1: Batch %s -- %d processed, %d failed (%s %s)',
+                batch_id, processed, failed, job['operation'], job['object'])
 
     return HttpResponse(
         _batch_info_xml(batch),
@@ -614,6 +833,90 @@ def add_v1_batch(request, version, job_id):
     )
 
 
+def _query_batch(job, batch_id, now, state, **fields):
+    """A batch dict for a query job."""
+    return {
+        'id': batch_id,
+        'jobId': job['id'],
+        'state': state,
+        'createdDate': now,
+        'systemModstamp': now,
+        'numberRecordsProcessed': 0,
+        'numberRecordsFailed': 0,
+        'totalProcessingTime': 0,
+        'apiActiveProcessingTime': 0,
+        'apexProcessingTime': 0,
+        'results': [],
+        **fields,
+    }
+
+
+def _add_query_batch(job, soql, version, batch_id, now):
+    """
+    Run a query batch (the body is the SOQL text). The batch completes
+    immediately; with PK chunking one batch per chunk is created instead
+    and the original batch is left NotProcessed.
+    """
+    try:
+        parsed = parse_soql(soql.strip())
+        if parsed['object'] != job['object']:
+            raise ValueError(
+                f"Query object '{parsed['object']}' does not match job object '{job['object']}'"
+            )
+        if parsed.get('subqueries'):
+            raise ValueError('Nested queries are not supported in Bulk API query jobs')
+        if is_aggregate(parsed) or parsed.get('is_count'):
+            raise ValueError('Aggregate queries are not supported in Bulk API query jobs')
+        pk_chunking = job.get('pkChunking')
+        with read_only():
+            plan = (
+                PKChunkPlan(parsed, pk_chunking['chunkSize'], pk_chunking.get('startRow'))
+                if pk_chunking else None
+            )
+    except Exception as err:
+        batch = _query_batch(job, batch_id, now, 'Failed',
+                             stateMessage=f'InvalidBatch : Failed to process query: {err}')
+        job['batches'].append(batch)
+        job_store.update(job['id'], {
+            'numberBatchesFailed': (job.get('numberBatchesFailed') or 0) + 1,
+            'numberBatchesTotal': (job.get('numberBatchesTotal') or 0) + 1,
+        })
+        logger.info('Bulk v1: Query batch %s failed: %s', batch_id, err)
+        return HttpResponse(_batch_info_xml(batch), status=201, content_type='application/xml')
+
+    content_type = job.get('contentType', 'CSV')
+    query_results = job.setdefault('_queryResults', {})
+    if plan is None:
+        results = QueryBatchResults(parsed, content_type, version)
+        batch = _query_batch(job, batch_id, now, 'Completed',
+                             numberRecordsProcessed=results.row_count())
+        new_batches = [batch]
+        query_results[batch_id] = results
+    else:
+        batch = _query_batch(job, batch_id, now, 'NotProcessed')
+        new_batches = [batch]
+        for start, stop in plan.ranges:
+            chunk = plan.records[start:stop]
+            chunk_batch = _query_batch(job, generate_id('751'), now, 'Completed',
+                                       numberRecordsProcessed=count_records(parsed, records=chunk))
+            query_results[chunk_batch['id']] = QueryBatchResults(parsed, content_type, version, records=chunk)
+            new_batches.append(chunk_batch)
+
+    processed = sum(b['numberRecordsProcessed'] for b in new_batches)
+    job['batches'].extend(new_batches)
+    job_store.update(job['id'], {
+        'numberBatchesCompleted': (job.get('numberBatchesCompleted') or 0) + len(new_batches) - (plan is not None),
+        'numberBatchesTotal': (job.get('numberBatchesTotal') or 0) + len(new_batches),
+        'numberRecordsProcessed': (job.get('numberRecordsProcessed') or 0) + processed,
+    })
+
+    op_stats.incr(job['object'], f'bulk_{job["operation"]}', processed)
+    logger.info('Bulk v1: Query batch %s -- %d records from %s in %d batch(es)',
+                batch_id, processed, job['object'], len(new_batches) - (plan is not None))
+
+    return HttpResponse(_batch_info_xml(batch), status=201, content_type='application/xml')
+
+
 @csrf_exempt
 def close_abort_v1_job(request, version, job_id):
     """
@@ -631,19 +934,19 @@ def close_abort_v1_job(request, version, job_id):
             content_type='application/xml',
         )
 
-    xml = request.body.decode('utf-8') if request.body else ''
+    xml = get_raw_body(request)
     new_state = _xml_get(xml, 'state')
 
     if new_state == 'Closed':
         job_store.update(job['id'], {'v1State': 'Closed'})
-        print(f'  Bulk v1: Job {job["id"]} closed')
+        logger.info('Bulk v1: Job %s closed', job['id'])
     elif new_state == 'Aborted':
         job_store.update(job['id'], {'v1State': 'Aborted'})
         # Mark queued/in-progress batches as "Not Processed"
         for batch in (job.get('batches') or []):
             if batch['state'] in ('Queued', 'InProgress'):
                 batch['state'] = 'Not Processed'
-        print(f'  Bulk v1: Job {job["id"]} aborted')
+        logger.info('Bulk v1: Job %s aborted', job['id'])
     else:
         return HttpResponse(
             _error_xml(
@@ -703,6 +1006,7 @@ def list_v1_batches(request, version, job_id):
             f'    <id>{b["id"]}</id>\n'
             f'    <jobId>{b["jobId"]}</jobId>\n'
             f'    <state>{b["state"]}</state>\n'
+            f'{_state_message_xml(b, "    ")}'
             f'    <createdDate>{b["createdDate"]}</createdDate>\n'
             f'    <systemModstamp>{b["systemModstamp"]}</systemModstamp>\n'
             f'    <numberRecordsProcessed>{b.get("numberRecordsProcessed", 0)}</numberRecordsProcessed>\n'
@@ -797,6 +1101,11 @@ def get_v1_batch_results(request, version, job_id, batch_id):
             content_type='application/xml',
         )
 
+    results = (job.get('_queryResults') or {}).get(batch_id)
+    if results is not None:
+        body, content_type = _result_list(job, results.result_ids())
+        return HttpResponse(body, content_type=content_type)
+
     # Return results in the format matching the job's contentType
     ct = job.get('contentType', 'XML')
     if ct in ('CSV', 'ZIP_CSV'):
@@ -811,6 +1120,40 @@ def get_v1_batch_results(request, version, job_id, batch_id):
         )
 
 
+def get_v1_query_result(request, version, job_id, batch_id, result_id):
+    """
+    GET /services/async/:version/job/:jobId/batch/:batchId/result/:resultId
+
+    Streams one result file of a query batch in the job's contentType.
+    """
+    job = job_store.get(job_id)
+
+    if not job:
+        return HttpResponse(
+            _error_xml('InvalidJob', f'Job not found: {job_id}'),
+            status=404,
+            content_type='application/xml',
+        )
+
+    results = (job.get('_queryResults') or {}).get(batch_id)
+    if results is None:
+        return HttpResponse(
+            _error_xml('InvalidBatch', f'Query batch not found: {batch_id}'),
+            status=404,
+            content_type='application/xml',
+        )
+
+    body = results.stream(result_id)
+    if body is None:
+        return HttpResponse(
+            _error_xml('InvalidBatch', f'Result not found: {result_id}'),
+            status=404,
+            content_type='application/xml',
+        )
+
+    return StreamingHttpResponse(body, content_type=_query_content_type(job))
+
+
 # =====================================================================
 # METHOD DISPATCHERS (for Django URL routing)
 # =====================================================================
@@ -31,16 +31,20 @@ Views:
 """
 
 import json
+import logging
 
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
 from salesforce_mock.state.database import schemas
 from salesforce_mock.utils.error_formatter import format_error
 from salesforce_mock.state.job_store import job_store
 from salesforce_mock.services.bulk_processor import (
-    process_ingest_job, to_csv, get_csv_headers,
+    process_ingest_job, iter_ingest_results_csv, get_csv_headers,
 )
+from salesforce_mock.utils.request_body import get_raw_body
+
+logger = logging.getLogger(__name__)
 
 
 # =====================================================================
@@ -113,7 +117,7 @@ def create_ingest_job(request, version):
         'jobType': 'V2Ingest',
     })
 
-    print(f'  Bulk ingest job created: {job["id"]} ({operation} {obj})')
+    logger.info('Bulk ingest job created: %s (%s %s)', job['id'], operation, obj)
     return JsonResponse(_format_job_response(job), status=201)
 
 
@@ -148,7 +152,7 @@ def upload_csv_data(request, version, job_id):
             safe=False,
         )
 
-    csv_data = request.body.decode('utf-8') if request.body else ''
+    csv_data = get_raw_body(request)
     if not csv_data:
         return JsonResponse(
             format_error('INVALID_FIELD', 'CSV data is required'),
@@ -171,8 +175,7 @@ def upload_csv_data(request, version, job_id):
         job['csvData'] = csv_data
 
     job_store.update(job_id, {'csvData': job['csvData']})
-    row_count = len(csv_data.split('\n')) - 1
-    print(f'  CSV data uploaded to job {job_id} ({row_count} rows)')
+    logger.info('CSV data uploaded to job %s (%d rows)', job_id, csv_data.count('\n'))
     return HttpResponse(status=201)
 
 
@@ -233,13 +236,12 @@ def close_abort_job(request, version, job_id):
             'failedResults': job.get('failedResults', []),
         })
 
-        print(f'  Bulk job {job_id} completed: '
-              f'{job["numberRecordsProcessed"]} processed, '
-              f'{job["numberRecordsFailed"]} failed')
+        logger.info('Bulk job %s completed: %d processed, %d failed',
+                    job_id, job['numberRecordsProcessed'], job['numberRecordsFailed'])
 
     elif new_state == 'Aborted':
         job_store.update(job_id, {'state': 'Aborted'})
-        print(f'  Bulk job {job_id} aborted')
+        logger.info('Bulk job %s aborted', job_id)
 
     else:
         return JsonResponse(
@@ -285,6 +287,7 @@ def get_successful_results(request, version, job_id):
 
     Returns CSV of successfully processed records.
     Each row includes sf__Id (the created/updated record ID) and sf__Created.
+    The CSV is streamed from the job's compact result references.
     """
     job = job_store.get(job_id)
     if not job:
@@ -302,12 +305,10 @@ def get_successful_results(request, version, job_id):
             safe=False,
         )
 
-    successful = job.get('successfulResults', [])
-    if len(successful) == 0:
-        return HttpResponse('', content_type='text/csv')
-
-    headers = list(successful[0].keys())
-    return HttpResponse(to_csv(headers, successful), content_type='text/csv')
+    return StreamingHttpResponse(
+        iter_ingest_results_csv(job, 'successful'),
+        content_type='text/csv',
+    )
 
 
 def get_failed_results(request, version, job_id):
@@ -316,6 +317,7 @@ def get_failed_results(request, version, job_id):
 
     Returns CSV of failed records with error details.
     Each row includes sf__Id and sf__Error with the failure reason.
+    The CSV is streamed from the job's compact result references.
     """
     job = job_store.get(job_id)
     if not job:
@@ -333,12 +335,10 @@ def get_failed_results(request, version, job_id):
             safe=False,
         )
 
-    failed = job.get('failedResults', [])
-    if len(failed) == 0:
-        return HttpResponse('', content_type='text/csv')
-
-    headers = list(failed[0].keys())
-    return HttpResponse(to_csv(headers, failed), content_type='text/csv')
+    return StreamingHttpResponse(
+        iter_ingest_results_csv(job, 'failed'),
+        content_type='text/csv',
+    )
 
 
 def get_unprocessed_records(request, version, job_id):
@@ -380,7 +380,7 @@ def delete_ingest_job(request, version, job_id):
         )
 
     job_store.remove(job_id)
-    print(f'  Bulk job {job_id} deleted')
+    logger.info('Bulk job %s deleted', job_id)
     return HttpResponse(status=204)
 
 
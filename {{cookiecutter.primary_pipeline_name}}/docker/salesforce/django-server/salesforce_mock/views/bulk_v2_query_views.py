@@ -17,10 +17,19 @@ SnapLogic's first poll will see the completed state.
 Uses the SAME SOQL parser as the REST API query endpoint (core/soql_parser.py),
 and queries the SAME in-memory database.
 
+PK chunking:
+  Creating the job with a Sforce-Enable-PKChunking header ('true' or
+  'chunkSize=N[; startRow=Id]') splits the Id-ordered result into chunks
+  of N records. Chunks are built lazily on first download and are served
+  as result pages: .../results?locator=<n>, with Sforce-Locator pointing
+  at the next chunk. .../resultPages lists every page so clients can
+  download them concurrently.
+
 Routes:
     POST   /services/data/:version/jobs/query                - Create query job
     GET    /services/data/:version/jobs/query/:jobId         - Get job status
     GET    /services/data/:version/jobs/query/:jobId/results - Get CSV results
+    GET    /services/data/:version/jobs/query/:jobId/resultPages - List result pages
     PATCH  /services/data/:version/jobs/query/:jobId         - Abort job
     GET    /services/data/:version/jobs/query                - List all query jobs
 """
@@ -32,7 +41,7 @@ from django.views.decorators.csrf import csrf_exempt
 
 from salesforce_mock.utils.error_formatter import format_error
 from salesforce_mock.state.job_store import job_store
-from salesforce_mock.services.bulk_processor import process_query_job
+from salesforce_mock.services.bulk_processor import parse_pk_chunking_header, process_query_job
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +62,9 @@ def create_query_job(request, version):
         operation: 'query' or 'queryAll' (optional, defaults to 'query')
         query: SOQL query string (required)
 
+    Headers:
+        Sforce-Enable-PKChunking: optional, enables chunked results
+
     Returns 201 with formatted job response on success.
     """
     try:
@@ -83,6 +95,15 @@ def create_query_job(request, version):
             safe=False,
         )
 
+    try:
+        pk_chunking = parse_pk_chunking_header(request.headers.get('Sforce-Enable-PKChunking'))
+    except ValueError as err:
+        return JsonResponse(
+            format_error('INVALID_FIELD', str(err)),
+            status=400,
+            safe=False,
+        )
+
     job = job_store.create({
         'object': '',  # Will be extracted from SOQL by processor
         'operation': operation or 'query',
@@ -90,8 +111,8 @@ def create_query_job(request, version):
         'jobType': 'V2Query',
     })
 
-    # Process the query immediately (synchronous)
-    process_query_job(job)
+    # Process the query immediately (synchronous); PK chunks are built on download
+    process_query_job(job, pk_chunking=pk_chunking)
     job_store.update(job['id'], {
         'state': job['state'],
         'object': job.get('object', ''),
@@ -146,6 +167,9 @@ def get_query_results(request, version, job_id):
 
     Returns query results as CSV. Includes Sforce-Locator and
     Sforce-NumberOfRecords headers (matching real Salesforce).
+
+    For PK-chunked jobs ?locator=<n> selects the chunk (default: the
+    first) and Sforce-Locator names the next one, or 'null' after the last.
     """
     job = job_store.get(job_id)
     if not job:
@@ -170,6 +194,22 @@ def get_query_results(request, version, job_id):
             safe=False,
         )
 
+    plan = job.get('_pkChunks')
+    if plan is not None:
+        locator = request.GET.get('locator') or '0'
+        if not locator.isdigit() or int(locator) >= len(plan):
+            return JsonResponse(
+                format_error('INVALID_FIELD', f'Invalid locator: {locator}'),
+                status=400,
+                safe=False,
+            )
+        index = int(locator)
+        body, count = plan.chunk(index)
+        response = HttpResponse(body, content_type='text/csv')
+        response['Sforce-Locator'] = str(index + 1) if index + 1 < len(plan) else 'null'
+        response['Sforce-NumberOfRecords'] = str(count)
+        return response
+
     # Set Salesforce-specific headers
     response = HttpResponse(
         job.get('queryResults', ''),
@@ -180,6 +220,55 @@ def get_query_results(request, version, job_id):
     return response
 
 
+# =====================================================================
+# View: List Query Result Pages
+# =====================================================================
+
+def get_query_result_pages(request, version, job_id):
+    """
+    GET /services/data/:version/jobs/query/:jobId/resultPages
+
+    Lists the result pages of a completed query job so they can be
+    downloaded in parallel. A PK-chunked job has one page per chunk;
+    other jobs have a single page.
+    """
+    job = job_store.get(job_id)
+    if not job:
+        return JsonResponse(
+            format_error('NOT_FOUND', 'Job not found'),
+            status=404,
+            safe=False,
+        )
+
+    if job.get('jobType') != 'V2Query':
+        return JsonResponse(
+            format_error('INVALID_TYPE', 'This is not a query job'),
+            status=400,
+            safe=False,
+        )
+
+    if job.get('state') != 'JobComplete':
+        return JsonResponse(
+            format_error('INVALID_STATE',
+                         'Results are only available when job state is JobComplete'),
+            status=400,
+            safe=False,
+        )
+
+    results_url = f'/services/data/{version}/jobs/query/{job_id}/results'
+    plan = job.get('_pkChunks')
+    if plan is None:
+        pages = [{'resultLink': results_url}]
+    else:
+        pages = [{'resultLink': f'{results_url}?locator={i}'} for i in range(len(plan))]
+
+    return JsonResponse({
+        'resultPages': pages,
+        'done': True,
+        'nextRecordsUrl': None,
+    })
+
+
 # =====================================================================
 # View: Abort Query Job
 # =====================================================================
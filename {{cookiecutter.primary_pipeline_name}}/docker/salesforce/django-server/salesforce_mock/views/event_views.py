@@ -28,6 +28,7 @@ CometD Protocol Flow:
   4. Disconnect -> cleanup
 """
 import json
+import logging
 
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
@@ -36,8 +37,12 @@ from salesforce_mock.state.database import schemas
 from salesforce_mock.utils.id_generator import generate_id
 from salesforce_mock.utils.error_formatter import format_error
 from salesforce_mock.state.event_bus import event_bus
+from salesforce_mock.services import change_events
+from salesforce_mock.state.stats import op_stats
 from datetime import datetime, timezone
 
+logger = logging.getLogger(__name__)
+
 
 # ==========================================================================
 # PLATFORM EVENT PUBLISHER
@@ -78,7 +83,8 @@ def publish_event(request, version, object_name):
     # Publish to event bus
     event_bus.publish(channel, payload)
 
-    print(f'  \U0001f4e2 Published Platform Event: {object_name} ({event_id})')
+    op_stats.incr(object_name, 'publish')
+    logger.debug('Published Platform Event: %s (%s)', object_name, event_id)
 
     # Return standard Salesforce create response
     return JsonResponse(
@@ -232,14 +238,15 @@ def _handle_subscribe(message):
 
 def _handle_unsubscribe(message):
     """
-    Handle CometD unsubscribe -- acknowledges subscription removal.
+    Handle CometD unsubscribe -- removes the client's subscription.
 
-    For simplicity, unsubscribe just acknowledges without removing
-    (the mock doesn't need sophisticated subscription management).
+    Change Data Capture stays enabled for an object only while some
+    client is subscribed to its channel (see services/change_events.py).
 
     Returns:
         dict: CometD unsubscribe acknowledgment.
     """
+    event_bus.unsubscribe(message.get('clientId'), message.get('subscription'))
     return {
         'channel': '/meta/unsubscribe',
         'clientId': message.get('clientId'),
@@ -263,7 +270,9 @@ def _handle_connect(message):
     client_id = message.get('clientId')
     responses = []
 
-    # Get new events for this client's subscriptions
+    # Get new events for this client's subscriptions (including change
+    # events still being published for already-committed changes)
+    change_events.flush()
     new_events = event_bus.connect(client_id)
 
     # Add event data messages
@@ -284,7 +293,7 @@ def _handle_connect(message):
     })
 
     if new_events:
-        print(f'  \U0001f4e8 CometD delivered {len(new_events)} events to {client_id}')
+        logger.debug('CometD delivered %d events to %s', len(new_events), client_id)
 
     return responses
 
@@ -24,7 +24,9 @@ configured with "REST API" (not "Bulk API").
 """
 
 import json
+import logging
 import random
+import re
 import string
 import time
 from datetime import datetime, timezone
@@ -33,11 +35,24 @@ from django.conf import settings
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
+from salesforce_mock.services import change_events
 from salesforce_mock.state.database import schemas, database
+from salesforce_mock.state.recycle_bin import recycle_bin
+from salesforce_mock.state.stats import op_stats
 from salesforce_mock.utils.id_generator import generate_id
 from salesforce_mock.utils.error_formatter import format_error
 from salesforce_mock.utils.validator import validate
-from salesforce_mock.parsers.soql_parser import parse_soql, apply_where, apply_order_by
+from salesforce_mock.parsers.soql_parser import parse_soql
+from salesforce_mock.state.schema_registry import registry
+from salesforce_mock.services.soql_executor import (
+    compile_projection,
+    count_records,
+    execute_query,
+    is_aggregate,
+    project_aggregate,
+)
+
+logger = logging.getLogger(__name__)
 
 
 # =====================================================================
@@ -52,10 +67,19 @@ def oauth_token(request):
     Mock Salesforce OAuth2 token endpoint.
     Accepts ANY credentials and returns a valid-looking token.
     This is the first call every SnapLogic Salesforce snap makes.
+
+    With an X-Mock-Tenant header (or MOCK_TENANT_BY_USERNAME enabled) the
+    token is scoped to that tenant, so later requests need no extra header.
     """
     timestamp = int(time.time() * 1000)
     random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=13))
-    token = f'00D000000000000!mock.token.{timestamp}.{random_suffix}'
+    tenant = request.headers.get('X-Mock-Tenant')
+    if not tenant and settings.MOCK_TENANT_BY_USERNAME:
+        tenant = re.sub(r'[^\w-]', '_', request.POST.get('username', ''))[:64]
+    if tenant:
+        token = f'00D000000000000!mock.tenant.{tenant}.{timestamp}.{random_suffix}'
+    else:
+        token = f'00D000000000000!mock.token.{timestamp}.{random_suffix}'
 
     protocol = 'https' if request.is_secure() else 'http'
     container_name = 'salesforce-api-mock'
@@ -83,69 +107,19 @@ def describe_object(request, version, object_name):
 
     Returns Salesforce object metadata (field definitions, types, picklist values).
     SnapLogic calls this BEFORE every operation to discover available fields.
+    The field list is precompiled by the schema registry.
     """
-    schema = schemas.get(object_name)
+    describe = registry.compiled.describes.get(object_name)
 
-    if not schema:
+    if not describe:
         return JsonResponse(
             format_error('NOT_FOUND', f"sObject type '{object_name}' is not supported."),
             status=404,
             safe=False,
         )
 
-    fields = [
-        {
-            'name': 'Id',
-            'type': 'id',
-            'label': f"{schema['label']} ID",
-            'length': 18,
-            'updateable': False,
-            'createable': False,
-            'nillable': False,
-            'queryable': True,
-            'filterable': True,
-            'picklistValues': [],
-        }
-    ]
-
-    for name, field_def in schema.get('fields', {}).items():
-        picklist_values = []
-        for i, v in enumerate(field_def.get('values', [])):
-            picklist_values.append({
-                'value': v,
-                'label': v,
-                'active': True,
-                'defaultValue': i == 0 and field_def.get('required', False),
-            })
-
-        fields.append({
-            'name': name,
-            'type': field_def.get('type', 'string'),
-            'label': field_def.get('label', name),
-            'length': field_def.get('maxLength', 18 if field_def.get('type') == 'id' else 0),
-            'precision': field_def.get('precision', 0),
-            'scale': field_def.get('scale', 0),
-            'digits': field_def.get('digits', 0),
-            'updateable': field_def.get('updateable', True) is not False,
-            'createable': field_def.get('createable', True) is not False,
-            'nillable': not field_def.get('required', False),
-            'queryable': True,
-            'filterable': True,
-            'referenceTo': field_def.get('referenceTo', []),
-            'picklistValues': picklist_values,
-        })
-
     return JsonResponse({
-        'name': schema['name'],
-        'label': schema['label'],
-        'labelPlural': schema.get('labelPlural', schema['label'] + 's'),
-        'keyPrefix': schema.get('keyPrefix', schema.get('idPrefix', '')),
-        'fields': fields,
-        'createable': True,
-        'updateable': True,
-        'deletable': True,
-        'queryable': True,
-        'searchable': True,
+        **describe,
         'urls': {
             'sobject': f'/services/data/{version}/sobjects/{object_name}',
             'describe': f'/services/data/{version}/sobjects/{object_name}/describe',
@@ -189,14 +163,12 @@ def create_record(request, version, object_name):
         'CreatedDate': now,
         'LastModifiedDate': now,
         'SystemModstamp': now,
-        'attributes': {
-            'type': object_name,
-            'url': f'/services/data/{version}/sobjects/{object_name}/{record_id}',
-        },
     }
 
     database[object_name].append(record)
-    print(f'  \u2705 Created {object_name}: {record_id}')
+    change_events.created(object_name, record, change_events.origin('rest', version))
+    op_stats.incr(object_name, 'create')
+    logger.debug('Created %s: %s', object_name, record_id)
 
     return JsonResponse({'id': record_id, 'success': True, 'errors': []}, status=201)
 
@@ -233,10 +205,13 @@ def upsert_record(request, version, object_name, ext_id_field, ext_id_value):
     if existing_index is not None:
         # Update existing record
         now = datetime.now(timezone.utc).isoformat()
+        change_events.updating(object_name, records[existing_index], body, now,
+                               change_events.origin('rest', version))
         records[existing_index].update(body)
         records[existing_index]['LastModifiedDate'] = now
         records[existing_index]['SystemModstamp'] = now
-        print(f'  \u2705 Upserted (updated) {object_name}: {records[existing_index]["Id"]}')
+        op_stats.incr(object_name, 'upsert_update')
+        logger.debug('Upserted (updated) %s: %s', object_name, records[existing_index]['Id'])
         return HttpResponse(status=204)
     else:
         # Create new record
@@ -254,14 +229,12 @@ def upsert_record(request, version, object_name, ext_id_field, ext_id_value):
             'CreatedDate': now,
             'LastModifiedDate': now,
             'SystemModstamp': now,
-            'attributes': {
-                'type': object_name,
-                'url': f'/services/data/{version}/sobjects/{object_name}/{record_id}',
-            },
         }
 
         records.append(record)
-        print(f'  \u2705 Upserted (created) {object_name}: {record_id}')
+        change_events.created(object_name, record, change_events.origin('rest', version))
+        op_stats.incr(object_name, 'upsert_create')
+        logger.debug('Upserted (created) %s: %s', object_name, record_id)
         return JsonResponse(
             {'id': record_id, 'success': True, 'errors': [], 'created': True},
             status=201,
@@ -302,14 +275,14 @@ def get_record(request, version, object_name, record_id):
             safe=False,
         )
 
-    response = {**record}
-    if 'attributes' not in response:
-        response['attributes'] = {
+    # Attributes are not stored on records; derive them for the response
+    return JsonResponse({
+        'attributes': {
             'type': object_name,
             'url': f'/services/data/{version}/sobjects/{object_name}/{record_id}',
-        }
-
-    return JsonResponse(response)
+        },
+        **record,
+    })
 
 
 # =====================================================================
@@ -356,11 +329,13 @@ def update_record(request, version, object_name, record_id):
         return JsonResponse(errors, status=400, safe=False)
 
     now = datetime.now(timezone.utc).isoformat()
+    change_events.updating(object_name, records[index], body, now, change_events.origin('rest', version))
     records[index].update(body)
     records[index]['LastModifiedDate'] = now
     records[index]['SystemModstamp'] = now
 
-    print(f'  \u2705 Updated {object_name}: {record_id}')
+    op_stats.incr(object_name, 'update')
+    logger.debug('Updated %s: %s', object_name, record_id)
     return HttpResponse(status=204)
 
 
@@ -399,8 +374,10 @@ def delete_record(request, version, object_name, record_id):
             safe=False,
         )
 
-    records.pop(index)
-    print(f'  \u2705 Deleted {object_name}: {record_id}')
+    recycle_bin.add(object_name, records.pop(index))
+    change_events.deleted(object_name, record_id, change_events.origin('rest', version))
+    op_stats.incr(object_name, 'delete')
+    logger.debug('Deleted %s: %s', object_name, record_id)
     return HttpResponse(status=204)
 
 
@@ -443,54 +420,23 @@ def soql_query(request, version):
             safe=False,
         )
 
-    records = list(database.get(parsed['object'], []))
-
-    # Apply WHERE clause
-    if parsed.get('where') and len(parsed['where']) > 0:
-        records = apply_where(records, parsed['where'])
-
-    # Apply ORDER BY
-    if parsed.get('order_by'):
-        records = apply_order_by(records, parsed['order_by'])
-
-    # Apply OFFSET
-    if parsed.get('offset'):
-        records = records[parsed['offset']:]
-
-    # Apply LIMIT
-    if parsed.get('limit'):
-        records = records[:parsed['limit']]
-
-    # Handle COUNT() queries
-    if parsed.get('is_count'):
-        return JsonResponse({'totalSize': len(records), 'done': True, 'records': []})
-
-    # Project fields
-    projected = []
-    for record in records:
-        row = {
-            'attributes': {
-                'type': parsed['object'],
-                'url': (
-                    record.get('attributes', {}).get('url')
-                    or f"/services/data/{version}/sobjects/{parsed['object']}/{record.get('Id')}"
-                ),
-            }
-        }
+    try:
+        # COUNT() queries are counted without materializing the records
+        if parsed.get('is_count'):
+            return JsonResponse({'totalSize': count_records(parsed), 'done': True, 'records': []})
+        records = execute_query(parsed)
+    except ValueError as err:
+        return JsonResponse(
+            format_error('INVALID_FIELD', str(err)),
+            status=400,
+            safe=False,
+        )
 
-        if '*' in parsed.get('fields', []):
-            # Wildcard: include all fields except attributes
-            for key in record:
-                if key != 'attributes':
-                    row[key] = record[key]
-        else:
-            for field in parsed.get('fields', []):
-                if field in record and record[field] is not None:
-                    row[field] = record[field]
-                elif field in record:
-                    row[field] = record[field]
-
-        projected.append(row)
+    if is_aggregate(parsed):
+        projected = [project_aggregate(row, parsed) for row in records]
+    else:
+        project = compile_projection(parsed, version)
+        projected = [project(record) for record in records]
 
     return JsonResponse({
         'totalSize': len(projected),
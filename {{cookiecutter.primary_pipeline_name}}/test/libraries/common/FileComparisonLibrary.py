@@ -5,6 +5,20 @@ This library provides comparison methods that don't exist in standard libraries:
 - CSV comparison with JSON field exclusions
 - Key-based row matching
 - Detailed difference reporting
+- Streaming comparison of files larger than memory (on-disk hash buckets)
+- Duplicate-aware unordered comparison (row multisets of fixed-size digests)
+- Parallel normalization of row chunks in a process pool (workers=N)
+- Key-based comparison of files larger than memory (external sort-merge join)
+- Streaming comparison of large JSON arrays and NDJSON files, element by element
+- Order-insensitive JSON comparison on structural digests, memoized per array element
+- Column-wise comparison of Parquet and Avro files in record batches (optional
+  pyarrow / fastavro); gzip and bzip2 CSV / JSON files are read as streams
+- Difference cap with early exit (max_differences), one-pass checksum
+  quick_check and key-sampled comparison with a confidence bound
+- Per-column numeric tolerances (abs_tol, rel_tol, decimal places) for
+  positional CSV comparison, vectorized with NumPy when installed
+- Byte-identical CSV files confirmed from a memory-mapped byte compare,
+  without parsing
 
 Standard operations (file reading, JSON parsing) should use:
 - JSONLibrary for JSON operations
@@ -14,19 +28,98 @@ Standard operations (file reading, JSON parsing) should use:
 Author: SnapLogic QA Team
 """
 
+import bz2
 import csv
+import gzip
+import heapq
 import json
+import math
+import mmap
+import multiprocessing
 import os
-from typing import List, Dict, Any, Optional, Set
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from hashlib import blake2b
+from itertools import groupby, islice, zip_longest
+from json.encoder import encode_basestring_ascii
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Set, Iterator, TextIO
 from robot.api.deco import keyword
 from robot.api import logger
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # optional, only Compare Parquet / Avro Files need it
+    pa = pc = pq = None
+
+try:
+    import fastavro
+except ImportError:  # optional, only Compare Avro Files needs it
+    fastavro = None
+
+try:
+    import numpy as np
+except ImportError:  # optional, vectorizes the column_tolerances comparison
+    np = None
+
 
 class FileComparisonLibrary:
     """Robot Framework library for file comparison operations."""
 
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
-    ROBOT_LIBRARY_VERSION = '2.2.0'
+    ROBOT_LIBRARY_VERSION = '2.11.0'
+
+    # Unordered comparison counts rows by a fixed-size digest of the normalized
+    # row instead of keeping the rows themselves
+    ROW_DIGEST_SIZE = 16
+
+    # Streaming comparison: approximate in-memory size of a bucket's digest
+    # counters relative to the size of its rows on disk (~150 bytes per row;
+    # 4x covers rows down to ~40 bytes), used to pick the number of on-disk
+    # buckets so one bucket pair fits the memory budget
+    STREAMING_MEMORY_FACTOR = 4
+    STREAMING_MAX_BUCKETS = 256
+
+    # Streaming key-based comparison: approximate in-memory bytes per buffered
+    # row on top of its JSON text (key string, tuple and list slot), used to
+    # cut the sort runs to the memory budget
+    SORT_RECORD_OVERHEAD = 200
+
+    # Streaming JSON comparison reads the files in blocks of this many characters
+    JSON_READ_SIZE = 1024 * 1024
+    _JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+    _JSON_NUMBER_CHARS = re.compile(r'[0-9.eE+-]*')
+
+    # Compressed CSV / JSON files are read as streams; their uncompressed size
+    # (for sizing the streaming buckets) is estimated as this many times the
+    # compressed size
+    COMPRESSION_RATIO_ESTIMATE = 5
+
+    # Compare CSV Files first compares the raw files, this many bytes of the
+    # two memory-mapped files at a time, and only parses them if they differ
+    BYTE_COMPARE_CHUNK = 8 * 1024 * 1024
+
+    # Columnar comparison (Parquet / Avro) reads and compares this many rows
+    # of each file at a time
+    RECORD_BATCH_SIZE = 65536
+
+    # Rows per unit of work for the normalization stage; with workers > 1 each
+    # chunk is pickled to a worker process, so chunks must amortize that cost
+    ROW_CHUNK_SIZE = 2000
+
+    # State of the running comparison keyword (see _comparison_run)
+    _pool = None
+    _workers = 1
+    _phase_seconds = None
+    _max_differences = 0
 
     # ==================== NUMERIC NORMALIZATION ====================
 
@@ -120,6 +213,154 @@ class FileComparisonLibrary:
         # Plain value - try numeric normalization
         return self._normalize_numeric_string(field)
 
+    # ==================== NUMERIC TOLERANCE ====================
+
+    def _tolerance_specs(
+        self,
+        column_tolerances: Dict[str, Dict[str, float]],
+        header1: Optional[List[str]],
+        header2: Optional[List[str]]
+    ) -> List[tuple]:
+        """Validated column_tolerances as (column, index in file1, index in file2,
+        abs_tol, rel_tol, decimal_places or None) tuples."""
+        specs = []
+        for column, spec in column_tolerances.items():
+            if not header1 or not header2 or column not in header1 or column not in header2:
+                raise ValueError(f"column_tolerances column '{column}' not found in both headers")
+            unknown = set(spec) - {'abs_tol', 'rel_tol', 'decimal_places'}
+            if unknown:
+                raise ValueError(f"Unknown tolerance setting(s) {sorted(unknown)} for column '{column}': "
+                                 f"use abs_tol, rel_tol and/or decimal_places")
+            abs_tol, rel_tol = float(spec.get('abs_tol', 0.0)), float(spec.get('rel_tol', 0.0))
+            decimal_places = spec.get('decimal_places')
+            decimal_places = None if decimal_places is None else int(decimal_places)
+            if abs_tol < 0 or rel_tol < 0 or (decimal_places is not None and decimal_places < 0):
+                raise ValueError(f"Tolerances for column '{column}' must not be negative: {dict(spec)}")
+            specs.append((column, header1.index(column), header2.index(column), abs_tol, rel_tol, decimal_places))
+        return specs
+
+    def _compare_tolerance_columns(self, pairs, specs: List[tuple]) -> tuple:
+        """Compare the column_tolerances columns of (row1, row2) data row pairs.
+
+        Returns (FIELD_VALUE_MISMATCH differences, {column: mismatching row
+        indices}). Row indices start at 1, as in the ordered comparison. Once
+        a difference cap is reached, mismatches are only listed by row index.
+        """
+        differences = []
+        mismatch_rows = {spec[0]: [] for spec in specs}
+        offset = 1
+        for chunk, mismatches in self._map_row_chunks('_tolerance_chunk', pairs, specs):
+            for i, column, value1, value2 in mismatches:
+                mismatch_rows[column].append(offset + i)
+                if not self._difference_cap_reached(differences):
+                    differences.append({
+                        'type': 'FIELD_VALUE_MISMATCH',
+                        'row_index': offset + i,
+                        'column': column,
+                        'file1_value': value1,
+                        'file2_value': value2
+                    })
+            offset += len(chunk)
+        return differences, mismatch_rows
+
+    @staticmethod
+    def _blank_columns(row: List[str], indices: Set[int]) -> List[str]:
+        """The row with the fields at `indices` emptied."""
+        return ['' if i in indices else value for i, value in enumerate(row)]
+
+    @staticmethod
+    def _parse_number(value: str) -> Optional[float]:
+        """A CSV field as a number, or None if it is not a number. Integer text
+        is an int, so IDs beyond 2**53 compare exactly."""
+        try:
+            number = int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+        return number if abs(number) <= sys.float_info.max else float(value)
+
+    @staticmethod
+    def _round_places(number: float, decimal_places: int) -> float:
+        """number rounded half-to-even to decimal_places (as numpy.round; ints
+        and numbers too large to scale are returned unchanged)."""
+        if isinstance(number, int):
+            return number
+        scale = 10.0 ** decimal_places
+        scaled = number * scale
+        return round(scaled) / scale if math.isfinite(scaled) else number
+
+    def _within_tolerance(
+        self,
+        value1: str,
+        value2: str,
+        abs_tol: float,
+        rel_tol: float,
+        decimal_places: Optional[int]
+    ) -> bool:
+        """Whether two CSV fields match under a column tolerance: numbers after
+        rounding and within abs_tol / rel_tol (NaN matches NaN, infinities
+        only themselves), other values as text."""
+        number1, number2 = self._parse_number(value1), self._parse_number(value2)
+        if number1 is None or number2 is None:
+            return value1.strip() == value2.strip()
+        if decimal_places is not None:
+            number1 = self._round_places(number1, decimal_places)
+            number2 = self._round_places(number2, decimal_places)
+        if number1 == number2 or (math.isnan(number1) and math.isnan(number2)):
+            return True
+        return (math.isfinite(number1) and math.isfinite(number2)
+                and abs(number1 - number2) <= max(rel_tol * max(abs(number1), abs(number2)), abs_tol))
+
+    def _tolerance_mismatches(
+        self,
+        values1: List[str],
+        values2: List[str],
+        abs_tol: float,
+        rel_tol: float,
+        decimal_places: Optional[int]
+    ) -> List[int]:
+        """Positions where _within_tolerance is False, computed on NumPy arrays.
+        float64 cannot hold integers beyond 2**53 exactly, so pairs with such a
+        value are rechecked with _within_tolerance."""
+        numbers1, numeric1 = self._parse_number_array(values1)
+        numbers2, numeric2 = self._parse_number_array(values2)
+        with np.errstate(invalid='ignore', over='ignore'):
+            if decimal_places is not None:
+                numbers1 = self._round_places_array(numbers1, decimal_places)
+                numbers2 = self._round_places_array(numbers2, decimal_places)
+            same = (numbers1 == numbers2) | (np.isnan(numbers1) & np.isnan(numbers2))
+            if abs_tol or rel_tol:
+                allowed = np.maximum(rel_tol * np.maximum(np.abs(numbers1), np.abs(numbers2)), abs_tol)
+                same |= np.isfinite(numbers1) & np.isfinite(numbers2) & (np.abs(numbers1 - numbers2) <= allowed)
+            inexact = (np.abs(numbers1) >= 2.0 ** 53) | (np.abs(numbers2) >= 2.0 ** 53)
+        numeric = numeric1 & numeric2
+        mismatches = set(np.flatnonzero(numeric & ~same & ~inexact).tolist())
+        mismatches.update(
+            i for i in np.flatnonzero(numeric & inexact).tolist()
+            if not self._within_tolerance(values1[i], values2[i], abs_tol, rel_tol, decimal_places)
+        )
+        mismatches.update(i for i in np.flatnonzero(~numeric).tolist() if values1[i].strip() != values2[i].strip())
+        return sorted(mismatches)
+
+    def _parse_number_array(self, values: List[str]) -> tuple:
+        """(float64 array, mask of the fields that are numbers) of CSV fields;
+        fields that are not numbers are NaN in the array."""
+        try:
+            return np.array(values, dtype=np.float64), np.ones(len(values), dtype=bool)
+        except ValueError:
+            numbers = [self._parse_number(value) for value in values]
+            numeric = np.array([number is not None for number in numbers], dtype=bool)
+            return np.array([np.nan if number is None else number for number in numbers], dtype=np.float64), numeric
+
+    @staticmethod
+    def _round_places_array(numbers: Any, decimal_places: int) -> Any:
+        """_round_places on a float64 array."""
+        scale = 10.0 ** decimal_places
+        scaled = numbers * scale
+        return np.where(np.isfinite(scaled), np.rint(scaled) / scale, numbers)
+
     # ==================== CSV COMPARISON ====================
 
     @keyword("Compare CSV Files")
@@ -129,7 +370,15 @@ class FileComparisonLibrary:
         file2_path: str,
         ignore_order: bool = True,
         show_details: bool = True,
-        normalize_numerics: bool = False
+        normalize_numerics: bool = False,
+        streaming: bool = False,
+        memory_limit_mb: int = 256,
+        temp_dir: Optional[str] = None,
+        workers: int = 1,
+        max_differences: int = 0,
+        quick_check: bool = False,
+        column_tolerances: Optional[Dict[str, Dict[str, float]]] = None,
+        byte_check: bool = True
     ) -> Dict[str, Any]:
         """
         Compare two CSV files and return detailed comparison results.
@@ -137,13 +386,70 @@ class FileComparisonLibrary:
         Args:
             file1_path: Path to the first CSV file (actual)
             file2_path: Path to the second CSV file (expected)
-            ignore_order: Whether to ignore row order (default: True)
+            ignore_order: Whether to ignore row order (default: True). Rows are then
+                          compared as multisets: a row duplicated in one file but
+                          not the other is reported as DUPLICATE_ROW_MISMATCH.
             show_details: Whether to log detailed differences (default: True)
             normalize_numerics: Whether to normalize numeric types before comparison
                                (e.g., 1250.0 treated as equal to 1250). Default: False.
+            streaming: Read both files row by row instead of loading them whole, so
+                       files larger than memory can be compared (default: False).
+                       Unordered comparison hash-partitions the rows into on-disk
+                       buckets and compares bucket by bucket; ordered comparison
+                       walks both files in step. Returns the same result dictionary,
+                       except that ordered ROW_CONTENT_MISMATCH entries do not list
+                       where else the row occurs in the other file.
+            memory_limit_mb: Approximate memory budget for streaming comparison;
+                             determines the number of buckets (default: 256).
+            temp_dir: Directory for the streaming buckets (default: system temp dir).
+            workers: Number of worker processes that normalize and digest the rows,
+                     in chunks of ROW_CHUNK_SIZE rows (default: 1, no worker pool).
+                     Speeds up normalize_numerics on JSON-in-CSV files on multi-core
+                     machines; the result is the same for any number of workers.
+            max_differences: Stop looking for differences once this many are found
+                             (default: 0, no limit). Keeps a badly broken output from
+                             taking minutes to diff and flooding the log; the result
+                             then lists the first differences found, with 'truncated'
+                             set. Row counts stay exact.
+            quick_check: Only check the files' row counts and content checksums, in
+                         one streaming pass per file (default: False). The checksum
+                         adds up the digests of the normalized rows, so it ignores row
+                         order when ignore_order=True (and follows it otherwise).
+                         Differences are HEADER_MISMATCH, ROW_COUNT_MISMATCH and
+                         CHECKSUM_MISMATCH; which rows differ is not determined. The
+                         result adds 'file1_size' / 'file2_size' (bytes) and
+                         'file1_checksum' / 'file2_checksum'.
+            column_tolerances: Numeric tolerances per column name, as
+                               {column: {'abs_tol': ..., 'rel_tol': ..., 'decimal_places': ...}}
+                               (any of the three; default: none). Requires
+                               ignore_order=False. These columns are compared
+                               value by value, row by row, a chunk of rows at a time
+                               (vectorized with NumPy when it is installed): both
+                               values are rounded to decimal_places, then match when
+                               abs(a - b) <= max(rel_tol * max(abs(a), abs(b)), abs_tol).
+                               Values that are not numbers must be equal as text. A
+                               value out of tolerance is a FIELD_VALUE_MISMATCH with
+                               'row_index' and 'column', and 'column_mismatch_rows'
+                               lists the mismatching rows per column. The other
+                               columns are compared as usual; row-level differences
+                               show the tolerance columns empty.
+            byte_check: Before parsing, compare the file sizes and then the raw bytes
+                        of the memory-mapped files (default: True). Byte-identical
+                        files are IDENTICAL under every option, so they are not
+                        compared row by row: their rows are counted by scanning the
+                        bytes for line breaks (files with quoted fields, or gzip /
+                        bzip2 files, are counted with one csv.reader pass), and only
+                        the header is read to check column_tolerances. Set to False
+                        to always parse and compare the rows.
 
         Returns:
             Dictionary with comparison results including status, differences, etc.
+            'decided_by' tells which tier decided: 'bytes' (byte-identical files,
+            not parsed), 'checksum' (quick_check) or 'rows' (parsed and compared).
+            'truncated' is True when max_differences was reached.
+            'timings' holds the seconds spent reading, normalizing and comparing,
+            the total and the number of workers (in streaming mode reading is
+            counted as normalizing, as the files are normalized while read).
 
         Example:
             | ${result}= | Compare CSV Files | ${actual} | ${expected} |
@@ -151,9 +457,75 @@ class FileComparisonLibrary:
             |
             | # With numeric normalization (e.g., Snowflake int vs JSON float):
             | ${result}= | Compare CSV Files | ${actual} | ${expected} | normalize_numerics=${TRUE} |
+            |
+            | # Multi-GB pipeline output, bounded memory:
+            | ${result}= | Compare CSV Files | ${actual} | ${expected} | streaming=${TRUE} | memory_limit_mb=512 |
+            |
+            | # Normalize on 4 cores:
+            | ${result}= | Compare CSV Files | ${actual} | ${expected} | normalize_numerics=${TRUE} | workers=4 |
+            |
+            | # Smoke check of a nightly 10M-row extract; details only for the first 50 differences:
+            | ${result}= | Compare CSV Files | ${actual} | ${expected} | quick_check=${TRUE} |
+            | ${result}= | Compare CSV Files | ${actual} | ${expected} | max_differences=50 |
+            |
+            | # Oracle NUMBER vs Snowflake FLOAT extract, in row order:
+            | ${tolerances}= | Evaluate | {'AMOUNT': {'decimal_places': 2}, 'RATE': {'rel_tol': 1e-9}} |
+            | ${result}= | Compare CSV Files | ${actual} | ${expected} | ignore_order=${FALSE} | column_tolerances=${tolerances} |
         """
-        csv1 = self._read_csv_file(file1_path)
-        csv2 = self._read_csv_file(file2_path)
+        if column_tolerances and (ignore_order or quick_check):
+            raise ValueError("column_tolerances compares rows by position: use ignore_order=False "
+                             "(and no quick_check)")
+
+        with self._comparison_run(workers, max_differences) as report_timings:
+            with self._phase('read'):
+                byte_identical = byte_check and self._files_byte_identical(file1_path, file2_path)
+            if byte_identical:
+                if column_tolerances:
+                    with self._open_csv_file(file1_path) as f:
+                        header = next(csv.reader(f), None)
+                    self._tolerance_specs(column_tolerances, header, header)
+                result = self._byte_identical_result(file1_path, file2_path, self._count_csv_records(file1_path))
+                if column_tolerances:
+                    result['column_mismatch_rows'] = {column: [] for column in column_tolerances}
+            elif quick_check:
+                result = self._quick_check_csv_files(file1_path, file2_path, ignore_order, normalize_numerics)
+            elif streaming:
+                result = self._compare_csv_files_streaming(
+                    file1_path, file2_path, ignore_order, normalize_numerics,
+                    memory_limit_mb, temp_dir, column_tolerances
+                )
+            else:
+                result = self._compare_csv_files_in_memory(
+                    file1_path, file2_path, ignore_order, normalize_numerics, column_tolerances
+                )
+            result['decided_by'] = 'bytes' if byte_identical else 'checksum' if quick_check else 'rows'
+            self._apply_difference_cap(result)
+            result['timings'] = report_timings()
+
+        if show_details:
+            self._log_comparison_result(result)
+
+        return result
+
+    def _compare_csv_files_in_memory(
+        self,
+        file1_path: str,
+        file2_path: str,
+        ignore_order: bool,
+        normalize_numerics: bool,
+        column_tolerances: Optional[Dict[str, Dict[str, float]]] = None
+    ) -> Dict[str, Any]:
+        """compare_csv_files with both files loaded into memory."""
+        with self._phase('read'):
+            csv1 = self._read_csv_file(file1_path)
+            csv2 = self._read_csv_file(file2_path)
+
+        tolerance_differences = []
+        if column_tolerances:
+            specs = self._tolerance_specs(column_tolerances, csv1[0] if csv1 else None, csv2[0] if csv2 else None)
+            tolerance_differences, mismatch_rows = self._compare_tolerance_columns(zip(csv1[1:], csv2[1:]), specs)
+            csv1 = csv1[:1] + [self._blank_columns(row, {spec[1] for spec in specs}) for row in csv1[1:]]
+            csv2 = csv2[:1] + [self._blank_columns(row, {spec[2] for spec in specs}) for row in csv2[1:]]
 
         result = {
             'status': 'UNKNOWN',
@@ -184,12 +556,11 @@ class FileComparisonLibrary:
             differences = self._compare_csv_ordered(csv1, csv2, normalize_numerics=normalize_numerics)
 
         result['differences'].extend(differences)
+        if column_tolerances:
+            result['differences'].extend(tolerance_differences)
+            result['column_mismatch_rows'] = mismatch_rows
         result['total_differences'] = len(result['differences'])
         result['status'] = 'IDENTICAL' if result['total_differences'] == 0 else 'DIFFERENT'
-
-        if show_details:
-            self._log_comparison_result(result)
-
         return result
 
     @keyword("Compare CSV Files With Exclusions")
@@ -201,7 +572,15 @@ class FileComparisonLibrary:
         match_key: Optional[str] = None,
         ignore_order: bool = True,
         show_details: bool = True,
-        normalize_numerics: bool = False
+        normalize_numerics: bool = False,
+        streaming: bool = False,
+        memory_limit_mb: int = 256,
+        temp_dir: Optional[str] = None,
+        workers: int = 1,
+        max_differences: int = 0,
+        sample_size: int = 0,
+        confidence: float = 0.95,
+        sample_seed: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Compare two CSV files while excluding specified keys from comparison.
@@ -216,6 +595,12 @@ class FileComparisonLibrary:
 
         Both exclusion types can be used together in the same comparison.
 
+        With match_key, rows are paired by key value, in file order when a key
+        occurs more than once. A key value occurring more than once in either
+        file is reported as DUPLICATE_KEY (with both counts and positions),
+        and its unpaired rows as UNMATCHED_ROW_IN_FILE1/2. Key-based
+        differences are listed in key order.
+
         Args:
             file1_path: Path to the first CSV file (actual output)
             file2_path: Path to the second CSV file (expected output)
@@ -225,9 +610,36 @@ class FileComparisonLibrary:
             show_details: Whether to show detailed comparison results (default: True)
             normalize_numerics: Whether to normalize numeric types before comparison
                                (e.g., 1250.0 treated as equal to 1250). Default: False.
+            streaming: Compare files larger than memory (default: False); requires
+                       match_key. Both files are sorted by key in on-disk runs and
+                       merge-joined, giving the same differences as the in-memory
+                       comparison.
+            memory_limit_mb: Approximate memory budget of a sort run for streaming
+                             comparison (default: 256).
+            temp_dir: Directory for the sort runs (default: system temp dir).
+            workers: Number of worker processes that normalize the JSON cells and
+                     compute the row keys, in chunks of rows (default: 1, no worker pool).
+            max_differences: Stop looking for differences once this many are found,
+                             see Compare CSV Files (default: 0, no limit).
+            sample_size: Compare only this many randomly chosen match_key values
+                         (default: 0, all of them); requires match_key. The keys of
+                         all rows are computed, but only the sampled keys' rows are
+                         normalized and compared. Sampled differences are the same
+                         as those of the full comparison for these keys.
+            confidence: Confidence level of the bound reported for a sampled
+                        comparison (default: 0.95).
+            sample_seed: Seed of the key sample (default: random; the seed used is
+                         reported so a failing sample can be re-run).
 
         Returns:
-            Dictionary with comparison results including status (IDENTICAL/DIFFERENT)
+            Dictionary with comparison results including status (IDENTICAL/DIFFERENT),
+            'truncated' and the 'timings' breakdown described in Compare CSV Files.
+            A sampled comparison adds 'sample': 'keys_total', 'keys_sampled',
+            'keys_with_differences', 'seed', 'confidence' and
+            'max_difference_rate', the share of all keys that can differ at
+            that confidence (one-sided Clopper-Pearson bound: with 300 keys
+            sampled and none differing, at most ~1% of keys differ at 95%).
+            IDENTICAL then means that no sampled key differs.
 
         Example:
             | # JSON key exclusion (Snowflake JSON-in-CSV):
@@ -242,36 +654,73 @@ class FileComparisonLibrary:
             |
             | # With numeric normalization:
             | ${result}= | Compare CSV Files With Exclusions | ${actual} | ${expected} | ${exclude} | normalize_numerics=${TRUE} |
+            |
+            | # Large JSON-in-CSV extracts, normalized on 4 cores:
+            | ${result}= | Compare CSV Files With Exclusions | ${actual} | ${expected} | ${exclude} | workers=4 |
+            |
+            | # 50M-row extracts matched by key in bounded memory:
+            | ${result}= | Compare CSV Files With Exclusions | ${actual} | ${expected} | ${exclude} | match_key=ID | streaming=${TRUE} |
+            |
+            | # Spot-check 1000 random keys:
+            | ${result}= | Compare CSV Files With Exclusions | ${actual} | ${expected} | ${exclude} | match_key=ID | sample_size=1000 |
         """
+        if streaming and not match_key:
+            raise ValueError("streaming=True requires a match_key: the streaming comparison joins rows by key")
+        sample_size = int(sample_size or 0)
+        if sample_size:
+            if sample_size < 0:
+                raise ValueError(f"sample_size must not be negative, got {sample_size}")
+            if not match_key or streaming:
+                raise ValueError("sample_size requires a match_key and streaming=False: keys are sampled from "
+                                 "the files in memory")
+            confidence = float(confidence)
+            if not 0 < confidence < 1:
+                raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+
+        with self._comparison_run(workers, max_differences) as report_timings:
+            if sample_size:
+                result = self._compare_csv_key_sample(
+                    file1_path, file2_path, exclude_keys, match_key, ignore_order, normalize_numerics,
+                    sample_size, confidence, sample_seed
+                )
+            elif streaming:
+                result = self._compare_csv_with_exclusions_streaming(
+                    file1_path, file2_path, exclude_keys, match_key, ignore_order, normalize_numerics,
+                    memory_limit_mb, temp_dir
+                )
+            else:
+                result = self._compare_csv_with_exclusions(
+                    file1_path, file2_path, exclude_keys, match_key, ignore_order, normalize_numerics
+                )
+            self._apply_difference_cap(result)
+            result['timings'] = report_timings()
+
+        if show_details:
+            self._log_comparison_result(result)
+
+        return result
+
+    def _compare_csv_with_exclusions(
+        self,
+        file1_path: str,
+        file2_path: str,
+        exclude_keys: List[str],
+        match_key: Optional[str],
+        ignore_order: bool,
+        normalize_numerics: bool
+    ) -> Dict[str, Any]:
+        """Body of compare_csv_with_exclusions (without logging)."""
         # Read CSV content
-        csv1 = self._read_csv_file(file1_path)
-        csv2 = self._read_csv_file(file2_path)
+        with self._phase('read'):
+            csv1 = self._read_csv_file(file1_path)
+            csv2 = self._read_csv_file(file2_path)
 
         # Phase 1: CSV column-level exclusion
         # Check if any exclude_keys match CSV column header names and remove those columns
         remaining_exclude_keys = list(exclude_keys) if exclude_keys else []
-        excluded_columns = []
 
         if csv1 and csv2 and exclude_keys:
-            headers1 = csv1[0]
-            headers2 = csv2[0]
-            exclude_keys_lower = {k.lower() for k in exclude_keys}
-
-            # Find column indices to exclude from each file (headers may differ)
-            exclude_indices_1 = set()
-            exclude_indices_2 = set()
-
-            for i, h in enumerate(headers1):
-                if h.lower() in exclude_keys_lower:
-                    exclude_indices_1.add(i)
-                    if h not in excluded_columns:
-                        excluded_columns.append(h)
-
-            for i, h in enumerate(headers2):
-                if h.lower() in exclude_keys_lower:
-                    exclude_indices_2.add(i)
-                    if h not in excluded_columns:
-                        excluded_columns.append(h)
+            exclude_indices_1, exclude_indices_2 = self._excluded_column_indices(csv1[0], csv2[0], exclude_keys)
 
             # Remove excluded columns from all rows
             if exclude_indices_1:
@@ -279,12 +728,10 @@ class FileComparisonLibrary:
             if exclude_indices_2:
                 csv2 = [[val for i, val in enumerate(row) if i not in exclude_indices_2] for row in csv2]
 
-            if excluded_columns:
-                logger.console(f"Excluded {len(excluded_columns)} CSV column(s) by header name: {excluded_columns}")
-
         # Phase 2: JSON key-level exclusion (normalize remaining JSON keys in cell values)
-        normalized_csv1 = self._normalize_csv_content(csv1, remaining_exclude_keys, normalize_numerics)
-        normalized_csv2 = self._normalize_csv_content(csv2, remaining_exclude_keys, normalize_numerics)
+        with self._phase('normalize'):
+            normalized_csv1 = self._normalize_csv_rows(csv1, remaining_exclude_keys, normalize_numerics)
+            normalized_csv2 = self._normalize_csv_rows(csv2, remaining_exclude_keys, normalize_numerics)
 
         result = {
             'status': 'UNKNOWN',
@@ -320,21 +767,9 @@ class FileComparisonLibrary:
             lookup2 = self._build_row_lookup(data2, match_key, headers2)
 
             if len(data1) > 0 and len(lookup1) == 0:
-                logger.console("")  # Add blank line before error
-                raise ValueError(
-                    f"match_key '{match_key}' not found in any row. Please check:\n"
-                    f"  1. For simple CSV: Use a column name exactly as in header (e.g., 'Name', 'CustomerID')\n"
-                    f"  2. For JSON in CSV: Use dot notation (e.g., 'headers.profile_id')\n"
-                    f"  3. The key name is spelled correctly (case-sensitive)"
-                )
+                raise self._match_key_not_found(match_key)
             if len(data2) > 0 and len(lookup2) == 0:
-                logger.console("")  # Add blank line before error
-                raise ValueError(
-                    f"match_key '{match_key}' not found in any row of expected file. Please check:\n"
-                    f"  1. For simple CSV: Use a column name exactly as in header (e.g., 'Name', 'CustomerID')\n"
-                    f"  2. For JSON in CSV: Use dot notation (e.g., 'headers.profile_id')\n"
-                    f"  3. The key name is spelled correctly (case-sensitive)"
-                )
+                raise self._match_key_not_found(match_key, " of expected file")
 
         # Compare data using appropriate method
         # Logic matches original Robot Framework implementation:
@@ -349,7 +784,8 @@ class FileComparisonLibrary:
                 logger.console(f"Row order will also be verified (ignore_order=False)")
 
             differences = self._compare_csv_by_key(
-                normalized_csv1, normalized_csv2, match_key, ignore_order, normalize_numerics
+                normalized_csv1, normalized_csv2, match_key, ignore_order, normalize_numerics,
+                lookups=(lookup1, lookup2)
             )
             result['differences'].extend(differences)
 
@@ -381,10 +817,6 @@ class FileComparisonLibrary:
 
         result['total_differences'] = len(result['differences'])
         result['status'] = 'IDENTICAL' if result['total_differences'] == 0 else 'DIFFERENT'
-
-        if show_details:
-            self._log_comparison_result(result)
-
         return result
 
     # ==================== JSON COMPARISON ====================
@@ -396,7 +828,11 @@ class FileComparisonLibrary:
         file2_path: str,
         ignore_order: bool = True,
         show_details: bool = True,
-        normalize_numerics: bool = False
+        normalize_numerics: bool = False,
+        streaming: bool = False,
+        memory_limit_mb: int = 256,
+        temp_dir: Optional[str] = None,
+        max_differences: int = 0
     ) -> Dict[str, Any]:
         """
         Compare two JSON files and return detailed comparison results.
@@ -404,17 +840,41 @@ class FileComparisonLibrary:
         Args:
             file1_path: Path to the first JSON file
             file2_path: Path to the second JSON file
-            ignore_order: Whether to ignore array order (default: True)
+            ignore_order: Whether to ignore array order (default: True). Arrays
+                          at every level are matched as multisets of items;
+                          only unmatched items are reported, under their
+                          position in file 1.
             show_details: Whether to log detailed differences (default: True)
             normalize_numerics: Whether to normalize numeric types before comparison
                                (e.g., 1250.0 treated as equal to 1250). Default: False.
+            streaming: Compare the files element by element without loading them
+                       (default: False), for multi-GB outputs. Each file is either
+                       a top-level JSON array or NDJSON / JSON Lines (one value per
+                       line; always assumed for .ndjson and .jsonl files), and its
+                       elements are compared:
+                       - ignore_order=True: as multisets of element digests (spilled
+                         to on-disk buckets beyond memory_limit_mb). Differences are
+                         ELEMENT_ONLY_IN_FILE1/2 and DUPLICATE_ELEMENT_MISMATCH, with
+                         the element's position as 'path' ([index]).
+                       - ignore_order=False: pairwise, with the same differences as
+                         the in-memory comparison of two arrays.
+                       The result adds 'file1_elements' and 'file2_elements'.
+            memory_limit_mb: Approximate memory budget for streaming comparison;
+                             determines the number of buckets (default: 256).
+            temp_dir: Directory for the streaming buckets (default: system temp dir).
+            max_differences: Stop looking for differences once this many are found,
+                             see Compare CSV Files (default: 0, no limit).
 
         Returns:
-            Dictionary with comparison results
+            Dictionary with comparison results, including 'truncated' (see
+            Compare CSV Files)
 
         Example:
             | ${result}= | Compare JSON Files | ${actual} | ${expected} |
             | Should Be Equal | ${result}[status] | IDENTICAL |
+            |
+            | # Multi-GB JSON array or NDJSON output of a file writer snap:
+            | ${result}= | Compare JSON Files | ${actual} | ${expected} | streaming=${TRUE} |
         """
         result = {
             'status': 'UNKNOWN',
@@ -426,26 +886,34 @@ class FileComparisonLibrary:
         }
 
         try:
-            json1 = self._read_json_file(file1_path)
-            json2 = self._read_json_file(file2_path)
-
-            if ignore_order:
-                files_equal = self._compare_json_ignore_order(json1, json2, normalize_numerics)
-            else:
-                if normalize_numerics:
-                    files_equal = self._normalize_json_numerics(json1) == self._normalize_json_numerics(json2)
+            with self._comparison_run(1, max_differences):
+                if streaming:
+                    result.update(self._compare_json_files_streaming(
+                        file1_path, file2_path, ignore_order, normalize_numerics, [], memory_limit_mb, temp_dir
+                    ))
                 else:
-                    files_equal = json1 == json2
+                    json1 = self._read_json_file(file1_path)
+                    json2 = self._read_json_file(file2_path)
 
-            if files_equal:
-                result['status'] = 'IDENTICAL'
-                result['files_match'] = True
-            else:
-                result['status'] = 'DIFFERENT'
-                result['files_match'] = False
-                differences = self._find_json_differences(json1, json2, '', normalize_numerics)
-                result['differences'] = differences
-                result['total_differences'] = len(differences)
+                    digests = {} if ignore_order else None
+                    if ignore_order:
+                        files_equal = self._compare_json_ignore_order(json1, json2, normalize_numerics, digests)
+                    else:
+                        if normalize_numerics:
+                            files_equal = self._normalize_json_numerics(json1) == self._normalize_json_numerics(json2)
+                        else:
+                            files_equal = json1 == json2
+
+                    if files_equal:
+                        result['status'] = 'IDENTICAL'
+                        result['files_match'] = True
+                    else:
+                        result['status'] = 'DIFFERENT'
+                        result['files_match'] = False
+                        result['differences'] = self._find_json_differences(
+                            json1, json2, '', normalize_numerics, digests, self._max_differences
+                        )
+                self._apply_difference_cap(result)
 
         except json.JSONDecodeError as e:
             result['status'] = 'ERROR'
@@ -455,7 +923,7 @@ class FileComparisonLibrary:
             })
 
         if show_details:
-            self._log_comparison_result(result)
+            self._log_comparison_result(result, 'json')
 
         return result
 
@@ -467,7 +935,11 @@ class FileComparisonLibrary:
         exclude_keys: List[str],
         ignore_order: bool = True,
         show_details: bool = True,
-        normalize_numerics: bool = False
+        normalize_numerics: bool = False,
+        streaming: bool = False,
+        memory_limit_mb: int = 256,
+        temp_dir: Optional[str] = None,
+        max_differences: int = 0
     ) -> Dict[str, Any]:
         """
         Compare two JSON files while excluding specified keys from comparison.
@@ -480,10 +952,37 @@ class FileComparisonLibrary:
             show_details: Whether to log detailed differences (default: True)
             normalize_numerics: Whether to normalize numeric types before comparison
                                (e.g., 1250.0 treated as equal to 1250). Default: False.
+            streaming: Compare JSON arrays / NDJSON element by element, see
+                       Compare JSON Files (default: False). Keys are excluded
+                       from each element.
+            memory_limit_mb: Approximate memory budget for streaming comparison (default: 256).
+            temp_dir: Directory for the streaming buckets (default: system temp dir).
+            max_differences: Stop looking for differences once this many are found,
+                             see Compare CSV Files (default: 0, no limit).
 
         Returns:
-            Dictionary with comparison results
+            Dictionary with comparison results, including 'truncated'
         """
+        if streaming:
+            result = {
+                'status': 'UNKNOWN',
+                'file1_path': file1_path,
+                'file2_path': file2_path,
+                'excluded_keys': exclude_keys,
+                'files_match': False,
+                'differences': [],
+                'total_differences': 0
+            }
+            with self._comparison_run(1, max_differences):
+                result.update(self._compare_json_files_streaming(
+                    file1_path, file2_path, ignore_order, normalize_numerics, exclude_keys,
+                    memory_limit_mb, temp_dir
+                ))
+                self._apply_difference_cap(result)
+            if show_details:
+                self._log_comparison_result(result, 'json')
+            return result
+
         json1 = self._read_json_file(file1_path)
         json2 = self._read_json_file(file2_path)
 
@@ -501,47 +1000,171 @@ class FileComparisonLibrary:
             'total_differences': 0
         }
 
-        if ignore_order:
-            files_equal = self._compare_json_ignore_order(
-                normalized_json1, normalized_json2, normalize_numerics
-            )
-        else:
-            if normalize_numerics:
-                files_equal = (self._normalize_json_numerics(normalized_json1) ==
-                              self._normalize_json_numerics(normalized_json2))
+        with self._comparison_run(1, max_differences):
+            digests = {} if ignore_order else None
+            if ignore_order:
+                files_equal = self._compare_json_ignore_order(
+                    normalized_json1, normalized_json2, normalize_numerics, digests
+                )
             else:
-                files_equal = normalized_json1 == normalized_json2
+                if normalize_numerics:
+                    files_equal = (self._normalize_json_numerics(normalized_json1) ==
+                                  self._normalize_json_numerics(normalized_json2))
+                else:
+                    files_equal = normalized_json1 == normalized_json2
 
-        if files_equal:
-            result['status'] = 'IDENTICAL'
-            result['files_match'] = True
-        else:
-            result['status'] = 'DIFFERENT'
-            result['files_match'] = False
-            differences = self._find_json_differences(
-                normalized_json1, normalized_json2, '', normalize_numerics
-            )
-            result['differences'] = differences
-            result['total_differences'] = len(differences)
+            if files_equal:
+                result['status'] = 'IDENTICAL'
+                result['files_match'] = True
+            else:
+                result['status'] = 'DIFFERENT'
+                result['files_match'] = False
+                result['differences'] = self._find_json_differences(
+                    normalized_json1, normalized_json2, '', normalize_numerics, digests, self._max_differences
+                )
+            self._apply_difference_cap(result)
 
         if show_details:
-            self._log_comparison_result(result)
+            self._log_comparison_result(result, 'json')
 
         return result
 
+    @keyword("Compare Parquet Files")
+    def compare_parquet_files(
+        self,
+        file1_path: str,
+        file2_path: str,
+        exclude_columns: Optional[List[str]] = None,
+        sort_by: Optional[List[str]] = None,
+        show_details: bool = True,
+        abs_tol: float = 0.0,
+        rel_tol: float = 0.0,
+        max_differences: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Compare two Parquet files column by column, one record batch at a time.
+
+        Only the compared columns are read, RECORD_BATCH_SIZE rows at a time,
+        and each column of a batch is compared as a whole by pyarrow compute
+        kernels: no CSV round-trip, and the column types are compared too.
+        Requires pyarrow (pip install pyarrow).
+
+        Args:
+            file1_path: Path to the first Parquet file (actual output)
+            file2_path: Path to the second Parquet file (expected output)
+            exclude_columns: Columns to leave out of the comparison (default: none)
+            sort_by: Columns to sort both files by before comparing rows by
+                     position, for outputs without a deterministic row order
+                     (default: none). Sorting reads the compared columns into
+                     memory (in columnar form).
+            show_details: Whether to log detailed differences (default: True)
+            abs_tol: Absolute tolerance for numeric columns (default: 0.0)
+            rel_tol: Relative tolerance for numeric columns (default: 0.0). Values
+                     match when abs(a - b) <= max(rel_tol * max(abs(a), abs(b)), abs_tol),
+                     as with math.isclose.
+            max_differences: Report at most this many differences (default: 0, no
+                             limit). Columns are still compared to the end, so row
+                             counts and 'column_mismatch_counts' stay exact.
+
+        Returns:
+            Dictionary with comparison results. Differences are HEADER_MISMATCH
+            (column names), COLUMN_TYPE_MISMATCH (values are then compared in
+            a common type), ROW_COUNT_MISMATCH and FIELD_VALUE_MISMATCH with
+            'row_index' (from 1) and 'column'. 'column_mismatch_counts' gives
+            the number of mismatching rows per column.
+
+        Example:
+            | ${result}= | Compare Parquet Files | ${actual} | ${expected} |
+            | Should Be Equal | ${result}[status] | IDENTICAL |
+            |
+            | # Float columns, rows in any order:
+            | ${result}= | Compare Parquet Files | ${actual} | ${expected} | sort_by=${keys} | abs_tol=1e-9 |
+        """
+        return self._compare_columnar_files(
+            'parquet', file1_path, file2_path, exclude_columns, sort_by, show_details, abs_tol, rel_tol,
+            max_differences
+        )
+
+    @keyword("Compare Avro Files")
+    def compare_avro_files(
+        self,
+        file1_path: str,
+        file2_path: str,
+        exclude_columns: Optional[List[str]] = None,
+        sort_by: Optional[List[str]] = None,
+        show_details: bool = True,
+        abs_tol: float = 0.0,
+        rel_tol: float = 0.0,
+        max_differences: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Compare two Avro container files field by field, one record batch at a time.
+
+        The records are read with fastavro into pyarrow record batches typed
+        from the writer schema, then compared exactly like Compare Parquet
+        Files. Requires fastavro and pyarrow (pip install fastavro pyarrow).
+
+        Args:
+            file1_path: Path to the first Avro file (actual output)
+            file2_path: Path to the second Avro file (expected output)
+            exclude_columns: Top-level fields to leave out of the comparison (default: none)
+            sort_by: Fields to sort both files by before comparing records by
+                     position (default: none), see Compare Parquet Files.
+            show_details: Whether to log detailed differences (default: True)
+            abs_tol: Absolute tolerance for numeric fields (default: 0.0)
+            rel_tol: Relative tolerance for numeric fields (default: 0.0)
+            max_differences: Report at most this many differences (default: 0, no limit)
+
+        Returns:
+            Dictionary with comparison results, as Compare Parquet Files.
+
+        Example:
+            | ${result}= | Compare Avro Files | ${actual} | ${expected} | exclude_columns=${volatile} |
+            | Should Be Equal | ${result}[status] | IDENTICAL |
+        """
+        return self._compare_columnar_files(
+            'avro', file1_path, file2_path, exclude_columns, sort_by, show_details, abs_tol, rel_tol,
+            max_differences
+        )
+
     # ==================== PRIVATE HELPER METHODS ====================
 
     def _read_csv_file(self, file_path: str) -> List[List[str]]:
         """Read CSV file and return as list of lists."""
-        with open(file_path, 'r', newline='', encoding='utf-8') as f:
+        with self._open_csv_file(file_path) as f:
             reader = csv.reader(f)
             return [row for row in reader]
 
+    def _open_csv_file(self, file_path: str) -> TextIO:
+        """Open a CSV file for reading as text, ready for csv.reader."""
+        return self._open_text_file(file_path, newline='')
+
     def _read_json_file(self, file_path: str) -> Any:
         """Read JSON file and return parsed data."""
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with self._open_text_file(file_path) as f:
             return json.load(f)
 
+    def _open_text_file(self, file_path: str, newline: Optional[str] = None) -> TextIO:
+        """Open a UTF-8 text file for reading; gzip and bzip2 files (recognized
+        by their magic bytes, whatever their name) are decompressed as a stream."""
+        with open(file_path, 'rb') as f:
+            magic = f.read(3)
+        if magic[:2] == b'\x1f\x8b':
+            return gzip.open(file_path, 'rt', encoding='utf-8', newline=newline)
+        if magic == b'BZh':
+            return bz2.open(file_path, 'rt', encoding='utf-8', newline=newline)
+        return open(file_path, 'r', encoding='utf-8', newline=newline)
+
+    def _text_size_estimate(self, file_path: str) -> int:
+        """Approximate size of a file's text: its size, times
+        COMPRESSION_RATIO_ESTIMATE for gzip and bzip2 files."""
+        size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as f:
+            magic = f.read(3)
+        if magic[:2] == b'\x1f\x8b' or magic == b'BZh':
+            return size * self.COMPRESSION_RATIO_ESTIMATE
+        return size
+
     def _normalize_csv_content(
         self,
         csv_content: List[List[str]],
@@ -555,6 +1178,42 @@ class FileComparisonLibrary:
             for row in csv_content
         ]
 
+    def _excluded_column_indices(
+        self,
+        headers1: List[str],
+        headers2: List[str],
+        exclude_keys: List[str]
+    ) -> tuple:
+        """Indices of the columns of each file whose header name is an exclude key
+        (case-insensitive). Headers may differ between the files."""
+        exclude_keys_lower = {k.lower() for k in exclude_keys}
+        excluded_columns = []
+        indices = []
+        for headers in (headers1, headers2):
+            file_indices = set()
+            for i, h in enumerate(headers):
+                if h.lower() in exclude_keys_lower:
+                    file_indices.add(i)
+                    if h not in excluded_columns:
+                        excluded_columns.append(h)
+            indices.append(file_indices)
+
+        if excluded_columns:
+            logger.console(f"Excluded {len(excluded_columns)} CSV column(s) by header name: {excluded_columns}")
+        return indices[0], indices[1]
+
+    def _normalize_csv_rows(
+        self,
+        csv_content: List[List[str]],
+        exclude_keys: List[str],
+        normalize_numerics: bool = False
+    ) -> List[List[str]]:
+        """_normalize_csv_content applied chunk by chunk (in the worker pool, if any)."""
+        normalized = []
+        for _, rows in self._map_row_chunks('_normalize_csv_content', csv_content, exclude_keys, normalize_numerics):
+            normalized.extend(rows)
+        return normalized
+
     def _normalize_field(self, field: str, exclude_keys_lower: Set[str],
                          normalize_numerics: bool = False) -> str:
         """Normalize a single field by removing excluded keys if it's JSON.
@@ -637,44 +1296,46 @@ class FileComparisonLibrary:
         csv2: List[List[str]],
         normalize_numerics: bool = False
     ) -> bool:
-        """Compare CSV content using set-based comparison (ignoring row order).
+        """Compare CSV content as row multisets (ignoring row order).
 
-        This method converts rows to tuples and compares as sets.
+        Each row must occur the same number of times in both files, so a
+        duplicated or dropped copy of a row is a difference.
         When normalize_numerics=True, uses numeric-aware normalization so
         1250.0 and 1250 are treated as equal.
-        Returns True if the sets are equal, False otherwise.
+        Returns True if the multisets are equal, False otherwise.
         """
-        # Get data rows (skip headers)
         data1 = csv1[1:] if csv1 else []
         data2 = csv2[1:] if csv2 else []
-
-        # Convert rows to tuples for set comparison
-        # Normalize each field for numeric-aware comparison when flag is set
-        set1 = {tuple(self._normalize_csv_row(row, normalize_numerics)) for row in data1}
-        set2 = {tuple(self._normalize_csv_row(row, normalize_numerics)) for row in data2}
+        differences = self._compare_csv_unordered(csv1, csv2, normalize_numerics)
 
         # Debug logging
-        logger.info(f"Set comparison - File1 rows: {len(set1)}, File2 rows: {len(set2)}")
+        logger.info(f"Multiset comparison - File1 rows: {len(data1)}, File2 rows: {len(data2)}")
 
-        if set1 != set2:
-            # Find what's different
-            only_in_set1 = set1 - set2
-            only_in_set2 = set2 - set1
+        if differences:
+            only_in_set1 = [d['row_content'] for d in differences if d['type'] == 'ROW_ONLY_IN_FILE1']
+            only_in_set2 = [d['row_content'] for d in differences if d['type'] == 'ROW_ONLY_IN_FILE2']
+            duplicates = [d for d in differences if d['type'] == 'DUPLICATE_ROW_MISMATCH']
 
             if only_in_set1:
                 logger.info(f"Rows only in file1: {len(only_in_set1)}")
-                for i, row in enumerate(list(only_in_set1)[:2]):  # Log first 2
+                for i, row in enumerate(only_in_set1[:2]):  # Log first 2
                     logger.info(f"  File1 row {i}: {str(row)[:500]}")
 
             if only_in_set2:
                 logger.info(f"Rows only in file2: {len(only_in_set2)}")
-                for i, row in enumerate(list(only_in_set2)[:2]):  # Log first 2
+                for i, row in enumerate(only_in_set2[:2]):  # Log first 2
                     logger.info(f"  File2 row {i}: {str(row)[:500]}")
 
+            if duplicates:
+                logger.info(f"Rows with different duplicate counts: {len(duplicates)}")
+                for diff in duplicates[:2]:
+                    logger.info(f"  {diff['file1_count']}x in file1, {diff['file2_count']}x in file2: "
+                                f"{str(diff['row_content'])[:500]}")
+
             # Try to find near-matches for debugging
             if only_in_set1 and only_in_set2:
-                sample1 = list(only_in_set1)[0]
-                sample2 = list(only_in_set2)[0]
+                sample1 = only_in_set1[0]
+                sample2 = only_in_set2[0]
                 # Compare field by field
                 for idx, (f1, f2) in enumerate(zip(sample1, sample2)):
                     if f1 != f2:
@@ -683,7 +1344,7 @@ class FileComparisonLibrary:
                         logger.info(f"    File2 field: {f2[:300] if len(f2) > 300 else f2}")
                         break
 
-        return set1 == set2
+        return not differences
 
     def _compare_csv_unordered(
         self,
@@ -693,34 +1354,115 @@ class FileComparisonLibrary:
     ) -> List[Dict[str, Any]]:
         """Compare CSV content ignoring row order.
 
+        Rows are compared as multisets: each normalized row is reduced to a
+        fixed-size digest and the digests are counted, so memory per row is
+        constant and duplicate rows are counted rather than collapsed. Row
+        text is recovered in a second pass, only for rows whose counts differ.
+
         When normalize_numerics=True, uses numeric-aware normalization so
         1250.0 and 1250 are treated as equal.
         """
-        differences = []
-
         # Get data rows (skip headers)
         data1 = csv1[1:] if csv1 else []
         data2 = csv2[1:] if csv2 else []
 
-        # Convert to sets of tuples for comparison with optional numeric normalization
-        set1 = {tuple(self._normalize_csv_row(row, normalize_numerics)) for row in data1}
-        set2 = {tuple(self._normalize_csv_row(row, normalize_numerics)) for row in data2}
+        with self._phase('normalize'):
+            counts1 = self._count_row_digests(data1, normalize_numerics)
+            counts2 = self._count_row_digests(data2, normalize_numerics)
+
+        def rows_for_digests(wanted: Set[bytes]) -> Dict[bytes, List[str]]:
+            return self._find_rows_by_digest((data1, data2), wanted, normalize_numerics)
+
+        return self._multiset_row_differences(counts1, counts2, rows_for_digests)
+
+    def _count_row_digests(self, rows, normalize_numerics: bool) -> Counter:
+        """Counter of the digests of the normalized rows, computed chunk by chunk."""
+        counts = Counter()
+        for _, digests in self._map_row_chunks('_digest_chunk', rows, normalize_numerics):
+            counts.update(digests)
+        return counts
+
+    def _find_rows_by_digest(self, sources, wanted: Set[bytes], normalize_numerics: bool) -> Dict[bytes, List[str]]:
+        """Second pass: {digest: normalized row} for the wanted digests, scanning row
+        sources in order and stopping as soon as every digest has been found."""
+        found = {}
+        for rows in sources:
+            for chunk, digests in self._map_row_chunks('_digest_chunk', rows, normalize_numerics):
+                for row, digest in zip(chunk, digests):
+                    if digest in wanted and digest not in found:
+                        found[digest] = self._normalize_csv_row(row, normalize_numerics)
+                        if len(found) == len(wanted):
+                            return found
+        return found
+
+    def _row_digest(self, row: List[str]) -> bytes:
+        """Fixed-size digest of a (normalized) row, distinct for distinct rows.
+
+        Fields are joined with the unit separator; rows whose fields contain
+        it are encoded as JSON behind a 0xFF byte, which never occurs in UTF-8,
+        so the two encodings cannot collide.
+        """
+        text = '\x1f'.join(row)
+        if row and text.count('\x1f') == len(row) - 1:
+            data = text.encode('utf-8', 'surrogatepass')
+        else:
+            data = b'\xff' + json.dumps(row).encode('ascii')
+        return blake2b(data, digest_size=self.ROW_DIGEST_SIZE).digest()
 
-        # Find rows only in file1
-        for row in set1 - set2:
-            differences.append({
-                'type': 'ROW_ONLY_IN_FILE1',
-                'row_content': list(row)
-            })
+    def _multiset_row_differences(
+        self,
+        counts1: Counter,
+        counts2: Counter,
+        rows_for_digests
+    ) -> List[Dict[str, Any]]:
+        """Differences between two row multisets given as digest counters.
 
-        # Find rows only in file2
-        for row in set2 - set1:
-            differences.append({
-                'type': 'ROW_ONLY_IN_FILE2',
-                'row_content': list(row)
-            })
+        rows_for_digests(wanted) is only called when the multisets differ: a
+        second pass returning {digest: row} for the mismatched digests (at
+        most max_differences of them, when capped).
+        Rows missing from one file are ROW_ONLY_IN_FILE1/2 (with their count);
+        rows present in both with different counts are DUPLICATE_ROW_MISMATCH.
+        """
+        mismatched = self._capped_mismatches(self._mismatched_counts(counts1, counts2))
+        if not mismatched:
+            return []
+
+        rows = rows_for_digests(set(mismatched))
+        only_in_file1, only_in_file2, duplicates = [], [], []
+        for digest, (count1, count2) in mismatched.items():
+            row = list(rows[digest])
+            if count2 == 0:
+                only_in_file1.append({'type': 'ROW_ONLY_IN_FILE1', 'row_content': row, 'count': count1})
+            elif count1 == 0:
+                only_in_file2.append({'type': 'ROW_ONLY_IN_FILE2', 'row_content': row, 'count': count2})
+            else:
+                duplicates.append({
+                    'type': 'DUPLICATE_ROW_MISMATCH',
+                    'row_content': row,
+                    'file1_count': count1,
+                    'file2_count': count2
+                })
+        return only_in_file1 + only_in_file2 + duplicates
 
-        return differences
+    def _capped_mismatches(self, mismatched: Dict[Any, tuple]) -> Dict[Any, tuple]:
+        """The first max_differences mismatched digests (all of them without a cap),
+        so that only their rows are looked up."""
+        if self._difference_cap_reached(mismatched):
+            return dict(islice(mismatched.items(), self._max_differences))
+        return mismatched
+
+    @staticmethod
+    def _mismatched_counts(counts1: Counter, counts2: Counter) -> Dict[Any, tuple]:
+        """{digest: (count in file1, count in file2)} for the digests whose counts differ."""
+        mismatched = {}
+        for digest, count1 in counts1.items():
+            count2 = counts2.get(digest, 0)
+            if count1 != count2:
+                mismatched[digest] = (count1, count2)
+        for digest, count2 in counts2.items():
+            if digest not in counts1:
+                mismatched[digest] = (0, count2)
+        return mismatched
 
     def _compare_csv_ordered(
         self,
@@ -732,79 +1474,75 @@ class FileComparisonLibrary:
         """Compare CSV content in order with detailed field-level differences.
 
         Also finds matching rows between files to show where each row can be found.
+        Rows are first compared pairwise in chunks; the row keys used to find
+        matches are only computed, once per file, when some pair differs.
+        With a difference cap the pairwise walk stops once the cap is reached.
         """
         differences = []
-        max_rows = max(len(csv1), len(csv2))
-
-        # Build a lookup of file2 rows for finding matches
-        # Key is a normalized string representation of the row (excluding dynamic fields)
-        file2_row_lookup = {}
-        for idx in range(1, len(csv2)):
-            row_key = self._get_row_key_for_matching(csv2[idx], exclude_keys, normalize_numerics)
-            if row_key not in file2_row_lookup:
-                file2_row_lookup[row_key] = []
-            file2_row_lookup[row_key].append(idx)
-
-        for row_index in range(1, max_rows):  # Skip header
-            has_row1 = row_index < len(csv1)
-            has_row2 = row_index < len(csv2)
-
-            if has_row1 and has_row2:
-                # Use numeric-aware comparison when flag is set
-                norm_row1 = self._normalize_csv_row(csv1[row_index], normalize_numerics)
-                norm_row2 = self._normalize_csv_row(csv2[row_index], normalize_numerics)
-                if norm_row1 != norm_row2:
-                    diff = {
-                        'type': 'ROW_CONTENT_MISMATCH',
-                        'row_index': row_index,
-                        'file1_row': csv1[row_index],
-                        'file2_row': csv2[row_index]
-                    }
-                    # Get detailed field-level differences for clear output
-                    field_diffs = self._compare_row_fields_with_details(
-                        csv1[row_index], csv2[row_index], row_index, normalize_numerics
-                    )
-                    if field_diffs:
-                        diff['field_differences'] = field_diffs
-
-                    # Find where this row from file1 exists in file2 (if anywhere)
-                    # Row indices start at 1 (header is 0), so use directly as data row number
-                    row1_key = self._get_row_key_for_matching(
-                        csv1[row_index], exclude_keys, normalize_numerics
-                    )
-                    if row1_key in file2_row_lookup:
-                        matching_rows_in_file2 = file2_row_lookup[row1_key]
-                        diff['file1_row_matches_file2_rows'] = matching_rows_in_file2  # Already 1-based data row numbers
-
-                    # Find where this row from file2 exists in file1 (if anywhere)
-                    row2_key = self._get_row_key_for_matching(
-                        csv2[row_index], exclude_keys, normalize_numerics
-                    )
-                    file1_matches = []
-                    for idx in range(1, len(csv1)):
-                        if self._get_row_key_for_matching(
-                            csv1[idx], exclude_keys, normalize_numerics
-                        ) == row2_key:
-                            file1_matches.append(idx)  # idx is already 1-based data row number
-                    if file1_matches:
-                        diff['file2_row_matches_file1_rows'] = file1_matches
-
-                    differences.append(diff)
-            elif has_row1:
-                differences.append({
-                    'type': 'EXTRA_ROW_IN_FILE1',
-                    'row_index': row_index,
-                    'row_content': csv1[row_index]
-                })
-            elif has_row2:
-                differences.append({
-                    'type': 'EXTRA_ROW_IN_FILE2',
-                    'row_index': row_index,
-                    'row_content': csv2[row_index]
-                })
+        data1 = csv1[1:]  # Skip header
+        data2 = csv2[1:]
+
+        with self._phase('normalize'):
+            # 1-based data row numbers (= indices into csv1/csv2) of differing row pairs
+            mismatched_rows = []
+            offset = 1
+            for pairs, mismatches in self._map_row_chunks(
+                '_mismatch_chunk', zip(data1, data2), normalize_numerics
+            ):
+                mismatched_rows.extend(offset + i for i in mismatches)
+                offset += len(pairs)
+                if self._difference_cap_reached(mismatched_rows):
+                    del mismatched_rows[self._max_differences:]
+                    break
+
+            # Key is a normalized string representation of the row (excluding dynamic fields)
+            if mismatched_rows:
+                keys1, file1_row_lookup = self._row_keys_with_lookup(data1, exclude_keys, normalize_numerics)
+                keys2, file2_row_lookup = self._row_keys_with_lookup(data2, exclude_keys, normalize_numerics)
+
+        for row_index in mismatched_rows:
+            # With detailed field-level differences for clear output
+            diff = self._ordered_row_difference(row_index, csv1[row_index], csv2[row_index], normalize_numerics)
+
+            # Find where this row from file1 exists in file2 (if anywhere)
+            # Row indices start at 1 (header is 0), so use directly as data row number
+            matching_rows_in_file2 = file2_row_lookup.get(keys1[row_index - 1])
+            if matching_rows_in_file2:
+                diff['file1_row_matches_file2_rows'] = matching_rows_in_file2
+
+            # Find where this row from file2 exists in file1 (if anywhere)
+            matching_rows_in_file1 = file1_row_lookup.get(keys2[row_index - 1])
+            if matching_rows_in_file1:
+                diff['file2_row_matches_file1_rows'] = matching_rows_in_file1
+
+            differences.append(diff)
+
+        for row_index in range(len(data2) + 1, len(data1) + 1):
+            if self._difference_cap_reached(differences):
+                break
+            differences.append(self._ordered_row_difference(row_index, csv1[row_index], None, normalize_numerics))
+        for row_index in range(len(data1) + 1, len(data2) + 1):
+            if self._difference_cap_reached(differences):
+                break
+            differences.append(self._ordered_row_difference(row_index, None, csv2[row_index], normalize_numerics))
 
         return differences
 
+    def _row_keys_with_lookup(
+        self,
+        rows: List[List[str]],
+        exclude_keys: Optional[List[str]],
+        normalize_numerics: bool
+    ) -> tuple:
+        """Row matching keys of `rows` and {key: [1-based data row numbers]}."""
+        keys = []
+        for _, chunk_keys in self._map_row_chunks('_row_key_chunk', rows, exclude_keys, normalize_numerics):
+            keys.extend(chunk_keys)
+        lookup = {}
+        for row_number, key in enumerate(keys, start=1):
+            lookup.setdefault(key, []).append(row_number)
+        return keys, lookup
+
     def _get_row_key_for_matching(self, row: List[str], exclude_keys: List[str] = None,
                                   normalize_numerics: bool = False) -> str:
         """Generate a key for row matching by normalizing JSON content and excluding dynamic fields.
@@ -843,75 +1581,109 @@ class FileComparisonLibrary:
         csv2: List[List[str]],
         match_key: str,
         ignore_order: bool,
-        normalize_numerics: bool = False
+        normalize_numerics: bool = False,
+        lookups: Optional[tuple] = None
     ) -> List[Dict[str, Any]]:
-        """Compare CSV rows by matching them using a specific key field."""
-        differences = []
-
-        # Get headers and data rows
-        headers1 = csv1[0] if csv1 else []
-        headers2 = csv2[0] if csv2 else []
-        data1 = csv1[1:] if csv1 else []
-        data2 = csv2[1:] if csv2 else []
+        """Compare CSV rows by matching them using a specific key field.
 
-        # Build lookup dictionaries (pass headers for column-based matching)
-        lookup1 = self._build_row_lookup(data1, match_key, headers1)
-        lookup2 = self._build_row_lookup(data2, match_key, headers2)
-
-        all_keys = set(lookup1.keys()) | set(lookup2.keys())
+        `lookups` are the _build_row_lookup results of both files, if the
+        caller already built them. Differences are listed in key order.
+        """
+        differences = []
 
-        for key_value in all_keys:
-            in_file1 = key_value in lookup1
-            in_file2 = key_value in lookup2
+        if lookups is None:
+            # Get headers and data rows
+            headers1 = csv1[0] if csv1 else []
+            headers2 = csv2[0] if csv2 else []
+            data1 = csv1[1:] if csv1 else []
+            data2 = csv2[1:] if csv2 else []
+
+            # Build lookup dictionaries (pass headers for column-based matching)
+            lookups = (self._build_row_lookup(data1, match_key, headers1),
+                       self._build_row_lookup(data2, match_key, headers2))
+        lookup1, lookup2 = lookups
+
+        for key_value in sorted(lookup1.keys() | lookup2.keys()):
+            if self._difference_cap_reached(differences):
+                break
+            differences.extend(self._compare_key_rows(
+                key_value, lookup1.get(key_value, []), lookup2.get(key_value, []),
+                match_key, ignore_order, normalize_numerics
+            ))
 
-            if in_file1 and in_file2:
-                row_info1 = lookup1[key_value]
-                row_info2 = lookup2[key_value]
+        return differences
 
-                # Check row order if not ignoring
-                if not ignore_order and row_info1['index'] != row_info2['index']:
-                    differences.append({
-                        'type': 'ROW_ORDER_MISMATCH',
-                        'match_key': match_key,
-                        'key_value': key_value,
-                        'file1_position': row_info1['index'],
-                        'file2_position': row_info2['index']
-                    })
+    def _compare_key_rows(
+        self,
+        key_value: str,
+        rows1: List[Dict[str, Any]],
+        rows2: List[Dict[str, Any]],
+        match_key: str,
+        ignore_order: bool,
+        normalize_numerics: bool
+    ) -> List[Dict[str, Any]]:
+        """Differences for one match_key value, given its rows ({'row', 'index'})
+        in each file in file order. The n-th row in file1 is paired with the
+        n-th row in file2; a key occurring more than once in either file is a
+        DUPLICATE_KEY difference and its unpaired rows are unmatched."""
+        differences = []
 
-                # Compare row content with optional numeric-aware comparison
-                norm_row1 = self._normalize_csv_row(row_info1['row'], normalize_numerics)
-                norm_row2 = self._normalize_csv_row(row_info2['row'], normalize_numerics)
-                if norm_row1 != norm_row2:
-                    diff = {
-                        'type': 'ROW_CONTENT_MISMATCH',
-                        'match_key': match_key,
-                        'key_value': key_value,
-                        'file1_row': row_info1['row'],
-                        'file2_row': row_info2['row']
-                    }
-                    # Get field-level differences
-                    field_diffs = self._compare_row_fields_with_details(
-                        row_info1['row'], row_info2['row'], row_info1['index'],
-                        normalize_numerics
-                    )
-                    if field_diffs:
-                        diff['field_differences'] = field_diffs
-                    differences.append(diff)
+        if len(rows1) > 1 or len(rows2) > 1:
+            differences.append({
+                'type': 'DUPLICATE_KEY',
+                'match_key': match_key,
+                'key_value': key_value,
+                'file1_count': len(rows1),
+                'file2_count': len(rows2),
+                'file1_positions': [row_info['index'] for row_info in rows1],
+                'file2_positions': [row_info['index'] for row_info in rows2]
+            })
 
-            elif in_file1:
+        for row_info1, row_info2 in zip(rows1, rows2):
+            # Check row order if not ignoring
+            if not ignore_order and row_info1['index'] != row_info2['index']:
                 differences.append({
-                    'type': 'UNMATCHED_ROW_IN_FILE1',
+                    'type': 'ROW_ORDER_MISMATCH',
                     'match_key': match_key,
                     'key_value': key_value,
-                    'row_content': lookup1[key_value]['row']
+                    'file1_position': row_info1['index'],
+                    'file2_position': row_info2['index']
                 })
-            else:
-                differences.append({
-                    'type': 'UNMATCHED_ROW_IN_FILE2',
+
+            # Compare row content with optional numeric-aware comparison
+            norm_row1 = self._normalize_csv_row(row_info1['row'], normalize_numerics)
+            norm_row2 = self._normalize_csv_row(row_info2['row'], normalize_numerics)
+            if norm_row1 != norm_row2:
+                diff = {
+                    'type': 'ROW_CONTENT_MISMATCH',
                     'match_key': match_key,
                     'key_value': key_value,
-                    'row_content': lookup2[key_value]['row']
-                })
+                    'file1_row': row_info1['row'],
+                    'file2_row': row_info2['row']
+                }
+                # Get field-level differences
+                field_diffs = self._compare_row_fields_with_details(
+                    row_info1['row'], row_info2['row'], row_info1['index'],
+                    normalize_numerics
+                )
+                if field_diffs:
+                    diff['field_differences'] = field_diffs
+                differences.append(diff)
+
+        for row_info1 in rows1[len(rows2):]:
+            differences.append({
+                'type': 'UNMATCHED_ROW_IN_FILE1',
+                'match_key': match_key,
+                'key_value': key_value,
+                'row_content': row_info1['row']
+            })
+        for row_info2 in rows2[len(rows1):]:
+            differences.append({
+                'type': 'UNMATCHED_ROW_IN_FILE2',
+                'match_key': match_key,
+                'key_value': key_value,
+                'row_content': row_info2['row']
+            })
 
         return differences
 
@@ -1104,8 +1876,9 @@ class FileComparisonLibrary:
         rows: List[List[str]],
         match_key: str,
         headers: List[str] = None
-    ) -> Dict[str, Dict[str, Any]]:
-        """Build a dictionary mapping match_key values to rows and positions.
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Build a dictionary mapping match_key values to their rows and
+        positions ({'row', 'index'}), in file order. Rows without the key are left out.
 
         Supports both:
         - Simple CSV column names (e.g., 'Name', 'CustomerID')
@@ -1113,19 +1886,35 @@ class FileComparisonLibrary:
         """
         lookup = {}
         key_parts = match_key.split('.')
+        column_index = self._match_key_column(match_key, headers)
 
+        index = 0
+        for chunk, key_values in self._map_row_chunks('_match_key_chunk', rows, key_parts, column_index):
+            for row, key_value in zip(chunk, key_values):
+                if key_value is not None:
+                    lookup.setdefault(key_value, []).append({'row': row, 'index': index})
+                index += 1
+
+        return lookup
+
+    def _match_key_column(self, match_key: str, headers: Optional[List[str]]) -> Optional[int]:
+        """Index of the column named match_key, or None to look the key up in JSON fields."""
         # Check if match_key is a simple column name (exists in headers)
-        column_index = None
         if headers and match_key in headers:
             column_index = headers.index(match_key)
             logger.info(f"Using column-based matching: '{match_key}' at index {column_index}")
+            return column_index
+        return None
 
-        for index, row in enumerate(rows):
-            key_value = self._extract_key_from_row(row, key_parts, column_index)
-            if key_value is not None:
-                lookup[str(key_value)] = {'row': row, 'index': index}
-
-        return lookup
+    def _match_key_not_found(self, match_key: str, where: str = "") -> ValueError:
+        """Error for a match_key that no row of a file has."""
+        logger.console("")  # Add blank line before error
+        return ValueError(
+            f"match_key '{match_key}' not found in any row{where}. Please check:\n"
+            f"  1. For simple CSV: Use a column name exactly as in header (e.g., 'Name', 'CustomerID')\n"
+            f"  2. For JSON in CSV: Use dot notation (e.g., 'headers.profile_id')\n"
+            f"  3. The key name is spelled correctly (case-sensitive)"
+        )
 
     def _extract_key_from_row(
         self,
@@ -1180,63 +1969,113 @@ class FileComparisonLibrary:
             return None
 
     def _compare_json_ignore_order(self, json1: Any, json2: Any,
-                                   normalize_numerics: bool = False) -> bool:
+                                   normalize_numerics: bool = False,
+                                   digests: Optional[Dict[int, bytes]] = None) -> bool:
         """Compare two JSON structures ignoring array order.
 
+        The structures are equal when their order-insensitive digests are
+        (see _json_digest). Pass a `digests` dictionary to keep the digests
+        of the array elements for a following _find_json_differences call.
+
         When normalize_numerics=True, 1250.0 and 1250 are treated as equal.
         """
-        # Normalize numeric values before comparison only if flag is set
-        if normalize_numerics:
-            norm1 = self._normalize_numeric_value(json1)
-            norm2 = self._normalize_numeric_value(json2)
-        else:
-            norm1 = json1
-            norm2 = json2
-
-        if type(norm1) != type(norm2):
-            return False
+        if digests is None:
+            digests = {}
+        return (self._json_digest(json1, True, normalize_numerics, digests) ==
+                self._json_digest(json2, True, normalize_numerics, digests))
 
-        if isinstance(norm1, dict):
-            if set(norm1.keys()) != set(norm2.keys()):
-                return False
-            return all(
-                self._compare_json_ignore_order(norm1[k], norm2[k], normalize_numerics)
-                for k in norm1.keys()
-            )
-        elif isinstance(norm1, list):
-            if len(norm1) != len(norm2):
-                return False
-            try:
-                if normalize_numerics:
-                    norm1_sorted = sorted(norm1, key=lambda x: json.dumps(
-                        self._normalize_json_numerics(x), sort_keys=True))
-                    norm2_sorted = sorted(norm2, key=lambda x: json.dumps(
-                        self._normalize_json_numerics(x), sort_keys=True))
+    def _json_digest(
+        self,
+        value: Any,
+        ignore_order: bool,
+        normalize_numerics: bool = False,
+        digests: Optional[Dict[int, bytes]] = None
+    ) -> bytes:
+        """Fixed-size structural digest of a JSON value, computed bottom-up.
+
+        Equal values have equal digests; int, float, bool and null stay
+        distinct types (as in the in-memory comparison), unless
+        normalize_numerics makes whole floats ints. With ignore_order the
+        items of every list are sorted, so lists compare as multisets at
+        every nesting level.
+
+        `digests` memoizes by id() the digest of `value` and of every dict or
+        list that is a list item, the nodes _find_json_differences matches
+        and descends into, so those are hashed once however often their
+        subtrees are compared. Containers under dict keys are hashed again
+        when their parent is not memoized, which keeps the memo to one entry
+        per array element. It is only valid while the hashed documents are
+        alive.
+        """
+        if digests is None:
+            digests = {}
+        digest_size = self.ROW_DIGEST_SIZE
+
+        def item_text(item: Any, keep: bool = False) -> str:
+            # A dict value or list item inside its parent's digest input:
+            # scalars as JSON text, containers as '#' and their digest (fixed
+            # length, and '#' never starts JSON text, so this is unambiguous)
+            item_type = type(item)
+            if item_type is str:
+                return encode_basestring_ascii(item)
+            if item_type is dict or item_type is list:
+                return '#' + node_digest(item, keep).hex()
+            if item_type is int:
+                return int.__repr__(item)
+            if item_type is float:
+                if normalize_numerics and item.is_integer():
+                    item = int(item)
+                elif item == 0:
+                    item = 0.0  # -0.0 == 0.0
+            return json.dumps(item)
+
+        def node_digest(node: Any, keep: bool) -> bytes:
+            digest = digests.get(id(node))
+            if digest is None:
+                if type(node) is dict:
+                    text = '{' + ','.join([encode_basestring_ascii(key) + ':' + item_text(node[key])
+                                           for key in sorted(node)])
                 else:
-                    norm1_sorted = sorted(norm1, key=lambda x: json.dumps(x, sort_keys=True))
-                    norm2_sorted = sorted(norm2, key=lambda x: json.dumps(x, sort_keys=True))
-                return all(
-                    self._compare_json_ignore_order(a, b, normalize_numerics)
-                    for a, b in zip(norm1_sorted, norm2_sorted)
-                )
-            except TypeError:
-                return norm1 == norm2
-        else:
-            return norm1 == norm2
+                    items = [item_text(item, True) for item in node]
+                    if ignore_order:
+                        items.sort()
+                    text = '[' + ','.join(items)
+                digest = blake2b(text.encode('ascii'), digest_size=digest_size).digest()
+                if keep:
+                    digests[id(node)] = digest
+            return digest
+
+        if type(value) is dict or type(value) is list:
+            return node_digest(value, True)
+        return blake2b(item_text(value).encode('ascii'), digest_size=digest_size).digest()
 
     def _find_json_differences(
         self,
         json1: Any,
         json2: Any,
         path: str,
-        normalize_numerics: bool = False
+        normalize_numerics: bool = False,
+        digests: Optional[Dict[int, bytes]] = None,
+        limit: int = 0
     ) -> List[Dict[str, Any]]:
         """Find all differences between two JSON structures.
 
         When normalize_numerics=True, 1250.0 and 1250 are treated as equal.
+
+        With `digests` (the memo of _compare_json_ignore_order) array order is
+        ignored: subtrees with equal digests are skipped, array items are
+        matched by digest and only the unmatched items are compared, pairwise
+        in file order, under the path of their position in file 1.
+
+        With `limit` > 0 the walk stops once `limit` differences are found.
         """
         differences = []
 
+        if digests is not None and isinstance(json1, (dict, list)) and (
+                self._json_digest(json1, True, normalize_numerics, digests) ==
+                self._json_digest(json2, True, normalize_numerics, digests)):
+            return differences
+
         # Normalize numeric values before comparison only if flag is set
         if normalize_numerics:
             norm1 = self._normalize_numeric_value(json1)
@@ -1257,11 +2096,14 @@ class FileComparisonLibrary:
         if isinstance(norm1, dict):
             all_keys = set(norm1.keys()) | set(norm2.keys())
             for key in all_keys:
+                if 0 < limit <= len(differences):
+                    break
                 new_path = f"{path}.{key}" if path else key
                 if key in norm1 and key in norm2:
                     differences.extend(
                         self._find_json_differences(
-                            norm1[key], norm2[key], new_path, normalize_numerics
+                            norm1[key], norm2[key], new_path, normalize_numerics, digests,
+                            limit and limit - len(differences)
                         )
                     )
                 elif key in norm1:
@@ -1285,11 +2127,21 @@ class FileComparisonLibrary:
                     'file1_length': len(norm1),
                     'file2_length': len(norm2)
                 })
-            for i in range(min(len(norm1), len(norm2))):
+            if digests is None:
+                pairs = zip(range(len(norm1)), norm1, norm2)
+            else:
+                unmatched1, unmatched2 = self._unmatched_json_items(
+                    norm1, norm2, normalize_numerics, digests
+                )
+                pairs = ((i, norm1[i], norm2[j]) for i, j in zip(unmatched1, unmatched2))
+            for i, item1, item2 in pairs:
+                if 0 < limit <= len(differences):
+                    break
                 new_path = f"{path}[{i}]" if path else f"[{i}]"
                 differences.extend(
                     self._find_json_differences(
-                        norm1[i], norm2[i], new_path, normalize_numerics
+                        item1, item2, new_path, normalize_numerics, digests,
+                        limit and limit - len(differences)
                     )
                 )
 
@@ -1303,16 +2155,1666 @@ class FileComparisonLibrary:
 
         return differences
 
-    def _log_comparison_result(self, result: Dict[str, Any]) -> None:
+    def _unmatched_json_items(
+        self,
+        items1: list,
+        items2: list,
+        normalize_numerics: bool,
+        digests: Dict[int, bytes]
+    ) -> tuple:
+        """Positions of the items of two arrays left over after matching equal
+        items (by order-insensitive digest) as multisets, in array order."""
+        digests1 = [self._json_digest(item, True, normalize_numerics, digests) for item in items1]
+        digests2 = [self._json_digest(item, True, normalize_numerics, digests) for item in items2]
+        remaining = Counter(digests1)
+        remaining.subtract(digests2)
+        unmatched1 = []
+        for i, digest in enumerate(digests1):
+            if remaining[digest] > 0:
+                remaining[digest] -= 1
+                unmatched1.append(i)
+        # digests with a negative balance are the surplus of file 2
+        unmatched2 = []
+        for j, digest in enumerate(digests2):
+            if remaining[digest] < 0:
+                remaining[digest] += 1
+                unmatched2.append(j)
+        return unmatched1, unmatched2
+
+    # ==================== PARALLEL NORMALIZATION ====================
+    # Normalization runs as chunk operations: methods taking a list of rows
+    # (plus picklable arguments) and returning a picklable result. With
+    # workers > 1 the chunks are processed in a process pool, otherwise in
+    # the calling process; either way results come back in input order.
+
+    @contextmanager
+    def _comparison_run(self, workers: int, max_differences: Optional[int] = 0):
+        """Set up one comparison keyword call: the phase timings, the
+        difference cap and, for workers > 1, the worker pool. Yields a
+        function returning the 'timings' dictionary."""
+        workers = int(workers)
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        max_differences = int(max_differences or 0)
+        if max_differences < 0:
+            raise ValueError(f"max_differences must not be negative, got {max_differences}")
+        start = time.perf_counter()
+        self._phase_seconds = {'read': 0.0, 'normalize': 0.0}
+        self._max_differences = max_differences
+        self._workers = workers
+        self._pool = self._start_worker_pool(workers) if workers > 1 else None
+
+        def report_timings() -> Dict[str, Any]:
+            total = time.perf_counter() - start
+            timings = {phase: round(seconds, 3) for phase, seconds in self._phase_seconds.items()}
+            timings['compare'] = round(max(0.0, total - sum(self._phase_seconds.values())), 3)
+            timings['total'] = round(total, 3)
+            timings['workers'] = workers
+            logger.info(f"Comparison timings: {timings}")
+            return timings
+
+        try:
+            yield report_timings
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+            self._workers = 1
+            self._phase_seconds = None
+            self._max_differences = 0
+
+    def _difference_cap_reached(self, differences: list) -> bool:
+        """Whether `differences` holds max_differences entries (never without a cap)."""
+        return 0 < self._max_differences <= len(differences)
+
+    def _apply_difference_cap(self, result: Dict[str, Any]) -> None:
+        """Cut result['differences'] to max_differences and set 'truncated'
+        (the cap was reached, so further differences were not looked for)."""
+        differences = result['differences']
+        result['truncated'] = self._difference_cap_reached(differences)
+        if result['truncated']:
+            del differences[self._max_differences:]
+        result['total_differences'] = len(differences)
+
+    @contextmanager
+    def _phase(self, name: str):
+        """Add the time spent in the block to phase `name` of the running comparison."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._phase_seconds is not None:
+                self._phase_seconds[name] += time.perf_counter() - start
+
+    def _start_worker_pool(self, workers: int) -> ProcessPoolExecutor:
+        """Process pool running _run_row_chunk.
+
+        Forked workers inherit the already imported library; with other start
+        methods (macOS, Windows) workers import it by module name, so its
+        directory must stay on sys.path after Robot Framework's import.
+        """
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        else:
+            context = multiprocessing.get_context()
+            library_dir = os.path.dirname(os.path.abspath(__file__))
+            if library_dir not in sys.path:
+                sys.path.append(library_dir)
+        logger.info(f"Normalizing rows with {workers} worker processes")
+        return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+    def _map_row_chunks(self, operation: str, rows, *args) -> Iterator[tuple]:
+        """Apply chunk operation `operation` to consecutive chunks of `rows`.
+
+        Yields (chunk, result) in input order. With a worker pool at most two
+        chunks per worker are in flight, so rows read from a stream are not
+        read further ahead than that.
+        """
+        rows = iter(rows)
+        chunks = iter(lambda: list(islice(rows, self.ROW_CHUNK_SIZE)), [])
+        if self._pool is None:
+            method = getattr(self, operation)
+            for chunk in chunks:
+                yield chunk, method(chunk, *args)
+            return
+
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, self._pool.submit(_run_row_chunk, operation, chunk, args)))
+            if len(pending) >= 2 * self._workers:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+    def _digest_chunk(self, rows: List[List[str]], normalize_numerics: bool) -> List[bytes]:
+        """Chunk operation: digests of the normalized rows."""
+        return [self._row_digest(self._normalize_csv_row(row, normalize_numerics)) for row in rows]
+
+    def _bucket_chunk(self, rows: List[List[str]], normalize_numerics: bool, buckets: int) -> Dict[int, str]:
+        """Chunk operation: {bucket: bucket file lines} for the normalized rows (see _partition_csv_rows)."""
+        lines = {}
+        for row in rows:
+            row = self._normalize_csv_row(row, normalize_numerics)
+            digest = self._row_digest(row)
+            bucket = int.from_bytes(digest[:4], 'big') % buckets
+            lines.setdefault(bucket, []).append(f'{digest.hex()}{json.dumps(row)}\n')
+        return {bucket: ''.join(bucket_lines) for bucket, bucket_lines in lines.items()}
+
+    def _row_key_chunk(
+        self,
+        rows: List[List[str]],
+        exclude_keys: Optional[List[str]],
+        normalize_numerics: bool
+    ) -> List[str]:
+        """Chunk operation: row matching keys (see _get_row_key_for_matching)."""
+        return [self._get_row_key_for_matching(row, exclude_keys, normalize_numerics) for row in rows]
+
+    def _match_key_chunk(
+        self,
+        rows: List[List[str]],
+        key_parts: List[str],
+        column_index: Optional[int]
+    ) -> List[Optional[str]]:
+        """Chunk operation: match_key value of each row as a string (None if the row has none)."""
+        key_values = []
+        for row in rows:
+            key_value = self._extract_key_from_row(row, key_parts, column_index)
+            key_values.append(None if key_value is None else str(key_value))
+        return key_values
+
+    def _keyed_rows_chunk(
+        self,
+        rows: List[List[str]],
+        exclude_indices: Set[int],
+        exclude_keys: List[str],
+        normalize_numerics: bool,
+        key_parts: List[str],
+        column_index: Optional[int]
+    ) -> tuple:
+        """Chunk operation: the rows without the excluded columns, normalized
+        (see _normalize_csv_content), and their match_key values."""
+        if exclude_indices:
+            rows = [[val for i, val in enumerate(row) if i not in exclude_indices] for row in rows]
+        normalized = self._normalize_csv_content(rows, exclude_keys, normalize_numerics)
+        return normalized, self._match_key_chunk(normalized, key_parts, column_index)
+
+    def _sample_key_chunk(
+        self,
+        rows: List[List[str]],
+        exclude_indices: Set[int],
+        exclude_keys: List[str],
+        normalize_numerics: bool,
+        key_parts: List[str],
+        column_index: Optional[int]
+    ) -> List[Optional[str]]:
+        """Chunk operation: the match_key values _keyed_rows_chunk computes, but
+        normalizing only the key column when match_key is a column name."""
+        if column_index is None:
+            return self._keyed_rows_chunk(rows, exclude_indices, exclude_keys, normalize_numerics, key_parts, None)[1]
+        exclude_keys_lower = {k.lower() for k in exclude_keys}
+        key_values = []
+        for row in rows:
+            if exclude_indices:
+                row = [val for i, val in enumerate(row) if i not in exclude_indices]
+            if column_index < len(row):
+                key_values.append(self._normalize_field(row[column_index], exclude_keys_lower, normalize_numerics))
+            else:
+                key_values.extend(self._keyed_rows_chunk(
+                    [row], set(), exclude_keys, normalize_numerics, key_parts, column_index
+                )[1])
+        return key_values
+
+    def _tolerance_chunk(self, pairs: List[tuple], specs: List[tuple]) -> List[tuple]:
+        """Chunk operation: (offset, column, value1, value2) for each value of a
+        column_tolerances column (see _tolerance_specs) out of tolerance in
+        the (row1, row2) pairs, by offset."""
+        mismatches = []
+        for column, index1, index2, abs_tol, rel_tol, decimal_places in specs:
+            values1 = [row1[index1] if index1 < len(row1) else '' for row1, _ in pairs]
+            values2 = [row2[index2] if index2 < len(row2) else '' for _, row2 in pairs]
+            if np is not None:
+                offsets = self._tolerance_mismatches(values1, values2, abs_tol, rel_tol, decimal_places)
+            else:
+                offsets = [i for i, (value1, value2) in enumerate(zip(values1, values2))
+                           if not self._within_tolerance(value1, value2, abs_tol, rel_tol, decimal_places)]
+            mismatches.extend((i, column, values1[i], values2[i]) for i in offsets)
+        mismatches.sort(key=itemgetter(0))
+        return mismatches
+
+    def _mismatch_chunk(self, pairs: List[tuple], normalize_numerics: bool) -> List[int]:
+        """Chunk operation: offsets of the (row1, row2) pairs that differ after
+        normalization, or where one row is missing (None)."""
+        return [
+            i for i, (row1, row2) in enumerate(pairs)
+            if row1 is None or row2 is None
+            or self._normalize_csv_row(row1, normalize_numerics) != self._normalize_csv_row(row2, normalize_numerics)
+        ]
+
+    # ==================== STREAMING CSV COMPARISON ====================
+
+    def _compare_csv_files_streaming(
+        self,
+        file1_path: str,
+        file2_path: str,
+        ignore_order: bool,
+        normalize_numerics: bool,
+        memory_limit_mb: int,
+        temp_dir: Optional[str],
+        column_tolerances: Optional[Dict[str, Dict[str, float]]] = None
+    ) -> Dict[str, Any]:
+        """Compare two CSV files without loading either into memory.
+
+        Produces the same result dictionary as compare_csv_files. The
+        column_tolerances columns are compared in a separate pass over the files.
+        """
+        result = {
+            'status': 'UNKNOWN',
+            'file1_path': file1_path,
+            'file2_path': file2_path,
+            'file1_rows': 0,
+            'file2_rows': 0,
+            'headers_match': False,
+            'row_count_match': False,
+            'differences': [],
+            'total_differences': 0
+        }
+
+        with self._open_csv_file(file1_path) as f1, self._open_csv_file(file2_path) as f2:
+            rows1 = csv.reader(f1)
+            rows2 = csv.reader(f2)
+            header1 = next(rows1, None)
+            header2 = next(rows2, None)
+
+            if header1 is not None and header2 is not None:
+                result['headers_match'] = header1 == header2
+                if not result['headers_match']:
+                    result['differences'].append({
+                        'type': 'HEADER_MISMATCH',
+                        'file1_header': header1,
+                        'file2_header': header2
+                    })
+
+            tolerance_differences = []
+            if column_tolerances:
+                specs = self._tolerance_specs(column_tolerances, header1, header2)
+                tolerance_differences, result['column_mismatch_rows'] = self._compare_tolerance_columns(
+                    zip(self._iter_csv_data_rows(file1_path), self._iter_csv_data_rows(file2_path)), specs
+                )
+                indices1, indices2 = {spec[1] for spec in specs}, {spec[2] for spec in specs}
+                rows1 = (self._blank_columns(row, indices1) for row in rows1)
+                rows2 = (self._blank_columns(row, indices2) for row in rows2)
+
+            if ignore_order:
+                buckets = self._streaming_bucket_count(file1_path, file2_path, memory_limit_mb)
+                differences, count1, count2 = self._compare_csv_unordered_streaming(
+                    rows1, rows2, normalize_numerics, buckets, (file1_path, file2_path), temp_dir
+                )
+            else:
+                differences, count1, count2 = self._compare_csv_ordered_streaming(
+                    rows1, rows2, normalize_numerics
+                )
+
+        # Row counts include the header, as in compare_csv_files
+        result['file1_rows'] = count1 + (header1 is not None)
+        result['file2_rows'] = count2 + (header2 is not None)
+        result['row_count_match'] = result['file1_rows'] == result['file2_rows']
+        result['differences'].extend(differences)
+        result['differences'].extend(tolerance_differences)
+        result['total_differences'] = len(result['differences'])
+        result['status'] = 'IDENTICAL' if result['total_differences'] == 0 else 'DIFFERENT'
+        return result
+
+    def _streaming_bucket_count(self, file1_path: str, file2_path: str, memory_limit_mb: int) -> int:
+        """Number of on-disk buckets so that one bucket of each file fits the memory budget."""
+        total_bytes = self._text_size_estimate(file1_path) + self._text_size_estimate(file2_path)
+        budget = max(1, int(memory_limit_mb)) * 1024 * 1024
+        buckets = -(-total_bytes * self.STREAMING_MEMORY_FACTOR // budget)
+        return max(1, min(self.STREAMING_MAX_BUCKETS, buckets))
+
+    def _compare_csv_unordered_streaming(
+        self,
+        rows1: Iterator[List[str]],
+        rows2: Iterator[List[str]],
+        normalize_numerics: bool,
+        buckets: int,
+        file_paths: tuple,
+        temp_dir: Optional[str] = None
+    ) -> tuple:
+        """Streaming counterpart of _compare_csv_unordered.
+
+        With a single bucket, both files' digest counters are built directly
+        from the readers and mismatched rows are recovered by re-reading the
+        files (`file_paths`). Otherwise each normalized row is written, behind
+        its digest, to one of `buckets` bucket files per side chosen by the
+        digest; equal rows always share a bucket, so comparing the buckets
+        pairwise finds exactly the whole-file differences while holding one
+        bucket pair's counters in memory.
+
+        Returns (differences, data rows in file1, data rows in file2).
+        """
+        if buckets == 1:
+            with self._phase('normalize'):
+                counts1 = self._count_row_digests(rows1, normalize_numerics)
+                counts2 = self._count_row_digests(rows2, normalize_numerics)
+
+            def rows_for_digests(wanted: Set[bytes]) -> Dict[bytes, List[str]]:
+                sources = [self._iter_csv_data_rows(path) for path in file_paths]
+                return self._find_rows_by_digest(sources, wanted, normalize_numerics)
+
+            differences = self._multiset_row_differences(counts1, counts2, rows_for_digests)
+            return differences, sum(counts1.values()), sum(counts2.values())
+
+        logger.info(f"Streaming comparison: partitioning rows into {buckets} buckets")
+        only_in_file1, only_in_file2, duplicates = [], [], []
+        with tempfile.TemporaryDirectory(prefix='csv-compare-', dir=temp_dir) as work_dir:
+            with self._phase('normalize'):
+                count1 = self._partition_csv_rows(rows1, normalize_numerics, work_dir, '1', buckets)
+                count2 = self._partition_csv_rows(rows2, normalize_numerics, work_dir, '2', buckets)
+
+            for bucket in range(buckets):
+                if 0 < self._max_differences <= len(only_in_file1) + len(only_in_file2) + len(duplicates):
+                    break
+                paths = (os.path.join(work_dir, f'1-{bucket}.jsonl'), os.path.join(work_dir, f'2-{bucket}.jsonl'))
+                counts1, counts2 = (self._count_bucket_digests(path) for path in paths)
+                for diff in self._multiset_row_differences(
+                    counts1, counts2, lambda wanted: self._read_bucket_rows(paths, wanted)
+                ):
+                    if diff['type'] == 'ROW_ONLY_IN_FILE1':
+                        only_in_file1.append(diff)
+                    elif diff['type'] == 'ROW_ONLY_IN_FILE2':
+                        only_in_file2.append(diff)
+                    else:
+                        duplicates.append(diff)
+
+        return only_in_file1 + only_in_file2 + duplicates, count1, count2
+
+    def _iter_csv_data_rows(self, file_path: str) -> Iterator[List[str]]:
+        """Yield the rows of a CSV file after its header, one at a time."""
+        with self._open_csv_file(file_path) as f:
+            rows = csv.reader(f)
+            next(rows, None)
+            yield from rows
+
+    def _partition_csv_rows(
+        self,
+        rows: Iterator[List[str]],
+        normalize_numerics: bool,
+        work_dir: str,
+        side: str,
+        buckets: int
+    ) -> int:
+        """Write normalized rows to per-bucket files by digest. Returns the row count.
+
+        Each line is the row digest in hex followed by the row as JSON (which
+        keeps embedded newlines escaped), so counting a bucket reads only the
+        digest and the row text is parsed only for mismatches.
+        """
+        files = [
+            open(os.path.join(work_dir, f'{side}-{bucket}.jsonl'), 'w', encoding='utf-8')
+            for bucket in range(buckets)
+        ]
+        try:
+            count = 0
+            for chunk, lines in self._map_row_chunks('_bucket_chunk', rows, normalize_numerics, buckets):
+                for bucket, text in lines.items():
+                    files[bucket].write(text)
+                count += len(chunk)
+            return count
+        finally:
+            for f in files:
+                f.close()
+
+    def _count_bucket_digests(self, path: str) -> Counter:
+        """Digest counter of one bucket file (hex digests as keys)."""
+        width = self.ROW_DIGEST_SIZE * 2
+        with open(path, 'r', encoding='utf-8') as f:
+            return Counter(line[:width] for line in f)
+
+    def _read_bucket_rows(self, paths: tuple, wanted: Set[str]) -> Dict[str, List[str]]:
+        """Second pass over a bucket pair: {hex digest: row} for the wanted digests."""
+        width = self.ROW_DIGEST_SIZE * 2
+        found = {}
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    digest = line[:width]
+                    if digest in wanted and digest not in found:
+                        found[digest] = json.loads(line[width:])
+        return found
+
+    def _compare_csv_ordered_streaming(
+        self,
+        rows1: Iterator[List[str]],
+        rows2: Iterator[List[str]],
+        normalize_numerics: bool
+    ) -> tuple:
+        """Streaming counterpart of _compare_csv_ordered: walks both files in step.
+
+        Reports the same difference types, without the cross-file row matching
+        (file1_row_matches_file2_rows / file2_row_matches_file1_rows), which
+        would need an index of the whole file. Once a difference cap is
+        reached the remaining rows are only counted, not compared.
+
+        Returns (differences, data rows in file1, data rows in file2).
+        """
+        differences = []
+        counts = [0, 0]
+        row_index = 0
+
+        def counted(rows, side):
+            for row in rows:
+                counts[side] += 1
+                yield row
+
+        rows1, rows2 = counted(rows1, 0), counted(rows2, 1)
+        # Reading and normalizing are interleaved with the comparison, so the
+        # whole walk counts as the normalize phase
+        with self._phase('normalize'):
+            for pairs, mismatches in self._map_row_chunks(
+                '_mismatch_chunk', zip_longest(rows1, rows2), normalize_numerics
+            ):
+                for i in mismatches:
+                    row1, row2 = pairs[i]
+                    differences.append(self._ordered_row_difference(
+                        row_index + 1 + i, row1, row2, normalize_numerics
+                    ))
+                row_index += len(pairs)
+                if self._difference_cap_reached(differences):
+                    del differences[self._max_differences:]
+                    deque(rows1, maxlen=0)
+                    deque(rows2, maxlen=0)
+                    break
+
+        return differences, counts[0], counts[1]
+
+    def _ordered_row_difference(
+        self,
+        row_index: int,
+        row1: Optional[List[str]],
+        row2: Optional[List[str]],
+        normalize_numerics: bool
+    ) -> Dict[str, Any]:
+        """Difference entry for a row position whose rows differ (or exist in one file only)."""
+        if row2 is None:
+            return {'type': 'EXTRA_ROW_IN_FILE1', 'row_index': row_index, 'row_content': row1}
+        if row1 is None:
+            return {'type': 'EXTRA_ROW_IN_FILE2', 'row_index': row_index, 'row_content': row2}
+        diff = {
+            'type': 'ROW_CONTENT_MISMATCH',
+            'row_index': row_index,
+            'file1_row': row1,
+            'file2_row': row2
+        }
+        field_diffs = self._compare_row_fields_with_details(row1, row2, row_index, normalize_numerics)
+        if field_diffs:
+            diff['field_differences'] = field_diffs
+        return diff
+
+    # ==================== STREAMING KEY-BASED COMPARISON ====================
+
+    def _compare_csv_with_exclusions_streaming(
+        self,
+        file1_path: str,
+        file2_path: str,
+        exclude_keys: List[str],
+        match_key: str,
+        ignore_order: bool,
+        normalize_numerics: bool,
+        memory_limit_mb: int,
+        temp_dir: Optional[str]
+    ) -> Dict[str, Any]:
+        """Key-based compare_csv_with_exclusions for files larger than memory.
+
+        Each file is read once and its keyed rows are sorted by key on disk
+        (_sort_rows_by_key). The two key-ordered streams are then merge-joined
+        and each key's rows compared with _compare_key_rows, holding one key's
+        rows per file at a time. The differences, in key order, are the same
+        as those of the in-memory comparison.
+        """
+        remaining_exclude_keys = list(exclude_keys) if exclude_keys else []
+        logger.console(f"Using key-based matching with key: {match_key} (streaming sort-merge)")
+        if not ignore_order:
+            logger.console(f"Row order will also be verified (ignore_order=False)")
+
+        with tempfile.TemporaryDirectory(prefix='csv-sort-', dir=temp_dir) as work_dir, \
+                self._open_csv_file(file1_path) as f1, self._open_csv_file(file2_path) as f2:
+            reader1 = csv.reader(f1)
+            reader2 = csv.reader(f2)
+            header1 = next(reader1, None)
+            header2 = next(reader2, None)
+
+            # CSV column-level exclusion, as in compare_csv_with_exclusions
+            exclude_indices_1 = exclude_indices_2 = set()
+            if header1 is not None and header2 is not None and exclude_keys:
+                exclude_indices_1, exclude_indices_2 = self._excluded_column_indices(header1, header2, exclude_keys)
+
+            with self._phase('normalize'):
+                sorted1 = self._sort_rows_by_key(
+                    reader1, header1, exclude_indices_1, remaining_exclude_keys, match_key,
+                    normalize_numerics, memory_limit_mb, os.path.join(work_dir, '1')
+                )
+                sorted2 = self._sort_rows_by_key(
+                    reader2, header2, exclude_indices_2, remaining_exclude_keys, match_key,
+                    normalize_numerics, memory_limit_mb, os.path.join(work_dir, '2')
+                )
+
+            if sorted1['rows'] > 0 and sorted1['keyed_rows'] == 0:
+                raise self._match_key_not_found(match_key)
+            if sorted2['rows'] > 0 and sorted2['keyed_rows'] == 0:
+                raise self._match_key_not_found(match_key, " of expected file")
+
+            result = {
+                'status': 'UNKNOWN',
+                'file1_path': file1_path,
+                'file2_path': file2_path,
+                'file1_rows': sorted1['rows'] + (header1 is not None),
+                'file2_rows': sorted2['rows'] + (header2 is not None),
+                'excluded_keys': exclude_keys,
+                'match_key': match_key,
+                'headers_match': False,
+                'row_count_match': False,
+                'differences': [],
+                'total_differences': 0
+            }
+
+            result['row_count_match'] = result['file1_rows'] == result['file2_rows']
+
+            # Compare headers
+            if header1 is not None and header2 is not None:
+                result['headers_match'] = sorted1['header'] == sorted2['header']
+                if not result['headers_match']:
+                    result['differences'].append({
+                        'type': 'HEADER_MISMATCH',
+                        'file1_header': sorted1['header'],
+                        'file2_header': sorted2['header']
+                    })
+
+            for key_value, rows1, rows2 in self._merge_join_by_key(sorted1['records'], sorted2['records']):
+                if self._difference_cap_reached(result['differences']):
+                    break
+                result['differences'].extend(self._compare_key_rows(
+                    key_value, rows1, rows2, match_key, ignore_order, normalize_numerics
+                ))
+
+        result['total_differences'] = len(result['differences'])
+        result['status'] = 'IDENTICAL' if result['total_differences'] == 0 else 'DIFFERENT'
+        return result
+
+    def _sort_rows_by_key(
+        self,
+        reader: Iterator[List[str]],
+        header: Optional[List[str]],
+        exclude_indices: Set[int],
+        exclude_keys: List[str],
+        match_key: str,
+        normalize_numerics: bool,
+        memory_limit_mb: int,
+        run_prefix: str
+    ) -> Dict[str, Any]:
+        """External sort of one file's data rows by match_key value.
+
+        Rows are column-excluded, normalized and keyed chunk by chunk, then
+        buffered as JSON lines [key, index, row] up to the memory budget,
+        sorted by key (stably, so a key's rows stay in file order) and written
+        to run files `run_prefix`-N. Rows without the key are left out, as in
+        _build_row_lookup. A file within the budget is sorted in memory.
+
+        Returns {'header': normalized header, 'rows': data rows, 'keyed_rows':
+        rows with the key, 'records': (key, index, row) in key order}, where
+        records lazily merges the runs.
+        """
+        sorted_file = {'header': None, 'rows': 0, 'keyed_rows': 0, 'records': iter(())}
+        if header is None:
+            return sorted_file
+
+        if exclude_indices:
+            header = [val for i, val in enumerate(header) if i not in exclude_indices]
+        header = self._normalize_csv_content([header], exclude_keys, normalize_numerics)[0]
+        column_index = self._match_key_column(match_key, header)
+        budget = max(1, int(memory_limit_mb)) * 1024 * 1024
+
+        runs, buffer, buffered = [], [], 0
+        index = keyed_rows = 0
+        for _, (rows, key_values) in self._map_row_chunks(
+            '_keyed_rows_chunk', reader, exclude_indices, exclude_keys, normalize_numerics,
+            match_key.split('.'), column_index
+        ):
+            for row, key_value in zip(rows, key_values):
+                if key_value is not None:
+                    line = json.dumps([key_value, index, row])
+                    buffer.append((key_value, line))
+                    buffered += len(line) + len(key_value) + self.SORT_RECORD_OVERHEAD
+                    keyed_rows += 1
+                    if buffered >= budget:
+                        runs.append(self._write_sort_run(buffer, f'{run_prefix}-{len(runs)}'))
+                        buffer, buffered = [], 0
+                index += 1
+
+        if not runs:
+            buffer.sort(key=itemgetter(0))
+            records = (json.loads(line) for _, line in buffer)
+        else:
+            if buffer:
+                runs.append(self._write_sort_run(buffer, f'{run_prefix}-{len(runs)}'))
+            logger.info(f"Sorted {keyed_rows} rows by '{match_key}' in {len(runs)} on-disk runs")
+            # Ties keep the run order, so a key's rows stay in file order
+            records = heapq.merge(*(self._read_sort_run(path) for path in runs), key=itemgetter(0))
+
+        sorted_file.update(header=header, rows=index, keyed_rows=keyed_rows, records=records)
+        return sorted_file
+
+    @staticmethod
+    def _write_sort_run(buffer: List[tuple], path: str) -> str:
+        """Sort buffered (key, line) records by key and write the lines to `path`."""
+        buffer.sort(key=itemgetter(0))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(f'{line}\n' for _, line in buffer)
+        return path
+
+    @staticmethod
+    def _read_sort_run(path: str) -> Iterator[list]:
+        """Records [key, index, row] of a sort run, in order."""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    @staticmethod
+    def _merge_join_by_key(records1: Iterator, records2: Iterator) -> Iterator[tuple]:
+        """Full outer join of two key-ordered (key, index, row) streams.
+
+        Yields (key, rows in file1, rows in file2) for every key of either
+        stream in key order, with rows as {'row', 'index'} in file order.
+        """
+        def key_groups(records):
+            for key_value, group in groupby(records, key=itemgetter(0)):
+                yield key_value, [{'row': row, 'index': index} for _, index, row in group]
+
+        groups1 = key_groups(records1)
+        groups2 = key_groups(records2)
+        group1 = next(groups1, None)
+        group2 = next(groups2, None)
+        while group1 is not None or group2 is not None:
+            if group2 is None or (group1 is not None and group1[0] < group2[0]):
+                yield group1[0], group1[1], []
+                group1 = next(groups1, None)
+            elif group1 is None or group2[0] < group1[0]:
+                yield group2[0], [], group2[1]
+                group2 = next(groups2, None)
+            else:
+                yield group1[0], group1[1], group2[1]
+                group1 = next(groups1, None)
+                group2 = next(groups2, None)
+
+    # ==================== QUICK CHECK AND SAMPLED COMPARISON ====================
+
+    def _files_byte_identical(self, file1_path: str, file2_path: str) -> bool:
+        """Whether two files have the same bytes: equal sizes, then the
+        memory-mapped files compared BYTE_COMPARE_CHUNK bytes at a time,
+        stopping at the first chunk that differs."""
+        size = os.path.getsize(file1_path)
+        if size != os.path.getsize(file2_path):
+            return False
+        if size == 0 or os.path.samefile(file1_path, file2_path):
+            return True
+        chunk = self.BYTE_COMPARE_CHUNK
+        with open(file1_path, 'rb') as f1, open(file2_path, 'rb') as f2:
+            try:
+                with mmap.mmap(f1.fileno(), 0, access=mmap.ACCESS_READ) as map1, \
+                        mmap.mmap(f2.fileno(), 0, access=mmap.ACCESS_READ) as map2:
+                    return all(map1[offset:offset + chunk] == map2[offset:offset + chunk]
+                               for offset in range(0, size, chunk))
+            except (OSError, ValueError):
+                # Not mappable (e.g. some network file systems): compare buffered reads
+                f1.seek(0)
+                f2.seek(0)
+                return all(block == f2.read(chunk) for block in iter(lambda: f1.read(chunk), b''))
+
+    def _count_csv_records(self, file_path: str) -> int:
+        """Number of rows csv.reader yields for a file, header included.
+
+        Plain files without quote characters are counted from their bytes, a
+        BYTE_COMPARE_CHUNK at a time: every \n, \r or \r\n ends a row, plus
+        a last row without a line break. Quoted fields may hold line breaks,
+        so those files (and gzip / bzip2 files) are counted with csv.reader.
+        """
+        with open(file_path, 'rb') as f:
+            magic = f.read(3)
+            if magic[:2] != b'\x1f\x8b' and magic != b'BZh':
+                f.seek(0)
+                rows, previous = 0, b''
+                for block in iter(lambda: f.read(self.BYTE_COMPARE_CHUNK), b''):
+                    if b'"' in block:
+                        break
+                    rows += block.count(b'\n') + block.count(b'\r') - block.count(b'\r\n')
+                    if previous == b'\r' and block[:1] == b'\n':
+                        rows -= 1
+                    previous = block[-1:]
+                else:
+                    return rows + (previous not in (b'', b'\n', b'\r'))
+        with self._open_csv_file(file_path) as f:
+            return sum(1 for _ in csv.reader(f))
+
+    @staticmethod
+    def _byte_identical_result(file1_path: str, file2_path: str, rows: int) -> Dict[str, Any]:
+        """compare_csv_files result for byte-identical files of `rows` rows,
+        which are not compared row by row."""
+        return {
+            'status': 'IDENTICAL',
+            'file1_path': file1_path,
+            'file2_path': file2_path,
+            'file1_rows': rows,
+            'file2_rows': rows,
+            'headers_match': True,
+            'row_count_match': True,
+            'differences': [],
+            'total_differences': 0
+        }
+
+    def _quick_check_csv_files(
+        self,
+        file1_path: str,
+        file2_path: str,
+        ignore_order: bool,
+        normalize_numerics: bool
+    ) -> Dict[str, Any]:
+        """compare_csv_files with quick_check=True: headers, row counts and
+        row checksums of both files, each read in one streaming pass."""
+        result = {
+            'status': 'UNKNOWN',
+            'file1_path': file1_path,
+            'file2_path': file2_path,
+            'file1_rows': 0,
+            'file2_rows': 0,
+            'file1_size': os.path.getsize(file1_path),
+            'file2_size': os.path.getsize(file2_path),
+            'headers_match': False,
+            'row_count_match': False,
+            'differences': [],
+            'total_differences': 0
+        }
+
+        with self._phase('normalize'):
+            header1, count1, checksum1 = self._csv_checksum(file1_path, ignore_order, normalize_numerics)
+            header2, count2, checksum2 = self._csv_checksum(file2_path, ignore_order, normalize_numerics)
+
+        if header1 is not None and header2 is not None:
+            result['headers_match'] = header1 == header2
+            if not result['headers_match']:
+                result['differences'].append({
+                    'type': 'HEADER_MISMATCH',
+                    'file1_header': header1,
+                    'file2_header': header2
+                })
+
+        # Row counts include the header, as in compare_csv_files
+        result['file1_rows'] = count1 + (header1 is not None)
+        result['file2_rows'] = count2 + (header2 is not None)
+        result['row_count_match'] = result['file1_rows'] == result['file2_rows']
+        if not result['row_count_match']:
+            result['differences'].append({
+                'type': 'ROW_COUNT_MISMATCH',
+                'file1_count': result['file1_rows'],
+                'file2_count': result['file2_rows']
+            })
+
+        result['file1_checksum'] = checksum1
+        result['file2_checksum'] = checksum2
+        if checksum1 != checksum2:
+            result['differences'].append({
+                'type': 'CHECKSUM_MISMATCH',
+                'file1_checksum': checksum1,
+                'file2_checksum': checksum2
+            })
+
+        result['total_differences'] = len(result['differences'])
+        result['status'] = 'IDENTICAL' if result['total_differences'] == 0 else 'DIFFERENT'
+        return result
+
+    def _csv_checksum(self, file_path: str, ignore_order: bool, normalize_numerics: bool) -> tuple:
+        """(header, data row count, checksum) of a CSV file, reading it once.
+
+        The checksum combines the digests of the normalized data rows: with
+        ignore_order their sum modulo 2**128, which is the same for any row
+        order but still counts duplicate rows, otherwise a hash of the
+        digests in row order.
+        """
+        size = self.ROW_DIGEST_SIZE
+        modulus = 1 << (8 * size)
+        total, sequence, count = 0, blake2b(digest_size=size), 0
+        with self._open_csv_file(file_path) as f:
+            rows = csv.reader(f)
+            header = next(rows, None)
+            for chunk, digests in self._map_row_chunks('_digest_chunk', rows, normalize_numerics):
+                count += len(chunk)
+                if ignore_order:
+                    total = (total + sum(int.from_bytes(digest, 'big') for digest in digests)) % modulus
+                else:
+                    sequence.update(b''.join(digests))
+        checksum = f'{total:0{2 * size}x}' if ignore_order else sequence.hexdigest()
+        return header, count, checksum
+
+    def _compare_csv_key_sample(
+        self,
+        file1_path: str,
+        file2_path: str,
+        exclude_keys: List[str],
+        match_key: str,
+        ignore_order: bool,
+        normalize_numerics: bool,
+        sample_size: int,
+        confidence: float,
+        sample_seed: Optional[int]
+    ) -> Dict[str, Any]:
+        """compare_csv_with_exclusions on a random sample of match_key values.
+
+        The key of every row is computed (see _sample_key_chunk), sample_size
+        of the keys of either file are drawn, and only the rows of the drawn
+        keys are normalized and compared with _compare_key_rows. Keys are
+        drawn from the sorted key list, so a seed reproduces the sample.
+        """
+        with self._phase('read'):
+            csv1 = self._read_csv_file(file1_path)
+            csv2 = self._read_csv_file(file2_path)
+
+        remaining_exclude_keys = list(exclude_keys) if exclude_keys else []
+        exclude_indices_1 = exclude_indices_2 = set()
+        if csv1 and csv2 and exclude_keys:
+            exclude_indices_1, exclude_indices_2 = self._excluded_column_indices(csv1[0], csv2[0], exclude_keys)
+
+        def normalized(row: List[str], exclude_indices: Set[int]) -> List[str]:
+            if exclude_indices:
+                row = [val for i, val in enumerate(row) if i not in exclude_indices]
+            return self._normalize_csv_content([row], remaining_exclude_keys, normalize_numerics)[0]
+
+        with self._phase('normalize'):
+            header1 = normalized(csv1[0], exclude_indices_1) if csv1 else []
+            header2 = normalized(csv2[0], exclude_indices_2) if csv2 else []
+            positions1 = self._key_positions(csv1[1:], exclude_indices_1, remaining_exclude_keys,
+                                             normalize_numerics, match_key, header1)
+            positions2 = self._key_positions(csv2[1:], exclude_indices_2, remaining_exclude_keys,
+                                             normalize_numerics, match_key, header2)
+
+        if len(csv1) > 1 and not positions1:
+            raise self._match_key_not_found(match_key)
+        if len(csv2) > 1 and not positions2:
+            raise self._match_key_not_found(match_key, " of expected file")
+
+        result = {
+            'status': 'UNKNOWN',
+            'file1_path': file1_path,
+            'file2_path': file2_path,
+            'file1_rows': len(csv1),
+            'file2_rows': len(csv2),
+            'excluded_keys': exclude_keys,
+            'match_key': match_key,
+            'headers_match': False,
+            'row_count_match': len(csv1) == len(csv2),
+            'differences': [],
+            'total_differences': 0
+        }
+
+        if csv1 and csv2:
+            result['headers_match'] = header1 == header2
+            if not result['headers_match']:
+                result['differences'].append({
+                    'type': 'HEADER_MISMATCH',
+                    'file1_header': header1,
+                    'file2_header': header2
+                })
+
+        keys = sorted(positions1.keys() | positions2.keys())
+        seed = random.randrange(2 ** 32) if sample_seed is None else int(sample_seed)
+        sampled = sorted(random.Random(seed).sample(keys, min(sample_size, len(keys))))
+        logger.console(f"Comparing a sample of {len(sampled)} of {len(keys)} '{match_key}' values (seed {seed})")
+
+        checked = differing = 0
+        for key_value in sampled:
+            if self._difference_cap_reached(result['differences']):
+                break
+            rows1 = [{'row': normalized(csv1[index + 1], exclude_indices_1), 'index': index}
+                     for index in positions1.get(key_value, [])]
+            rows2 = [{'row': normalized(csv2[index + 1], exclude_indices_2), 'index': index}
+                     for index in positions2.get(key_value, [])]
+            differences = self._compare_key_rows(
+                key_value, rows1, rows2, match_key, ignore_order, normalize_numerics
+            )
+            result['differences'].extend(differences)
+            checked += 1
+            differing += bool(differences)
+
+        result['sample'] = {
+            'keys_total': len(keys),
+            'keys_sampled': checked,
+            'keys_with_differences': differing,
+            'seed': seed,
+            'confidence': confidence,
+            'max_difference_rate': self._difference_rate_bound(differing, checked, len(keys), confidence)
+        }
+        result['total_differences'] = len(result['differences'])
+        result['status'] = 'IDENTICAL' if result['total_differences'] == 0 else 'DIFFERENT'
+        return result
+
+    def _key_positions(
+        self,
+        rows: List[List[str]],
+        exclude_indices: Set[int],
+        exclude_keys: List[str],
+        normalize_numerics: bool,
+        match_key: str,
+        header: List[str]
+    ) -> Dict[str, List[int]]:
+        """{match_key value: 0-based data row positions} of the rows, in file order."""
+        column_index = self._match_key_column(match_key, header)
+        positions = {}
+        index = 0
+        for chunk, key_values in self._map_row_chunks(
+            '_sample_key_chunk', rows, exclude_indices, exclude_keys, normalize_numerics,
+            match_key.split('.'), column_index
+        ):
+            for key_value in key_values:
+                if key_value is not None:
+                    positions.setdefault(key_value, []).append(index)
+                index += 1
+        return positions
+
+    @staticmethod
+    def _difference_rate_bound(differing: int, sampled: int, population: int, confidence: float) -> float:
+        """Upper bound, at `confidence`, on the share of the population that
+        differs when `differing` of `sampled` random members differ.
+
+        One-sided Clopper-Pearson bound: the rate p at which seeing at most
+        `differing` differences in `sampled` draws has probability
+        1 - confidence, found by bisection on the binomial CDF. Without
+        differences this is 1 - (1 - confidence) ** (1 / sampled). Sampling
+        without replacement only makes the bound conservative; a sample of the
+        whole population gives the exact share.
+        """
+        if sampled >= population:
+            return differing / population if population else 0.0
+        if differing >= sampled:
+            return 1.0
+        alpha = 1.0 - confidence
+        if differing == 0:
+            return 1.0 - alpha ** (1.0 / sampled)
+
+        log_choose = [math.lgamma(sampled + 1) - math.lgamma(i + 1) - math.lgamma(sampled - i + 1)
+                      for i in range(differing + 1)]
+
+        def at_most_differing(p: float) -> float:
+            log_p, log_q = math.log(p), math.log1p(-p)
+            return sum(math.exp(c + i * log_p + (sampled - i) * log_q) for i, c in enumerate(log_choose))
+
+        low, high = differing / sampled, 1.0
+        for _ in range(60):
+            middle = (low + high) / 2
+            if at_most_differing(middle) > alpha:
+                low = middle
+            else:
+                high = middle
+        return high
+
+    # ==================== COLUMNAR FILE COMPARISON ====================
+    # Parquet and Avro files are read as pyarrow record batches, and the two
+    # batch streams are compared a column at a time over the rows both cover.
+
+    def _compare_columnar_files(
+        self,
+        file_format: str,
+        file1_path: str,
+        file2_path: str,
+        exclude_columns: Optional[List[str]],
+        sort_by: Optional[List[str]],
+        show_details: bool,
+        abs_tol: float,
+        rel_tol: float,
+        max_differences: int = 0
+    ) -> Dict[str, Any]:
+        """Compare Parquet Files / Compare Avro Files: compare the batches of
+        two files of `file_format` ('parquet' or 'avro'). Once max_differences
+        value mismatches are listed, further mismatches are only counted."""
+        self._require_columnar_modules(file_format)
+        abs_tol, rel_tol = float(abs_tol), float(rel_tol)
+        excluded = set(exclude_columns or [])
+        result = {
+            'status': 'UNKNOWN',
+            'file1_path': file1_path,
+            'file2_path': file2_path,
+            'file1_rows': 0,
+            'file2_rows': 0,
+            'headers_match': False,
+            'row_count_match': False,
+            'files_match': False,
+            'differences': [],
+            'total_differences': 0,
+            'column_mismatch_counts': {}
+        }
+
+        with self._comparison_run(1, max_differences) as report_timings:
+            with self._phase('read'):
+                schema1, stringified1 = self._columnar_schema(file_format, file1_path)
+                schema2, stringified2 = self._columnar_schema(file_format, file2_path)
+            columns1 = [name for name in schema1.names if name not in excluded]
+            columns2 = [name for name in schema2.names if name not in excluded]
+            result['headers_match'] = columns1 == columns2
+            if set(columns1) != set(columns2):
+                result['differences'].append({
+                    'type': 'HEADER_MISMATCH',
+                    'file1_header': columns1,
+                    'file2_header': columns2
+                })
+            columns = [name for name in columns1 if name in set(columns2)]
+            for name in sort_by or []:
+                if name not in columns:
+                    raise ValueError(f"sort_by column '{name}' not found in both files")
+            for name in columns:
+                type1, type2 = schema1.field(name).type, schema2.field(name).type
+                if type1 != type2:
+                    result['differences'].append({
+                        'type': 'COLUMN_TYPE_MISMATCH',
+                        'column': name,
+                        'file1_type': str(type1),
+                        'file2_type': str(type2)
+                    })
+
+            sides = []
+            for path, schema, stringified in ((file1_path, schema1, stringified1),
+                                              (file2_path, schema2, stringified2)):
+                selected = pa.schema([schema.field(name) for name in columns])
+                batches = self._columnar_batches(file_format, path, selected, stringified & set(columns))
+                if sort_by:
+                    batches = self._sorted_batches(batches, selected, sort_by)
+                sides.append(batches)
+
+            row_counts = [0, 0]
+            mismatch_counts = result['column_mismatch_counts']
+            value_differences = []
+            for offset, batch1, batch2 in self._aligned_batches(sides[0], sides[1], row_counts):
+                batch_differences = []
+                for name in columns:
+                    column1, column2 = batch1.column(name), batch2.column(name)
+                    positions = self._column_mismatches(column1, column2, abs_tol, rel_tol)
+                    if positions:
+                        mismatch_counts[name] = mismatch_counts.get(name, 0) + len(positions)
+                    if self._max_differences:
+                        # positions ascend: the batch's first rows are among each column's first ones
+                        positions = positions[:max(0, self._max_differences - len(value_differences))]
+                    batch_differences.extend({
+                        'type': 'FIELD_VALUE_MISMATCH',
+                        'row_index': offset + position + 1,
+                        'column': name,
+                        'file1_value': column1[position].as_py(),
+                        'file2_value': column2[position].as_py()
+                    } for position in positions)
+                batch_differences.sort(key=itemgetter('row_index'))
+                value_differences.extend(batch_differences)
+                if self._difference_cap_reached(value_differences):
+                    del value_differences[self._max_differences:]
+
+            result['file1_rows'], result['file2_rows'] = row_counts
+            result['row_count_match'] = row_counts[0] == row_counts[1]
+            if not result['row_count_match']:
+                result['differences'].append({
+                    'type': 'ROW_COUNT_MISMATCH',
+                    'file1_count': row_counts[0],
+                    'file2_count': row_counts[1]
+                })
+            result['differences'].extend(value_differences)
+            result['files_match'] = not result['differences']
+            self._apply_difference_cap(result)
+            result['timings'] = report_timings()
+
+        result['status'] = 'IDENTICAL' if result['files_match'] else 'DIFFERENT'
+        if show_details:
+            self._log_comparison_result(result, file_format)
+        return result
+
+    def _require_columnar_modules(self, file_format: str) -> None:
+        """Raise ImportError naming the packages a columnar comparison needs but cannot import."""
+        missing = [package for package, module in (('pyarrow', pa), ('fastavro', fastavro))
+                   if module is None and (package == 'pyarrow' or file_format == 'avro')]
+        if missing:
+            raise ImportError(
+                f"Comparing {file_format.capitalize()} files requires {' and '.join(missing)}: "
+                f"pip install {' '.join(missing)}"
+            )
+
+    def _columnar_schema(self, file_format: str, file_path: str) -> tuple:
+        """(pyarrow schema, names of the columns read as str()) of a Parquet or Avro file."""
+        if file_format == 'parquet':
+            return pq.read_schema(file_path), set()
+        with open(file_path, 'rb') as f:
+            writer_schema = fastavro.reader(f).writer_schema
+        fields, stringified, named = [], set(), {}
+        for field in writer_schema['fields']:
+            arrow_type = self._avro_arrow_type(field['type'], named, writer_schema.get('namespace'))
+            if arrow_type is None:
+                arrow_type = pa.string()
+                stringified.add(field['name'])
+            fields.append(pa.field(field['name'], arrow_type))
+        return pa.schema(fields), stringified
+
+    def _avro_arrow_type(self, avro_type: Any, named: Dict[str, Any], namespace: Optional[str]) -> Any:
+        """pyarrow type of the values fastavro reads for `avro_type`, or None
+        when there is none (unions of several types, uuid, decimals wider than
+        decimal256) and the values are compared as str(). `named` collects the
+        named types defined so far."""
+        primitives = {
+            'null': pa.null(), 'boolean': pa.bool_(), 'int': pa.int32(), 'long': pa.int64(),
+            'float': pa.float32(), 'double': pa.float64(), 'bytes': pa.binary(), 'string': pa.string()
+        }
+        if isinstance(avro_type, list):
+            branches = [branch for branch in avro_type if branch != 'null']
+            if len(branches) == 1:
+                return self._avro_arrow_type(branches[0], named, namespace)
+            return None
+        if isinstance(avro_type, str):
+            if avro_type in primitives:
+                return primitives[avro_type]
+            return named.get(avro_type, named.get(f'{namespace}.{avro_type}'))
+
+        kind = avro_type['type']
+        logical = avro_type.get('logicalType')
+        if logical == 'decimal':
+            precision, scale = avro_type.get('precision', 77), avro_type.get('scale', 0)
+            if precision <= 38:
+                arrow_type = pa.decimal128(precision, scale)
+            elif precision <= 76:
+                arrow_type = pa.decimal256(precision, scale)
+            else:
+                arrow_type = None
+        elif logical in ('date', 'time-millis', 'time-micros', 'timestamp-millis', 'timestamp-micros',
+                         'local-timestamp-millis', 'local-timestamp-micros'):
+            arrow_type = {
+                'date': pa.date32(), 'time-millis': pa.time32('ms'), 'time-micros': pa.time64('us'),
+                'timestamp-millis': pa.timestamp('ms', tz='UTC'), 'timestamp-micros': pa.timestamp('us', tz='UTC'),
+                'local-timestamp-millis': pa.timestamp('ms'), 'local-timestamp-micros': pa.timestamp('us'),
+            }[logical]
+        elif logical == 'uuid':
+            arrow_type = None
+        elif kind == 'record':
+            namespace = avro_type.get('namespace', namespace)
+            fields = [(field['name'], self._avro_arrow_type(field['type'], named, namespace))
+                      for field in avro_type['fields']]
+            if all(field_type is not None for _, field_type in fields):
+                arrow_type = pa.struct(fields)
+            else:
+                arrow_type = None
+        elif kind == 'enum':
+            arrow_type = pa.string()
+        elif kind == 'fixed':
+            arrow_type = pa.binary(avro_type['size'])
+        elif kind == 'array':
+            item_type = self._avro_arrow_type(avro_type['items'], named, namespace)
+            arrow_type = pa.list_(item_type) if item_type is not None else None
+        elif kind == 'map':
+            value_type = self._avro_arrow_type(avro_type['values'], named, namespace)
+            arrow_type = pa.map_(pa.string(), value_type) if value_type is not None else None
+        else:
+            arrow_type = self._avro_arrow_type(kind, named, namespace)
+
+        if kind in ('record', 'enum', 'fixed') and 'name' in avro_type:
+            name = avro_type['name']
+            named[name] = arrow_type
+            named[f"{avro_type.get('namespace', namespace)}.{name}"] = arrow_type
+        return arrow_type
+
+    def _columnar_batches(self, file_format: str, file_path: str, schema: Any, stringified: Set[str]) -> Iterator[Any]:
+        """Record batches of the columns of `schema`, RECORD_BATCH_SIZE rows at a time."""
+        if file_format == 'parquet':
+            batches = pq.ParquetFile(file_path).iter_batches(
+                batch_size=self.RECORD_BATCH_SIZE, columns=schema.names
+            )
+            while True:
+                with self._phase('read'):
+                    batch = next(batches, None)
+                if batch is None:
+                    return
+                yield batch
+
+        with open(file_path, 'rb') as f:
+            records = fastavro.reader(f)
+            while True:
+                with self._phase('read'):
+                    chunk = list(islice(records, self.RECORD_BATCH_SIZE))
+                    if not chunk:
+                        return
+                    columns = {name: [record.get(name) for record in chunk] for name in schema.names}
+                    for name in stringified:
+                        columns[name] = [None if value is None else str(value) for value in columns[name]]
+                    batch = pa.RecordBatch.from_pydict(columns, schema=schema)
+                yield batch
+
+    def _sorted_batches(self, batches: Iterator[Any], schema: Any, sort_by: List[str]) -> Iterator[Any]:
+        """All rows of `batches` sorted by the `sort_by` columns, as record batches."""
+        with self._phase('read'):
+            table = pa.Table.from_batches(list(batches), schema=schema)
+        table = table.sort_by([(name, 'ascending') for name in sort_by])
+        return iter(table.to_batches(max_chunksize=self.RECORD_BATCH_SIZE))
+
+    @staticmethod
+    def _aligned_batches(batches1: Iterator[Any], batches2: Iterator[Any], row_counts: List[int]) -> Iterator[tuple]:
+        """Yield (offset, batch1, batch2): slices of the two batch streams
+        holding the same rows (from row `offset`), until either stream ends.
+        row_counts receives the number of rows of each stream; the longer
+        stream is read to its end."""
+        streams = (iter(batches1), iter(batches2))
+        current, start = [None, None], [0, 0]
+        offset = 0
+        while True:
+            for side in (0, 1):
+                while current[side] is None or start[side] == current[side].num_rows:
+                    current[side], start[side] = next(streams[side], None), 0
+                    if current[side] is None:
+                        break
+                    row_counts[side] += current[side].num_rows
+            if current[0] is None or current[1] is None:
+                break
+            length = min(current[0].num_rows - start[0], current[1].num_rows - start[1])
+            yield offset, current[0].slice(start[0], length), current[1].slice(start[1], length)
+            start[0] += length
+            start[1] += length
+            offset += length
+        for side in (0, 1):
+            row_counts[side] += sum(batch.num_rows for batch in streams[side])
+
+    def _column_mismatches(self, column1: Any, column2: Any, abs_tol: float, rel_tol: float) -> List[int]:
+        """Positions where two equally long pyarrow arrays differ, computed
+        column-wise: null matches only null, NaN matches NaN, and numeric
+        values within abs_tol / rel_tol (as math.isclose) match."""
+        if column1.equals(column2):
+            return []
+        column1, column2 = self._common_arrow_type(column1, column2)
+        numeric = all(
+            pa.types.is_integer(column.type) or pa.types.is_floating(column.type)
+            or pa.types.is_decimal(column.type)
+            for column in (column1, column2)
+        )
+        try:
+            same = pc.equal(column1, column2)
+            column_type = column1.type
+            if numeric and (abs_tol or rel_tol):
+                values1, values2 = pc.cast(column1, pa.float64()), pc.cast(column2, pa.float64())
+                allowed = pc.max_element_wise(
+                    pc.multiply(pc.max_element_wise(pc.abs(values1), pc.abs(values2)), rel_tol), abs_tol
+                )
+                same = pc.or_(same, pc.less_equal(pc.abs(pc.subtract(values1, values2)), allowed))
+            if pa.types.is_floating(column_type):
+                same = pc.or_(same, pc.and_(pc.is_nan(column1), pc.is_nan(column2)))
+            null1, null2 = pc.is_null(column1), pc.is_null(column2)
+            same = pc.if_else(pc.or_(null1, null2), pc.and_(null1, null2), same)
+        except pa.ArrowInvalid:
+            if not numeric:
+                values2 = column2.to_pylist()
+                return [i for i, value in enumerate(column1.to_pylist()) if value != values2[i]]
+            # int64 values beyond 2**53 do not cast to float64 exactly
+            return self._exact_numeric_mismatches(column1, column2, abs_tol, rel_tol)
+        except (pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            # No compute kernel for the type (struct, list, map): compare as Python values
+            values2 = column2.to_pylist()
+            return [i for i, value in enumerate(column1.to_pylist()) if value != values2[i]]
+        return pc.indices_nonzero(pc.invert(same)).to_pylist()
+
+    @staticmethod
+    def _exact_numeric_mismatches(column1: Any, column2: Any, abs_tol: float, rel_tol: float) -> List[int]:
+        """_column_mismatches for numeric arrays that float64 cannot hold
+        exactly (large int64): equality is checked in Arrow where the types
+        allow, and only the differing positions are compared as exact Python
+        numbers, with the same null, NaN and tolerance rules."""
+        try:
+            differing = pc.indices_nonzero(pc.invert(pc.fill_null(pc.equal(column1, column2), False)))
+            values1 = pc.take(column1, differing).to_pylist()
+            values2 = pc.take(column2, differing).to_pylist()
+            positions = differing.to_pylist()
+        except pa.ArrowInvalid:
+            # Mixed int64 / float64: no exact common type in Arrow
+            values1, values2 = column1.to_pylist(), column2.to_pylist()
+            positions = range(len(values1))
+        mismatches = []
+        for position, value1, value2 in zip(positions, values1, values2):
+            if value1 is None or value2 is None:
+                if value1 is not value2:
+                    mismatches.append(position)
+                continue
+            if value1 == value2 or (value1 != value1 and value2 != value2):
+                continue
+            try:
+                difference = abs(value1 - value2)
+            except TypeError:
+                difference = abs(float(value1) - float(value2))
+            if not difference <= max(rel_tol * float(max(abs(value1), abs(value2))), abs_tol):
+                mismatches.append(position)
+        return mismatches
+
+    @staticmethod
+    def _common_arrow_type(column1: Any, column2: Any) -> tuple:
+        """The two arrays cast to one type where possible: all-null to the other
+        type, numbers to float64, otherwise the second to the first's type or
+        both to string. Arrays that cannot be cast are returned unchanged."""
+        type1, type2 = column1.type, column2.type
+        if type1 == type2:
+            return column1, column2
+        try:
+            if pa.types.is_null(type1):
+                return column1.cast(type2), column2
+            if pa.types.is_null(type2):
+                return column1, column2.cast(type1)
+            numeric = (pa.types.is_integer, pa.types.is_floating, pa.types.is_decimal)
+            if any(check(type1) for check in numeric) and any(check(type2) for check in numeric):
+                return column1.cast(pa.float64()), column2.cast(pa.float64())
+            try:
+                return column1, column2.cast(type1)
+            except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+                return column1.cast(pa.string()), column2.cast(pa.string())
+        except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+            return column1, column2
+
+    # ==================== STREAMING JSON COMPARISON ====================
+
+    def _compare_json_files_streaming(
+        self,
+        file1_path: str,
+        file2_path: str,
+        ignore_order: bool,
+        normalize_numerics: bool,
+        exclude_keys: List[str],
+        memory_limit_mb: int,
+        temp_dir: Optional[str]
+    ) -> Dict[str, Any]:
+        """Compare two JSON arrays / NDJSON files element by element.
+
+        Returns the comparison fields of the result dictionary (status,
+        files_match, differences, total_differences, element counts).
+        """
+        exclude_keys_lower = {k.lower() for k in exclude_keys} if exclude_keys else set()
+        if ignore_order:
+            buckets = self._streaming_bucket_count(file1_path, file2_path, memory_limit_mb)
+            differences, count1, count2 = self._compare_json_elements_unordered(
+                (file1_path, file2_path), exclude_keys_lower, normalize_numerics, buckets, temp_dir
+            )
+        else:
+            # Numerics are normalized for the equality check only, so differences
+            # show the values as written (as in the in-memory comparison)
+            differences, count1, count2 = self._compare_json_elements_ordered(
+                self._iter_normalized_json_elements(file1_path, exclude_keys_lower, False),
+                self._iter_normalized_json_elements(file2_path, exclude_keys_lower, False),
+                normalize_numerics
+            )
+
+        return {
+            'status': 'IDENTICAL' if not differences else 'DIFFERENT',
+            'files_match': not differences,
+            'file1_elements': count1,
+            'file2_elements': count2,
+            'differences': differences,
+            'total_differences': len(differences)
+        }
+
+    def _iter_json_elements(self, file_path: str) -> Iterator[Any]:
+        """Yield the elements of a top-level JSON array, or the values of an
+        NDJSON / JSON Lines file, parsing one element at a time.
+
+        The file is read in JSON_READ_SIZE blocks and each element decoded with
+        raw_decode. An element is only complete once a character that cannot
+        continue a number follows it ('-0.' decodes as 0), otherwise it is
+        decoded again with more input.
+        Files named .ndjson / .jsonl (optionally .gz / .bz2) are always read as
+        a sequence of values.
+        """
+        decoder = json.JSONDecoder()
+        whitespace = self._JSON_WHITESPACE
+        number_chars = self._JSON_NUMBER_CHARS
+        name = re.sub(r'\.(gz|bz2)$', '', file_path.lower())
+        in_array = None if not name.endswith(('.ndjson', '.jsonl')) else False
+        array_closed = expect_comma = seen_element = False
+
+        with self._open_text_file(file_path) as f:
+            buffer, pos, eof = '', 0, False
+            while True:
+                pos = whitespace.match(buffer, pos).end()
+                if pos == len(buffer):
+                    if eof:
+                        break
+                    buffer, pos = f.read(self.JSON_READ_SIZE), 0
+                    eof = not buffer
+                    continue
+
+                char = buffer[pos]
+                if array_closed:
+                    raise json.JSONDecodeError("Extra data", buffer, pos)
+                if in_array is None:
+                    in_array = char == '['
+                    pos += in_array
+                    continue
+                # ']' closes the array after an element, or at once if it is empty
+                if in_array and char == ']' and (expect_comma or not seen_element):
+                    array_closed = True
+                    pos += 1
+                    continue
+                if in_array and expect_comma:
+                    if char != ',':
+                        raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                    expect_comma = False
+                    pos += 1
+                    continue
+
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    complete = eof or number_chars.match(buffer, end).end() < len(buffer)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    complete = False
+                if not complete:
+                    more = f.read(max(self.JSON_READ_SIZE, len(buffer) - pos))
+                    buffer, pos = buffer[pos:] + more, 0
+                    eof = not more
+                    continue
+
+                yield value
+                pos = end
+                expect_comma = in_array
+                seen_element = True
+
+            if in_array and not array_closed:
+                raise json.JSONDecodeError("Expecting ']'", buffer, pos)
+
+    def _iter_normalized_json_elements(
+        self,
+        file_path: str,
+        exclude_keys_lower: Set[str],
+        normalize_numerics: bool
+    ) -> Iterator[Any]:
+        """_iter_json_elements with the excluded keys removed and numerics normalized."""
+        for element in self._iter_json_elements(file_path):
+            if exclude_keys_lower:
+                element = self._remove_keys_recursive(element, exclude_keys_lower)
+            if normalize_numerics:
+                element = self._normalize_json_numerics(element)
+            yield element
+
+    def _compare_json_elements_ordered(
+        self,
+        elements1: Iterator[Any],
+        elements2: Iterator[Any],
+        normalize_numerics: bool
+    ) -> tuple:
+        """Compare two element streams pairwise, like the in-memory comparison of
+        two arrays: each unequal pair's differences under its [index] path and,
+        first, ARRAY_LENGTH_MISMATCH if the counts differ.
+
+        Once a difference cap is reached the remaining elements are only counted.
+
+        Returns (differences, elements in file1, elements in file2).
+        """
+        differences = []
+        count1 = count2 = 0
+        for index, (element1, element2) in enumerate(zip_longest(elements1, elements2, fillvalue=_MISSING)):
+            count1 += element1 is not _MISSING
+            count2 += element2 is not _MISSING
+            if element1 is _MISSING or element2 is _MISSING or self._difference_cap_reached(differences):
+                continue
+            if normalize_numerics:
+                equal = self._normalize_json_numerics(element1) == self._normalize_json_numerics(element2)
+            else:
+                equal = element1 == element2
+            if not equal:
+                differences.extend(self._find_json_differences(
+                    element1, element2, f"[{index}]", normalize_numerics,
+                    limit=self._max_differences and self._max_differences - len(differences)
+                ))
+
+        if count1 != count2:
+            differences.insert(0, {
+                'type': 'ARRAY_LENGTH_MISMATCH',
+                'path': 'root',
+                'file1_length': count1,
+                'file2_length': count2
+            })
+        return differences, count1, count2
+
+    def _compare_json_elements_unordered(
+        self,
+        file_paths: tuple,
+        exclude_keys_lower: Set[str],
+        normalize_numerics: bool,
+        buckets: int,
+        temp_dir: Optional[str] = None
+    ) -> tuple:
+        """Compare the elements of two JSON files as multisets of element digests.
+
+        With a single bucket both digest counters are built in memory;
+        otherwise each side's digests are written to `buckets` bucket files
+        by digest (16 bytes per element) and the buckets compared pairwise.
+        Only mismatched digests are kept, and their elements are recovered in
+        a second pass over the files.
+
+        Returns (differences, elements in file1, elements in file2).
+        """
+        if buckets == 1:
+            counts1, counts2 = (
+                Counter(self._json_digest(element, True) for element in
+                        self._iter_normalized_json_elements(path, exclude_keys_lower, normalize_numerics))
+                for path in file_paths
+            )
+            mismatched = self._mismatched_counts(counts1, counts2)
+            count1, count2 = sum(counts1.values()), sum(counts2.values())
+        else:
+            logger.info(f"Streaming JSON comparison: partitioning element digests into {buckets} buckets")
+            mismatched = {}
+            with tempfile.TemporaryDirectory(prefix='json-compare-', dir=temp_dir) as work_dir:
+                count1, count2 = (
+                    self._partition_json_digests(
+                        path, exclude_keys_lower, normalize_numerics, work_dir, side, buckets
+                    )
+                    for side, path in (('1', file_paths[0]), ('2', file_paths[1]))
+                )
+                for bucket in range(buckets):
+                    counts1, counts2 = (
+                        self._count_digest_file(os.path.join(work_dir, f'{side}-{bucket}.bin'))
+                        for side in ('1', '2')
+                    )
+                    mismatched.update(self._mismatched_counts(counts1, counts2))
+
+        return (self._json_element_differences(mismatched, file_paths, exclude_keys_lower, normalize_numerics),
+                count1, count2)
+
+    def _partition_json_digests(
+        self,
+        file_path: str,
+        exclude_keys_lower: Set[str],
+        normalize_numerics: bool,
+        work_dir: str,
+        side: str,
+        buckets: int
+    ) -> int:
+        """Write the element digests of a file to per-bucket files. Returns the element count."""
+        files = [open(os.path.join(work_dir, f'{side}-{bucket}.bin'), 'wb') for bucket in range(buckets)]
+        try:
+            count = 0
+            for element in self._iter_normalized_json_elements(file_path, exclude_keys_lower, normalize_numerics):
+                digest = self._json_digest(element, True)
+                files[int.from_bytes(digest[:4], 'big') % buckets].write(digest)
+                count += 1
+            return count
+        finally:
+            for f in files:
+                f.close()
+
+    def _count_digest_file(self, path: str) -> Counter:
+        """Counter of the fixed-size digests stored back to back in a bucket file."""
+        size = self.ROW_DIGEST_SIZE
+        with open(path, 'rb') as f:
+            data = f.read()
+        return Counter(data[i:i + size] for i in range(0, len(data), size))
+
+    def _json_element_differences(
+        self,
+        mismatched: Dict[bytes, tuple],
+        file_paths: tuple,
+        exclude_keys_lower: Set[str],
+        normalize_numerics: bool
+    ) -> List[Dict[str, Any]]:
+        """Difference entries for mismatched element digests.
+
+        A second pass over the files finds the first occurrence of each
+        mismatched element (file1 first); elements missing from one file are
+        ELEMENT_ONLY_IN_FILE1/2 (with their count), elements in both with
+        different counts DUPLICATE_ELEMENT_MISMATCH. Each group is in order of
+        the element's position. With a difference cap only the first
+        max_differences mismatched digests are looked up.
+        """
+        mismatched = self._capped_mismatches(mismatched)
+        if not mismatched:
+            return []
+
+        found = {}
+        for path in file_paths:
+            elements = self._iter_normalized_json_elements(path, exclude_keys_lower, normalize_numerics)
+            for index, element in enumerate(elements):
+                digest = self._json_digest(element, True)
+                if digest in mismatched and digest not in found:
+                    found[digest] = (index, element)
+                    if len(found) == len(mismatched):
+                        break
+            if len(found) == len(mismatched):
+                break
+
+        only_in_file1, only_in_file2, duplicates = [], [], []
+        for digest, (count1, count2) in mismatched.items():
+            index, element = found[digest]
+            if count2 == 0:
+                only_in_file1.append((index, {
+                    'type': 'ELEMENT_ONLY_IN_FILE1', 'path': f"[{index}]", 'value': element, 'count': count1
+                }))
+            elif count1 == 0:
+                only_in_file2.append((index, {
+                    'type': 'ELEMENT_ONLY_IN_FILE2', 'path': f"[{index}]", 'value': element, 'count': count2
+                }))
+            else:
+                duplicates.append((index, {
+                    'type': 'DUPLICATE_ELEMENT_MISMATCH',
+                    'path': f"[{index}]",
+                    'value': element,
+                    'file1_count': count1,
+                    'file2_count': count2
+                }))
+        return [diff for group in (only_in_file1, only_in_file2, duplicates)
+                for _, diff in sorted(group, key=itemgetter(0))]
+
+    def _log_comparison_result(self, result: Dict[str, Any], file_format: str = 'csv') -> None:
         """Log comparison results to Robot Framework log.
 
         Matches the original Robot Framework logging format:
-        - Shows summary header with match_key, excluded keys, unique differences count
+        - Shows a "<FORMAT> COMPARISON SUMMARY" header for the compared file_format
+          ('csv', 'json', 'parquet' or 'avro') with match_key, excluded keys and
+          unique differences count
         - Shows FIELD DIFFERENCES section with detailed field-level comparison
         """
         logger.console("")
         logger.console("=" * 50)
-        logger.console("CSV COMPARISON SUMMARY")
+        logger.console(f"{file_format.upper()} COMPARISON SUMMARY")
         logger.console("=" * 50)
 
         # Display file paths with blank lines for readability
@@ -1323,6 +3825,32 @@ class FileComparisonLibrary:
 
         logger.console(f"Status: {result['status']}")
 
+        timings = result.get('timings')
+        if timings:
+            logger.console(
+                f"Timings: read {timings['read']:.2f}s, normalize {timings['normalize']:.2f}s, "
+                f"compare {timings['compare']:.2f}s, total {timings['total']:.2f}s "
+                f"(workers: {timings['workers']})"
+            )
+
+        if result.get('truncated'):
+            logger.console(f"Differences: stopped at the first {result['total_differences']} (max_differences)")
+
+        sample = result.get('sample')
+        if sample:
+            logger.console(
+                f"Sample: {sample['keys_sampled']} of {sample['keys_total']} keys (seed {sample['seed']}), "
+                f"{sample['keys_with_differences']} with differences; at {sample['confidence']:.0%} confidence "
+                f"at most {sample['max_difference_rate']:.2%} of keys differ"
+            )
+
+        if result.get('decided_by') == 'bytes':
+            logger.console("Files are byte-identical (rows not compared)")
+
+        if 'file1_checksum' in result:
+            logger.console(f"Quick check: {result['file1_size']} / {result['file2_size']} bytes, "
+                           f"{result['file1_rows']} / {result['file2_rows']} rows")
+
         match_key = result.get('match_key')
         if match_key:
             logger.console(f"Match Key: {match_key}")
@@ -1341,7 +3869,8 @@ class FileComparisonLibrary:
                             unique_keys.append(key)
                 else:
                     key_value = diff.get('key_value', '')
-                    field_key = f"{key_value}_Field{diff.get('field_index', 0)}" if key_value else f"Row{diff.get('row_index', 0)}_Field{diff.get('field_index', 0)}"
+                    field = diff.get('column', diff.get('field_index', 0))
+                    field_key = f"{key_value}_Field{field}" if key_value else f"Row{diff.get('row_index', 0)}_Field{field}"
                     if field_key not in unique_keys:
                         unique_keys.append(field_key)
             elif diff['type'] == 'ROW_CONTENT_MISMATCH':
@@ -1369,6 +3898,10 @@ class FileComparisonLibrary:
             elif diff['type'] == 'HEADER_MISMATCH':
                 if 'HEADERS' not in unique_keys:
                     unique_keys.append('HEADERS')
+            elif diff['type'] == 'COLUMN_TYPE_MISMATCH':
+                unique_keys.append(f"COLUMN_TYPE_{diff.get('column', '')}")
+            elif diff['type'] == 'CHECKSUM_MISMATCH':
+                unique_keys.append('CHECKSUM')
             elif diff['type'] == 'UNMATCHED_ROW_IN_FILE1':
                 row_key = f"UNMATCHED_ACTUAL_{diff.get('key_value', '')}"
                 if row_key not in unique_keys:
@@ -1377,10 +3910,22 @@ class FileComparisonLibrary:
                 row_key = f"UNMATCHED_EXPECTED_{diff.get('key_value', '')}"
                 if row_key not in unique_keys:
                     unique_keys.append(row_key)
+            elif diff['type'] in ('ROW_ONLY_IN_FILE1', 'ROW_ONLY_IN_FILE2', 'DUPLICATE_ROW_MISMATCH'):
+                row_key = f"{diff['type']}_{diff.get('row_content')}"
+                if row_key not in unique_keys:
+                    unique_keys.append(row_key)
             elif diff['type'] == 'ROW_ORDER_MISMATCH':
                 order_key = f"ORDER_MISMATCH_{diff.get('key_value', '')}"
                 if order_key not in unique_keys:
                     unique_keys.append(order_key)
+            elif diff['type'] == 'DUPLICATE_KEY':
+                duplicate_key = f"DUPLICATE_KEY_{diff.get('key_value', '')}"
+                if duplicate_key not in unique_keys:
+                    unique_keys.append(duplicate_key)
+            elif diff['type'] in ('ELEMENT_ONLY_IN_FILE1', 'ELEMENT_ONLY_IN_FILE2', 'DUPLICATE_ELEMENT_MISMATCH'):
+                element_key = f"{diff['type']}_{diff.get('path', '')}"
+                if element_key not in unique_keys:
+                    unique_keys.append(element_key)
 
         unique_count = len(unique_keys)
         logger.console(f"Unique Field Differences: {unique_count}")
@@ -1430,18 +3975,19 @@ class FileComparisonLibrary:
                                 logger.console(f"Expected: {val}")
                     else:
                         # Simple field - show row/field difference
+                        field = diff.get('column', diff.get('field_index', 0))
                         if has_key_value:
-                            field_key = f"{diff['key_value']}_Field{diff.get('field_index', 0)}"
+                            field_key = f"{diff['key_value']}_Field{field}"
                         else:
-                            field_key = f"Row{diff.get('row_index', 0)}_Field{diff.get('field_index', 0)}"
+                            field_key = f"Row{diff.get('row_index', 0)}_Field{field}"
 
                         if field_key not in logged_keys:
                             logged_keys.append(field_key)
                             logger.console("")
                             if has_key_value:
-                                logger.console(f"Matched Row ({diff.get('match_key', '')} = {diff['key_value']}), Field: {diff.get('field_index', 0)}")
+                                logger.console(f"Matched Row ({diff.get('match_key', '')} = {diff['key_value']}), Field: {field}")
                             else:
-                                logger.console(f"Row: {diff.get('row_index', 0)}, Field: {diff.get('field_index', 0)}")
+                                logger.console(f"Row: {diff.get('row_index', 0)}, Field: {field}")
                             logger.console(f"Actual: {diff.get('file1_value', '')}")
                             logger.console(f"Expected: {diff.get('file2_value', '')}")
 
@@ -1545,6 +4091,18 @@ class FileComparisonLibrary:
                         logger.console(f"Actual: {diff.get('file1_header', '')}")
                         logger.console(f"Expected: {diff.get('file2_header', '')}")
 
+                elif diff['type'] == 'COLUMN_TYPE_MISMATCH':
+                    logger.console("")
+                    logger.console(f"Column type mismatch: {diff.get('column', '')}")
+                    logger.console(f"Actual: {diff.get('file1_type', '')}")
+                    logger.console(f"Expected: {diff.get('file2_type', '')}")
+
+                elif diff['type'] == 'CHECKSUM_MISMATCH':
+                    logger.console("")
+                    logger.console("Row checksum mismatch")
+                    logger.console(f"Actual: {diff.get('file1_checksum', '')}")
+                    logger.console(f"Expected: {diff.get('file2_checksum', '')}")
+
                 elif diff['type'] == 'UNMATCHED_ROW_IN_FILE1':
                     key_value = diff.get('key_value', 'unknown')
                     row_key = f"UNMATCHED_ACTUAL_{key_value}"
@@ -1571,5 +4129,55 @@ class FileComparisonLibrary:
                         logger.console(f"Actual position: {diff.get('file1_position', '')}")
                         logger.console(f"Expected position: {diff.get('file2_position', '')}")
 
+                elif diff['type'] == 'DUPLICATE_KEY':
+                    logger.console("")
+                    logger.console(f"Duplicate key {diff.get('match_key', '')} = {diff.get('key_value', 'unknown')}")
+                    logger.console(f"Actual count: {diff.get('file1_count', '')} "
+                                   f"(positions {diff.get('file1_positions', [])[:10]})")
+                    logger.console(f"Expected count: {diff.get('file2_count', '')} "
+                                   f"(positions {diff.get('file2_positions', [])[:10]})")
+
+                elif diff['type'] in ('ROW_ONLY_IN_FILE1', 'ROW_ONLY_IN_FILE2'):
+                    logger.console("")
+                    where = 'actual' if diff['type'] == 'ROW_ONLY_IN_FILE1' else 'expected'
+                    times = f" ({diff['count']} times)" if diff.get('count', 1) > 1 else ""
+                    logger.console(f"Row only in {where} file{times}: {str(diff.get('row_content', ''))[:300]}")
+
+                elif diff['type'] == 'DUPLICATE_ROW_MISMATCH':
+                    logger.console("")
+                    logger.console(f"Duplicate count mismatch: {str(diff.get('row_content', ''))[:300]}")
+                    logger.console(f"Actual count: {diff.get('file1_count', '')}")
+                    logger.console(f"Expected count: {diff.get('file2_count', '')}")
+
+                elif diff['type'] in ('ELEMENT_ONLY_IN_FILE1', 'ELEMENT_ONLY_IN_FILE2'):
+                    logger.console("")
+                    where = 'actual' if diff['type'] == 'ELEMENT_ONLY_IN_FILE1' else 'expected'
+                    times = f" ({diff['count']} times)" if diff.get('count', 1) > 1 else ""
+                    logger.console(f"Element {diff.get('path', '')} only in {where} file{times}: "
+                                   f"{json.dumps(diff.get('value'), default=str)[:300]}")
+
+                elif diff['type'] == 'DUPLICATE_ELEMENT_MISMATCH':
+                    logger.console("")
+                    logger.console(f"Duplicate element count mismatch {diff.get('path', '')}: "
+                                   f"{json.dumps(diff.get('value'), default=str)[:300]}")
+                    logger.console(f"Actual count: {diff.get('file1_count', '')}")
+                    logger.console(f"Expected count: {diff.get('file2_count', '')}")
+
         logger.console("")
         logger.console("=" * 50)
+
+
+# Library instance of a worker process of the normalization pool
+_worker_library = None
+
+
+def _run_row_chunk(operation: str, rows: list, args: tuple):
+    """Worker process entry point: run FileComparisonLibrary chunk operation `operation`."""
+    global _worker_library
+    if _worker_library is None:
+        _worker_library = FileComparisonLibrary()
+    return getattr(_worker_library, operation)(rows, *args)
+
+
+# Fill value for the shorter element stream (JSON null is None)
+_MISSING = object()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+FileComparisonLibrary Benchmark
+===============================
+Measures wall time and peak memory of ``Compare CSV Files`` (or, with
+--match-key, key-based ``Compare CSV Files With Exclusions``) on generated
+pipeline-like CSV extracts, in-memory versus streaming.
+
+For each row count the benchmark writes an "actual" and an "expected"
+file with the same rows (in a different order unless --ignore-order
+false), a handful of changed rows and one JSON column (like Snowflake
+JSON-in-CSV outputs). Each comparison then runs in its own Python
+process so its peak RSS (ru_maxrss) is measured in isolation.
+
+Usage (from the test directory, with Robot Framework installed):
+  python libraries/common/benchmarks/file_comparison_benchmark.py \\
+      [--rows 1000000,10000000] [--modes memory,streaming] \\
+      [--memory-limit-mb 256] [--ignore-order true] [--work-dir /tmp] \\
+      [--normalize-numerics false] [--workers 1] [--match-key ENTITY_ID]
+
+The in-memory mode needs several times the file size in RAM; skip it for
+the largest row counts with --modes streaming.
+"""
+import argparse
+import csv
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+LIBRARY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHANGED_ROWS = 10
+
+
+def _row(i):
+    metadata = json.dumps({'event_id': f'E{i:09d}', 'amount': i % 5000, 'region': ('us', 'eu', 'apac')[i % 3]})
+    return [f'ENT-{i:09d}', f'Customer {i % 100000}', str(i % 5000), f'2024-01-{i % 28 + 1:02d}', metadata]
+
+
+def _write_files(rows, work_dir, permute):
+    """Write actual/expected CSVs: the same rows (expected permuted if `permute`) with a few edits."""
+    actual = os.path.join(work_dir, f'actual_{rows}.csv')
+    expected = os.path.join(work_dir, f'expected_{rows}.csv')
+    header = ['ENTITY_ID', 'NAME', 'AMOUNT', 'DAY', 'RECORD_METADATA']
+    # a prime coprime to rows: i -> i*step % rows permutes the rows
+    step = (7919 if rows % 7919 else 7907) if permute else 1
+    changed = {rows * k // CHANGED_ROWS for k in range(CHANGED_ROWS)} if rows >= CHANGED_ROWS else set()
+
+    with open(actual, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(_row(i) for i in range(rows))
+    with open(expected, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for j in range(rows):
+            i = j * step % rows
+            row = _row(i)
+            if i in changed:
+                row[2] = str(int(row[2]) + 1)
+            writer.writerow(row)
+    return actual, expected
+
+
+def _run_one(mode, actual, expected, memory_limit_mb, ignore_order, normalize_numerics, workers, match_key):
+    """Child process: run one comparison and print a JSON summary."""
+    sys.path.insert(0, LIBRARY_DIR)
+    from robot.api import logger
+    logger.console = lambda *args, **kwargs: None
+    from FileComparisonLibrary import FileComparisonLibrary
+
+    start = time.perf_counter()
+    if match_key:
+        result = FileComparisonLibrary().compare_csv_with_exclusions(
+            actual, expected, [], match_key=match_key, ignore_order=ignore_order, show_details=False,
+            normalize_numerics=normalize_numerics, streaming=(mode == 'streaming'),
+            memory_limit_mb=memory_limit_mb, workers=workers,
+        )
+    else:
+        result = FileComparisonLibrary().compare_csv_files(
+            actual, expected, ignore_order=ignore_order, show_details=False,
+            normalize_numerics=normalize_numerics, streaming=(mode == 'streaming'),
+            memory_limit_mb=memory_limit_mb, workers=workers,
+        )
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'seconds': elapsed,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'status': result['status'],
+        'differences': result['total_differences'],
+        'timings': result['timings'],
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default='1000000,10000000')
+    parser.add_argument('--modes', default='memory,streaming')
+    parser.add_argument('--memory-limit-mb', type=int, default=256)
+    parser.add_argument('--ignore-order', default='true')
+    parser.add_argument('--work-dir', default=None)
+    parser.add_argument('--normalize-numerics', default='false')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--match-key', default=None)
+    parser.add_argument('--run', nargs=3, metavar=('MODE', 'ACTUAL', 'EXPECTED'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    ignore_order = args.ignore_order.lower() == 'true'
+    normalize_numerics = args.normalize_numerics.lower() == 'true'
+
+    if args.run:
+        _run_one(args.run[0], args.run[1], args.run[2], args.memory_limit_mb, ignore_order,
+                 normalize_numerics, args.workers, args.match_key)
+        return
+
+    print(f'{"rows":>11} {"file MB":>8} {"mode":>10} {"seconds":>8} {"peak MB":>8} {"diffs":>6}  '
+          f'{"read":>6} {"norm":>6} {"compare":>7}')
+    with tempfile.TemporaryDirectory(prefix='compare-bench-', dir=args.work_dir) as work_dir:
+        for rows in (int(r) for r in args.rows.split(',')):
+            actual, expected = _write_files(rows, work_dir, permute=ignore_order)
+            size_mb = os.path.getsize(actual) / 1024 / 1024
+            for mode in args.modes.split(','):
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--run', mode, actual, expected,
+                     '--memory-limit-mb', str(args.memory_limit_mb), '--ignore-order', args.ignore_order,
+                     '--normalize-numerics', args.normalize_numerics, '--workers', str(args.workers)]
+                    + (['--match-key', args.match_key] if args.match_key else []),
+                    capture_output=True, text=True,
+                )
+                if output.returncode != 0:
+                    print(f'{rows:>11} {size_mb:>8.0f} {mode:>10}   failed: {output.stderr.strip().splitlines()[-1:]}')
+                    continue
+                stats = json.loads(output.stdout.strip().splitlines()[-1])
+                timings = stats['timings']
+                print(f'{rows:>11} {size_mb:>8.0f} {mode:>10} {stats["seconds"]:>8.1f} '
+                      f'{stats["peak_rss_mb"]:>8.0f} {stats["differences"]:>6}  '
+                      f'{timings["read"]:>6.1f} {timings["normalize"]:>6.1f} {timings["compare"]:>7.1f}')
+            os.remove(actual)
+            os.remove(expected)
+
+
+if __name__ == '__main__':
+    main()